@@ -0,0 +1,165 @@
+"""
+Loop which processes channel access requests for the server. Between processing calls it waits for a timeout which is
+short after the model has posted monitor updates or a put has been made and which backs off while the server is idle.
+"""
+
+import logging
+import time
+from collections import namedtuple
+from threading import Lock
+from typing import Callable, Optional, Tuple
+
+from server_common.observable import observable
+
+from ReflectometryServer.model_actor import QueueLatency
+
+logger = logging.getLogger(__name__)
+
+# Timeout in seconds used when processing with a fixed timeout
+FIXED_TIMEOUT = 0.1
+
+# Timeout in seconds used for the first processing call after the model has posted an update
+ADAPTIVE_MIN_TIMEOUT = 0.001
+
+# Longest timeout in seconds which the adaptive timeout backs off to while the server is idle
+ADAPTIVE_MAX_TIMEOUT = 0.05
+
+# Factor by which the adaptive timeout grows on each processing call where there was nothing to do
+ADAPTIVE_BACKOFF_FACTOR = 2
+
+PutLatencyUpdate = namedtuple(
+    "PutLatencyUpdate",
+    [
+        "latency",  # time in seconds from a put being received to the monitors it caused being sent
+    ],
+)
+
+
+@observable(PutLatencyUpdate)
+class ProcessWakeup:
+    """
+    Records when the model has something for the channel access processing loop to send, and the time puts were
+    received so that the latency from put to monitor can be measured.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._woken = False
+        self._put_started = None
+        self._put_finished = None
+        self.put_latency = QueueLatency()
+
+    def wake(self):
+        """
+        Signal that monitor updates have been posted and need to be sent.
+        """
+        with self._lock:
+            self._woken = True
+
+    def put_started(self):
+        """
+        Signal that a put has been received. Only the earliest put not yet sent is timed.
+        """
+        with self._lock:
+            if self._put_started is None:
+                self._put_started = time.perf_counter()
+
+    def put_finished(self):
+        """
+        Signal that the put has been processed so its monitor updates are waiting to be sent.
+        """
+        with self._lock:
+            if self._put_finished is None:
+                self._put_finished = self._put_started
+            self._put_started = None
+            self._woken = True
+
+    def take(self) -> Tuple[bool, Optional[float]]:
+        """
+        Take the current state clearing it.
+
+        Returns: whether there are updates to send; time the earliest put whose monitors are waiting to be sent was
+            received, None if there are none
+        """
+        with self._lock:
+            woken, put_time = self._woken, self._put_finished
+            self._woken = False
+            self._put_finished = None
+        return woken, put_time
+
+    def record_put_sent(self, put_time: float):
+        """
+        Record that the monitors for a put have been sent.
+        Args:
+            put_time: time the put was received
+        """
+        latency = time.perf_counter() - put_time
+        self.put_latency.record(latency)
+        self.trigger_listeners(PutLatencyUpdate(latency))
+
+
+# Signals from the model to the channel access processing loop
+CA_PROCESS_WAKEUP = ProcessWakeup()
+
+
+class CaProcessLoop:
+    """
+    Repeatedly processes channel access requests. After a wakeup it processes with the minimum timeout; each call
+    without a wakeup doubles the timeout up to the maximum. With equal minimum and maximum timeouts this is the fixed
+    polling loop.
+    """
+
+    def __init__(
+        self,
+        process: Callable[[float], None],
+        poll: Callable[[], None],
+        min_timeout: float = FIXED_TIMEOUT,
+        max_timeout: float = FIXED_TIMEOUT,
+        wakeup: ProcessWakeup = CA_PROCESS_WAKEUP,
+    ):
+        """
+        Initialise.
+        Args:
+            process: function which processes channel access server requests for up to the given timeout
+            poll: function which processes channel access client events
+            min_timeout: timeout in seconds after a wakeup
+            max_timeout: longest timeout in seconds while idle
+            wakeup: signals from the model
+        """
+        self._process = process
+        self._poll = poll
+        self._min_timeout = min_timeout
+        self._max_timeout = max_timeout
+        self._wakeup = wakeup
+        self.timeout = max_timeout
+
+    def process_once(self):
+        """
+        Process channel access requests once. If a put had finished before processing its monitors have been sent
+        afterwards so its latency is recorded.
+        """
+        woken, put_time = self._wakeup.take()
+        if woken:
+            self.timeout = self._min_timeout
+        else:
+            self.timeout = min(self.timeout * ADAPTIVE_BACKOFF_FACTOR, self._max_timeout)
+        self._process(self.timeout)
+        self._poll()
+        if put_time is not None:
+            self._wakeup.record_put_sent(put_time)
+
+    def run(self):
+        """
+        Process channel access requests until an exception is raised.
+        """
+        logger.info(
+            "Processing channel access with timeouts from {} to {} s".format(
+                self._min_timeout, self._max_timeout
+            )
+        )
+        while True:
+            try:
+                self.process_once()
+            except Exception:
+                logger.exception("Channel access processing stopped")
+                break
@@ -0,0 +1,285 @@
+"""
+Replay of a channel access recording into a headless beamline, to reproduce and profile a recorded session without
+the motors or clients it ran with.
+
+Monitor updates are fed to the beamline through its PV wrappers and writes through a reflectometry driver whose PVs
+are never served, so both take the same path through the server as they did when recorded. Replay is either at the
+original speed or as fast as possible; when as fast as possible the replay waits before each write for the readbacks
+before it to be processed, so that the write acts on the same readbacks as when recorded.
+
+Run with:
+    python -m ReflectometryServer.ChannelAccess.ca_replay RECORDING --config CONFIG.py [--speed SPEED | --fast]
+
+The configuration is called with the macros stored in the recording. Autosave is read and written as by the server,
+so run with ICPVARDIR pointing at a scratch directory.
+"""
+
+import argparse
+import importlib.util
+import statistics
+import time
+from collections import defaultdict, namedtuple
+from typing import Any, Callable, Dict, List, Optional
+
+from pcaspy import SimpleServer
+from server_common.channel_access import AlarmSeverity, AlarmStatus
+
+from ReflectometryServer.beamline import Beamline
+from ReflectometryServer.ca_recording import CaRecording, RecordKind, read_recording
+from ReflectometryServer.ChannelAccess.pv_manager import PVManager
+from ReflectometryServer.ChannelAccess.reflectometry_driver import ReflectometryDriver
+from ReflectometryServer.config_helper import ConfigHelper
+from ReflectometryServer.pv_wrapper import PROCESS_MONITOR_EVENTS, set_default_channel_access
+from ReflectometryServer.simulated_motors import SimulatedChannelAccess, VirtualClock
+
+# Prefix of the PVs of the replay driver; these are never served
+REPLAY_PV_PREFIX = "TE:REPLAY:REFL_01:"
+
+ReplayResult = namedtuple(
+    "ReplayResult",
+    [
+        "beamline",  # beamline the recording was replayed into
+        "timings",  # dictionary of the times in seconds of each stage of the replay
+    ],
+)
+
+
+class ReplayChannelAccess:
+    """
+    Channel access stand in for a replay. PVs in the recording start with their first recorded value and are updated
+    as their monitor events are replayed; other PVs, e.g. motor fields which are read but not monitored, have the
+    values of a simulated motor. Writes to PVs are counted but have no effect.
+    """
+
+    def __init__(self, recording: CaRecording):
+        """
+        Initialise.
+        Args:
+            recording: recording being replayed
+        """
+        self._values: Dict[str, Any] = {}
+        for event in recording.events:
+            if event.kind == RecordKind.MONITOR and event.pv not in self._values:
+                self._values[event.pv] = event.value
+        self._defaults = SimulatedChannelAccess(VirtualClock(speed=0))
+        self._monitors: Dict[str, List[Callable]] = defaultdict(list)
+        self.put_count = 0
+
+    def pv_exists(self, pv: str, timeout: Optional[float] = None) -> bool:
+        """
+        Args:
+            pv: pv name
+            timeout: unused
+
+        Returns: True; every PV exists in a replay
+        """
+        return True
+
+    def caget(self, pv: str, as_string: bool = False, timeout: Optional[float] = None) -> Any:
+        """
+        Args:
+            pv: pv name
+            as_string: unused
+            timeout: unused
+
+        Returns: the current value of the PV
+        """
+        if pv in self._values:
+            return self._values[pv]
+        return self._defaults.caget(pv)
+
+    def caput(
+        self,
+        pv: str,
+        value: Any,
+        wait: bool = False,
+        timeout: Optional[float] = None,
+        safe_not_quick: bool = True,
+    ):
+        """
+        Count a write; its effect, if any, is in the recorded monitor events.
+        Args:
+            pv: pv name
+            value: value to write
+            wait: unused
+            timeout: unused
+            safe_not_quick: unused
+        """
+        self.put_count += 1
+
+    def caput_retry_on_fail(
+        self, pv: str, value: Any, retry_count: int = 5, safe_not_quick: bool = True
+    ):
+        """
+        Count a write; its effect, if any, is in the recorded monitor events.
+        Args:
+            pv: pv name
+            value: value to write
+            retry_count: unused
+            safe_not_quick: unused
+        """
+        self.put_count += 1
+
+    def add_monitor(
+        self, pv: str, call_back_function: Callable, link_alarm_on_disconnect: bool = True
+    ):
+        """
+        Call a function with the value, alarm severity and alarm status of each replayed monitor event of a PV. As
+        with a channel access monitor it is called straight away with the current value, if the PV has one.
+        Args:
+            pv: pv name
+            call_back_function: function to call
+            link_alarm_on_disconnect: unused
+        """
+        self._monitors[pv].append(call_back_function)
+        if pv in self._values:
+            call_back_function(self._values[pv], AlarmSeverity.No, AlarmStatus.No)
+
+    def post(self, pv: str, value: Any, alarm_severity: int, alarm_status: int):
+        """
+        Replay a monitor event.
+        Args:
+            pv: pv name
+            value: new value
+            alarm_severity: alarm severity
+            alarm_status: alarm status
+        """
+        self._values[pv] = value
+        for call_back_function in self._monitors.get(pv, []):
+            call_back_function(value, alarm_severity, alarm_status)
+
+
+def create_driver(beamline: Beamline) -> ReflectometryDriver:
+    """
+    Args:
+        beamline: beamline to drive
+
+    Returns: reflectometry driver for the beamline whose PVs are created but never served
+    """
+    server = SimpleServer()
+    pv_manager = PVManager()
+    server.createPV(REPLAY_PV_PREFIX, pv_manager.PVDB)
+    driver = ReflectometryDriver(server, pv_manager)
+    pv_manager.set_beamline(beamline)
+    server.createPV(REPLAY_PV_PREFIX, pv_manager.get_init_filtered_pvdb())
+    driver.set_beamline(beamline)
+    return driver
+
+
+def replay(
+    recording: CaRecording,
+    create_beamline: Callable[[Dict[str, str]], Beamline],
+    speed: Optional[float] = 1.0,
+) -> ReplayResult:
+    """
+    Replay a recording into a new beamline.
+    Args:
+        recording: recording to replay
+        create_beamline: function which creates the beamline from the macros, e.g. the get_beamline of a configuration
+        speed: speed of the replay compared with the recording; None for as fast as possible
+
+    Returns: the beamline and the times in seconds of each stage of the replay:
+        construction: creating the beamline, processing the initial readbacks and creating the driver
+        monitor: passing each monitor event to the beamline
+        readback_batch: processing each batch of readbacks
+        write <PV>: each write to the PV, including any move it causes
+        settle: processing the readbacks left after the last event
+        total: replaying all the events
+    """
+    timings = defaultdict(list)
+    replay_ca = ReplayChannelAccess(recording)
+    set_default_channel_access(replay_ca)
+    PROCESS_MONITOR_EVENTS.batch_timer = lambda _, duration: timings["readback_batch"].append(
+        duration
+    )
+    driver = None
+    try:
+        start = time.perf_counter()
+        ConfigHelper.reset()
+        beamline = create_beamline(recording.metadata.get("macros", {}))
+        PROCESS_MONITOR_EVENTS.wait_for_processing()
+        driver = create_driver(beamline)
+        timings["construction"].append(time.perf_counter() - start)
+
+        first_time = recording.events[0].time if recording.events else 0.0
+        replay_start = time.perf_counter()
+        for event in recording.events:
+            if speed is not None:
+                delay = replay_start + (event.time - first_time) / speed - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            elif event.kind == RecordKind.WRITE:
+                PROCESS_MONITOR_EVENTS.wait_for_processing()
+            event_start = time.perf_counter()
+            if event.kind == RecordKind.MONITOR:
+                replay_ca.post(event.pv, event.value, event.severity, event.status)
+                timings["monitor"].append(time.perf_counter() - event_start)
+            else:
+                driver.write(event.pv, event.value)
+                timings["write {}".format(event.pv)].append(time.perf_counter() - event_start)
+
+        settle_start = time.perf_counter()
+        PROCESS_MONITOR_EVENTS.wait_for_processing()
+        timings["settle"].append(time.perf_counter() - settle_start)
+        timings["total"].append(time.perf_counter() - replay_start)
+    finally:
+        PROCESS_MONITOR_EVENTS.batch_timer = None
+        if driver is not None:
+            driver.close()
+        set_default_channel_access(None)
+    return ReplayResult(beamline, dict(timings))
+
+
+def print_timings(timings: Dict[str, List[float]]):
+    """
+    Print the count, total, median and maximum time of each stage of a replay.
+    Args:
+        timings: times of each stage of the replay
+    """
+    print(
+        "{:<40}{:>8}{:>14}{:>14}{:>14}".format(
+            "stage", "count", "total (ms)", "median (ms)", "max (ms)"
+        )
+    )
+    for stage, times in timings.items():
+        print(
+            "{:<40}{:>8}{:>14.3f}{:>14.3f}{:>14.3f}".format(
+                stage,
+                len(times),
+                sum(times) * 1e3,
+                statistics.median(times) * 1e3,
+                max(times) * 1e3,
+            )
+        )
+
+
+def _load_get_beamline(config_path: str) -> Callable[[Dict[str, str]], Beamline]:
+    """
+    Args:
+        config_path: path of a beamline configuration file
+
+    Returns: the configuration's get_beamline function
+    """
+    spec = importlib.util.spec_from_file_location("replay_config", config_path)
+    config = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(config)
+    return config.get_beamline
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay a channel access recording")
+    parser.add_argument("recording", help="recording to replay")
+    parser.add_argument("--config", required=True, help="beamline configuration file")
+    speed_group = parser.add_mutually_exclusive_group()
+    speed_group.add_argument(
+        "--speed", type=float, default=1.0, help="speed compared with the recording"
+    )
+    speed_group.add_argument("--fast", action="store_true", help="replay as fast as possible")
+    arguments = parser.parse_args()
+    print_timings(
+        replay(
+            read_recording(arguments.recording),
+            _load_get_beamline(arguments.config),
+            None if arguments.fast else arguments.speed,
+        ).timings
+    )
@@ -1,17 +1,30 @@
+import json
+import logging
 from enum import Enum
-from typing import Dict, Tuple, Union
+from functools import partial
+from math import isfinite
+from threading import Lock, Timer
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple, Union
 
 from server_common.channel_access import AlarmSeverity, AlarmStatus
 from server_common.utilities import SEVERITY, print_and_log
 
 from ReflectometryServer import Beamline
 from ReflectometryServer.ChannelAccess.constants import MAX_ALARM_ID, STANDARD_FLOAT_PV_FIELDS
+from ReflectometryServer.model_actor import MODEL_ACTOR, CommandPriority
 from ReflectometryServer.parameters import BeamlineParameterType, ParameterUpdateBase
+from ReflectometryServer.recomputation_detector import RECOMPUTATION_DETECTOR
 from ReflectometryServer.server_status_manager import STATUS_MANAGER
 
+logger = logging.getLogger(__name__)
+
 # field for in beam parameter
 OUT_IN_ENUM_TEXT = ["OUT", "IN"]
 
+# Fraction of the pvs in a published state which may change before the changes are merged into its shared values
+PUBLISHED_STATE_MERGE_FRACTION = 0.25
+
 
 # Field for the various type of beamline parameter
 PARAMS_FIELDS_BEAMLINE_TYPES = {
@@ -87,6 +100,18 @@ def _convert_to_epics_pv_value(
     return pv_value, severity, status
 
 
+def _finite_or_none(value):
+    """
+    Args:
+        value: value to put in a json document
+
+    Returns: the value, or None if it is a float which json can not represent (NaN or infinite)
+    """
+    if isinstance(value, float) and not isfinite(value):
+        return None
+    return value
+
+
 class PvSort(Enum):
     """
     Enum for the type of PV
@@ -224,20 +249,223 @@ class PvSort(Enum):
         return value, severity, status
 
 
+class MoveCoalescer:
+    """
+    Gathers the parameters which are asked to move within a time window of the first request into a single move of the
+    beamline, so that motors are given one new target instead of being retargeted by each request.
+    """
+
+    def __init__(
+        self, beamline: Beamline, window: float, on_move: Optional[Callable[[], None]] = None
+    ):
+        """
+        Initialise.
+        Args:
+            beamline: the beamline to move
+            window: time in seconds from the first request until the move is made
+            on_move: function to call after the move has been made; None for no function
+        """
+        self._beamline = beamline
+        self._window = window
+        self._on_move = on_move
+        self._pending_parameters = set()
+        self._timer = None
+        self._lock = Lock()
+
+    def request_move(self, parameter):
+        """
+        Request that a parameter is moved to its setpoint at the end of the current window, starting a window if
+        there is not one already.
+        Args:
+            parameter (ReflectometryServer.parameters.BeamlineParameter): parameter to move
+        """
+        with self._lock:
+            self._pending_parameters.add(parameter)
+            if self._timer is None:
+                self._timer = Timer(self._window, self._move)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self):
+        """
+        Make the move for any pending parameters now rather than waiting until the end of the window.
+        """
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+        self._move()
+
+    def _move(self):
+        """
+        Move all the pending parameters in a single beamline move. This is called on the timer thread so the move is
+        made through the model actor, which runs it after any other change to the model in progress even when the
+        actor is not running.
+        """
+        with self._lock:
+            parameters = self._pending_parameters
+            self._pending_parameters = set()
+            self._timer = None
+        if len(parameters) == 0:
+            return
+
+        MODEL_ACTOR.call(
+            RECOMPUTATION_DETECTOR.in_action(
+                "coalesced move", partial(self._move_parameters, parameters)
+            ),
+            CommandPriority.MOVE,
+        )
+
+    def _move_parameters(self, parameters):
+        """
+        Move the beamline for the given parameters on the model thread.
+        Args:
+            parameters: parameters to move
+        """
+        logger.info(
+            "Coalesced move of parameters: {}".format(", ".join(param.name for param in parameters))
+        )
+        try:
+            self._beamline.move_for_parameters(parameters)
+        except Exception as ex:
+            STATUS_MANAGER.update_error_log(
+                "Coalesced move of parameters failed: {}".format(ex), ex
+            )
+        if self._on_move is not None:
+            self._on_move()
+
+
+class PublishedState:
+    """
+    Immutable snapshot of the externally visible values and alarms of all PVs. A new snapshot is made after each batch
+    of changes to the model so that channel access reads are consistent and never touch the live model. A snapshot
+    shares the values of the PVs which have not changed with the snapshot it was made from, so making one costs the
+    number of PVs changed since the shared values were last merged rather than the number of PVs.
+    """
+
+    __slots__ = ("_base_values", "_base_alarms", "_values", "_alarms")
+
+    def __init__(
+        self,
+        values: Mapping[str, Any],
+        alarms: Mapping[str, Tuple[Optional[int], Optional[int]]],
+    ):
+        """
+        Initialise.
+        Args:
+            values: value of each pv keyed by pv name
+            alarms: alarm severity and status of each pv keyed by pv name
+        """
+        self._base_values = MappingProxyType(dict(values))
+        self._base_alarms = MappingProxyType(dict(alarms))
+        self._values = MappingProxyType({})
+        self._alarms = MappingProxyType({})
+
+    def value(self, pv_name: str) -> Any:
+        """
+        Args:
+            pv_name: name of the pv
+
+        Returns: the published value of the pv
+        Raises:
+            KeyError: if the pv has not been published
+        """
+        try:
+            return self._values[pv_name]
+        except KeyError:
+            return self._base_values[pv_name]
+
+    def _alarm(self, pv_name: str) -> Tuple[Optional[int], Optional[int]]:
+        """
+        Args:
+            pv_name: name of the pv
+
+        Returns: the published alarm severity and status of the pv
+        Raises:
+            KeyError: if the pv has not been published
+        """
+        try:
+            return self._alarms[pv_name]
+        except KeyError:
+            return self._base_alarms[pv_name]
+
+    def alarm_severity(self, pv_name: str) -> Optional[int]:
+        """
+        Args:
+            pv_name: name of the pv
+
+        Returns: the published alarm severity of the pv
+        Raises:
+            KeyError: if the pv has not been published
+        """
+        return self._alarm(pv_name)[0]
+
+    def alarm_status(self, pv_name: str) -> Optional[int]:
+        """
+        Args:
+            pv_name: name of the pv
+
+        Returns: the published alarm status of the pv
+        Raises:
+            KeyError: if the pv has not been published
+        """
+        return self._alarm(pv_name)[1]
+
+    def updated(
+        self,
+        values: Mapping[str, Any],
+        alarms: Mapping[str, Tuple[Optional[int], Optional[int]]],
+    ) -> "PublishedState":
+        """
+        Args:
+            values: new values of the pvs which have changed
+            alarms: new alarm severity and status of the pvs which have changed
+
+        Returns: a new snapshot with the changed values and alarms; this snapshot is unchanged
+        """
+        changed_values = {**self._values, **values}
+        changed_alarms = {**self._alarms, **alarms}
+        if len(changed_values) + len(changed_alarms) > PUBLISHED_STATE_MERGE_FRACTION * (
+            len(self._base_values) + len(self._base_alarms)
+        ):
+            # merge once enough pvs have changed that copying them all costs little more than copying the changes
+            return PublishedState(
+                {**self._base_values, **changed_values}, {**self._base_alarms, **changed_alarms}
+            )
+        state = PublishedState.__new__(PublishedState)
+        state._base_values = self._base_values
+        state._base_alarms = self._base_alarms
+        state._values = MappingProxyType(changed_values)
+        state._alarms = MappingProxyType(changed_alarms)
+        return state
+
+
 class DriverParamHelper:
     """
     Driver to help with channel access to parameters
     """
 
-    def __init__(self, pv_manager, beamline: Beamline):
+    def __init__(
+        self,
+        pv_manager,
+        beamline: Beamline,
+        on_coalesced_move: Optional[Callable[[], None]] = None,
+    ):
         """
         Initialise.
         Args:
             pv_manager: pv manger
             beamline: the beamline to use this with
+            on_coalesced_move: function to call after setpoint writes gathered by the beamline's move coalescing
+                window have been moved; None for no function
         """
         self._pv_manager = pv_manager
         self._beamline = beamline
+        if beamline.move_coalescing_window is None:
+            self._move_coalescer = None
+        else:
+            self._move_coalescer = MoveCoalescer(
+                beamline, beamline.move_coalescing_window, on_coalesced_move
+            )
 
     def param_write(self, pv_name, value):
         """
@@ -256,9 +484,14 @@ class DriverParamHelper:
         if param_sort == PvSort.ACTION and not param.is_disabled and not param.is_locked:
             param.move = 1
         elif param_sort == PvSort.SP and not param.is_disabled and not param.is_locked:
-            param.sp = convert_from_epics_pv_value(
+            set_point = convert_from_epics_pv_value(
                 param.parameter_type, value, self._pv_manager.PVDB[pv_name]
             )
+            if self._move_coalescer is None:
+                param.sp = set_point
+            elif not param.read_only:
+                param.sp_no_move = set_point
+                self._move_coalescer.request_move(param)
         elif param_sort == PvSort.SET_AND_NO_ACTION and not param.is_locked:
             param.sp_no_move = convert_from_epics_pv_value(
                 param.parameter_type, value, self._pv_manager.PVDB[pv_name]
@@ -282,6 +515,73 @@ class DriverParamHelper:
             value_accepted = False
         return value_accepted
 
+    def bulk_param_write(self, value, move) -> Dict[str, str]:
+        """
+        Set the setpoints of many parameters at once. All the new setpoints are validated before any are set so either
+        all parameters are set or none are. When moving, the move is only made if every driver would be within its
+        soft limits; otherwise the previous setpoints of all parameters are put back and no custom function is run
+        or setpoint autosaved.
+        Args:
+            value: json object mapping parameter name to its new setpoint (in the parameter's units, options for an
+                enum parameter and true/false for an in beam parameter)
+            move: True to move the beamline once the setpoints are set; False to only set them
+
+        Returns:
+            errors for parameters which could not be set keyed by parameter name, or by "" for errors which are not
+            for a single parameter; empty if all were set
+        """
+        try:
+            set_points = json.loads(value)
+        except ValueError as ex:
+            return {"": "Value is not valid json: {}".format(ex)}
+        if not isinstance(set_points, dict):
+            return {"": "Value must be a json object of parameter names to setpoints"}
+
+        errors = {}
+        for param_name, set_point in set_points.items():
+            error = self._validate_set_point(param_name, set_point)
+            if error is not None:
+                errors[param_name] = error
+        if errors:
+            return errors
+
+        if move:
+            reasons_not_moved = self._beamline.move_to_set_points_within_limits(set_points)
+            if reasons_not_moved:
+                errors[""] = "Setpoints put back, not moved: {}".format(reasons_not_moved)
+        else:
+            for param_name, set_point in set_points.items():
+                self._beamline.parameter(param_name).sp_no_move = set_point
+        return errors
+
+    def _validate_set_point(self, param_name, set_point):
+        """
+        Args:
+            param_name: name of the parameter to set
+            set_point: new setpoint for the parameter
+
+        Returns: reason the setpoint can not be set on the parameter; None if it can be set
+        """
+        if param_name not in self._beamline.parameters:
+            return "Unknown parameter"
+        param = self._beamline.parameter(param_name)
+        if param.read_only:
+            return "Parameter is read only"
+        if param.is_locked:
+            return "Parameter is locked"
+        if param.parameter_type == BeamlineParameterType.FLOAT:
+            if isinstance(set_point, bool) or not isinstance(set_point, (int, float)):
+                return "Setpoint must be a number"
+            if not isfinite(set_point):
+                return "Setpoint must be a finite number"
+        elif param.parameter_type == BeamlineParameterType.IN_OUT:
+            if not isinstance(set_point, bool):
+                return "Setpoint must be true or false"
+        elif param.parameter_type == BeamlineParameterType.ENUM:
+            if set_point not in param.options:
+                return "Setpoint must be one of {}".format(param.options)
+        return None
+
     def get_param_monitor_updates(
         self,
     ) -> Tuple[str, Union[float, int, str, bool], AlarmSeverity, AlarmStatus]:
@@ -302,6 +602,36 @@ class DriverParamHelper:
                 )
                 yield pv_name, value, alarm_severity, alarm_status
 
+    def get_param_snapshot(self) -> List[Dict[str, Any]]:
+        """
+        Snapshot of the state of every parameter, taken in a single pass so that the values are consistent with each
+        other.
+
+        Returns: for each parameter, in beamline order, a dictionary of its name, setpoint (sp), setpoint readback
+            (sp_rbv), readback (rbv), whether the readback is at the setpoint (at_sp), whether it is changing
+            (changing) and the readback alarm severity and status (severity, status). Non-finite values are None so
+            the snapshot is valid json.
+        """
+        snapshot = []
+        for parameter in self._beamline.parameters.values():
+            try:
+                is_changing = parameter.is_changing
+            except NotImplementedError:
+                is_changing = False
+            snapshot.append(
+                {
+                    "name": parameter.name,
+                    "sp": _finite_or_none(parameter.sp),
+                    "sp_rbv": _finite_or_none(parameter.sp_rbv),
+                    "rbv": _finite_or_none(parameter.rbv),
+                    "at_sp": parameter.rbv_at_sp,
+                    "changing": is_changing,
+                    "severity": parameter.alarm_severity,
+                    "status": parameter.alarm_status,
+                }
+            )
+        return snapshot
+
     def get_param_update_from_event(
         self, pv_name: str, param_type: BeamlineParameterType, update: ParameterUpdateBase
     ) -> Tuple[str, Union[float, int, str, bool], AlarmSeverity, AlarmStatus]:
@@ -55,9 +55,46 @@ BEAMLINE_PREFIX = "BL:"
 SERVER_STATUS = "STAT"
 SERVER_MESSAGE = "MSG"
 SERVER_ERROR_LOG = "LOG"
+CA_PUT_LATENCY = "CA:PUT_LATENCY"
 BEAMLINE_MODE = BEAMLINE_PREFIX + "MODE"
 BEAMLINE_MOVE = BEAMLINE_PREFIX + "MOVE"
 REAPPLY_MODE_INITS = BEAMLINE_PREFIX + "INIT_ON_MOVE"
+PARAM_SNAPSHOT = BEAMLINE_PREFIX + "PARAM_SNAPSHOT"
+BULK_PARAMS = BEAMLINE_PREFIX + "PARAMS"
+BULK_PARAMS_ERRORS = BULK_PARAMS + ":ERRORS"
+PRESET_PREFIX = BEAMLINE_PREFIX + "PRESET"
+PRESET_SAVE = PRESET_PREFIX + ":SAVE"
+PRESET_RECALL = PRESET_PREFIX + ":RECALL"
+PRESET_LIST = PRESET_PREFIX + ":LIST"
+DEPENDENCIES = BEAMLINE_PREFIX + "DEPENDENCIES"
+DEPENDENCIES_AFFECTED = DEPENDENCIES + ":AFFECTED"
+CUSTOM_FUNCTION_PREFIX = BEAMLINE_PREFIX + "CUSTOM_FN"
+CUSTOM_FUNCTION_QUEUE = CUSTOM_FUNCTION_PREFIX + ":QUEUE"
+CUSTOM_FUNCTION_RUN_TIME = CUSTOM_FUNCTION_PREFIX + ":RUN_TIME"
+CUSTOM_FUNCTION_RUNNING = CUSTOM_FUNCTION_PREFIX + ":RUNNING"
+DIAGNOSTICS_PREFIX = "DIAG:"
+LISTENER_PROFILE = DIAGNOSTICS_PREFIX + "LISTENERS"
+LISTENER_PROFILE_DUMP = LISTENER_PROFILE + ":DUMP"
+LISTENER_PROFILE_RESET = LISTENER_PROFILE + ":RESET"
+TRACE = DIAGNOSTICS_PREFIX + "TRACE"
+TRACE_DUMP = TRACE + ":DUMP"
+MOVE_TIMELINE_PV = DIAGNOSTICS_PREFIX + "MOVES"
+MOVE_CALC_TIME = DIAGNOSTICS_PREFIX + "MOVE:CALC_TIME"
+MOVE_WALL_TIME = DIAGNOSTICS_PREFIX + "MOVE:WALL_TIME"
+RECOMPUTATION = DIAGNOSTICS_PREFIX + "RECOMPUTE"
+RECOMPUTATION_DUMP = RECOMPUTATION + ":DUMP"
+METRICS = DIAGNOSTICS_PREFIX + "METRICS"
+METRICS_BATCH_SIZE = DIAGNOSTICS_PREFIX + "BATCH:SIZE"
+METRICS_BATCH_TIME = DIAGNOSTICS_PREFIX + "BATCH:TIME"
+# pv name and description of the rate of each counter in the server metrics, keyed by counter name
+METRICS_RATE_PVS = {
+    "ca_reads": (DIAGNOSTICS_PREFIX + "CA:READ_RATE", "Channel access reads"),
+    "ca_writes": (DIAGNOSTICS_PREFIX + "CA:WRITE_RATE", "Channel access writes"),
+    "monitor_events": (DIAGNOSTICS_PREFIX + "MONITOR_RATE", "Monitor events from motors"),
+    "pv_posts": (DIAGNOSTICS_PREFIX + "POST_RATE", "Posts of PV values"),
+    "autosave_writes": (DIAGNOSTICS_PREFIX + "AUTOSAVE_RATE", "Autosave writes"),
+    "status_updates": (DIAGNOSTICS_PREFIX + "STATUS_RATE", "Server status updates"),
+}
 
 PARAM_INFO = "PARAM_INFO"
 PARAM_INFO_COLLIMATION = "COLLIM_INFO"
@@ -137,6 +174,12 @@ PARAM_IN_MODE = {"type": "enum", "enums": ["NO", "YES"]}
 PARAM_FIELDS_ACTION = {"type": "int", "count": 1, "value": 0}
 PARAM_FIELDS_ACTION_WITH_MANAGER = PARAM_FIELDS_ACTION | MANAGER_FIELD
 STANDARD_2048_CHAR_WF_FIELDS = {"type": "char", "count": 2048, "value": ""}
+PARAM_SNAPSHOT_WF_FIELDS = {"type": "char", "count": 65536, "value": ""}
+BULK_PARAMS_WF_FIELDS = {"type": "char", "count": 16384, "value": ""}
+DEPENDENCIES_WF_FIELDS = {"type": "char", "count": 65536, "value": ""}
+LISTENER_PROFILE_WF_FIELDS = {"type": "char", "count": 16384, "value": ""}
+MOVE_TIMELINE_WF_FIELDS = {"type": "char", "count": 65536, "value": ""}
+METRICS_WF_FIELDS = {"type": "char", "count": 16384, "value": ""}
 STANDARD_STRING_FIELDS = {"type": "string", "value": ""}
 STANDARD_DISP_FIELDS = {"type": "enum", "enums": ["0", "1"], "value": 0}
 ALARM_STAT_PV_FIELDS = {"type": "enum", "enums": AlarmStringsTruncated}
@@ -156,6 +199,16 @@ def is_pv_name_this_field(field_name, pv_name):
     return pv_name_no_val == field_name
 
 
+def default_monitor_deadband(precision):
+    """
+    Args:
+        precision: number of decimal places the PV is displayed to
+
+    Returns: monitor deadband for a PV, changes smaller than this are not visible at the PV's precision
+    """
+    return 0.5 * 10**-precision
+
+
 def check_if_pv_value_exceeds_max_size(value, max_size, pv):
     """
     Args:
@@ -190,6 +243,7 @@ class PVManager:
         self._params_pv_lookup = OrderedDict()
         self._footprint_parameters = {}
         self._add_status_pvs()
+        self._add_metrics_pvs()
 
         for pv_name in self.PVDB.keys():
             logger.debug("Creating pv: {}".format(pv_name))
@@ -232,6 +286,52 @@ class PVManager:
             interest="HIGH",
             on_init=True,
         )
+        self._add_pv_with_fields(
+            CA_PUT_LATENCY,
+            None,
+            STANDARD_FLOAT_PV_FIELDS | {"unit": "ms"},
+            "Latency from put to monitor",
+            PvSort.RBV,
+            on_init=True,
+        )
+
+    def _add_metrics_pvs(self):
+        """
+        PVs for the runtime metrics of the server
+        """
+        for pv_name, description in METRICS_RATE_PVS.values():
+            self._add_pv_with_fields(
+                pv_name,
+                None,
+                STANDARD_FLOAT_PV_FIELDS | {"unit": "1/s"},
+                description,
+                PvSort.RBV,
+                on_init=True,
+            )
+        self._add_pv_with_fields(
+            METRICS_BATCH_SIZE,
+            None,
+            STANDARD_FLOAT_PV_FIELDS,
+            "Mean monitor events in a batch",
+            PvSort.RBV,
+            on_init=True,
+        )
+        self._add_pv_with_fields(
+            METRICS_BATCH_TIME,
+            None,
+            STANDARD_FLOAT_PV_FIELDS | {"unit": "ms"},
+            "Mean model time for a batch",
+            PvSort.RBV,
+            on_init=True,
+        )
+        self._add_pv_with_fields(
+            METRICS,
+            None,
+            METRICS_WF_FIELDS,
+            "Runtime metrics of the server",
+            PvSort.RBV,
+            on_init=True,
+        )
 
     def set_beamline(self, beamline):
         """
@@ -291,6 +391,171 @@ class PVManager:
             interest="MEDIUM",
         )
 
+        self._add_pv_with_fields(
+            PARAM_SNAPSHOT,
+            None,
+            PARAM_SNAPSHOT_WF_FIELDS,
+            "Snapshot of all parameter values",
+            PvSort.RBV,
+        )
+
+        # PVs for setting many parameters at once
+        self._add_pv_with_fields(
+            BULK_PARAMS + SP_SUFFIX,
+            None,
+            BULK_PARAMS_WF_FIELDS,
+            "Set many parameters and move",
+            PvSort.SP,
+        )
+        self._add_pv_with_fields(
+            BULK_PARAMS + SET_AND_NO_ACTION_SUFFIX,
+            None,
+            BULK_PARAMS_WF_FIELDS,
+            "Set many parameters",
+            PvSort.SET_AND_NO_ACTION,
+        )
+        self._add_pv_with_fields(
+            BULK_PARAMS_ERRORS,
+            None,
+            BULK_PARAMS_WF_FIELDS,
+            "Errors from setting many parameters",
+            PvSort.RBV,
+        )
+
+        # PVs for beamline presets
+        self._add_pv_with_fields(
+            PRESET_SAVE, None, STANDARD_STRING_FIELDS, "Save beamline preset with name", PvSort.SP
+        )
+        self._add_pv_with_fields(
+            PRESET_RECALL,
+            None,
+            STANDARD_STRING_FIELDS,
+            "Recall beamline preset with name",
+            PvSort.SP,
+        )
+        self._add_pv_with_fields(
+            PRESET_LIST,
+            None,
+            STANDARD_2048_CHAR_WF_FIELDS,
+            "Beamline presets",
+            PvSort.RBV,
+        )
+
+        # PVs for the dependency graph of the beamline model
+        self._add_pv_with_fields(
+            DEPENDENCIES,
+            None,
+            DEPENDENCIES_WF_FIELDS,
+            "Dependency graph of the beamline model",
+            PvSort.RBV,
+        )
+        self._add_pv_with_fields(
+            DEPENDENCIES_AFFECTED + SP_SUFFIX,
+            None,
+            STANDARD_STRING_FIELDS,
+            "Node to find the nodes affected by",
+            PvSort.SP,
+        )
+        self._add_pv_with_fields(
+            DEPENDENCIES_AFFECTED,
+            None,
+            DEPENDENCIES_WF_FIELDS,
+            "Nodes affected by a change in the node",
+            PvSort.RBV,
+        )
+
+        # PVs for the custom functions on parameters
+        self._add_pv_with_fields(
+            CUSTOM_FUNCTION_QUEUE,
+            None,
+            {"type": "int", "value": 0},
+            "Custom functions queued or running",
+            PvSort.RBV,
+        )
+        self._add_pv_with_fields(
+            CUSTOM_FUNCTION_RUN_TIME,
+            None,
+            STANDARD_FLOAT_PV_FIELDS | {"unit": "s"},
+            "Run time of last custom function",
+            PvSort.RBV,
+        )
+        self._add_pv_with_fields(
+            CUSTOM_FUNCTION_RUNNING,
+            None,
+            STANDARD_2048_CHAR_WF_FIELDS,
+            "Parameters with running custom functions",
+            PvSort.RBV,
+        )
+
+        # PVs for the listener profiler, which only has results if profiling was turned on at start up
+        self._add_pv_with_fields(
+            LISTENER_PROFILE + SP_SUFFIX,
+            None,
+            {"type": "int", "value": 0},
+            "Number of top listeners, 0 for all",
+            PvSort.SP,
+        )
+        self._add_pv_with_fields(
+            LISTENER_PROFILE,
+            None,
+            LISTENER_PROFILE_WF_FIELDS,
+            "Listeners taking most time",
+            PvSort.RBV,
+        )
+        self._add_pv_with_fields(
+            LISTENER_PROFILE_DUMP,
+            None,
+            STANDARD_STRING_FIELDS,
+            "Write listener profile to file",
+            PvSort.SP,
+        )
+        self._add_pv_with_fields(
+            LISTENER_PROFILE_RESET, None, PARAM_FIELDS_ACTION, "Reset listener profile", PvSort.SP
+        )
+
+        # PVs for tracing the server as a timeline
+        self._add_pv_with_fields(
+            TRACE, None, PARAM_FIELDS_BINARY, "Trace into ring buffer", PvSort.SP
+        )
+        self._add_pv_with_fields(
+            TRACE_DUMP, None, STANDARD_STRING_FIELDS, "Write trace to file", PvSort.SP
+        )
+
+        # PVs for the timings of the most recent moves
+        self._add_pv_with_fields(
+            MOVE_TIMELINE_PV,
+            None,
+            MOVE_TIMELINE_WF_FIELDS,
+            "Timings of the most recent moves",
+            PvSort.RBV,
+        )
+        self._add_pv_with_fields(
+            MOVE_CALC_TIME,
+            None,
+            STANDARD_FLOAT_PV_FIELDS | {"unit": "ms"},
+            "Server time to calculate last move",
+            PvSort.RBV,
+        )
+        self._add_pv_with_fields(
+            MOVE_WALL_TIME,
+            None,
+            STANDARD_FLOAT_PV_FIELDS | {"unit": "ms"},
+            "Time from last move to settled",
+            PvSort.RBV,
+        )
+
+        # PVs for the detector of redundant recomputation
+        self._add_pv_with_fields(
+            RECOMPUTATION, None, PARAM_FIELDS_BINARY, "Count recomputations", PvSort.SP
+        )
+        self._add_pv_with_fields(
+            RECOMPUTATION_DUMP,
+            None,
+            STANDARD_STRING_FIELDS,
+            "Write recomputation report to file",
+            PvSort.SP,
+        )
+
     def _add_footprint_calculator_pvs(self):
         """
         Add PVs related to the footprint calculation to the server's PV database.
@@ -403,10 +668,16 @@ class PVManager:
             fields["enums"] = parameter.options
 
         # Readback PV
+        rbv_fields = fields.copy()
+        if parameter_type == BeamlineParameterType.FLOAT:
+            if parameter.monitor_deadband is None:
+                rbv_fields["mdel"] = default_monitor_deadband(fields["prec"])
+            else:
+                rbv_fields["mdel"] = parameter.monitor_deadband
         self._add_pv_with_fields(
             prepended_alias,
             param_name,
-            fields,
+            rbv_fields,
             description,
             PvSort.RBV,
             archive=True,
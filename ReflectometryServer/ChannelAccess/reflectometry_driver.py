@@ -2,39 +2,80 @@
 Driver for the reflectometry server.
 """
 
+import json
 import logging
+from contextlib import contextmanager
 from functools import partial
+from threading import Lock
 from typing import Optional
 
 from pcaspy import Alarm, Driver, Severity
 from pcaspy.driver import Data, manager
 from server_common.loggers.isis_logger import IsisPutLog
+from server_common.utilities import compress_and_hex
 
 from ReflectometryServer import Beamline
 from ReflectometryServer.beamline import ActiveModeUpdate
+from ReflectometryServer.ca_recording import CA_RECORDER
+from ReflectometryServer.ChannelAccess.ca_process_loop import CA_PROCESS_WAKEUP, PutLatencyUpdate
 from ReflectometryServer.ChannelAccess.constants import REFL_IOC_NAME, REFLECTOMETRY_PREFIX
-from ReflectometryServer.ChannelAccess.driver_utils import DriverParamHelper
+from ReflectometryServer.ChannelAccess.driver_utils import DriverParamHelper, PublishedState
 from ReflectometryServer.ChannelAccess.pv_manager import (
     BEAMLINE_MODE,
     BEAMLINE_MOVE,
+    BULK_PARAMS,
+    BULK_PARAMS_ERRORS,
+    CA_PUT_LATENCY,
+    CUSTOM_FUNCTION_QUEUE,
+    CUSTOM_FUNCTION_RUN_TIME,
+    CUSTOM_FUNCTION_RUNNING,
+    DEPENDENCIES,
+    DEPENDENCIES_AFFECTED,
     DISP_FIELD,
     DQQ_TEMPLATE,
     FP_TEMPLATE,
     IN_MODE_SUFFIX,
+    LISTENER_PROFILE,
+    LISTENER_PROFILE_DUMP,
+    LISTENER_PROFILE_RESET,
+    METRICS,
+    METRICS_BATCH_SIZE,
+    METRICS_BATCH_TIME,
+    METRICS_RATE_PVS,
+    MOVE_CALC_TIME,
+    MOVE_TIMELINE_PV,
+    MOVE_WALL_TIME,
+    PARAM_SNAPSHOT,
+    PRESET_LIST,
+    PRESET_RECALL,
+    PRESET_SAVE,
     QMAX_TEMPLATE,
     QMIN_TEMPLATE,
     REAPPLY_MODE_INITS,
+    RECOMPUTATION,
+    RECOMPUTATION_DUMP,
     SAMPLE_LENGTH,
     SERVER_ERROR_LOG,
     SERVER_MESSAGE,
     SERVER_STATUS,
+    SET_AND_NO_ACTION_SUFFIX,
     SP_SUFFIX,
+    TRACE,
+    TRACE_DUMP,
     VAL_FIELD,
     PvSort,
+    check_if_pv_value_exceeds_max_size,
     is_pv_name_this_field,
 )
+from ReflectometryServer.custom_function_executor import (
+    CUSTOM_FUNCTION_EXECUTOR,
+    CustomFunctionStatusUpdate,
+)
 from ReflectometryServer.engineering_corrections import CorrectionUpdate
 from ReflectometryServer.footprint_manager import FootprintSort
+from ReflectometryServer.listener_profiler import LISTENER_PROFILER
+from ReflectometryServer.model_actor import MODEL_ACTOR, CommandPriority
+from ReflectometryServer.move_timeline import MOVE_TIMELINE, MoveTimelineUpdate
 from ReflectometryServer.parameters import (
     BeamlineParameterGroup,
     BeamlineParameterType,
@@ -46,12 +87,21 @@ from ReflectometryServer.parameters import (
     ParameterSetpointReadbackUpdate,
     ParameterUpdateBase,
 )
+from ReflectometryServer.presets import PresetStore
+from ReflectometryServer.pv_wrapper import (
+    PROCESS_MONITOR_EVENTS,
+    ReadbackBatchStartUpdate,
+    ReadbackBatchUpdate,
+)
+from ReflectometryServer.recomputation_detector import RECOMPUTATION_DETECTOR
+from ReflectometryServer.server_metrics import SERVER_METRICS, MetricsUpdate
 from ReflectometryServer.server_status_manager import (
     STATUS_MANAGER,
     ErrorLogUpdate,
     ProblemInfo,
     StatusUpdate,
 )
+from ReflectometryServer.tracing import TRACER
 
 logger = logging.getLogger(__name__)
 
@@ -74,6 +124,10 @@ class ReflectometryDriver(Driver):
                 the beamline.
         """
         super(ReflectometryDriver, self).__init__()
+        self._published_state = PublishedState({}, {})
+        self._pvs_changed_since_publish = set()
+        self._publish_lock = Lock()
+        self._publish_deferrals = 0
         self._ca_server = server
         self._initialised = False
         self._beamline = None
@@ -82,8 +136,12 @@ class ReflectometryDriver(Driver):
 
         self.add_trigger_status_change_listener()
         self.add_trigger_log_update_listener()
+        CA_PROCESS_WAKEUP.add_listener(PutLatencyUpdate, self._on_put_latency_update)
+        SERVER_METRICS.add_listener(MetricsUpdate, self._on_metrics_update)
         self.put_log = IsisPutLog(REFL_IOC_NAME)
         self._driver_help = None
+        self._preset_store = None
+        self._published_params_in_mode = None
 
     def set_beamline(self, beamline):
         """
@@ -94,8 +152,11 @@ class ReflectometryDriver(Driver):
         """
 
         self._beamline = beamline
-        self._driver_help = DriverParamHelper(self._pv_manager, beamline)
+        self._driver_help = DriverParamHelper(
+            self._pv_manager, beamline, on_coalesced_move=self.update_monitors
+        )
         self._footprint_manager = beamline.footprint_manager
+        self._preset_store = PresetStore(beamline)
 
         for reason, pv in list(manager.pvs[self.port].items()):
             if reason not in self._pv_manager.initial_PVs:
@@ -110,65 +171,64 @@ class ReflectometryDriver(Driver):
         self.add_trigger_active_mode_change_listener()
         self.add_footprint_param_listeners()
         self._add_trigger_on_engineering_correction_change()
+        CUSTOM_FUNCTION_EXECUTOR.add_listener(
+            CustomFunctionStatusUpdate, self._on_custom_function_status_update
+        )
+        MOVE_TIMELINE.add_listener(MoveTimelineUpdate, self._on_move_timeline_update)
+        PROCESS_MONITOR_EVENTS.add_listener(ReadbackBatchStartUpdate, self._on_readback_batch_start)
+        PROCESS_MONITOR_EVENTS.add_listener(ReadbackBatchUpdate, self._on_readback_batch)
 
-        self.update_monitors()
+        self._update_param_both_pv_and_pv_val(DEPENDENCIES, self._dependencies_value())
+        self._update_param_both_pv_and_pv_val(TRACE, int(TRACER.enabled))
+        self._pvs_changed_since_publish.update(self.pvDB.keys())
         self._initialised = True
+        self.update_monitors()
+
+    def close(self):
+        """
+        Remove the listeners this driver added to the server wide singletons, so a driver which is no longer used
+        (e.g. in a test or replay) is not kept alive and updated by them.
+        """
+        STATUS_MANAGER.remove_listener(StatusUpdate, self._on_server_status_change)
+        STATUS_MANAGER.remove_listener(ErrorLogUpdate, self._on_error_log_update)
+        CA_PROCESS_WAKEUP.remove_listener(PutLatencyUpdate, self._on_put_latency_update)
+        SERVER_METRICS.remove_listener(MetricsUpdate, self._on_metrics_update)
+        if self._initialised:
+            CUSTOM_FUNCTION_EXECUTOR.remove_listener(
+                CustomFunctionStatusUpdate, self._on_custom_function_status_update
+            )
+            MOVE_TIMELINE.remove_listener(MoveTimelineUpdate, self._on_move_timeline_update)
+            PROCESS_MONITOR_EVENTS.remove_listener(
+                ReadbackBatchStartUpdate, self._on_readback_batch_start
+            )
+            PROCESS_MONITOR_EVENTS.remove_listener(ReadbackBatchUpdate, self._on_readback_batch)
+            self._initialised = False
 
     def read(self, reason):
         """
-        Processes an incoming caget request.
+        Processes an incoming caget request. Values are served from the last published state so that reads are
+        consistent with each other and do not touch the live model.
 
         Args:
             reason (str): The PV that is being read.
 
         Returns: The value associated to this PV
         """
+        SERVER_METRICS.ca_reads.increment()
         try:
             if self._initialised:
-                if self._pv_manager.is_param(reason):
-                    return self.getParam(reason)
-
-                elif self._pv_manager.is_beamline_mode(reason):
-                    return self._beamline_mode_value(self._beamline.active_mode)
-
-                elif is_pv_name_this_field(BEAMLINE_MOVE, reason):
-                    return self._beamline.move
-
-                elif is_pv_name_this_field(REAPPLY_MODE_INITS, reason):
-                    return self._beamline.reinit_mode_on_move
-
-                elif is_pv_name_this_field(SERVER_STATUS, reason):
-                    beamline_status_enums = self._pv_manager.PVDB[SERVER_STATUS]["enums"]
-                    new_value = beamline_status_enums.index(STATUS_MANAGER.status.display_string)
-                    #  Set the value so that the error condition is set
-                    self.setParam(reason, new_value)
-                    return new_value
-
-                elif is_pv_name_this_field(SERVER_MESSAGE, reason):
-                    # The server message has the active errors in the beginning so truncation happens at the end.
-                    truncated_string = "<truncated>"
-                    server_message_max_character_size = self._pv_manager.PVDB[SERVER_MESSAGE][
-                        "count"
-                    ]
-                    message = STATUS_MANAGER.message
-                    if len(message) > server_message_max_character_size:
-                        return (
-                            message[: server_message_max_character_size - len(truncated_string)]
-                            + truncated_string
-                        )
-                    else:
-                        return message
-                elif is_pv_name_this_field(SERVER_ERROR_LOG, reason):
-                    # The server status manager class appends new messages to the end of the log string,
-                    # so the last "count" characters are returned.
-                    error_log_max_character_size = self._pv_manager.PVDB[SERVER_ERROR_LOG]["count"]
-                    return STATUS_MANAGER.error_log[-error_log_max_character_size:]
-                elif is_pv_name_this_field(SAMPLE_LENGTH, reason):
-                    return self._footprint_manager.get_sample_length()
-                elif self._pv_manager.is_alarm_status(reason):
-                    return self.getParamDB(self._pv_manager.strip_fields_from_pv(reason)).alarm
+                published_state = self._published_state
+                if self._pv_manager.is_alarm_status(reason):
+                    return published_state.alarm_status(
+                        self._pv_manager.strip_fields_from_pv(reason)
+                    )
                 elif self._pv_manager.is_alarm_severity(reason):
-                    return self.getParamDB(self._pv_manager.strip_fields_from_pv(reason)).severity
+                    return published_state.alarm_severity(
+                        self._pv_manager.strip_fields_from_pv(reason)
+                    )
+                return published_state.value(reason)
+        except KeyError:
+            pass  # not published yet so use the current value
         except Exception as e:
             STATUS_MANAGER.update_error_log("Exception when reading parameter {}".format(reason), e)
             STATUS_MANAGER.update_active_problems(
@@ -178,11 +238,163 @@ class ReflectometryDriver(Driver):
 
         return self.getParam(reason)
 
+    def setParam(self, reason, value):
+        """
+        Set a PV value, recording that it has changed since the state was last published.
+        Args:
+            reason: name of the pv
+            value: new value
+        """
+        super(ReflectometryDriver, self).setParam(reason, value)
+        with self._publish_lock:
+            self._pvs_changed_since_publish.add(reason)
+
+    def setParamStatus(self, reason, alarm=None, severity=None):
+        """
+        Set a PV alarm, recording that it has changed since the state was last published.
+        Args:
+            reason: name of the pv
+            alarm: alarm status
+            severity: alarm severity
+        """
+        super(ReflectometryDriver, self).setParamStatus(reason, alarm, severity)
+        with self._publish_lock:
+            self._pvs_changed_since_publish.add(reason)
+
+    def updatePVs(self):
+        """
+        Publish the state for reads and post changed values to monitors.
+        """
+        self._publish_state()
+        # post through the base class so that the state is published once rather than once per pv
+        for reason in self.pvDB:
+            self._post(reason)
+        CA_PROCESS_WAKEUP.wake()
+
+    def updatePV(self, reason):
+        """
+        Publish the state for reads and post a changed value to monitors.
+        Args:
+            reason: name of the pv
+        """
+        self._publish_state()
+        self._post(reason)
+        CA_PROCESS_WAKEUP.wake()
+
+    def _post(self, reason):
+        """
+        Post a pv to its monitors if it has changed since it was last posted, counting the post.
+        Args:
+            reason: name of the pv
+        """
+        if self.pvDB[reason].flag:
+            SERVER_METRICS.pv_posts.increment()
+        super(ReflectometryDriver, self).updatePV(reason)
+
+    def _update_pvs_off_model(self, pv_names):
+        """
+        Publish the state of and post only the given PVs, for PVs which are updated off the model thread and hold
+        nothing from the model, so that the model is not read. These posts are not counted in the metrics because they
+        report the server rather than the beamline.
+        Args:
+            pv_names: names of the pvs, without fields, which have been updated
+        """
+        reasons = [reason for pv_name in pv_names for reason in (pv_name, pv_name + VAL_FIELD)]
+        with self._publish_lock:
+            values = {}
+            alarms = {}
+            for reason in reasons:
+                self._pvs_changed_since_publish.discard(reason)
+                data = self.pvDB[reason]
+                values[reason] = data.value
+                alarms[reason] = (data.severity, data.alarm)
+            self._published_state = self._published_state.updated(values, alarms)
+        for reason in reasons:
+            super(ReflectometryDriver, self).updatePV(reason)
+        CA_PROCESS_WAKEUP.wake()
+
+    @contextmanager
+    def _publish_once(self):
+        """
+        Context in which the state is not published as PVs are updated but once when the outermost context ends, so
+        that a batch of changes costs one publish rather than one per PV.
+        """
+        self._defer_publishing()
+        try:
+            yield
+        finally:
+            self._end_deferred_publishing()
+
+    def _defer_publishing(self):
+        """
+        Stop publishing the state until publishing is no longer deferred.
+        """
+        with self._publish_lock:
+            self._publish_deferrals += 1
+
+    def _end_deferred_publishing(self):
+        """
+        End a deferral of publishing, publishing the state if no other deferral is in progress.
+        """
+        with self._publish_lock:
+            self._publish_deferrals = max(self._publish_deferrals - 1, 0)
+        self._publish_state()
+
+    def _publish_state(self):
+        """
+        Publish a new immutable snapshot of the PVs which have changed since the last snapshot, from which channel
+        access reads are served. The PVs are only set from update events and on the model thread, so the live model is
+        not read and this can be called from any thread. Nothing is published while publishing is deferred; the
+        changes are published when the deferral ends.
+        """
+        with self._publish_lock:
+            if self._publish_deferrals > 0:
+                return
+            changed_pvs = self._pvs_changed_since_publish
+            self._pvs_changed_since_publish = set()
+            values = {}
+            alarms = {}
+            for reason in changed_pvs:
+                data = self.pvDB[reason]
+                values[reason] = data.value
+                alarms[reason] = (data.severity, data.alarm)
+            self._published_state = self._published_state.updated(values, alarms)
+
     def _beamline_mode_value(self, mode):
         beamline_mode_enums = self._pv_manager.PVDB[BEAMLINE_MODE]["enums"]
         return beamline_mode_enums.index(mode)
 
     def write(self, reason, value):
+        """
+        Process an incoming channel_access request. The write is run by the model actor so that, when it is running, it
+        is ordered with all other changes to the model ahead of readback batches.
+        :param reason: The PV that is being written to.
+        :param value: The value being written to the PV
+        """
+        SERVER_METRICS.ca_writes.increment()
+        CA_RECORDER.record_write(reason, value)
+        CA_PROCESS_WAKEUP.put_started()
+        try:
+            with TRACER.span("write", "ca", {"pv": reason, "value": value}):
+                return MODEL_ACTOR.call(
+                    RECOMPUTATION_DETECTOR.in_action(
+                        "write {}".format(reason), partial(self._write, reason, value)
+                    ),
+                    CommandPriority.USER_WRITE,
+                )
+        finally:
+            CA_PROCESS_WAKEUP.put_finished()
+
+    def _write(self, reason, value):
+        """
+        Process an incoming channel_access request on the model thread, publishing the state once it is processed.
+        :param reason: The PV that is being written to.
+        :param value: The value being written to the PV
+        """
+        with self._publish_once():
+            return self._process_write(reason, value)
+
+    def _process_write(self, reason, value):
         """
         Process an incoming channel_access request.
         :param reason: The PV that is being written to.
@@ -194,6 +406,46 @@ class ReflectometryDriver(Driver):
                 value_accepted = self._driver_help.param_write(reason, value)
             elif is_pv_name_this_field(BEAMLINE_MOVE, reason):
                 self._beamline.move = 1
+            elif is_pv_name_this_field(BULK_PARAMS + SP_SUFFIX, reason):
+                value_accepted = self._bulk_param_write(value, move=True)
+            elif is_pv_name_this_field(BULK_PARAMS + SET_AND_NO_ACTION_SUFFIX, reason):
+                value_accepted = self._bulk_param_write(value, move=False)
+            elif is_pv_name_this_field(PRESET_SAVE, reason):
+                self._preset_store.save(value)
+                self._update_param_both_pv_and_pv_val(PRESET_LIST, self._preset_list_value())
+            elif is_pv_name_this_field(PRESET_RECALL, reason):
+                self._preset_store.recall(value)
+            elif is_pv_name_this_field(DEPENDENCIES_AFFECTED + SP_SUFFIX, reason):
+                affected = json.dumps(self._beamline.dependency_graph.affected_by(value))
+                self._update_param_both_pv_and_pv_val(
+                    DEPENDENCIES_AFFECTED,
+                    check_if_pv_value_exceeds_max_size(
+                        affected,
+                        self._pv_manager.PVDB[DEPENDENCIES_AFFECTED]["count"],
+                        DEPENDENCIES_AFFECTED,
+                    ),
+                )
+            elif is_pv_name_this_field(LISTENER_PROFILE + SP_SUFFIX, reason):
+                self._update_param_both_pv_and_pv_val(
+                    LISTENER_PROFILE,
+                    check_if_pv_value_exceeds_max_size(
+                        LISTENER_PROFILER.profile_json(value if value > 0 else None),
+                        self._pv_manager.PVDB[LISTENER_PROFILE]["count"],
+                        LISTENER_PROFILE,
+                    ),
+                )
+            elif is_pv_name_this_field(LISTENER_PROFILE_DUMP, reason):
+                LISTENER_PROFILER.dump(value)
+            elif is_pv_name_this_field(LISTENER_PROFILE_RESET, reason):
+                LISTENER_PROFILER.reset()
+            elif is_pv_name_this_field(TRACE, reason):
+                TRACER.enabled = bool(value)
+            elif is_pv_name_this_field(TRACE_DUMP, reason):
+                TRACER.dump(value)
+            elif is_pv_name_this_field(RECOMPUTATION, reason):
+                RECOMPUTATION_DETECTOR.enabled = bool(value)
+            elif is_pv_name_this_field(RECOMPUTATION_DUMP, reason):
+                RECOMPUTATION_DETECTOR.dump(value)
             elif is_pv_name_this_field(REAPPLY_MODE_INITS, reason):
                 self._beamline.reinit_mode_on_move = value
             elif self._pv_manager.is_beamline_mode(reason):
@@ -229,22 +481,100 @@ class ReflectometryDriver(Driver):
             value_accepted = False
         return value_accepted
 
+    def _bulk_param_write(self, value, move):
+        """
+        Set many parameters at once, reporting any errors in the bulk errors PV and the error log.
+        Args:
+            value: json object mapping parameter name to its new setpoint
+            move: True to move the beamline once the setpoints are set; False to only set them
+
+        Returns:
+            True if all the setpoints were accepted; False otherwise
+        """
+        errors = self._driver_help.bulk_param_write(value, move)
+        self._update_param_both_pv_and_pv_val(BULK_PARAMS_ERRORS, json.dumps(errors))
+        self.updatePV(BULK_PARAMS_ERRORS)
+        for param_name, error in errors.items():
+            STATUS_MANAGER.update_error_log(
+                "Bulk set of parameters rejected, parameter '{}': {}".format(param_name, error)
+            )
+        return not errors
+
     def update_monitors(self):
         """
         Updates the PV values and alarms for each parameter so that changes are visible to monitors.
         """
-        # with self.monitor_lock:
-        for (
-            pv_name,
-            value,
-            alarm_severity,
-            alarm_status,
-        ) in self._driver_help.get_param_monitor_updates():
-            self._update_param_both_pv_and_pv_val(pv_name, value, alarm_severity, alarm_status)
+        with self._publish_once():
+            for (
+                pv_name,
+                value,
+                alarm_severity,
+                alarm_status,
+            ) in self._driver_help.get_param_monitor_updates():
+                self._update_param_both_pv_and_pv_val(pv_name, value, alarm_severity, alarm_status)
+            self._update_param_both_pv_and_pv_val(PARAM_SNAPSHOT, self._param_snapshot_value())
+            self._update_param_both_pv_and_pv_val(PRESET_LIST, self._preset_list_value())
+            self._update_param_both_pv_and_pv_val(BEAMLINE_MOVE, self._beamline.move)
+            self._update_param_both_pv_and_pv_val(
+                REAPPLY_MODE_INITS, self._beamline.reinit_mode_on_move
+            )
+            self._update_param_both_pv_and_pv_val(
+                SAMPLE_LENGTH, self._footprint_manager.get_sample_length()
+            )
 
-        self._update_all_footprints()
+            self._update_all_footprints()
         self.updatePVs()
 
+    def _on_readback_batch_start(self, _):
+        """
+        Defer publishing the state while a batch of readbacks is processed, so that it is published once per batch.
+
+        Args:
+            _: the batch start update
+        """
+        self._defer_publishing()
+
+    def _on_readback_batch(self, _):
+        """
+        Rebuild the parameter snapshot and publish the state once a batch of readbacks has been processed, so that they
+        follow the readbacks without being rebuilt for every readback in the batch.
+
+        Args:
+            _: the batch update
+        """
+        self._update_param_both_pv_and_pv_val(PARAM_SNAPSHOT, self._param_snapshot_value())
+        self.updatePV(PARAM_SNAPSHOT)
+        self._end_deferred_publishing()
+
+    def _preset_list_value(self):
+        """
+        Returns: json list of the beamline presets, with whether each matches the current model, for the preset list PV
+        """
+        value = json.dumps(self._preset_store.preset_info())
+        return check_if_pv_value_exceeds_max_size(
+            value, self._pv_manager.PVDB[PRESET_LIST]["count"], PRESET_LIST
+        )
+
+    def _dependencies_value(self):
+        """
+        Returns: the dependency graph of the beamline model as compressed and hexed json for the dependencies PV
+        """
+        value = compress_and_hex(self._beamline.dependency_graph.to_json())
+        return check_if_pv_value_exceeds_max_size(
+            value, self._pv_manager.PVDB[DEPENDENCIES]["count"], DEPENDENCIES
+        )
+
+    def _param_snapshot_value(self):
+        """
+        Returns: the snapshot of all parameters as compressed and hexed json for the snapshot PV
+        """
+        value = compress_and_hex(
+            json.dumps(self._driver_help.get_param_snapshot(), allow_nan=False)
+        )
+        return check_if_pv_value_exceeds_max_size(
+            value, self._pv_manager.PVDB[PARAM_SNAPSHOT]["count"], PARAM_SNAPSHOT
+        )
+
     def _update_all_footprints(self):
         """
         Updates footprint calculations for all value sorts.
@@ -358,17 +688,24 @@ class ReflectometryDriver(Driver):
 
     def _on_bl_mode_change(self, mode_update):
         """
-        Beamline mode change in driver
+        Beamline mode change in driver. In mode PVs are only updated for parameters which have entered or left the mode.
         Args:
             mode_update (ActiveModeUpdate):  new mode update
         """
-        params_in_mode = mode_update.mode.names_of_parameters_in_mode()
+        params_in_mode = set(mode_update.mode.names_of_parameters_in_mode())
+        if self._published_params_in_mode is None:
+            params_to_update = None
+        else:
+            params_to_update = params_in_mode.symmetric_difference(self._published_params_in_mode)
         for pv_name, (param_name, param_sort) in self._pv_manager.param_names_pv_names_and_sort():
-            if param_sort is PvSort.RBV:
+            if param_sort is PvSort.RBV and (
+                params_to_update is None or param_name in params_to_update
+            ):
                 if param_name in params_in_mode:
                     self._update_param_both_pv_and_pv_val(pv_name + IN_MODE_SUFFIX, 1)
                 else:
                     self._update_param_both_pv_and_pv_val(pv_name + IN_MODE_SUFFIX, 0)
+        self._published_params_in_mode = params_in_mode
 
         mode_value = self._beamline_mode_value(mode_update.mode.name)
         self._update_param_both_pv_and_pv_val(BEAMLINE_MODE, mode_value)
@@ -385,7 +722,104 @@ class ReflectometryDriver(Driver):
         beamline_status_enums = self._pv_manager.PVDB[SERVER_STATUS]["enums"]
         status_id = beamline_status_enums.index(update.server_status.display_string)
         self._update_param_both_pv_and_pv_val(SERVER_STATUS, status_id)
-        self._update_param_both_pv_and_pv_val(SERVER_MESSAGE, update.server_message)
+
+        # The server message has the active errors in the beginning so truncation happens at the end.
+        truncated_string = "<truncated>"
+        server_message_max_character_size = self._pv_manager.PVDB[SERVER_MESSAGE]["count"]
+        message = update.server_message
+        if len(message) > server_message_max_character_size:
+            message = (
+                message[: server_message_max_character_size - len(truncated_string)]
+                + truncated_string
+            )
+        self._update_param_both_pv_and_pv_val(SERVER_MESSAGE, message)
+        self.updatePVs()
+
+    def _on_put_latency_update(self, update: PutLatencyUpdate):
+        """
+        Update the latency from a put to its monitors being sent.
+
+        Args:
+            update: the latency of the last put
+        """
+        self._update_param_both_pv_and_pv_val(CA_PUT_LATENCY, update.latency * 1000)
+        self._update_pvs_off_model([CA_PUT_LATENCY])
+
+    def _on_metrics_update(self, update: MetricsUpdate):
+        """
+        Update the runtime metrics of the server, adding those kept by the channel access processing, the model actor
+        and the custom function executor to the full metrics.
+
+        Args:
+            update: the metrics over the last interval
+        """
+        for counter_name, (pv_name, _) in METRICS_RATE_PVS.items():
+            self._update_param_both_pv_and_pv_val(pv_name, update.rates[counter_name])
+        self._update_param_both_pv_and_pv_val(METRICS_BATCH_SIZE, update.batch_size)
+        self._update_param_both_pv_and_pv_val(METRICS_BATCH_TIME, update.batch_time)
+        metrics = {
+            "rates": update.rates,
+            "totals": update.totals,
+            "histograms": update.histograms,
+            "put_latency": CA_PROCESS_WAKEUP.put_latency.as_dict(),
+            "model_queue_depth": MODEL_ACTOR.queue_depth,
+            "model_queue_latency": MODEL_ACTOR.latency_metrics(),
+            "custom_functions": {
+                "superseded": CUSTOM_FUNCTION_EXECUTOR.superseded_count,
+                "timed_out": CUSTOM_FUNCTION_EXECUTOR.timed_out_count,
+            },
+        }
+        self._update_param_both_pv_and_pv_val(
+            METRICS,
+            check_if_pv_value_exceeds_max_size(
+                json.dumps(metrics, separators=(",", ":")),
+                self._pv_manager.PVDB[METRICS]["count"],
+                METRICS,
+            ),
+        )
+        self._update_pvs_off_model(
+            [pv_name for pv_name, _ in METRICS_RATE_PVS.values()]
+            + [METRICS_BATCH_SIZE, METRICS_BATCH_TIME, METRICS]
+        )
+
+    def _on_custom_function_status_update(self, update: CustomFunctionStatusUpdate):
+        """
+        Update the queue depth, run time and running custom functions.
+
+        Args:
+            update: the status of the custom function executor
+        """
+        self._update_param_both_pv_and_pv_val(CUSTOM_FUNCTION_QUEUE, update.queue_depth)
+        self._update_param_both_pv_and_pv_val(CUSTOM_FUNCTION_RUN_TIME, update.run_time)
+        self._update_param_both_pv_and_pv_val(
+            CUSTOM_FUNCTION_RUNNING,
+            check_if_pv_value_exceeds_max_size(
+                json.dumps(update.running),
+                self._pv_manager.PVDB[CUSTOM_FUNCTION_RUNNING]["count"],
+                CUSTOM_FUNCTION_RUNNING,
+            ),
+        )
+        self.updatePVs()
+
+    def _on_move_timeline_update(self, update: MoveTimelineUpdate):
+        """
+        Update the timings of the most recent moves.
+
+        Args:
+            update: the timings of the most recent moves
+        """
+        self._update_param_both_pv_and_pv_val(
+            MOVE_TIMELINE_PV,
+            check_if_pv_value_exceeds_max_size(
+                json.dumps(update.moves, separators=(",", ":")),
+                self._pv_manager.PVDB[MOVE_TIMELINE_PV]["count"],
+                MOVE_TIMELINE_PV,
+            ),
+        )
+        if update.calc_time is not None:
+            self._update_param_both_pv_and_pv_val(MOVE_CALC_TIME, update.calc_time * 1000)
+        if update.wall_time is not None:
+            self._update_param_both_pv_and_pv_val(MOVE_WALL_TIME, update.wall_time * 1000)
         self.updatePVs()
 
     def _on_error_log_update(self, update: ErrorLogUpdate):
@@ -395,7 +829,12 @@ class ReflectometryDriver(Driver):
         Args:
             update: The new server status and message.
         """
-        self._update_param_both_pv_and_pv_val(SERVER_ERROR_LOG, update.log_as_string)
+        # The server status manager class appends new messages to the end of the log string,
+        # so the last "count" characters are kept.
+        error_log_max_character_size = self._pv_manager.PVDB[SERVER_ERROR_LOG]["count"]
+        self._update_param_both_pv_and_pv_val(
+            SERVER_ERROR_LOG, update.log_as_string[-error_log_max_character_size:]
+        )
         self.updatePVs()
 
     def add_trigger_active_mode_change_listener(self):
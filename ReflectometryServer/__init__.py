@@ -38,6 +38,8 @@ from ReflectometryServer.config_helper import (
     as_mode_correction,
     get_configured_beamline,
     optional_is_set,
+    set_custom_function_execution,
+    set_move_coalescing_window,
 )
 from ReflectometryServer.engineering_corrections import (
     COLUMN_NAME_FOR_DRIVER_SETPOINT,
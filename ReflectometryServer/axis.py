@@ -15,22 +15,34 @@ from ReflectometryServer.geometry import ChangeAxis
 
 logger = logging.getLogger(__name__)
 
-# Event that is triggered when the physical position of this component changes.
-PhysicalMoveUpdate = namedtuple(
-    "PhysicalMoveUpdate", ["source"]
-)  # The source of the beam path change. (the axis itself)
 
-# Event that is triggered when the changing state of the axis is updated (i.e. it starts or stops moving)
-AxisChangingUpdate = namedtuple("AxisChangingUpdate", [])
+@dataclass(frozen=True, slots=True)
+class PhysicalMoveUpdate:
+    """
+    Event that is triggered when the physical position of this component changes. Each axis creates one of these and
+    reuses it.
+    """
 
+    source: "ComponentAxis"  # The source of the beam path change. (the axis itself)
 
-@dataclass()
+
+@dataclass(frozen=True, slots=True)
+class AxisChangingUpdate:
+    """
+    Event that is triggered when the changing state of the axis is updated (i.e. it starts or stops moving)
+    """
+
+
+@dataclass(frozen=True, slots=True)
 class InitUpdate:
     """
     Event that is triggered when the position or angle of the beam path calc gets an initial value.
     """
 
-    pass
+
+# Events without a payload are immutable so a single instance of each is shared
+AXIS_CHANGING_UPDATE = AxisChangingUpdate()
+INIT_UPDATE = InitUpdate()
 
 
 # Event that happens when a value is redefine to a different value, e.g. offset is set from 2 to 3
@@ -52,7 +64,7 @@ class AddOutOfBeamPositionEvent:
     source: "ComponentAxis"
 
 
-@dataclass()
+@dataclass(slots=True)
 class AxisChangedUpdate:
     """
     Event when the user has changed the parameter but not yet been moved to (e.g. the yellow background)
@@ -61,7 +73,7 @@ class AxisChangedUpdate:
     is_changed_update: bool  # True if there is an unapplied updated; False otherwise
 
 
-@dataclass()
+@dataclass(slots=True)
 class SetRelativeToBeamUpdate:
     """
     Event when relative to beam has been updated
@@ -116,6 +128,7 @@ class ComponentAxis(metaclass=ABCMeta):
         self._max_parking_sequence_count = 0
         self.can_define_axis_position_as = False
         self._parking_index = None
+        self.physical_move_update = PhysicalMoveUpdate(self)
 
     def get_name(self):
         """
@@ -199,7 +212,7 @@ class ComponentAxis(metaclass=ABCMeta):
         """
         self.set_alarm(update.alarm_severity, update.alarm_status)
         self._on_set_displacement(update.value)
-        self.trigger_listeners(PhysicalMoveUpdate(self))
+        self.trigger_listeners(self.physical_move_update)
 
     @abstractmethod
     def _on_set_displacement(self, displacement):
@@ -237,7 +250,7 @@ class ComponentAxis(metaclass=ABCMeta):
             value: the new rotating state
         """
         self._is_changing = value
-        self.trigger_listeners(AxisChangingUpdate())
+        self.trigger_listeners(AXIS_CHANGING_UPDATE)
 
     @property
     def alarm(self):
@@ -401,7 +414,7 @@ class DirectCalcAxis(ComponentAxis):
         if self.autosaved_value is None:
             logger.debug(f"Setting {self._axis} initial value from motor to {motor_position}")
             self._position = motor_position
-        self.trigger_listeners(InitUpdate())  # Tell Parameter layer and Theta
+        self.trigger_listeners(INIT_UPDATE)  # Tell Parameter layer and Theta
 
 
 class BeamPathCalcModificationAxis(DirectCalcAxis):
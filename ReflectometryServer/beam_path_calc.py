@@ -12,6 +12,7 @@ from server_common.channel_access import AlarmSeverity, AlarmStatus, maximum_sev
 from server_common.observable import observable
 
 from ReflectometryServer.axis import (
+    INIT_UPDATE,
     AddOutOfBeamPositionEvent,
     AxisChangedUpdate,
     AxisChangingUpdate,
@@ -29,15 +30,18 @@ from ReflectometryServer.exceptions import (
 )
 from ReflectometryServer.file_io import disable_mode_autosave, parking_index_autosave
 from ReflectometryServer.geometry import ChangeAxis, Position, PositionAndAngle
+from ReflectometryServer.recomputation_detector import RECOMPUTATION_DETECTOR, RecomputationKind
 from ReflectometryServer.server_status_manager import STATUS_MANAGER, ProblemInfo
+from ReflectometryServer.tracing import TRACER
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class BeamPathUpdate:
     """
-    Event that is triggered when the path of the beam has changed.
+    Event that is triggered when the path of the beam has changed. Each beam path calc creates one of these and reuses
+    it.
     """
 
     # The source of the beam path change. (the beam path calc itself);
@@ -45,7 +49,7 @@ class BeamPathUpdate:
     source: Optional["TrackingBeamPathCalc"]
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class BeamPathUpdateOnInit:
     """
     Event that is triggered when the path of the beam has changed as a result of being initialised from file or motor
@@ -57,7 +61,7 @@ class BeamPathUpdateOnInit:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class ComponentInBeamUpdate:
     """
     Event that is triggered when the in beam status of a component has changed.
@@ -339,6 +343,7 @@ class TrackingBeamPathCalc:
         self._name = name
         self._incoming_beam = PositionAndAngle(0, 0, 0)
         self._movement_strategy = movement_strategy
+        self._beam_path_update = BeamPathUpdate(self)
 
         # This is used in disable mode where the incoming
         self.incoming_beam_can_change = True
@@ -382,10 +387,10 @@ class TrackingBeamPathCalc:
             logger.debug(f"Setting {self._name} displacement initial value from motor to {value}")
             self._movement_strategy.set_displacement(value)
         self.axis[ChangeAxis.POSITION].trigger_listeners(
-            InitUpdate()
+            INIT_UPDATE
         )  # Tell Parameter layer and Theta
 
-    def set_incoming_beam(self, incoming_beam, force=False, on_init=False):
+    def set_incoming_beam(self, incoming_beam, force=False, on_init=False, only_if_changed=False):
         """
         Set the incoming beam for the component setpoint calculation.
         This method should respect self.incoming_beam_can_change.
@@ -393,13 +398,23 @@ class TrackingBeamPathCalc:
             incoming_beam(PositionAndAngle): incoming beam
             force: set the incoming beam even if incoming_beam_can_change is not true
             on_init: whether the beam was set as part of IOC initialisation
+            only_if_changed: do nothing if the incoming beam is the same as the last incoming beam
         """
+        if only_if_changed and incoming_beam == self._incoming_beam:
+            return  # beam has not changed so nothing downstream needs recalculating
         if self.incoming_beam_can_change or force:
-            self._incoming_beam = incoming_beam
-            if not self.incoming_beam_can_change:
-                self.incoming_beam_auto_save()
-            self._on_set_incoming_beam(incoming_beam, on_init=on_init)
-            self._update_beam_path_axes()
+            with TRACER.span("beam path", "beam path", {"component": self._name}):
+                self._incoming_beam = incoming_beam
+                if not self.incoming_beam_can_change:
+                    self.incoming_beam_auto_save()
+                self._on_set_incoming_beam(incoming_beam, on_init=on_init)
+                self._update_beam_path_axes()
+            if RECOMPUTATION_DETECTOR.enabled:
+                RECOMPUTATION_DETECTOR.record(
+                    RecomputationKind.BEAM_PATH,
+                    self._name,
+                    (incoming_beam, self.get_outgoing_beam()),
+                )
         if on_init:
             # Beam has changed position so reapply autosave which is relative to beam, trigger beampath update init not
             # beam path update
@@ -410,7 +425,7 @@ class TrackingBeamPathCalc:
                 )
             self.trigger_listeners(BeamPathUpdateOnInit(self))
         else:
-            self.trigger_listeners(BeamPathUpdate(self))
+            self.trigger_listeners(self._beam_path_update)
 
     def _update_beam_path_axes(self):
         self.axis[ChangeAxis.DISPLACEMENT_POSITION].set_relative_to_beam(
@@ -430,7 +445,7 @@ class TrackingBeamPathCalc:
         pass
 
     def _on_in_beam_status_update(self, _):
-        self.trigger_listeners(BeamPathUpdate(self))
+        self.trigger_listeners(self._beam_path_update)
 
     def _on_long_axis_change(self, displacement):
         """
@@ -441,7 +456,22 @@ class TrackingBeamPathCalc:
         """
         offset_position = Position(0, displacement)
         self._movement_strategy.offset_position_at_zero(offset_position)
-        self.trigger_listeners(BeamPathUpdate(self))
+        self.trigger_listeners(self._beam_path_update)
+
+    @property
+    def incoming_beam(self):
+        """
+        Returns (PositionAndAngle): the last incoming beam set on this calc
+        """
+        return self._incoming_beam
+
+    @property
+    def is_reflecting(self):
+        """
+        Returns: True if the component can change the direction of the beam; False if the outgoing beam is always the
+            incoming beam
+        """
+        return False
 
     def get_outgoing_beam(self):
         """
@@ -488,7 +518,7 @@ class TrackingBeamPathCalc:
             displacement: the value to set away from the beam, e.g. height
         """
         self._movement_strategy.set_distance_relative_to_beam(self._incoming_beam, displacement)
-        self.trigger_listeners(BeamPathUpdate(self))
+        self.trigger_listeners(self._beam_path_update)
 
     def _get_position_relative_to_beam(self):
         """
@@ -523,7 +553,7 @@ class TrackingBeamPathCalc:
             displacement (float): The displacement in mantid coordinates to set the axis to
         """
         self._movement_strategy.set_displacement(displacement)
-        self.trigger_listeners(BeamPathUpdate(self))
+        self.trigger_listeners(self._beam_path_update)
 
     def _get_displacement(self):
         """
@@ -596,9 +626,9 @@ class TrackingBeamPathCalc:
             is_in_beam: True if set the component to be in the beam; False otherwise
         """
         self.in_beam_manager.set_is_in_beam(is_in_beam)
-        self.trigger_listeners(BeamPathUpdate(self))
+        self.trigger_listeners(self._beam_path_update)
         for axis in self.axis.values():
-            axis.trigger_listeners(PhysicalMoveUpdate(axis))
+            axis.trigger_listeners(axis.physical_move_update)
 
     def initialise_is_in_beam_from_file(self, is_in_beam):
         """
@@ -606,9 +636,9 @@ class TrackingBeamPathCalc:
         :param is_in_beam: True component is in beam; False otherwise
         """
         self.in_beam_manager.initialise_is_in_beam_from_file(is_in_beam)
-        self.trigger_listeners(BeamPathUpdate(self))
+        self.trigger_listeners(self._beam_path_update)
         for axis in self.axis.values():
-            axis.trigger_listeners(PhysicalMoveUpdate(axis))
+            axis.trigger_listeners(axis.physical_move_update)
 
     def incoming_beam_auto_save(self):
         """
@@ -633,7 +663,7 @@ class TrackingBeamPathCalc:
             self.set_incoming_beam(incoming_beam, force=True, on_init=True)
             # re trigger on init specifically so that if this is the component theta depends on theta get reset
             for axis in self.axis.values():
-                axis.trigger_listeners(InitUpdate())
+                axis.trigger_listeners(INIT_UPDATE)
 
     def __repr__(self):
         return f"{self._name}: {self.__class__.__name__} {id(self)}"
@@ -661,6 +691,13 @@ class _BeamPathCalcWithAngle(TrackingBeamPathCalc):
             ChangeAxis.DISPLACEMENT_ANGLE, self._get_angular_displacement_at_intersect
         )
 
+    @property
+    def is_reflecting(self):
+        """
+        Returns: True if the component reflects the beam; False if it just tracks the beam
+        """
+        return self._is_reflecting
+
     def _update_beam_path_axes(self):
         super()._update_beam_path_axes()
         self.axis[ChangeAxis.DISPLACEMENT_ANGLE].set_relative_to_beam(
@@ -675,7 +712,7 @@ class _BeamPathCalcWithAngle(TrackingBeamPathCalc):
         """
         self._angular_displacement = angle
         if self._is_reflecting:
-            self.trigger_listeners(BeamPathUpdate(self))
+            self.trigger_listeners(self._beam_path_update)
 
     def _get_angular_displacement(self):
         """
@@ -754,7 +791,7 @@ class SettableBeamPathCalcWithAngle(_BeamPathCalcWithAngle):
         if self.axis[ChangeAxis.ANGLE].autosaved_value is None:
             logger.debug(f"Setting {self._name} angle initial value from motor to {angle}")
             self._angular_displacement = angle
-        self.axis[ChangeAxis.ANGLE].trigger_listeners(InitUpdate())
+        self.axis[ChangeAxis.ANGLE].trigger_listeners(INIT_UPDATE)
         if self._is_reflecting:
             self.trigger_listeners(BeamPathUpdateOnInit(self))
 
@@ -1012,7 +1049,7 @@ class BeamPathCalcThetaSP(SettableBeamPathCalcWithAngle):
         else:
             self._angular_displacement = self._incoming_beam.angle + autosaved_value
 
-        self.axis[ChangeAxis.ANGLE].trigger_listeners(InitUpdate())
+        self.axis[ChangeAxis.ANGLE].trigger_listeners(INIT_UPDATE)
         self.trigger_listeners(BeamPathUpdateOnInit(self))
 
     def _calc_angle_from_next_component(self, incoming_beam):
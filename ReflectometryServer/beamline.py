@@ -12,6 +12,7 @@ from server_common.channel_access import UnableToConnectToPVException
 from server_common.observable import observable
 
 from ReflectometryServer.beam_path_calc import BeamPathUpdate, BeamPathUpdateOnInit
+from ReflectometryServer.dependency_graph import compile_dependency_graph
 from ReflectometryServer.exceptions import (
     AxisNotWithinSoftLimitsException,
     BeamlineConfigurationInvalidException,
@@ -21,8 +22,10 @@ from ReflectometryServer.file_io import MODE_KEY, mode_autosave
 from ReflectometryServer.footprint_calc import BaseFootprintSetup
 from ReflectometryServer.footprint_manager import FootprintManager
 from ReflectometryServer.geometry import ChangeAxis, PositionAndAngle
+from ReflectometryServer.move_timeline import MOVE_TIMELINE
 from ReflectometryServer.parameters import AxisParameter, RequestMoveEvent
 from ReflectometryServer.server_status_manager import STATUS_MANAGER, ProblemInfo
+from ReflectometryServer.tracing import traced
 
 logger = logging.getLogger(__name__)
 
@@ -172,6 +175,7 @@ class Beamline:
         incoming_beam=None,
         footprint_setup=None,
         beamline_constants=None,
+        move_coalescing_window=None,
     ):
         """
         The initializer.
@@ -188,12 +192,15 @@ class Beamline:
             footprint_setup (ReflectometryServer.BaseFootprintSetup.BaseFootprintSetup): the foot print setup
             beamline_constants (list[ReflectometryServer.beamline_constant.BeamlineConstant]): beamline constants to
                 expose
+            move_coalescing_window (float): time in seconds over which setpoint writes from channel access are
+                gathered into a single move; None to move on every write
         """
         self._components = components
         self._beam_path_calcs_set_point = []
         self._beam_path_calcs_rbv = []
         self._beamline_parameters = OrderedDict()
         self._drivers = drivers
+        self.move_coalescing_window = move_coalescing_window
         footprint_setup = footprint_setup if footprint_setup is not None else BaseFootprintSetup()
         self.footprint_manager = FootprintManager(footprint_setup)
         for beamline_parameter in beamline_parameters:
@@ -207,10 +214,21 @@ class Beamline:
             self._modes[mode.name] = mode
 
         self._validate(beamline_parameters, modes, drivers)
+        self.dependency_graph = compile_dependency_graph(
+            components, beamline_parameters, drivers, footprint_setup
+        )
+        # beam path calcs whose outgoing beam is always their incoming beam; used to stop recalculating downstream
+        # components when the beam has not changed
+        self._pass_through_beam_path_calcs = set()
+        # whether all beam paths have been calculated at least once
+        self._beam_paths_initialised = False
 
         for component in components:
             self._beam_path_calcs_set_point.append(component.beam_path_set_point)
             self._beam_path_calcs_rbv.append(component.beam_path_rbv)
+            if not self.dependency_graph.changes_beam_downstream(component.name):
+                self._pass_through_beam_path_calcs.add(component.beam_path_set_point)
+                self._pass_through_beam_path_calcs.add(component.beam_path_rbv)
             component.beam_path_set_point.add_listener(
                 BeamPathUpdateOnInit, self.update_next_beam_component_on_init
             )
@@ -256,6 +274,7 @@ class Beamline:
         self._set_incoming_beam_can_change()
 
         STATUS_MANAGER.set_initialised()
+        self._beam_paths_initialised = True
 
         if beamline_constants is not None:
             self.beamline_constants = beamline_constants
@@ -337,18 +356,23 @@ class Beamline:
             mode (str): name of the mode to set
         """
         try:
-            self._active_mode = self._modes[mode]
-            logger.info("CHANGED ACTIVE MODE: {}".format(mode))
-            for component in self._components:
-                component.set_incoming_beam_can_change(not self._active_mode.is_disabled)
-                mode_autosave.write_parameter(MODE_KEY, value=mode)
-            self._init_params_from_mode()
-            self.update_next_beam_component(BeamPathUpdate(None), self._beam_path_calcs_rbv)
-            self.update_next_beam_component(BeamPathUpdate(None), self._beam_path_calcs_set_point)
-            self.trigger_listeners(ActiveModeUpdate(self._active_mode))
+            new_mode = self._modes[mode]
         except KeyError:
             raise ValueError("Not a valid mode name: '{}'".format(mode))
 
+        previous_mode = self._active_mode
+        self._active_mode = new_mode
+        logger.info("CHANGED ACTIVE MODE: {}".format(mode))
+        mode_autosave.write_parameter(MODE_KEY, value=mode)
+        # whether the incoming beam can change only depends on whether the mode is disabled
+        if previous_mode is None or previous_mode.is_disabled != new_mode.is_disabled:
+            for component in self._components:
+                component.set_incoming_beam_can_change(not new_mode.is_disabled)
+        self._init_params_from_mode()
+        self.update_next_beam_component(BeamPathUpdate(None), self._beam_path_calcs_rbv)
+        self.update_next_beam_component(BeamPathUpdate(None), self._beam_path_calcs_set_point)
+        self.trigger_listeners(ActiveModeUpdate(self._active_mode))
+
     @property
     def move(self):
         """
@@ -358,12 +382,14 @@ class Beamline:
         return 0
 
     @move.setter
+    @traced("move")
     def move(self, _):
         """
         Move to all the beamline parameters in the mode or that have changed
         Args:
             _: dummy can be anything
         """
+        MOVE_TIMELINE.start("beamline")
         STATUS_MANAGER.clear_all()
         if self.reinit_mode_on_move:
             self._init_params_from_mode()
@@ -405,7 +431,11 @@ class Beamline:
             comp_index = calc_path_list.index(update.source)
 
         try:
-            calc_path_list[comp_index + 1].set_incoming_beam(outgoing)
+            next_component = calc_path_list[comp_index + 1]
+            if self._beam_paths_initialised and update.source in self._pass_through_beam_path_calcs:
+                next_component.set_incoming_beam(outgoing, only_if_changed=True)
+            else:
+                next_component.set_incoming_beam(outgoing)
         except IndexError:
             pass  # no more components to update
 
@@ -437,13 +467,77 @@ class Beamline:
         latest positions.
         """
         logger.info("BEAMLINE MOVE TRIGGERED")
+        if (
+            self._move_parameters_to_sp(lambda parameter: parameter.move_to_sp_no_callback())
+            is None
+        ):
+            self._move_drivers()
+
+    @traced("move")
+    def move_to_set_points_within_limits(self, set_points):
+        """
+        Set the setpoints of some parameters and move the beamline to them as for move, but only if every driver would
+        be within its soft limits. The parameters are moved in the model first, holding back their custom functions and
+        autosave; if a parameter is not initialised or any driver is then outside of its limits the setpoints of every
+        parameter are put back and nothing is run, saved or moved.
+
+        Args:
+            set_points (dict[str, Any]): new setpoint for each parameter name
+
+        Returns:
+            list[str]: reasons the beamline was not moved, e.g. a description of each driver outside of its soft
+                limits; empty if it was moved
+        """
+        MOVE_TIMELINE.start("beamline")
+        STATUS_MANAGER.clear_all()
+        logger.info("BEAMLINE MOVE TRIGGERED (within limits)")
+        parameters = list(self._beamline_parameters.values())
+        previous_set_points = [
+            (parameter.sp_no_move, parameter.sp_rbv, parameter.sp_changed)
+            for parameter in parameters
+        ]
+        for param_name, set_point in set_points.items():
+            self._beamline_parameters[param_name].sp_no_move = set_point
+        if self.reinit_mode_on_move:
+            self._init_params_from_mode()
+
+        moved = []
+        not_initialised = self._move_parameters_to_sp(
+            lambda parameter: moved.append((parameter, parameter.move_to_sp_in_model()))
+        )
+        if not_initialised is None:
+            reasons = self.drivers_outside_of_limits()
+            if reasons:
+                MOVE_TIMELINE.failed()
+        else:
+            reasons = [f"{not_initialised} not initialised"]
+        if reasons:
+            for parameter, previous_set_point in zip(parameters, previous_set_points):
+                parameter.restore_sp(*previous_set_point)
+            return reasons
+
+        for parameter, original_set_point_rbv in moved:
+            parameter.run_move_side_effects(original_set_point_rbv)
+        self._move_drivers()
+        return []
+
+    def _move_parameters_to_sp(self, move_parameter):
+        """
+        Move the beamline parameters which are in the mode or whose setpoint has changed to their setpoints.
+
+        Args:
+            move_parameter (Callable[[ReflectometryServer.parameters.BeamlineParameter], None]): moves a parameter to
+                its setpoint
+
+        Returns: the name of the parameter which was not initialised, so the move stopped; None if all were moved
+        """
         parameters = self._beamline_parameters.values()
         parameters_in_mode = self._active_mode.get_parameters_in_mode(parameters, None)
 
         for beamline_parameter in parameters:
             if beamline_parameter in parameters_in_mode or beamline_parameter.sp_changed:
                 try:
-                    beamline_parameter.move_to_sp_no_callback()
+                    move_parameter(beamline_parameter)
                 except ParameterNotInitializedException:
                     STATUS_MANAGER.update_active_problems(
                         ProblemInfo(
@@ -452,11 +546,12 @@ class Beamline:
                             Severity.MAJOR_ALARM,
                         )
                     )
-                    return
-
-        self._move_drivers()
+                    MOVE_TIMELINE.failed()
+                    return beamline_parameter.name
+        return None
 
-    def _move_for_single_beamline_parameters(self, request: RequestMoveEvent):
+    @traced("move")
+    def _move_for_single_beamline_parameters(self, request: RequestMoveEvent, motor_targets=None):
         """
         Moves starts from a single beamline parameter and move is to parameters sp read backs. If the
         request source is not in the mode then don't update any other parameters. Move to latest position.
@@ -464,7 +559,10 @@ class Beamline:
         Args:
             request: request to move a single parameter; if source is None start from the beginning,
                 otherwise start from source
+            motor_targets (Optional[dict[str, float]]): motor target, after engineering correction, to send each
+                driver to keyed by driver name; None to correct the component set points
         """
+        MOVE_TIMELINE.start(request.source.name)
         STATUS_MANAGER.clear_all()
         logger.info("PARAMETER MOVE TRIGGERED (source: {})".format(request.source.name))
         if self._active_mode.has_beamline_parameter(request.source):
@@ -475,7 +573,38 @@ class Beamline:
 
             for beamline_parameter in parameters_in_mode:
                 beamline_parameter.move_to_sp_rbv_no_callback()
-        self._move_drivers()
+        self._move_drivers(motor_targets)
+
+    def move_for_parameters(self, parameters, motor_targets=None):
+        """
+        Move several parameters to their setpoints with a single move of the drivers. The move starts from the first
+        of the parameters, in beamline order, which is in the mode (or the first parameter if none are in the mode).
+
+        Args:
+            parameters (collections.abc.Collection[ReflectometryServer.parameters.BeamlineParameter]): parameters to
+                move
+            motor_targets (Optional[dict[str, float]]): motor target, after engineering correction, to send each
+                driver to keyed by driver name, e.g. targets saved for the same set points and model inputs; drivers
+                without a target, or all drivers if None, are sent their corrected component set point
+        """
+        parameters_in_order = [
+            parameter for parameter in self._beamline_parameters.values() if parameter in parameters
+        ]
+        if len(parameters_in_order) == 0:
+            return
+
+        for parameter in parameters_in_order:
+            parameter.move_to_sp_no_callback()
+
+        source = next(
+            (
+                parameter
+                for parameter in parameters_in_order
+                if self._active_mode.has_beamline_parameter(parameter)
+            ),
+            parameters_in_order[0],
+        )
+        self._move_for_single_beamline_parameters(RequestMoveEvent(source), motor_targets)
 
     def parameter(self, key):
         """
@@ -508,36 +637,64 @@ class Beamline:
                 self._beamline_parameters[key].sp_no_move = value
                 logger.info("Default value applied for param {}: {}".format(key, value))
 
-    def _move_drivers(self):
+    def _move_drivers(self, motor_targets=None):
         """
         Issue move for all drivers at the speed of the slowest axis and set appropriate status for failure/success.
+
+        Args:
+            motor_targets (Optional[dict[str, float]]): motor target to send each driver to keyed by driver name; None
+                to correct the component set points
         """
+        MOVE_TIMELINE.end_stage("recalc")
         try:
             self._check_limits_for_all_drivers()
+            MOVE_TIMELINE.end_stage("limits")
 
-            self._perform_move_for_all_drivers(self._get_max_move_duration())
+            move_duration = self._get_max_move_duration()
+            MOVE_TIMELINE.end_stage("duration")
+
+            if motor_targets is None:
+                self._perform_move_for_all_drivers(move_duration)
+            else:
+                self._perform_move_for_all_drivers(move_duration, motor_targets)
+            MOVE_TIMELINE.setpoints_sent(move_duration)
         except (ZeroDivisionError, AxisNotWithinSoftLimitsException) as e:
+            MOVE_TIMELINE.failed()
             STATUS_MANAGER.update_error_log("Failed to perform beamline move: {}".format(e), e)
             STATUS_MANAGER.update_active_problems(
                 ProblemInfo("Failed to move driver", "beamline", Severity.MAJOR_ALARM)
             )
             return
         except (ValueError, UnableToConnectToPVException) as e:
+            MOVE_TIMELINE.failed()
             STATUS_MANAGER.update_error_log("Unable to connect to PV: {}".format(str(e)))
             STATUS_MANAGER.update_active_problems(
                 ProblemInfo("Unable to connect to PV", "beamline", Severity.MAJOR_ALARM)
             )
             return
 
-    def _perform_move_for_all_drivers(self, move_duration):
+    def _perform_move_for_all_drivers(self, move_duration, motor_targets=None):
         for driver in self._drivers:
-            driver.perform_move(move_duration)
+            if motor_targets is None:
+                driver.perform_move(move_duration)
+            else:
+                driver.perform_move(move_duration, motor_target=motor_targets.get(driver.name))
 
     def _check_limits_for_all_drivers(self):
         """
         Check SP against high and low soft limits for all drivers and raise exception if violated.
         Raises: AxisNotWithinSoftLimitsException if soft limits are violated.
         """
+        drivers_outside_of_limits = self.drivers_outside_of_limits()
+        if len(drivers_outside_of_limits) > 0:
+            raise AxisNotWithinSoftLimitsException(str(drivers_outside_of_limits))
+
+    def drivers_outside_of_limits(self):
+        """
+        Check SP against high and low soft limits for all drivers.
+        Returns:
+            list[str]: description of each driver whose setpoint is outside of its soft limits; empty if none are
+        """
         drivers_outside_of_limits = []
         for driver in self._drivers:
             (inside_limits, component_sp, hlm, llm) = driver.check_limits_against_sps()
@@ -545,8 +702,7 @@ class Beamline:
                 drivers_outside_of_limits.append(
                     f"{driver.name} setpoint {component_sp} outside of limits ({llm},{hlm}), not moving"
                 )
-        if len(drivers_outside_of_limits) > 0:
-            raise AxisNotWithinSoftLimitsException(str(drivers_outside_of_limits))
+        return drivers_outside_of_limits
 
     def _get_max_move_duration(self):
         """
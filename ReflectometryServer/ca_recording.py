@@ -0,0 +1,368 @@
+"""
+Recording of channel access traffic into the server, i.e. monitor updates from the motor PVs and writes to the
+server's PVs, so that a session can be replayed later to reproduce a problem.
+
+A recording is a binary file starting with a header:
+    magic bytes, length of the metadata and the metadata as JSON; the metadata holds the wall clock start time and
+    the IOC macros
+followed by records, each starting with its kind as a byte:
+    NAME: index and name of a PV; written before the first event for that PV
+    MONITOR: time since the start, PV index, alarm severity, alarm status and value
+    WRITE: time since the start, PV index and value
+"""
+
+import json
+import logging
+import numbers
+import struct
+import time
+from collections import namedtuple
+from enum import IntEnum
+from threading import Lock
+from typing import Any, BinaryIO, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Bytes which start every recording
+RECORDING_MAGIC = b"REFLCA01"
+
+# Time in seconds between flushes of the recording to disk
+FLUSH_INTERVAL = 1.0
+
+_HEADER = struct.Struct("<I")
+_KIND = struct.Struct("<B")
+_NAME = struct.Struct("<HH")
+_MONITOR = struct.Struct("<dHBB")
+_WRITE = struct.Struct("<dH")
+_LENGTH = struct.Struct("<I")
+_FLOAT = struct.Struct("<d")
+_INT = struct.Struct("<q")
+_BOOL = struct.Struct("<?")
+
+
+class RecordKind(IntEnum):
+    """
+    Kind of a record in a recording.
+    """
+
+    NAME = 0
+    MONITOR = 1
+    WRITE = 2
+
+
+class _ValueType(IntEnum):
+    """
+    Type of a recorded value.
+    """
+
+    NONE = 0
+    FLOAT = 1
+    INT = 2
+    BOOL = 3
+    STRING = 4
+    FLOATS = 5
+    JSON = 6
+
+
+RecordedEvent = namedtuple(
+    "RecordedEvent",
+    [
+        "kind",  # RecordKind.MONITOR or RecordKind.WRITE
+        "time",  # time in seconds since the start of the recording
+        "pv",  # name of the PV; for writes this is the PV name without the server prefix
+        "value",  # value of the update or write
+        "severity",  # alarm severity of a monitor update; None for writes
+        "status",  # alarm status of a monitor update; None for writes
+    ],
+)
+
+CaRecording = namedtuple(
+    "CaRecording",
+    [
+        "metadata",  # dictionary of the start time and IOC macros of the recording
+        "events",  # list of RecordedEvent in the order they happened
+    ],
+)
+
+
+def _encode_value(value: Any) -> bytes:
+    """
+    Args:
+        value: value to encode; arrays are encoded as lists
+
+    Returns: the value's type and the value as bytes
+    """
+    if hasattr(value, "tolist"):
+        value = value.tolist()
+    if value is None:
+        return _KIND.pack(_ValueType.NONE)
+    if isinstance(value, bool):
+        return _KIND.pack(_ValueType.BOOL) + _BOOL.pack(value)
+    if isinstance(value, numbers.Integral) and -(2**63) <= value < 2**63:
+        return _KIND.pack(_ValueType.INT) + _INT.pack(value)
+    if isinstance(value, numbers.Real):
+        return _KIND.pack(_ValueType.FLOAT) + _FLOAT.pack(value)
+    if isinstance(value, str):
+        encoded = value.encode("utf-8")
+        return _KIND.pack(_ValueType.STRING) + _LENGTH.pack(len(encoded)) + encoded
+    if isinstance(value, (list, tuple)) and all(isinstance(item, float) for item in value):
+        return (
+            _KIND.pack(_ValueType.FLOATS)
+            + _LENGTH.pack(len(value))
+            + struct.pack("<{}d".format(len(value)), *value)
+        )
+    encoded = json.dumps(value, default=str).encode("utf-8")
+    return _KIND.pack(_ValueType.JSON) + _LENGTH.pack(len(encoded)) + encoded
+
+
+class _Reader:
+    """
+    Reads the parts of a recording from its bytes.
+    """
+
+    def __init__(self, data: bytes):
+        self._data = data
+        self.offset = 0
+
+    @property
+    def at_end(self) -> bool:
+        """
+        Returns: True if all the data has been read
+        """
+        return self.offset >= len(self._data)
+
+    def unpack(self, structure: struct.Struct) -> tuple:
+        """
+        Args:
+            structure: structure to read
+
+        Returns: the values of the structure
+        """
+        values = structure.unpack_from(self._data, self.offset)
+        self.offset += structure.size
+        return values
+
+    def read_bytes(self, length: int) -> bytes:
+        """
+        Args:
+            length: number of bytes to read
+
+        Returns: the bytes
+        """
+        data = self._data[self.offset : self.offset + length]
+        if len(data) < length:
+            raise struct.error("Recording ends part way through a record")
+        self.offset += length
+        return data
+
+    def read_value(self) -> Any:
+        """
+        Returns: the next value
+        """
+        (value_type,) = self.unpack(_KIND)
+        if value_type == _ValueType.NONE:
+            return None
+        if value_type == _ValueType.BOOL:
+            return self.unpack(_BOOL)[0]
+        if value_type == _ValueType.INT:
+            return self.unpack(_INT)[0]
+        if value_type == _ValueType.FLOAT:
+            return self.unpack(_FLOAT)[0]
+        (length,) = self.unpack(_LENGTH)
+        if value_type == _ValueType.FLOATS:
+            return list(self.unpack(struct.Struct("<{}d".format(length))))
+        text = self.read_bytes(length).decode("utf-8")
+        return text if value_type == _ValueType.STRING else json.loads(text)
+
+
+def read_recording(path: str) -> CaRecording:
+    """
+    Read a recording. A recording which ends part way through a record, e.g. because the server stopped while
+    recording, is read up to the last complete record.
+    Args:
+        path: path of the recording
+
+    Returns: the recording
+    Raises:
+        ValueError: if the file is not a recording
+    """
+    with open(path, "rb") as recording_file:
+        data = recording_file.read()
+    if not data.startswith(RECORDING_MAGIC):
+        raise ValueError("{} is not a channel access recording".format(path))
+    reader = _Reader(data)
+    reader.offset = len(RECORDING_MAGIC)
+    (length,) = reader.unpack(_HEADER)
+    metadata = json.loads(reader.read_bytes(length).decode("utf-8"))
+
+    names = {}
+    events = []
+    try:
+        while not reader.at_end:
+            (kind,) = reader.unpack(_KIND)
+            if kind == RecordKind.NAME:
+                index, length = reader.unpack(_NAME)
+                names[index] = reader.read_bytes(length).decode("utf-8")
+            elif kind == RecordKind.MONITOR:
+                event_time, index, severity, status = reader.unpack(_MONITOR)
+                events.append(
+                    RecordedEvent(
+                        RecordKind.MONITOR,
+                        event_time,
+                        names[index],
+                        reader.read_value(),
+                        severity,
+                        status,
+                    )
+                )
+            elif kind == RecordKind.WRITE:
+                event_time, index = reader.unpack(_WRITE)
+                events.append(
+                    RecordedEvent(
+                        RecordKind.WRITE, event_time, names[index], reader.read_value(), None, None
+                    )
+                )
+            else:
+                raise ValueError("Unknown record kind {} in {}".format(kind, path))
+    except struct.error:
+        logger.warning("Recording {} is truncated; read {} events".format(path, len(events)))
+    return CaRecording(metadata, events)
+
+
+class CaRecorder:
+    """
+    Records monitor updates and writes to a file while recording is on. When it is off the cost is a single check.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._file: Optional[BinaryIO] = None
+        self._names: Dict[str, int] = {}
+        self._start = 0.0
+        self._last_flush = 0.0
+
+    @property
+    def is_recording(self) -> bool:
+        """
+        Returns: True if events are being recorded
+        """
+        return self._file is not None
+
+    def start(self, path: str, macros: Optional[Dict[str, str]] = None):
+        """
+        Start recording to a file, replacing any existing file. Start before the beamline is created so that the
+        initial values of the monitors are recorded; replaying needs them.
+        Args:
+            path: path of the file to record to
+            macros: macros of the IOC, stored in the recording so it can be replayed with the same configuration
+        """
+        self.stop()
+        metadata = json.dumps({"start_time": time.time(), "macros": macros or {}}).encode("utf-8")
+        recording_file = open(path, "wb")
+        recording_file.write(RECORDING_MAGIC + _HEADER.pack(len(metadata)) + metadata)
+        with self._lock:
+            self._names = {}
+            self._start = time.perf_counter()
+            self._last_flush = self._start
+            self._file = recording_file
+        logger.info("Recording channel access to {}".format(path))
+
+    def stop(self):
+        """
+        Stop recording and close the file.
+        """
+        with self._lock:
+            recording_file, self._file = self._file, None
+        if recording_file is not None:
+            recording_file.close()
+            logger.info("Stopped recording channel access")
+
+    def wrap_monitor(
+        self, pv: str, call_back_function: Callable[[Any, Any, Any], None]
+    ) -> Callable[[Any, Any, Any], None]:
+        """
+        Args:
+            pv: name of the monitored PV
+            call_back_function: function called with the value, alarm severity and alarm status of each update
+
+        Returns: monitor function which records each update, when recording, and then calls the function
+        """
+
+        def _record_and_call_back(value, alarm_severity, alarm_status):
+            if self._file is not None:
+                self.record_monitor(pv, value, alarm_severity, alarm_status)
+            call_back_function(value, alarm_severity, alarm_status)
+
+        return _record_and_call_back
+
+    def record_monitor(self, pv: str, value: Any, alarm_severity: Any, alarm_status: Any):
+        """
+        Record a monitor update if recording.
+        Args:
+            pv: name of the PV
+            value: new value
+            alarm_severity: alarm severity, recorded as an integer
+            alarm_status: alarm status, recorded as an integer
+        """
+        self._record(
+            RecordKind.MONITOR,
+            pv,
+            lambda event_time, index: _MONITOR.pack(
+                event_time, index, int(alarm_severity), int(alarm_status)
+            ),
+            value,
+        )
+
+    def record_write(self, reason: str, value: Any):
+        """
+        Record a write to a server PV if recording.
+        Args:
+            reason: PV written to, without the server prefix
+            value: value written
+        """
+        self._record(RecordKind.WRITE, reason, _WRITE.pack, value)
+
+    def _record(
+        self, kind: RecordKind, pv: str, pack_fields: Callable[[float, int], bytes], value: Any
+    ):
+        """
+        Write a record to the file if recording.
+        Args:
+            kind: kind of record
+            pv: name of the PV
+            pack_fields: function which packs the fields of the record from its time and PV index; the record is
+                dropped if they can not be packed
+            value: value of the record
+        """
+        if self._file is None:
+            return
+        try:
+            encoded_value = _encode_value(value)
+        except (TypeError, ValueError, struct.error) as ex:
+            logger.warning("Unable to record value of {}: {}".format(pv, ex))
+            return
+        with self._lock:
+            if self._file is None:
+                return
+            now = time.perf_counter()
+            index = self._names.get(pv)
+            is_new_name = index is None
+            if is_new_name:
+                index = len(self._names)
+            try:
+                fields = pack_fields(now - self._start, index)
+            except (TypeError, ValueError, struct.error) as ex:
+                logger.warning("Unable to record {} of {}: {}".format(kind.name, pv, ex))
+                return
+            if is_new_name:
+                self._names[pv] = index
+                name = pv.encode("utf-8")
+                self._file.write(_KIND.pack(RecordKind.NAME) + _NAME.pack(index, len(name)) + name)
+            self._file.write(_KIND.pack(kind) + fields + encoded_value)
+            if now - self._last_flush > FLUSH_INTERVAL:
+                self._file.flush()
+                self._last_flush = now
+
+
+# Recorder for all channel access traffic into the server
+CA_RECORDER = CaRecorder()
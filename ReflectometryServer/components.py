@@ -251,13 +251,26 @@ class BenchSetup(PositionAndAngle):
                 False sample in horizontal mode, jacks move to ANGLE and POSITION
         """
         super(BenchSetup, self).__init__(y, z, angle)
-        self.jack_front_z = jack_front_z
-        self.jack_rear_z = jack_rear_z
-        self.initial_table_angle = initial_table_angle
-        self.pivot_to_beam = pivot_to_beam
-        self.min_angle_for_slide = min_angle_for_slide
-        self.max_angle_for_slide = max_angle_for_slide
-        self.vertical_mode = vertical_mode
+        # set through object because, like its base, the setup is an immutable value
+        object.__setattr__(self, "jack_front_z", jack_front_z)
+        object.__setattr__(self, "jack_rear_z", jack_rear_z)
+        object.__setattr__(self, "initial_table_angle", initial_table_angle)
+        object.__setattr__(self, "pivot_to_beam", pivot_to_beam)
+        object.__setattr__(self, "min_angle_for_slide", min_angle_for_slide)
+        object.__setattr__(self, "max_angle_for_slide", max_angle_for_slide)
+        object.__setattr__(self, "vertical_mode", vertical_mode)
+
+    def _values(self):
+        return (
+            *super(BenchSetup, self)._values(),
+            self.jack_front_z,
+            self.jack_rear_z,
+            self.initial_table_angle,
+            self.pivot_to_beam,
+            self.min_angle_for_slide,
+            self.max_angle_for_slide,
+            self.vertical_mode,
+        )
 
 
 class BenchComponent(TiltingComponent):
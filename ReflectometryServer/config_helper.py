@@ -10,6 +10,11 @@ from pcaspy import Severity
 from ReflectometryServer.beamline import Beamline, BeamlineMode
 from ReflectometryServer.beamline_constant import BeamlineConstant
 from ReflectometryServer.components import Component
+from ReflectometryServer.custom_function_executor import (
+    CUSTOM_FUNCTION_EXECUTOR,
+    DEFAULT_MAX_WORKERS,
+    DEFAULT_TIMEOUT,
+)
 from ReflectometryServer.engineering_corrections import (
     ConstantCorrection,
     ModeSelectCorrection,
@@ -18,6 +23,7 @@ from ReflectometryServer.footprint_calc import FootprintSetup
 from ReflectometryServer.geometry import PositionAndAngle
 from ReflectometryServer.ioc_driver import IocDriver
 from ReflectometryServer.parameters import (
+    DEFAULT_RBV_DEADBAND,
     DEFAULT_RBV_TO_SP_TOLERANCE,
     BeamlineParameter,
     DirectParameter,
@@ -57,6 +63,9 @@ class ConfigHelper:
     mode_initial_values = {}
     beam_start = None
     footprint_setup = None
+    move_coalescing_window = None
+    custom_function_max_workers = DEFAULT_MAX_WORKERS
+    custom_function_timeout = DEFAULT_TIMEOUT
 
     @classmethod
     def reset(cls) -> None:
@@ -70,6 +79,9 @@ class ConfigHelper:
         cls.mode_initial_values = {}
         cls.beam_start = None
         cls.footprint_setup = None
+        cls.move_coalescing_window = None
+        cls.custom_function_max_workers = DEFAULT_MAX_WORKERS
+        cls.custom_function_timeout = DEFAULT_TIMEOUT
 
     def __init__(self) -> None:
         logger.warning("This class is usually used statically")
@@ -90,6 +102,9 @@ def get_configured_beamline() -> Beamline:
             )
         )
 
+    CUSTOM_FUNCTION_EXECUTOR.configure(
+        ConfigHelper.custom_function_max_workers, ConfigHelper.custom_function_timeout
+    )
     return Beamline(
         components=ConfigHelper.components,
         beamline_parameters=ConfigHelper.parameters,
@@ -98,6 +113,7 @@ def get_configured_beamline() -> Beamline:
         incoming_beam=ConfigHelper.beam_start,
         footprint_setup=ConfigHelper.footprint_setup,
         beamline_constants=ConfigHelper.constants,
+        move_coalescing_window=ConfigHelper.move_coalescing_window,
     )
 
 
@@ -148,6 +164,9 @@ def add_parameter(
     modes: Union[List, str, None] = None,
     mode_inits: Union[None, List] = None,
     marker: Union[int, None] = None,
+    monitor_deadband: Optional[float] = None,
+    rbv_deadband: Optional[float] = None,
+    custom_function_timeout: Optional[float] = None,
 ) -> BeamlineParameter:
     """
     Add a parameter to the beamline configuration.
@@ -158,6 +177,12 @@ def add_parameter(
         mode_inits: a list of mode and their initial value;
                     None for no init, e.g. [(nr, 0), (polarised, 1)]
         marker: index of location parameter should be added; None add to the end
+        monitor_deadband: monitor deadband (MDEL field) of the readback PV, the change needed before it is posted to
+            monitors; None to use a default based on the precision of the PV
+        rbv_deadband: change in the readback needed before a new readback is published to the rest of the server;
+            None to leave the parameter's own deadband
+        custom_function_timeout: time in seconds after which the parameter's custom function, if it is still running,
+            is reported as an error; None to leave the parameter's own timeout
 
     Returns:
         given parameter
@@ -179,6 +204,12 @@ def add_parameter(
         ... )
 
     """
+    if monitor_deadband is not None:
+        parameter.monitor_deadband = monitor_deadband
+    if rbv_deadband is not None:
+        parameter.rbv_deadband = rbv_deadband
+    if custom_function_timeout is not None:
+        parameter.custom_function_timeout = custom_function_timeout
     if marker is None:
         ConfigHelper.parameters.append(parameter)
     else:
@@ -332,6 +363,7 @@ def add_slit_parameters(
     exclude: List[str] = None,
     include_centres: bool = False,
     beam_blocker: Optional[str] = None,
+    rbv_deadband: float = DEFAULT_RBV_DEADBAND,
 ) -> Dict[str, BeamlineParameter]:
     """
     Add parameters for a slit, this is horizontal and vertical gaps and centres. Also add modes,
@@ -347,6 +379,7 @@ def add_slit_parameters(
         include_centres: True to include centres; False to just have the gaps
         beam_blocker: string containing code for beam blocker config, N,S,E,W for each blade
                       which blocks the beam
+        rbv_deadband: change in the readback of a gap or centre needed before a new readback is published
 
     Returns:
         slit gap parameters
@@ -372,7 +405,12 @@ def add_slit_parameters(
 
         vg_param_name = "S{}{}".format(slit_number, name)
         driver = create_jaws_pv_driver(jaws_pv_prefix, is_vertical, is_gap_not_centre)
-        parameter = SlitGapParameter(vg_param_name, driver, rbv_to_sp_tolerance=rbv_to_sp_tolerance)
+        parameter = SlitGapParameter(
+            vg_param_name,
+            driver,
+            rbv_to_sp_tolerance=rbv_to_sp_tolerance,
+            rbv_deadband=rbv_deadband,
+        )
         add_parameter(parameter, modes, mode_inits)
         parameters[name] = parameter
 
@@ -466,6 +504,43 @@ def add_footprint_setup(footprint_setup: FootprintSetup) -> FootprintSetup:
     return footprint_setup
 
 
+def set_move_coalescing_window(window: float) -> float:
+    """
+    Gather setpoint writes to parameters from channel access which arrive within a time window into a single move,
+    so that motors get one new target rather than being retargeted by each write.
+    Args:
+        window: time in seconds, from the first write, over which writes are gathered
+
+    Returns:
+        window
+
+    Examples:
+        >>> set_move_coalescing_window(0.1)
+    """
+    ConfigHelper.move_coalescing_window = window
+    return window
+
+
+def set_custom_function_execution(max_workers: int, timeout: Optional[float] = None) -> int:
+    """
+    Set how custom functions on parameters are run. Custom functions on different parameters run in parallel up to the
+    number of workers; those on the same parameter always run one at a time in order.
+    Args:
+        max_workers: number of custom functions which can run at the same time
+        timeout: time in seconds after which a custom function which is still running is reported as an error;
+            None for no timeout
+
+    Returns:
+        max_workers
+
+    Examples:
+        >>> set_custom_function_execution(4, timeout=60)
+    """
+    ConfigHelper.custom_function_max_workers = max_workers
+    ConfigHelper.custom_function_timeout = timeout
+    return max_workers
+
+
 def optional_is_set(optional_id: str, macros: Dict[str, str]) -> bool:
     """
     Check whether an optional macro for use in the configuration is set or not.
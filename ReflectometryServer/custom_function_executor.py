@@ -0,0 +1,220 @@
+"""
+Executor for the custom functions users attach to parameters. Calls for one parameter run one at a time in order. By
+default only one custom function runs at a time; a configuration can opt in to calls for different parameters running in
+parallel on a pool of workers, see set_custom_function_execution.
+"""
+
+import logging
+import time
+from collections import namedtuple
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import Lock, Timer
+from typing import Any, Callable, Dict, List, Optional
+
+from pcaspy import Severity
+from server_common.observable import observable
+
+from ReflectometryServer.server_status_manager import STATUS_MANAGER, ProblemInfo
+
+logger = logging.getLogger(__name__)
+
+# Default number of custom functions which can run at the same time
+DEFAULT_MAX_WORKERS = 1
+
+# Default time in seconds after which a running custom function is reported as overrunning; None for no timeout
+DEFAULT_TIMEOUT = None
+
+# Problem description for a custom function which is still running after its timeout
+TIMED_OUT_DESCRIPTION = "Custom function on parameter timed out."
+
+CustomFunctionStatusUpdate = namedtuple(
+    "CustomFunctionStatusUpdate",
+    [
+        "queue_depth",  # number of custom functions waiting to run or running
+        "run_time",  # time in seconds the last custom function to finish took to run
+        "running",  # names of the parameters whose custom functions are running
+    ],
+)
+
+
+class _CustomFunctionCall:
+    """
+    A call of a custom function.
+    """
+
+    def __init__(self, function: Callable[..., Any], args: tuple, timeout: Optional[float]):
+        self.function = function
+        self.args = args
+        self.timeout = timeout
+        self.future = Future()
+        self.timed_out = False
+        self.timed_out_lock = Lock()
+
+
+class _ParameterCalls:
+    """
+    The running and pending call for a parameter. Only the latest pending call is kept.
+    """
+
+    def __init__(self):
+        self.running: Optional[_CustomFunctionCall] = None
+        self.pending: Optional[_CustomFunctionCall] = None
+
+
+@observable(CustomFunctionStatusUpdate)
+class CustomFunctionExecutor:
+    """
+    Runs custom functions keeping the calls for each parameter in order. If a call is made for a parameter while one
+    is already waiting to run, the waiting call is superseded and cancelled. A call which runs for longer than its
+    timeout is reported; it can not be stopped so the next call for that parameter waits for it to finish.
+    """
+
+    def __init__(
+        self, max_workers: int = DEFAULT_MAX_WORKERS, timeout: Optional[float] = DEFAULT_TIMEOUT
+    ):
+        """
+        Initialise.
+        Args:
+            max_workers: number of custom functions which can run at the same time
+            timeout: time in seconds after which a running custom function is reported; None for no timeout
+        """
+        self._lock = Lock()
+        self._calls: Dict[str, _ParameterCalls] = {}
+        self._pool = ThreadPoolExecutor(max_workers=max_workers)
+        self.timeout = timeout
+        self.run_time = 0.0
+        self.superseded_count = 0
+        self.timed_out_count = 0
+
+    def configure(self, max_workers: int, timeout: Optional[float] = DEFAULT_TIMEOUT):
+        """
+        Set the number of workers and default timeout. Calls already submitted run on the previous workers.
+        Args:
+            max_workers: number of custom functions which can run at the same time
+            timeout: time in seconds after which a running custom function is reported; None for no timeout
+        """
+        if max_workers < 1:
+            raise ValueError("Custom function executor needs at least one worker")
+        with self._lock:
+            old_pool = self._pool
+            self._pool = ThreadPoolExecutor(max_workers=max_workers)
+            self.timeout = timeout
+        old_pool.shutdown(wait=False)
+
+    @property
+    def queue_depth(self) -> int:
+        """
+        Returns: number of custom functions waiting to run or running
+        """
+        with self._lock:
+            return sum(
+                (calls.running is not None) + (calls.pending is not None)
+                for calls in self._calls.values()
+            )
+
+    @property
+    def running(self) -> List[str]:
+        """
+        Returns: names of the parameters whose custom functions are running
+        """
+        with self._lock:
+            return [name for name, calls in self._calls.items() if calls.running is not None]
+
+    def submit(
+        self, name: str, function: Callable[..., Any], *args, timeout: Optional[float] = None
+    ) -> Future:
+        """
+        Submit a custom function to run after any call for the same parameter which is running.
+        Args:
+            name: name of the parameter the function is attached to
+            function: the custom function
+            *args: arguments to call the function with
+            timeout: time in seconds after which the call is reported as overrunning; None to use the default
+
+        Returns: future for the result of the call; cancelled if the call is superseded before it runs
+        """
+        call = _CustomFunctionCall(function, args, timeout if timeout is not None else self.timeout)
+        with self._lock:
+            calls = self._calls.setdefault(name, _ParameterCalls())
+            if calls.running is None:
+                calls.running = call
+                self._pool.submit(self._run, name, call)
+            else:
+                if calls.pending is not None:
+                    calls.pending.future.cancel()
+                    self.superseded_count += 1
+                    logger.info(
+                        "Custom function on parameter {} superseded before it ran".format(name)
+                    )
+                calls.pending = call
+        self._trigger_status_update()
+        return call.future
+
+    def _run(self, name: str, call: _CustomFunctionCall):
+        """
+        Run a call and then start the next call for the parameter.
+        Args:
+            name: name of the parameter
+            call: call to run
+        """
+        timer = None
+        if call.timeout is not None:
+            timer = Timer(call.timeout, self._on_timeout, [name, call])
+            timer.daemon = True
+            timer.start()
+        start = time.perf_counter()
+        if call.future.set_running_or_notify_cancel():
+            try:
+                call.future.set_result(call.function(*call.args))
+            except Exception as ex:
+                call.future.set_exception(ex)
+        run_time = time.perf_counter() - start
+        if timer is not None:
+            timer.cancel()
+        with call.timed_out_lock:
+            if call.timed_out:
+                STATUS_MANAGER.clear_active_problem(
+                    ProblemInfo(TIMED_OUT_DESCRIPTION, name, Severity.MINOR_ALARM)
+                )
+
+        with self._lock:
+            self.run_time = run_time
+            calls = self._calls[name]
+            calls.running, calls.pending = calls.pending, None
+            if calls.running is not None:
+                self._pool.submit(self._run, name, calls.running)
+        self._trigger_status_update()
+
+    def _on_timeout(self, name: str, call: _CustomFunctionCall):
+        """
+        Report a call which is still running after its timeout. The problem is cleared when the call finishes.
+        Args:
+            name: name of the parameter
+            call: the call which has timed out
+        """
+        with call.timed_out_lock:
+            if call.future.done():
+                return
+            call.timed_out = True
+            with self._lock:
+                self.timed_out_count += 1
+            STATUS_MANAGER.update_error_log(
+                "Custom function on parameter {} has been running for more than {}s".format(
+                    name, call.timeout
+                )
+            )
+            STATUS_MANAGER.update_active_problems(
+                ProblemInfo(TIMED_OUT_DESCRIPTION, name, Severity.MINOR_ALARM)
+            )
+
+    def _trigger_status_update(self):
+        """
+        Tell listeners the current queue depth, run time and running custom functions.
+        """
+        self.trigger_listeners(
+            CustomFunctionStatusUpdate(self.queue_depth, self.run_time, self.running)
+        )
+
+
+# Executor for custom functions on all parameters
+CUSTOM_FUNCTION_EXECUTOR = CustomFunctionExecutor()
@@ -0,0 +1,233 @@
+"""
+Dependency graph of a beamline compiled from its configuration. The graph describes how a change to a set point
+propagates through the model: from parameters to the components they move, along the beam to components downstream of
+those which change the beam, and from components to the drivers which move their motors. Engineering corrections which
+depend on parameters and the footprint calculation inputs are included.
+"""
+
+import json
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+if TYPE_CHECKING:
+    from ReflectometryServer.components import Component
+    from ReflectometryServer.footprint_calc import BaseFootprintSetup
+    from ReflectometryServer.ioc_driver import IocDriver
+    from ReflectometryServer.parameters import BeamlineParameter
+
+PARAMETER_NODE_PREFIX = "parameter:"
+COMPONENT_NODE_PREFIX = "component:"
+DRIVER_NODE_PREFIX = "driver:"
+FOOTPRINT_NODE = "footprint"
+
+
+def parameter_node(name: str) -> str:
+    """
+    Args:
+        name: name of the parameter
+
+    Returns: name of the node for the parameter
+    """
+    return PARAMETER_NODE_PREFIX + name
+
+
+def component_node(name: str) -> str:
+    """
+    Args:
+        name: name of the component
+
+    Returns: name of the node for the component
+    """
+    return COMPONENT_NODE_PREFIX + name
+
+
+def driver_node(name: str) -> str:
+    """
+    Args:
+        name: name of the driver
+
+    Returns: name of the node for the driver
+    """
+    return DRIVER_NODE_PREFIX + name
+
+
+class DependencyGraph:
+    """
+    Directed acyclic graph of which nodes are affected by a change in another node.
+    """
+
+    def __init__(self):
+        self._successors: Dict[str, List[str]] = OrderedDict()
+        self._topological_order: Optional[List[str]] = None
+
+    def add_node(self, node: str):
+        """
+        Add a node to the graph, if it is not already in it.
+        Args:
+            node: name of the node
+        """
+        if node not in self._successors:
+            self._successors[node] = []
+            self._topological_order = None
+
+    def add_edge(self, source: str, target: str):
+        """
+        Add an edge to the graph adding the nodes if they are not already in it.
+        Args:
+            source: node which when changed affects the target
+            target: node affected by the source
+        """
+        self.add_node(source)
+        self.add_node(target)
+        if target not in self._successors[source]:
+            self._successors[source].append(target)
+            self._topological_order = None
+
+    @property
+    def nodes(self) -> List[str]:
+        """
+        Returns: nodes in the order they were added
+        """
+        return list(self._successors.keys())
+
+    def successors(self, node: str) -> List[str]:
+        """
+        Args:
+            node: node to get the successors of
+
+        Returns: the nodes directly affected by a change in the node
+        """
+        return list(self._successors[node])
+
+    def changes_beam_downstream(self, component_name: str) -> bool:
+        """
+        Args:
+            component_name: name of the component
+
+        Returns: True if a change to the component can change the beam reaching other components; False otherwise
+        """
+        return any(
+            successor.startswith(COMPONENT_NODE_PREFIX)
+            for successor in self._successors.get(component_node(component_name), [])
+        )
+
+    def topological_order(self) -> List[str]:
+        """
+        Returns: all the nodes ordered so that each node comes after every node which affects it; ties are kept in the
+            order the nodes were added
+        Raises:
+            ValueError: if the graph contains a cycle
+        """
+        if self._topological_order is None:
+            in_degree = {node: 0 for node in self._successors}
+            for targets in self._successors.values():
+                for target in targets:
+                    in_degree[target] += 1
+
+            order = []
+            ready = [node for node, degree in in_degree.items() if degree == 0]
+            while ready:
+                node = ready.pop(0)
+                order.append(node)
+                for target in self._successors[node]:
+                    in_degree[target] -= 1
+                    if in_degree[target] == 0:
+                        ready.append(target)
+
+            if len(order) != len(self._successors):
+                cyclic_nodes = [node for node, degree in in_degree.items() if degree > 0]
+                raise ValueError(
+                    "Dependency graph contains a cycle through {}".format(cyclic_nodes)
+                )
+            self._topological_order = order
+        return list(self._topological_order)
+
+    def affected_by(self, node: str) -> List[str]:
+        """
+        Args:
+            node: node which changes
+
+        Returns: the nodes affected by a change in the node, in the order in which they should be recalculated
+        Raises:
+            ValueError: if the node is not in the graph
+        """
+        if node not in self._successors:
+            raise ValueError("No node named '{}' in the dependency graph".format(node))
+        affected = set()
+        to_visit = list(self._successors[node])
+        while to_visit:
+            next_node = to_visit.pop()
+            if next_node not in affected:
+                affected.add(next_node)
+                to_visit.extend(self._successors[next_node])
+        return [
+            ordered_node for ordered_node in self.topological_order() if ordered_node in affected
+        ]
+
+    def to_dict(self) -> Dict[str, List]:
+        """
+        Returns: the graph as a dictionary of the nodes in topological order and the edges as source target pairs
+        """
+        return {
+            "nodes": self.topological_order(),
+            "edges": [
+                [source, target]
+                for source, targets in self._successors.items()
+                for target in targets
+            ],
+        }
+
+    def to_json(self) -> str:
+        """
+        Returns: the graph as json
+        """
+        return json.dumps(self.to_dict())
+
+
+def compile_dependency_graph(
+    components: List["Component"],
+    parameters: List["BeamlineParameter"],
+    drivers: List["IocDriver"],
+    footprint_setup: Optional["BaseFootprintSetup"] = None,
+) -> DependencyGraph:
+    """
+    Compile the dependency graph for a beamline configuration.
+    Args:
+        components: components in beamline order
+        parameters: beamline parameters
+        drivers: drivers for the components
+        footprint_setup: setup of the footprint calculation; None for no footprint calculation
+
+    Returns: the dependency graph
+    Raises:
+        ValueError: if the graph contains a cycle
+    """
+    graph = DependencyGraph()
+
+    for parameter in parameters:
+        graph.add_node(parameter_node(parameter.name))
+        component = getattr(parameter, "component", None)
+        if component is not None:
+            graph.add_edge(parameter_node(parameter.name), component_node(component.name))
+
+    for index, component in enumerate(components):
+        graph.add_node(component_node(component.name))
+        if component.beam_path_set_point.is_reflecting:
+            for downstream_component in components[index + 1 :]:
+                graph.add_edge(
+                    component_node(component.name), component_node(downstream_component.name)
+                )
+
+    for driver in drivers:
+        graph.add_edge(component_node(driver.component.name), driver_node(driver.name))
+        for parameter in driver.engineering_correction_parameters:
+            graph.add_edge(parameter_node(parameter.name), driver_node(driver.name))
+
+    if footprint_setup is not None:
+        footprint_inputs = [footprint_setup.theta, *footprint_setup.gap_params.values()]
+        for parameter in footprint_inputs:
+            if parameter is not None:
+                graph.add_edge(parameter_node(parameter.name), FOOTPRINT_NODE)
+
+    graph.topological_order()
+    return graph
@@ -99,6 +99,13 @@ class EngineeringCorrection(metaclass=abc.ABCMeta):
         """
         return self.from_axis(setpoint, None)
 
+    @property
+    def parameters(self) -> List["BeamlineParameter"]:
+        """
+        Returns: the beamline parameters whose setpoints this correction depends on
+        """
+        return []
+
     def set_observe_mode_change_on(self, mode_changer: "Beamline") -> None:
         """
         Allow this correction to listen to mode change events from the mode_changer.
@@ -228,6 +235,13 @@ class UserFunctionCorrection(SymmetricEngineeringCorrection):
         self._user_correction_function = user_correction_function
         self._beamline_parameters = beamline_parameters
 
+    @property
+    def parameters(self) -> List["BeamlineParameter"]:
+        """
+        Returns: the beamline parameters used in the user function
+        """
+        return list(self._beamline_parameters)
+
     def correction(self, setpoint: float) -> float:
         """
         Correction as calculated by the provided user function.
@@ -411,6 +425,17 @@ class InterpolateGridDataCorrectionFromProvider(SymmetricEngineeringCorrection):
 
         self._default_correction = 0
 
+    @property
+    def parameters(self) -> List["BeamlineParameter"]:
+        """
+        Returns: the beamline parameters used in the interpolation, excluding the driver setpoint
+        """
+        return [
+            parameter
+            for parameter in self._beamline_parameters
+            if parameter is not self.set_point_value_as_parameter
+        ]
+
     def _find_parameter(
         self, parameter_name: str, beamline_parameters: List["BeamlineParameter"]
     ) -> "BeamlineParameter":
@@ -517,6 +542,18 @@ class ModeSelectCorrection(EngineeringCorrection):
         self._correction = None
         self._set_correction(None)
 
+    @property
+    def parameters(self) -> List["BeamlineParameter"]:
+        """
+        Returns: the beamline parameters that the correction for any mode depends on
+        """
+        parameters = []
+        for correction in [self._default_correction, *self._corrections_for_mode.values()]:
+            for parameter in correction.parameters:
+                if parameter not in parameters:
+                    parameters.append(parameter)
+        return parameters
+
     def set_observe_mode_change_on(self, mode_changer: "Beamline") -> None:
         """
         Allow this correction to listen to mode change events from the mode_changer
@@ -14,6 +14,7 @@ from server_common.autosave import (
 
 from ReflectometryServer.ChannelAccess.constants import REFL_AUTOSAVE_PATH
 from ReflectometryServer.geometry import PositionAndAngle
+from ReflectometryServer.server_metrics import SERVER_METRICS
 
 logger = logging.getLogger(__name__)
 
@@ -22,16 +23,34 @@ VELOCITY_AUTOSAVE_FILE = "velocity"
 MODE_AUTOSAVE_FILE = "mode"
 DISABLE_MODE_AUTOSAVE_FILE = "disable_mode_incoming_beams"
 COMPONENT_AUTOSAVE_FILE = "component"
+PRESET_AUTOSAVE_FILE = "presets"
 
 MODE_KEY = "mode"
 
+
+class CountedAutosaveFile(AutosaveFile):
+    """
+    Autosave file which counts its writes in the server metrics.
+    """
+
+    def write_parameter(self, parameter, value):
+        """
+        Write a parameter to the autosave file.
+        Args:
+            parameter: name of the parameter
+            value: value to write
+        """
+        SERVER_METRICS.autosave_writes.increment()
+        super(CountedAutosaveFile, self).write_parameter(parameter, value)
+
+
 # the mode autosave service
-mode_autosave = AutosaveFile(
+mode_autosave = CountedAutosaveFile(
     service_name="refl", file_name=MODE_AUTOSAVE_FILE, folder=REFL_AUTOSAVE_PATH
 )
 
 # the disable mode autosave service
-disable_mode_autosave = AutosaveFile(
+disable_mode_autosave = CountedAutosaveFile(
     service_name="refl",
     file_name=DISABLE_MODE_AUTOSAVE_FILE,
     conversion=PositionAndAngle,
@@ -39,7 +58,7 @@ disable_mode_autosave = AutosaveFile(
 )
 
 # the parameter autosave service for floats
-param_float_autosave = AutosaveFile(
+param_float_autosave = CountedAutosaveFile(
     service_name="refl",
     file_name=PARAM_AUTOSAVE_FILE,
     conversion=FloatConversion,
@@ -47,7 +66,7 @@ param_float_autosave = AutosaveFile(
 )
 
 # the parameter autosave service for booleans
-param_bool_autosave = AutosaveFile(
+param_bool_autosave = CountedAutosaveFile(
     service_name="refl",
     file_name=PARAM_AUTOSAVE_FILE,
     conversion=BoolConversion,
@@ -55,7 +74,7 @@ param_bool_autosave = AutosaveFile(
 )
 
 # the parameter autosave service for strings
-param_string_autosave = AutosaveFile(
+param_string_autosave = CountedAutosaveFile(
     service_name="refl",
     file_name=PARAM_AUTOSAVE_FILE,
     conversion=StringConversion,
@@ -63,7 +82,7 @@ param_string_autosave = AutosaveFile(
 )
 
 # the velocity autosave service for floats
-velocity_float_autosave = AutosaveFile(
+velocity_float_autosave = CountedAutosaveFile(
     service_name="refl",
     file_name=VELOCITY_AUTOSAVE_FILE,
     conversion=FloatConversion,
@@ -71,16 +90,24 @@ velocity_float_autosave = AutosaveFile(
 )
 
 # the velocity autosave service for booleans
-velocity_bool_autosave = AutosaveFile(
+velocity_bool_autosave = CountedAutosaveFile(
     service_name="refl",
     file_name=VELOCITY_AUTOSAVE_FILE,
     conversion=BoolConversion,
     folder=REFL_AUTOSAVE_PATH,
 )
 
-parking_index_autosave = AutosaveFile(
+parking_index_autosave = CountedAutosaveFile(
     service_name="refl",
     file_name=COMPONENT_AUTOSAVE_FILE,
     conversion=OptionalIntConversion,
     folder=REFL_AUTOSAVE_PATH,
 )
+
+# the beamline preset service, presets are stored as json strings
+preset_autosave = CountedAutosaveFile(
+    service_name="refl",
+    file_name=PRESET_AUTOSAVE_FILE,
+    conversion=StringConversion,
+    folder=REFL_AUTOSAVE_PATH,
+)
@@ -8,12 +8,34 @@ from math import cos, radians, sin
 
 class Position:
     """
-    The beam position and direction
+    The beam position and direction. Positions are immutable values so they can be shared and used as keys.
     """
 
+    __slots__ = ("y", "z")
+
     def __init__(self, y, z):
-        self.z = float(z)
-        self.y = float(y)
+        _set_z(self, float(z))
+        _set_y(self, float(y))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("{} is immutable".format(self.__class__.__name__))
+
+    def __delattr__(self, name):
+        raise AttributeError("{} is immutable".format(self.__class__.__name__))
+
+    def _values(self):
+        return self.y, self.z
+
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._values() == other._values()
+
+    def __hash__(self):
+        return hash(self._values())
+
+    def __reduce__(self):
+        return self.__class__, self._values()
 
     def __add__(self, other):
         return Position(self.y + other.y, self.z + other.z)
@@ -27,6 +49,8 @@ class PositionAndAngle(Position):
     The beam position and direction
     """
 
+    __slots__ = ("angle",)
+
     def __init__(self, y, z, angle):
         """
 
@@ -35,8 +59,12 @@ class PositionAndAngle(Position):
             z: z position in room co-ordinates
             angle: clockwise angle measured from the horizon (90 to -90 with 0 pointing away from the source)
         """
-        super(PositionAndAngle, self).__init__(y, z)
-        self.angle = float(angle)
+        _set_z(self, float(z))
+        _set_y(self, float(y))
+        _set_angle(self, float(angle))
+
+    def _values(self):
+        return self.y, self.z, self.angle
 
     def __repr__(self):
         return "{}({}, {}, {})".format(self.__class__.__name__, self.y, self.z, self.angle)
@@ -71,6 +99,12 @@ class PositionAndAngle(Position):
             raise ValueError("Converting from string to {}".format(PositionAndAngle.__name__))
 
 
+# setters for the slots, used on construction because attribute assignment is blocked to keep the values immutable
+_set_y = Position.y.__set__
+_set_z = Position.z.__set__
+_set_angle = PositionAndAngle.angle.__set__
+
+
 def position_from_radial_coords(r, theta, angle=None):
     """
     Create a position based on radial coordinates. If angle included create a position and angle.
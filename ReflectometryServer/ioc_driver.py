@@ -4,7 +4,7 @@ The driving layer communicates between the component layer and underlying pvs.
 
 import logging
 import math
-from collections import namedtuple
+import time
 from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
@@ -12,6 +12,7 @@ from pcaspy import Severity
 
 if TYPE_CHECKING:
     from ReflectometryServer.components import Component
+    from ReflectometryServer.parameters import BeamlineParameter
 from server_common.observable import observable
 
 from ReflectometryServer.axis import DefineValueAsEvent, ParkingSequenceUpdate
@@ -22,6 +23,7 @@ from ReflectometryServer.engineering_corrections import (
     NoCorrection,
 )
 from ReflectometryServer.geometry import ChangeAxis
+from ReflectometryServer.move_timeline import MOVE_TIMELINE
 from ReflectometryServer.out_of_beam import OutOfBeamLookup, OutOfBeamPosition
 from ReflectometryServer.parameters import BeamlineParameter, ParameterSetpointReadbackUpdate
 from ReflectometryServer.pv_wrapper import (
@@ -30,19 +32,22 @@ from ReflectometryServer.pv_wrapper import (
     ReadbackUpdate,
     SetpointUpdate,
 )
+from ReflectometryServer.recomputation_detector import RECOMPUTATION_DETECTOR, RecomputationKind
 from ReflectometryServer.server_status_manager import STATUS_MANAGER, ProblemInfo
+from ReflectometryServer.tracing import TRACER
 
 logger = logging.getLogger(__name__)
 
-# Event that is triggered when a new readback value is read from the axis (with corrections applied)
-CorrectedReadbackUpdate = namedtuple(
-    "CorrectedReadbackUpdate",
-    [
-        "value",  # The new (corrected) readback value of the axis (float)
-        "alarm_severity",  # The alarm severity of the axis, represented as an integer (see Channel Access doc)
-        "alarm_status",
-    ],
-)  # The alarm status of the axis, represented as an integer (see Channel Access doc)
+
+@dataclass(slots=True)
+class CorrectedReadbackUpdate:
+    """
+    Event that is triggered when a new readback value is read from the axis (with corrections applied)
+    """
+
+    value: float  # The new (corrected) readback value of the axis
+    alarm_severity: int  # The alarm severity of the axis as an integer (see Channel Access doc)
+    alarm_status: int  # The alarm status of the axis as an integer (see Channel Access doc)
 
 
 @dataclass
@@ -72,7 +77,7 @@ class IocDriver:
         synchronised: bool = True,
         engineering_correction: Optional[EngineeringCorrection] = None,
         pv_wrapper_for_parameter: Optional[PVWrapperForParameter] = None,
-        ignore_soft_limits: bool = False
+        ignore_soft_limits: bool = False,
     ):
         """
         Drive the IOC based on a component
@@ -85,7 +90,7 @@ class IocDriver:
             engineering_correction: the engineering correction to apply to the value from the component before it is
                 sent to the pv. None for no correction
             pv_wrapper_for_parameter: change the pv wrapper based on the value of a parameter
-            ignore_soft_limits: ignore soft limits for this axis when performing a compound move. 
+            ignore_soft_limits: ignore soft limits for this axis when performing a compound move.
         """
         self.component = component
         self.component_axis = component_axis
@@ -362,7 +367,7 @@ class IocDriver:
             )
         return duration
 
-    def perform_move(self, move_duration, force=False):
+    def perform_move(self, move_duration, force=False, motor_target=None):
         """
         Tells the driver to perform a move to the component set points within a given duration.
         The axis will update the set point cache when it is changed so don't need to do it here
@@ -370,26 +375,66 @@ class IocDriver:
         Args:
             move_duration (float): The duration in which to perform this move
             force (bool): move even if component does not report changed
-        """
-        component_sp, is_to_from_park = self._get_component_sp_and_is_to_from_parking()
-        if component_sp is not None and (self._axis_will_move() or force):
-            move_duration -= self._backlash_duration()
-            if move_duration > 1e-6 and self._synchronised and not is_to_from_park:
-                self._motor_axis.cache_velocity()
-                self._motor_axis.velocity = max(
-                    self._motor_axis.min_velocity, self._get_distance() / move_duration
+            motor_target (Optional[float]): position, after engineering correction, to send the motor axis to, e.g.
+                one saved for the same component set point; None to apply the engineering correction
+        """
+        start = time.perf_counter()
+        with TRACER.span("IocDriver.perform_move", "move", {"driver": self.name}):
+            component_sp, is_to_from_park = self._get_component_sp_and_is_to_from_parking()
+            if component_sp is not None and (self._axis_will_move() or force):
+                move_duration -= self._backlash_duration()
+                if move_duration > 1e-6 and self._synchronised and not is_to_from_park:
+                    self._motor_axis.cache_velocity()
+                    self._motor_axis.velocity = max(
+                        self._motor_axis.min_velocity, self._get_distance() / move_duration
+                    )
+                else:
+                    self._motor_axis.record_no_cache_velocity()
+
+                if motor_target is not None:
+                    motor_sp = motor_target
+                else:
+                    with TRACER.span("correction to axis", "correction", {"driver": self.name}):
+                        motor_sp = self._engineering_correction.to_axis(component_sp)
+                if RECOMPUTATION_DETECTOR.enabled:
+                    RECOMPUTATION_DETECTOR.record(
+                        RecomputationKind.CORRECTION_TO_AXIS, self.name, (component_sp, motor_sp)
+                    )
+                self._motor_axis.sp = motor_sp
+                MOVE_TIMELINE.put_sent(
+                    self.name, self._motor_axis.name, time.perf_counter() - start
                 )
-            else:
-                self._motor_axis.record_no_cache_velocity()
+            elif self.at_target_setpoint():
+                logger.debug(f"{self.name}: Not moving already at set point : {component_sp}")
+
+            # re update in case the new position is at the end of a sequence
+            self._retrigger_motor_axis_updates(None)
 
-            self._motor_axis.sp = self._engineering_correction.to_axis(component_sp)
-        elif self.at_target_setpoint():
-            logger.debug(f"{self.name}: Not moving already at set point : {component_sp}")
+            self.component.beam_path_set_point.axis[self.component_axis].is_changed = False
+
+    def motor_target(self) -> Optional[float]:
+        """
+        Returns: the position, after engineering correction, that the motor axis will be sent to on the next move; None
+            if it will not be moved because it is in a parking sequence with a None in it
+        """
+        component_sp = self._get_component_sp()
+        if component_sp is None:
+            return None
+        return self._engineering_correction.to_axis(component_sp)
 
-        # re update in case the new position is at the end of a sequence
-        self._retrigger_motor_axis_updates(None)
+    @property
+    def engineering_correction_description(self) -> str:
+        """
+        Returns: description of the engineering correction applied to the motor axis
+        """
+        return self._engineering_correction.description
 
-        self.component.beam_path_set_point.axis[self.component_axis].is_changed = False
+    @property
+    def engineering_correction_parameters(self) -> List["BeamlineParameter"]:
+        """
+        Returns: the beamline parameters whose setpoints the engineering correction depends on
+        """
+        return self._engineering_correction.parameters
 
     def rbv_cache(self):
         """
@@ -491,9 +536,16 @@ class IocDriver:
         Args:
             update (ReflectometryServer.pv_wrapper.ReadbackUpdate): update of the readback value of the axis
         """
-        corrected_new_value = self._engineering_correction.from_axis(
-            update.value, self._get_component_sp(True)
-        )
+        with TRACER.span("correction from axis", "correction", {"driver": self.name}):
+            corrected_new_value = self._engineering_correction.from_axis(
+                update.value, self._get_component_sp(True)
+            )
+        if RECOMPUTATION_DETECTOR.enabled:
+            RECOMPUTATION_DETECTOR.record(
+                RecomputationKind.CORRECTION_FROM_AXIS,
+                self.name,
+                (update.value, corrected_new_value),
+            )
         self._rbv_cache = corrected_new_value
         self._propagate_rbv_change(
             CorrectedReadbackUpdate(corrected_new_value, update.alarm_severity, update.alarm_status)
@@ -0,0 +1,357 @@
+"""
+Opt-in profiling of the listeners of the observable classes in the beamline model, to find where the time goes in the
+chains of listeners which an update sets off, e.g. PVWrapper -> IocDriver -> ComponentAxis -> TrackingBeamPathCalc ->
+Beamline -> BeamlineParameter -> ReflectometryDriver.
+
+The observable decorator lives in server_common so the profiler hooks in by replacing add_listener and
+trigger_listeners on the observable classes: listeners added after it is installed are wrapped to time each call, and
+triggers are followed so that each chain can be traced back to the event which started it. Install it before the
+beamline is created; until it is installed nothing is changed and nothing is measured.
+
+For each (update type, listener) pair it records the number of calls and the cumulative and maximum time of a call,
+including the time of any listeners the call triggers in turn. For each originating event, i.e. a trigger which is not
+inside another listener, it records the depth of the cascade, in levels of triggers, and its fan-out, the number of
+listener calls it caused.
+"""
+
+import json
+import logging
+import threading
+import time
+from collections import namedtuple
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Default number of entries reported as the top listeners and cascades
+DEFAULT_TOP_N = 20
+
+ListenerProfile = namedtuple(
+    "ListenerProfile",
+    [
+        "listeners",  # list of dictionaries of statistics per (update type, listener), most total time first
+        "cascades",  # list of dictionaries of statistics per originating event, largest fan-out first
+    ],
+)
+
+
+def _observable_classes() -> List[type]:
+    """
+    Returns: the observable classes of the server; imported here because they import most of the server
+    """
+    from ReflectometryServer.axis import ComponentAxis
+    from ReflectometryServer.beam_path_calc import InBeamManager, TrackingBeamPathCalc
+    from ReflectometryServer.beamline import Beamline
+    from ReflectometryServer.ChannelAccess.ca_process_loop import ProcessWakeup
+    from ReflectometryServer.custom_function_executor import CustomFunctionExecutor
+    from ReflectometryServer.engineering_corrections import EngineeringCorrection
+    from ReflectometryServer.ioc_driver import IocDriver
+    from ReflectometryServer.parameters import BeamlineParameter
+    from ReflectometryServer.pv_wrapper import PVWrapper
+    from ReflectometryServer.server_status_manager import _ServerStatusManager
+
+    return [
+        ComponentAxis,
+        InBeamManager,
+        TrackingBeamPathCalc,
+        Beamline,
+        ProcessWakeup,
+        CustomFunctionExecutor,
+        EngineeringCorrection,
+        IocDriver,
+        BeamlineParameter,
+        PVWrapper,
+        _ServerStatusManager,
+    ]
+
+
+def _listener_name(listener: Callable) -> str:
+    """
+    Args:
+        listener: listener function
+
+    Returns: readable name of the listener, e.g. class and method name for a bound method
+    """
+    while isinstance(listener, partial):
+        listener = listener.func
+    owner = getattr(listener, "__self__", None)
+    if owner is not None:
+        return "{}.{}".format(type(owner).__name__, listener.__name__)
+    return getattr(listener, "__qualname__", repr(listener))
+
+
+class _CallStats:
+    """
+    Statistics of the calls of a listener.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+
+    def record(self, duration: float):
+        """
+        Record a call.
+        Args:
+            duration: time in seconds of the call
+        """
+        self.count += 1
+        self.total += duration
+        self.maximum = max(self.maximum, duration)
+
+
+class _CascadeStats:
+    """
+    Statistics of the cascades of listener calls set off by an originating event.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.total_calls = 0
+        self.max_fan_out = 0
+        self.max_depth = 0
+        self.total = 0.0
+
+    def record(self, depth: int, fan_out: int, duration: float):
+        """
+        Record a cascade.
+        Args:
+            depth: deepest level of nested triggers
+            fan_out: number of listener calls
+            duration: time in seconds of the cascade
+        """
+        self.count += 1
+        self.total_calls += fan_out
+        self.max_fan_out = max(self.max_fan_out, fan_out)
+        self.max_depth = max(self.max_depth, depth)
+        self.total += duration
+
+
+class _ProfiledListener:
+    """
+    Listener wrapped to record the time of each call. It compares equal to the listener it wraps so that the listener
+    can still be removed.
+    """
+
+    def __init__(self, profiler: "ListenerProfiler", key: Tuple[str, str], listener: Callable):
+        self._profiler = profiler
+        self._key = key
+        self.listener = listener
+
+    def __call__(self, update):
+        return self._profiler.call_listener(self._key, self.listener, update)
+
+    def __eq__(self, other):
+        if isinstance(other, _ProfiledListener):
+            other = other.listener
+        return self.listener == other
+
+    def __hash__(self):
+        return hash(self.listener)
+
+
+class ListenerProfiler:
+    """
+    Records the time spent in the listeners of the observable classes once installed.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._listeners: Dict[Tuple[str, str], _CallStats] = {}
+        self._cascades: Dict[str, _CascadeStats] = {}
+        self._replaced: List[Tuple[type, str, Any]] = []
+
+    @property
+    def is_installed(self) -> bool:
+        """
+        Returns: True if listeners are being profiled
+        """
+        return len(self._replaced) > 0
+
+    def install(self, classes: Optional[List[type]] = None):
+        """
+        Start profiling the listeners added from now on to the observable classes.
+        Args:
+            classes: observable classes to profile; None for all the observable classes of the server
+        """
+        if self.is_installed:
+            return
+        for cls in _observable_classes() if classes is None else classes:
+            for name, make_replacement in (
+                ("add_listener", self._profiled_add_listener),
+                ("trigger_listeners", self._profiled_trigger_listeners),
+            ):
+                original = getattr(cls, name)
+                # a subclass which is not itself observable uses its base class's replacement
+                if not getattr(original, "is_profiled", False):
+                    self._replaced.append((cls, name, cls.__dict__.get(name)))
+                    replacement = make_replacement(original)
+                    replacement.is_profiled = True
+                    setattr(cls, name, replacement)
+        logger.info("Profiling listeners")
+
+    def uninstall(self):
+        """
+        Stop profiling; listeners which have already been wrapped carry on being timed until they are removed.
+        """
+        for cls, name, original in reversed(self._replaced):
+            if original is None:
+                delattr(cls, name)
+            else:
+                setattr(cls, name, original)
+        self._replaced = []
+
+    def reset(self):
+        """
+        Clear the statistics.
+        """
+        with self._lock:
+            self._listeners = {}
+            self._cascades = {}
+
+    def _profiled_add_listener(self, original: Callable) -> Callable:
+        """
+        Args:
+            original: add_listener of an observable class
+
+        Returns: add_listener which wraps the listener to profile it
+        """
+        profiler = self
+
+        def add_listener(observable, listener_type, listener, *args, **kwargs):
+            if not isinstance(listener, _ProfiledListener):
+                key = (listener_type.__name__, _listener_name(listener))
+                listener = _ProfiledListener(profiler, key, listener)
+            return original(observable, listener_type, listener, *args, **kwargs)
+
+        return add_listener
+
+    def _profiled_trigger_listeners(self, original: Callable) -> Callable:
+        """
+        Args:
+            original: trigger_listeners of an observable class
+
+        Returns: trigger_listeners which follows the depth of the cascade of triggers
+        """
+        profiler = self
+
+        def trigger_listeners(observable, update, *args, **kwargs):
+            local = profiler._local
+            depth = getattr(local, "depth", 0)
+            if depth == 0:
+                local.max_depth = 0
+                local.fan_out = 0
+                start = time.perf_counter()
+            local.depth = depth + 1
+            local.max_depth = max(local.max_depth, depth + 1)
+            try:
+                return original(observable, update, *args, **kwargs)
+            finally:
+                local.depth = depth
+                if depth == 0:
+                    profiler._record_cascade(
+                        "{}.{}".format(type(observable).__name__, type(update).__name__),
+                        local.max_depth,
+                        local.fan_out,
+                        time.perf_counter() - start,
+                    )
+
+        return trigger_listeners
+
+    def call_listener(self, key: Tuple[str, str], listener: Callable, update: Any) -> Any:
+        """
+        Call a listener, recording the time it took.
+        Args:
+            key: update type and listener name
+            listener: listener to call
+            update: update to call it with
+
+        Returns: the listener's return value
+        """
+        local = self._local
+        local.fan_out = getattr(local, "fan_out", 0) + 1
+        start = time.perf_counter()
+        try:
+            return listener(update)
+        finally:
+            duration = time.perf_counter() - start
+            with self._lock:
+                stats = self._listeners.get(key)
+                if stats is None:
+                    stats = self._listeners[key] = _CallStats()
+                stats.record(duration)
+
+    def _record_cascade(self, event: str, depth: int, fan_out: int, duration: float):
+        """
+        Record the cascade of an originating event.
+        Args:
+            event: observable class and update type of the event
+            depth: deepest level of nested triggers
+            fan_out: number of listener calls
+            duration: time in seconds of the cascade
+        """
+        with self._lock:
+            stats = self._cascades.get(event)
+            if stats is None:
+                stats = self._cascades[event] = _CascadeStats()
+            stats.record(depth, fan_out, duration)
+
+    def profile(self, top_n: Optional[int] = DEFAULT_TOP_N) -> ListenerProfile:
+        """
+        Args:
+            top_n: number of listeners and cascades to report; None for all
+
+        Returns: the listeners with the most total time and the originating events with the largest fan-out; times
+            are in milliseconds
+        """
+        with self._lock:
+            listeners = [
+                {
+                    "update": update_type,
+                    "listener": listener,
+                    "count": stats.count,
+                    "total_ms": stats.total * 1e3,
+                    "max_ms": stats.maximum * 1e3,
+                }
+                for (update_type, listener), stats in self._listeners.items()
+            ]
+            cascades = [
+                {
+                    "event": event,
+                    "count": stats.count,
+                    "max_depth": stats.max_depth,
+                    "max_fan_out": stats.max_fan_out,
+                    "mean_fan_out": stats.total_calls / stats.count,
+                    "total_ms": stats.total * 1e3,
+                }
+                for event, stats in self._cascades.items()
+            ]
+        listeners.sort(key=lambda entry: entry["total_ms"], reverse=True)
+        cascades.sort(key=lambda entry: entry["max_fan_out"], reverse=True)
+        return ListenerProfile(listeners[:top_n], cascades[:top_n])
+
+    def profile_json(self, top_n: Optional[int] = DEFAULT_TOP_N) -> str:
+        """
+        Args:
+            top_n: number of listeners and cascades to report; None for all
+
+        Returns: the profile as json
+        """
+        return json.dumps(self.profile(top_n)._asdict())
+
+    def dump(self, path: str):
+        """
+        Write the whole profile to a file as json.
+        Args:
+            path: path of the file
+        """
+        with open(path, "w") as dump_file:
+            dump_file.write(self.profile_json(None))
+        logger.info("Listener profile written to {}".format(path))
+
+
+# Profiler for the listeners of the server
+LISTENER_PROFILER = ListenerProfiler()
@@ -0,0 +1,240 @@
+"""
+Model actor which, when running, executes every change to the beamline model on a single dedicated thread in priority
+order. When it is not running commands are executed immediately on the calling thread, one at a time.
+"""
+
+import itertools
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from enum import IntEnum
+from queue import PriorityQueue
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of commands waiting for the model thread; submitting when full blocks until there is space
+DEFAULT_MAX_QUEUE_SIZE = 1000
+
+
+class CommandPriority(IntEnum):
+    """
+    Priority of a command for the model; lower values are executed first.
+    """
+
+    USER_WRITE = 0  # writes from channel access, including mode changes
+    MOVE = 1  # moves of the beamline not directly requested by a write, e.g. coalesced moves
+    READBACK_BATCH = 2  # batch of updates from motor monitors
+    STOP = 3  # stop the model thread once everything else has been processed
+
+
+@dataclass(order=True)
+class _Command:
+    """
+    A command waiting for the model thread.
+    """
+
+    priority: int  # priority of the command
+    sequence: (
+        int  # order the command was submitted in, so commands of the same priority are run in order
+    )
+    function: Optional[Callable[[], Any]] = field(compare=False)  # function to run; None to stop
+    future: Future = field(compare=False)  # future which is given the result of the function
+    submitted: float = field(compare=False)  # time the command was submitted
+
+
+class QueueLatency:
+    """
+    Statistics of the time commands wait in the queue before being executed.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+        self.last = 0.0
+
+    def record(self, latency: float):
+        """
+        Record the latency of a command.
+        Args:
+            latency: time in seconds the command waited
+        """
+        self.count += 1
+        self.total += latency
+        self.maximum = max(self.maximum, latency)
+        self.last = latency
+
+    @property
+    def mean(self) -> float:
+        """
+        Returns: mean latency in seconds; 0 if no commands have been recorded
+        """
+        return self.total / self.count if self.count > 0 else 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        """
+        Returns: the statistics as a dictionary
+        """
+        return {"count": self.count, "mean": self.mean, "max": self.maximum, "last": self.last}
+
+
+class ModelActor:
+    """
+    Runs commands which change the beamline model on a single thread, highest priority first and in submission order
+    within a priority.
+    """
+
+    def __init__(self, max_queue_size: int = DEFAULT_MAX_QUEUE_SIZE):
+        """
+        Initialise.
+        Args:
+            max_queue_size: maximum number of commands waiting to be run
+        """
+        self._queue = PriorityQueue(maxsize=max_queue_size)
+        self._sequence = itertools.count()
+        self._thread = None
+        # held while a command runs on a calling thread, so those commands are not run at the same time
+        self._calling_thread_lock = threading.RLock()
+        self.latency = {priority: QueueLatency() for priority in CommandPriority}
+
+    @property
+    def is_running(self) -> bool:
+        """
+        Returns: True if commands are being run on the model thread; False if they are run on the calling thread
+        """
+        return self._thread is not None
+
+    @property
+    def queue_depth(self) -> int:
+        """
+        Returns: number of commands waiting to be run
+        """
+        return self._queue.qsize()
+
+    def start(self):
+        """
+        Start the model thread so that from now on all commands are run on it.
+        """
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="model_actor", daemon=True)
+            self._thread.start()
+            logger.info("Model actor started")
+
+    def stop(self, timeout: Optional[float] = None):
+        """
+        Stop the model thread once all the commands already submitted have run. Commands submitted afterwards are run
+        on the calling thread.
+        Args:
+            timeout: maximum time to wait in seconds for the thread to stop; None to wait until it has
+        """
+        thread = self._thread
+        if thread is None:
+            return
+        self._put(CommandPriority.STOP, None)
+        thread.join(timeout)
+        self._thread = None
+        logger.info("Model actor stopped")
+
+    def submit(self, function: Callable[[], Any], priority: CommandPriority) -> Future:
+        """
+        Submit a command to be run on the model thread. If the model thread is not running the command is run
+        immediately, once no command is running on another calling thread; if this is called from the model thread it
+        is run immediately.
+        Args:
+            function: function to run
+            priority: priority of the command
+
+        Returns: future for the result of the function
+        """
+        if self._thread is None:
+            with self._calling_thread_lock:
+                return self._run_now(function)
+        if threading.current_thread() is self._thread:
+            return self._run_now(function)
+        return self._put(priority, function)
+
+    def _run_now(self, function: Callable[[], Any]) -> Future:
+        """
+        Run a command on the current thread.
+        Args:
+            function: function to run
+
+        Returns: future with the result of the function
+        """
+        future = Future()
+        future.set_running_or_notify_cancel()
+        self._set_result(future, function)
+        return future
+
+    def call(self, function: Callable[[], Any], priority: CommandPriority) -> Any:
+        """
+        Run a command on the model thread and wait for it to finish.
+        Args:
+            function: function to run
+            priority: priority of the command
+
+        Returns: the result of the function
+        Raises:
+            any exception raised by the function
+        """
+        return self.submit(function, priority).result()
+
+    def latency_metrics(self) -> Dict[str, Dict[str, float]]:
+        """
+        Returns: queue latency statistics for each priority, keyed by priority name
+        """
+        return {
+            priority.name: self.latency[priority].as_dict()
+            for priority in CommandPriority
+            if priority is not CommandPriority.STOP
+        }
+
+    def _put(self, priority: CommandPriority, function: Optional[Callable[[], Any]]) -> Future:
+        """
+        Put a command on the queue, blocking while the queue is full.
+        Args:
+            priority: priority of the command
+            function: function to run; None to stop the thread
+
+        Returns: future for the result of the function
+        """
+        future = Future()
+        self._queue.put(
+            _Command(priority, next(self._sequence), function, future, time.perf_counter())
+        )
+        return future
+
+    def _run(self):
+        """
+        Run commands from the queue until a stop command is found.
+        """
+        while True:
+            command = self._queue.get()
+            if command.function is None:
+                command.future.set_result(None)
+                break
+            self.latency[CommandPriority(command.priority)].record(
+                time.perf_counter() - command.submitted
+            )
+            if command.future.set_running_or_notify_cancel():
+                self._set_result(command.future, command.function)
+
+    @staticmethod
+    def _set_result(future: Future, function: Callable[[], Any]):
+        """
+        Run the function setting its result, or the exception it raises, on the future.
+        Args:
+            future: future to set
+            function: function to run
+        """
+        try:
+            future.set_result(function())
+        except Exception as ex:
+            future.set_exception(ex)
+
+
+# Actor through which all changes to the beamline model are made
+MODEL_ACTOR = ModelActor()
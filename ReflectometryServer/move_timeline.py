@@ -0,0 +1,278 @@
+"""
+Timeline of each move of the beamline, to show whether a slow move is caused by the server or by the motors.
+
+A move is timed from the write which started it through the stages the server does:
+    recalc: recalculating the parameters and beam path
+    limits: checking the setpoints against the soft limits of the drivers
+    duration: computing the duration of the move
+    puts: sending the setpoints, per driver which was sent one
+and then through the motors:
+    first moving: the first motor of the move reporting it is moving (DMOV=0)
+    last stopped: the last motor of the move reporting it has stopped (DMOV=1)
+    settled: the readbacks which arrived by the last motor stopping having been processed
+"""
+
+import logging
+import threading
+import time
+from collections import deque, namedtuple
+from typing import Any, Dict, List, Optional
+
+from server_common.observable import observable
+
+logger = logging.getLogger(__name__)
+
+# Number of moves kept in the timeline
+MOVE_HISTORY_LENGTH = 10
+
+MoveTimelineUpdate = namedtuple(
+    "MoveTimelineUpdate",
+    [
+        "moves",  # list of dictionaries of the timings of the most recent moves, oldest first
+        "calc_time",  # time in seconds the server took to calculate the last move and send its setpoints
+        "wall_time",  # time in seconds from the start of the last settled move to it being settled
+    ],
+)
+
+
+class MoveOutcome:
+    """
+    Outcomes of a move.
+    """
+
+    CALCULATING = "calculating"  # the server is calculating the move
+    MOVING = "moving"  # setpoints have been sent; waiting for the motors to stop
+    SETTLING = "settling"  # the motors have stopped; waiting for their readbacks to be processed
+    COMPLETE = "complete"  # the readbacks have been processed
+    NO_MOTION = "no motion"  # no setpoints needed sending
+    FAILED = "failed"  # the move was not made, e.g. a setpoint was outside the soft limits
+    SUPERSEDED = "superseded"  # another move started before this one completed
+
+
+class _MoveRecord:
+    """
+    Timings of a single move.
+    """
+
+    def __init__(self, source: str, start: float):
+        """
+        Initialise.
+        Args:
+            source: name of what started the move
+            start: perf_counter time the move started
+        """
+        self.source = source
+        self.start_time = time.time()
+        self.start = start
+        self.stage_start = start
+        self.stages: Dict[str, float] = {}
+        self.puts: Dict[str, float] = {}
+        self.motors = set()
+        self.started: Dict[str, float] = {}
+        self.stopped: Dict[str, float] = {}
+        self.move_duration: Optional[float] = None
+        self.calc_time: Optional[float] = None
+        self.last_stopped: Optional[float] = None
+        self.settled: Optional[float] = None
+        self.outcome = MoveOutcome.CALCULATING
+
+    @property
+    def first_moving(self) -> Optional[float]:
+        """
+        Returns: time in seconds from the start of the move to the first of its motors moving; None if none have
+        """
+        times = [self.started[motor] for motor in self.motors if motor in self.started]
+        return min(times) if times else None
+
+    def check_motors_stopped(self):
+        """
+        Move on to settling if all the motors of the move have moved and stopped.
+        """
+        if self.outcome == MoveOutcome.MOVING and all(
+            motor in self.stopped for motor in self.motors
+        ):
+            self.last_stopped = max(self.stopped[motor] for motor in self.motors)
+            self.outcome = MoveOutcome.SETTLING
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Returns: the timings of the move; times are in ms, the motor times from the start of the move
+        """
+
+        def _ms(seconds):
+            return None if seconds is None else round(seconds * 1e3, 1)
+
+        return {
+            "source": self.source,
+            "start": self.start_time,
+            "outcome": self.outcome,
+            "stages": {stage: _ms(duration) for stage, duration in self.stages.items()},
+            "puts": {driver: _ms(duration) for driver, duration in self.puts.items()},
+            "move_duration": self.move_duration,
+            "calc": _ms(self.calc_time),
+            "first_moving": _ms(self.first_moving),
+            "last_stopped": _ms(self.last_stopped),
+            "settled": _ms(self.settled),
+        }
+
+
+@observable(MoveTimelineUpdate)
+class MoveTimeline:
+    """
+    Records the timings of the most recent moves. Moves are made one at a time so the timings are of the current
+    move; a new move supersedes the current one if it has not completed.
+    """
+
+    def __init__(self, history_length: int = MOVE_HISTORY_LENGTH):
+        """
+        Initialise.
+        Args:
+            history_length: number of moves kept
+        """
+        self._lock = threading.RLock()
+        self._moves = deque(maxlen=history_length)
+        self._current: Optional[_MoveRecord] = None
+        self._wall_time: Optional[float] = None
+
+    def start(self, source: str):
+        """
+        Start timing a move; a move which has not completed is superseded.
+        Args:
+            source: name of what started the move, e.g. the parameter
+        """
+        with self._lock:
+            current = self._current
+            if current is not None and current.outcome in (
+                MoveOutcome.CALCULATING,
+                MoveOutcome.MOVING,
+                MoveOutcome.SETTLING,
+            ):
+                current.outcome = MoveOutcome.SUPERSEDED
+            self._current = _MoveRecord(source, time.perf_counter())
+            self._moves.append(self._current)
+
+    def end_stage(self, stage: str):
+        """
+        End a stage of the calculation of the current move, which started when the previous stage ended.
+        Args:
+            stage: name of the stage
+        """
+        with self._lock:
+            current = self._current
+            if current is not None and current.outcome == MoveOutcome.CALCULATING:
+                now = time.perf_counter()
+                current.stages[stage] = now - current.stage_start
+                current.stage_start = now
+
+    def put_sent(self, driver: str, motor: str, duration: float):
+        """
+        Record that a driver sent a setpoint to its motor.
+        Args:
+            driver: name of the driver
+            motor: name of the motor
+            duration: time in seconds the driver took to send the setpoint
+        """
+        with self._lock:
+            current = self._current
+            if current is not None and current.outcome == MoveOutcome.CALCULATING:
+                current.puts[driver] = duration
+                current.motors.add(motor)
+
+    def setpoints_sent(self, move_duration: float):
+        """
+        Record that all the setpoints of the current move have been sent.
+        Args:
+            move_duration: duration in seconds the move was calculated to take
+        """
+        with self._lock:
+            current = self._current
+            if current is None or current.outcome != MoveOutcome.CALCULATING:
+                return
+            now = time.perf_counter()
+            current.stages["puts"] = now - current.stage_start
+            current.calc_time = now - current.start
+            current.move_duration = move_duration
+            if current.motors:
+                current.outcome = MoveOutcome.MOVING
+                current.check_motors_stopped()
+            else:
+                current.outcome = MoveOutcome.NO_MOTION
+        self._publish()
+
+    def failed(self):
+        """
+        Record that the current move was not made.
+        """
+        with self._lock:
+            current = self._current
+            if current is None or current.outcome != MoveOutcome.CALCULATING:
+                return
+            current.calc_time = time.perf_counter() - current.start
+            current.outcome = MoveOutcome.FAILED
+        self._publish()
+
+    def motor_changing(self, motor: str, is_changing: bool):
+        """
+        Record a change in whether a motor is moving; called as the motor's monitor arrives. Changes are recorded for
+        every motor while the setpoints are being sent, because a motor can start moving before its driver has
+        finished sending its setpoint.
+        Args:
+            motor: name of the motor
+            is_changing: True if the motor is moving; False if it has stopped
+        """
+        with self._lock:
+            current = self._current
+            if current is None or current.outcome not in (
+                MoveOutcome.CALCULATING,
+                MoveOutcome.MOVING,
+            ):
+                return
+            now = time.perf_counter() - current.start
+            if is_changing:
+                current.started.setdefault(motor, now)
+                current.stopped.pop(motor, None)
+            elif motor in current.started:
+                current.stopped[motor] = now
+                current.check_motors_stopped()
+
+    def readbacks_processed(self, batch_start: float):
+        """
+        Record that a batch of readbacks has been processed; the current move is settled once a batch which started
+        after its last motor stopped has been processed.
+        Args:
+            batch_start: perf_counter time the batch started being processed
+        """
+        with self._lock:
+            current = self._current
+            if (
+                current is None
+                or current.outcome != MoveOutcome.SETTLING
+                or batch_start - current.start < current.last_stopped
+            ):
+                return
+            current.settled = time.perf_counter() - current.start
+            current.outcome = MoveOutcome.COMPLETE
+            self._wall_time = current.settled
+        self._publish()
+
+    def moves(self) -> List[Dict[str, Any]]:
+        """
+        Returns: the timings of the most recent moves, oldest first
+        """
+        with self._lock:
+            return [move.as_dict() for move in self._moves]
+
+    def _publish(self):
+        """
+        Tell the listeners about the timings.
+        """
+        with self._lock:
+            current = self._current
+            update = MoveTimelineUpdate(
+                self.moves(), current.calc_time if current is not None else None, self._wall_time
+            )
+        self.trigger_listeners(update)
+
+
+# Timeline of the moves of the beamline
+MOVE_TIMELINE = MoveTimeline()
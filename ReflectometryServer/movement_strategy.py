@@ -30,6 +30,27 @@ class LinearMovementCalc:
         self._current_position_at_zero = self._initial_position_at_zero
         self._displacement = 0
 
+        # the movement axis is fixed so its trigonometry is calculated once
+        angle_m_mod_180 = self._angle % 180.0
+        self._angle_mod_180 = angle_m_mod_180
+        self._is_zero_angle = fabs(angle_m_mod_180) <= ANGULAR_TOLERANCE
+        self._is_right_angle = (
+            fabs(angle_m_mod_180 - 90) <= ANGULAR_TOLERANCE
+            or fabs(angle_m_mod_180 + 90) <= ANGULAR_TOLERANCE
+        )
+        self._tan_m = tan(radians(self._angle))
+        self._direction_sign = -1.0 if (self._angle % 360.0) >= 180.0 else 1.0
+
+        self._invalidate_intercept_cache()
+
+    def _invalidate_intercept_cache(self):
+        """
+        Forget the last calculated intercept; must be called whenever the movement axis changes.
+        """
+        self._last_beam_key = None
+        self._last_intercept = None
+        self._last_dist_along_axis_to_intercept = None
+
     def calculate_interception(self, beam):
         """
         Calculate the interception point of the beam and component
@@ -40,64 +61,82 @@ class LinearMovementCalc:
 
         """
         assert beam is not None
+        beam_key = (beam.y, beam.z, beam.angle)
+        if beam_key != self._last_beam_key:
+            self._last_intercept = self._calculate_interception(beam)
+            self._last_dist_along_axis_to_intercept = None
+            self._last_beam_key = beam_key
+        return self._last_intercept
+
+    def _calculate_interception(self, beam):
+        """
+        Calculate the interception point of the beam and component without using the cache
+        Args:
+            beam (PositionAndAngle) : beam to intercept
+
+        Returns (Position): position of the interception
+
+        """
         y_m = self._current_position_at_zero.y
         z_m = self._current_position_at_zero.z
-        angle_m = self._angle
         y_b = beam.y
         z_b = beam.z
         angle_b = beam.angle
+        angle_b_mod_180 = angle_b % 180.0
 
-        if fabs(angle_b % 180.0 - angle_m % 180.0) <= ANGULAR_TOLERANCE:
+        if fabs(angle_b_mod_180 - self._angle_mod_180) <= ANGULAR_TOLERANCE:
             raise ValueError("No interception between beam and movement")
-        elif fabs(angle_b % 180.0) <= ANGULAR_TOLERANCE:
-            y, z = self._zero_angle(y_b, self._current_position_at_zero, self._angle)
-        elif fabs(angle_m % 180.0) <= ANGULAR_TOLERANCE:
-            y, z = self._zero_angle(y_m, beam, beam.angle)
-        elif (
-            fabs(angle_m % 180.0 - 90) <= ANGULAR_TOLERANCE
-            or fabs(angle_m % 180.0 + 90) <= ANGULAR_TOLERANCE
-        ):
-            y, z = self._right_angle(z_m, beam, beam.angle)
+        elif fabs(angle_b_mod_180) <= ANGULAR_TOLERANCE:
+            y, z = self._zero_angle(y_b, self._current_position_at_zero, self._angle, self._tan_m)
+        elif self._is_zero_angle:
+            y, z = self._zero_angle(y_m, beam, angle_b)
+        elif self._is_right_angle:
+            y, z = self._right_angle(z_m, beam, angle_b)
         elif (
-            fabs(angle_b % 180.0 - 90) <= ANGULAR_TOLERANCE
-            or fabs(angle_b % 180.0 + 90) <= ANGULAR_TOLERANCE
+            fabs(angle_b_mod_180 - 90) <= ANGULAR_TOLERANCE
+            or fabs(angle_b_mod_180 + 90) <= ANGULAR_TOLERANCE
         ):
-            y, z = self._right_angle(z_b, self._current_position_at_zero, self._angle)
+            y, z = self._right_angle(z_b, self._current_position_at_zero, self._angle, self._tan_m)
         else:
             tan_b = tan(radians(angle_b))
-            tan_m = tan(radians(angle_m))
+            tan_m = self._tan_m
             z = 1 / (tan_m - tan_b) * (y_b - y_m + z_m * tan_m - z_b * tan_b)
             y = tan_b * tan_m / (tan_b - tan_m) * (y_m / tan_m - y_b / tan_b + z_b - z_m)
 
         return Position(y, z)
 
-    def _zero_angle(self, y_zero, position, angle):
+    def _zero_angle(self, y_zero, position, angle, tan_angle=None):
         """
         Calculate when one of the angles is zero but not the other
         Args:
             y_zero: the y of the item with zero angle
             position: position of other ray
             angle: angle of other ray
+            tan_angle: tan of the angle of the other ray if already known; None to calculate it
 
         Returns: y and z of intercept
 
         """
+        if tan_angle is None:
+            tan_angle = tan(radians(angle))
         y = y_zero
-        z = position.z + (y_zero - position.y) / tan(radians(angle))
+        z = position.z + (y_zero - position.y) / tan_angle
         return y, z
 
-    def _right_angle(self, z_zero, position, angle):
+    def _right_angle(self, z_zero, position, angle, tan_angle=None):
         """
         Calculate when one of the angles is a right angle but not the other
         Args:
             z_zero: the z of the item with right angle
             position: position of other ray
             angle: angle of other ray
+            tan_angle: tan of the angle of the other ray if already known; None to calculate it
 
         Returns: y and z of intercept
         """
-
-        y = position.y + (z_zero - position.z) * tan(radians(angle))
+        if tan_angle is None:
+            tan_angle = tan(radians(angle))
+        y = position.y + (z_zero - position.z) * tan_angle
         z = z_zero
         return y, z
 
@@ -111,6 +150,8 @@ class LinearMovementCalc:
 
         """
         beam_intercept = self.calculate_interception(beam)
+        if self._last_dist_along_axis_to_intercept is not None:
+            return self._last_dist_along_axis_to_intercept
         y_diff = self._current_position_at_zero.y - beam_intercept.y
         z_diff = self._current_position_at_zero.z - beam_intercept.z
         dist_to_beam = sqrt(pow(y_diff, 2) + pow(z_diff, 2))
@@ -118,9 +159,9 @@ class LinearMovementCalc:
             direction = -1.0
         else:
             direction = 1.0
-        if (self._angle % 360.0) >= 180.0:
-            direction *= -1
+        direction *= self._direction_sign
         dist_along_axis_from_zero_to_beam_intercept = dist_to_beam * direction
+        self._last_dist_along_axis_to_intercept = dist_along_axis_from_zero_to_beam_intercept
         return dist_along_axis_from_zero_to_beam_intercept
 
     def position_in_mantid_coordinates(self, given_displacement=None):
@@ -200,3 +241,4 @@ class LinearMovementCalc:
             position_offset: The amount to change the zero position by.
         """
         self._current_position_at_zero = self._initial_position_at_zero + position_offset
+        self._invalidate_intercept_cache()
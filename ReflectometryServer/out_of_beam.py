@@ -2,6 +2,8 @@
 Module to define Out of beam position.
 """
 
+from bisect import bisect_right
+from math import isfinite
 from typing import List, Optional, Tuple
 
 from ReflectometryServer.geometry import Position
@@ -77,6 +79,12 @@ class OutOfBeamLookup:
             key=lambda position: (position.threshold is None, position.threshold),
             reverse=True,
         )
+        self._default_position = self._sorted_out_of_beam_positions[0]
+        # positions with a threshold in ascending threshold order so the position can be found with a binary search
+        self._positions_with_threshold = list(reversed(self._sorted_out_of_beam_positions[1:]))
+        self._thresholds = [position.threshold for position in self._positions_with_threshold]
+        self._last_intercept_height = None
+        self._last_position_for_intercept = self._default_position
 
     @staticmethod
     def _validate(positions):
@@ -110,14 +118,23 @@ class OutOfBeamLookup:
 
         Returns: The out-of-beam position
         """
-        default_pos = self._sorted_out_of_beam_positions[0]
-        pos_with_threshold_below_intercept = [
-            x for x in self._sorted_out_of_beam_positions[1:] if x.threshold <= beam_intercept.y
-        ]
-        if len(pos_with_threshold_below_intercept) > 0:
-            position_to_use = pos_with_threshold_below_intercept[0]
+        intercept_height = beam_intercept.y
+        if intercept_height == self._last_intercept_height:
+            return self._last_position_for_intercept
+
+        # index of the position with the highest threshold which is at or below the intercept; no threshold is reached
+        # by an intercept which is not a finite number
+        if isfinite(intercept_height):
+            index = bisect_right(self._thresholds, intercept_height) - 1
+        else:
+            index = -1
+        if index >= 0:
+            position_to_use = self._positions_with_threshold[index]
         else:
-            position_to_use = default_pos
+            position_to_use = self._default_position
+
+        self._last_intercept_height = intercept_height
+        self._last_position_for_intercept = position_to_use
         return position_to_use
 
     def out_of_beam_status(
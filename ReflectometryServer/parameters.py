@@ -2,8 +2,8 @@
 Parameters that the user would interact with
 """
 
-from concurrent.futures.thread import ThreadPoolExecutor
 from dataclasses import dataclass
+from math import isnan
 from typing import TYPE_CHECKING, Any, Callable, List, Optional, Union
 
 from pcaspy import Severity
@@ -30,6 +30,7 @@ from ReflectometryServer.beam_path_calc import (
     InitUpdate,
     PhysicalMoveUpdate,
 )
+from ReflectometryServer.custom_function_executor import CUSTOM_FUNCTION_EXECUTOR
 from ReflectometryServer.exceptions import ParameterNotInitializedException
 from ReflectometryServer.file_io import (
     param_bool_autosave,
@@ -43,18 +44,18 @@ from ReflectometryServer.pv_wrapper import (
     PVWrapper,
     ReadbackUpdate,
 )
+from ReflectometryServer.recomputation_detector import RECOMPUTATION_DETECTOR, RecomputationKind
 from ReflectometryServer.server_status_manager import STATUS_MANAGER, ProblemInfo
 
 DEFAULT_RBV_TO_SP_TOLERANCE = 0.002
 
-logger = logging.getLogger(__name__)
-
+# Default change in a readback value needed before a new readback update is published; 0 publishes any change
+DEFAULT_RBV_DEADBAND = 0.0
 
-# Thread pool for running custom user functions
-CUSTOM_FUNCTION_POOL = ThreadPoolExecutor(max_workers=1)
+logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class ParameterUpdateBase:
     """
     An update of a parameter used as a base for other events
@@ -67,28 +68,28 @@ class ParameterUpdateBase:
     alarm_status: [AlarmStatus]  # The alarm status of the parameter, represented as an integer
 
 
-@dataclass
+@dataclass(slots=True)
 class ParameterReadbackUpdate(ParameterUpdateBase):
     """
     An update of the parameter readback value
     """
 
 
-@dataclass
+@dataclass(slots=True)
 class ParameterInitUpdate(ParameterReadbackUpdate):
     """
     An update that is triggered when the parameter has received an initial value either from autosave or motor rbv.
     """
 
 
-@dataclass
+@dataclass(slots=True)
 class ParameterSetpointReadbackUpdate(ParameterReadbackUpdate):
     """
     An update of the parameter setpoint readback value
     """
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ParameterAtSetpointUpdate:
     """
     An update of the parameter at-setpoint state
@@ -97,7 +98,7 @@ class ParameterAtSetpointUpdate:
     value: bool  # The new state (boolean)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ParameterChangingUpdate:
     """
     An update of the parameter is-changing state
@@ -106,7 +107,35 @@ class ParameterChangingUpdate:
     value: bool  # The new state
 
 
-@dataclass
+# At-setpoint and changing updates only carry a boolean so one instance for each state is shared
+AT_SETPOINT_UPDATES = {state: ParameterAtSetpointUpdate(state) for state in (False, True)}
+CHANGING_UPDATES = {state: ParameterChangingUpdate(state) for state in (False, True)}
+
+
+def _readback_changed(last_value, new_value, deadband):
+    """
+    Args:
+        last_value: last published readback value
+        new_value: new readback value
+        deadband: numeric readbacks which differ by this amount or less are considered unchanged
+
+    Returns: True if the new readback value should be published; False otherwise
+    """
+    if _is_number(new_value) and _is_number(last_value):
+        if isnan(new_value) or isnan(last_value):
+            return isnan(new_value) != isnan(last_value)
+        return abs(new_value - last_value) > deadband
+    return new_value != last_value
+
+
+def _is_number(value):
+    """
+    Returns: True if the value is a number which is not a boolean; False otherwise
+    """
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+@dataclass(slots=True)
 class ParameterDisabledUpdate:
     """
     An update of the parameters is-disabled state
@@ -115,7 +144,7 @@ class ParameterDisabledUpdate:
     value: bool  # The new state
 
 
-@dataclass
+@dataclass(slots=True)
 class RequestMoveEvent:
     """
     Called after a move has been requested on a parameter
@@ -276,6 +305,8 @@ class BeamlineParameter(metaclass=abc.ABCMeta):
         custom_function: Optional[Callable[[Any, Any], str]] = None,
         characteristic_value="",
         sp_mirrors_rbv=False,
+        rbv_deadband=DEFAULT_RBV_DEADBAND,
+        custom_function_timeout: Optional[float] = None,
     ):
         """
         Initializer.
@@ -285,10 +316,14 @@ class BeamlineParameter(metaclass=abc.ABCMeta):
             autosave: True if the parameter should be autosaved on change and read on start; False otherwise
             rbv_to_sp_tolerance: tolerance between the sp and rbv over which a warning should be indicated
             custom_function: custom function to run on move
+            custom_function_timeout: time in seconds after which a running custom function is reported; None to use
+                the default of the custom function executor
             characteristic_value: PV which the user wants to group with this parameter; leave out for no value.
                 This should not include the instrument prefix, e.g. MOT:MTR0101
             sp_mirrors_rbv: if True the sp gets set to the readback value when this parameter is asked to perform a
                 move; False this doesn't happen
+            rbv_deadband: a new readback is only published if it differs from the last published readback by
+                more than this (or its alarm changes)
         """
         self._set_point = None
         self._set_point_rbv = None
@@ -309,11 +344,18 @@ class BeamlineParameter(metaclass=abc.ABCMeta):
             self.description = description
         self._autosave = autosave
         self._rbv_to_sp_tolerance = rbv_to_sp_tolerance
+        # change in the readback needed before a new readback is published
+        self.rbv_deadband = rbv_deadband
+        self._reset_published_state()
 
         self.define_current_value_as = None
         self._custom_function = custom_function
+        # time in seconds after which a running custom function is reported; None to use the executor's default
+        self.custom_function_timeout = custom_function_timeout
         self.characteristic_value = characteristic_value
         self.sp_mirrors_rbv = sp_mirrors_rbv
+        # change needed in the readback PV before it is posted to monitors; None to use the PV precision
+        self.monitor_deadband = None
 
     def __repr__(self):
         return "{} '{}': sp={}, sp_rbv={}, rbv={}, changed={}".format(
@@ -346,6 +388,7 @@ class BeamlineParameter(metaclass=abc.ABCMeta):
         Args:
             sp_init: The setpoint value to set
         """
+        self._reset_published_state()
         if self.read_only:
             self._set_point = self._rbv()
         else:
@@ -461,6 +504,16 @@ class BeamlineParameter(metaclass=abc.ABCMeta):
         """
         Move the component but don't call a callback indicating a move has been performed.
         """
+        original_set_point_rbv = self.move_to_sp_in_model()
+        self.run_move_side_effects(original_set_point_rbv)
+
+    def move_to_sp_in_model(self):
+        """
+        Move the component to the setpoint in the model only; the custom function is not run and the setpoint is not
+        autosaved until run_move_side_effects is called.
+
+        Returns: the setpoint readback before the move
+        """
         if self.sp_mirrors_rbv:
             self.sp_no_move = self._rbv()
         original_set_point_rbv = self._set_point_rbv
@@ -473,14 +526,44 @@ class BeamlineParameter(metaclass=abc.ABCMeta):
             self._set_point_rbv = original_set_point_rbv
             raise
 
+        self._sp_is_changed = False
+        self._on_update_sp_rbv()
+        return original_set_point_rbv
+
+    def run_move_side_effects(self, original_set_point_rbv):
+        """
+        Run the custom function and autosave the setpoint readback for a move made in the model.
+
+        Args:
+            original_set_point_rbv: the setpoint readback before the move
+        """
         if self._custom_function is not None:
-            CUSTOM_FUNCTION_POOL.submit(
-                self._run_custom_function, self._set_point_rbv, original_set_point_rbv
+            CUSTOM_FUNCTION_EXECUTOR.submit(
+                self.name,
+                self._run_custom_function,
+                self._set_point_rbv,
+                original_set_point_rbv,
+                timeout=self.custom_function_timeout,
             )
 
-        self._sp_is_changed = False
         if self._autosave:
             param_float_autosave.write_parameter(self._name, self._set_point_rbv)
+
+    def restore_sp(self, set_point, set_point_rbv, sp_changed):
+        """
+        Put back the setpoint and setpoint readback replaced by a move in the model which was then rejected, moving the
+        component back to the setpoint readback.
+
+        Args:
+            set_point: setpoint to put back
+            set_point_rbv: setpoint readback to put back
+            sp_changed: True if the setpoint to put back had not been moved to; False otherwise
+        """
+        self._set_point_rbv = set_point_rbv
+        if set_point_rbv is not None:
+            self._move_component()
+        self._set_point = set_point
+        self._sp_is_changed = sp_changed
         self._on_update_sp_rbv()
 
     def _run_custom_function(self, new_sp, original_sp):
@@ -521,15 +604,41 @@ class BeamlineParameter(metaclass=abc.ABCMeta):
 
     def _on_update_rbv(self, _):
         """
-        Trigger all rbv listeners
+        Trigger rbv listeners if the readback or its alarm has changed since it was last published and at setpoint
+        listeners if the at setpoint state has changed.
 
         Args:
             _: source of change which is not used
         """
         rbv = self._rbv()
+        if RECOMPUTATION_DETECTOR.enabled:
+            RECOMPUTATION_DETECTOR.record(RecomputationKind.PARAMETER_READBACK, self.name, rbv)
         self._update_alarms()
-        self.trigger_listeners(ParameterReadbackUpdate(rbv, self.alarm_severity, self.alarm_status))
-        self.trigger_listeners(ParameterAtSetpointUpdate(self.rbv_at_sp))
+        alarm = (self.alarm_severity, self.alarm_status)
+        if alarm != self._last_published_rbv_alarm or _readback_changed(
+            self._last_published_rbv, rbv, self.rbv_deadband
+        ):
+            self._last_published_rbv = rbv
+            self._last_published_rbv_alarm = alarm
+            self.trigger_listeners(ParameterReadbackUpdate(rbv, *alarm))
+        self._publish_at_setpoint()
+
+    def _publish_at_setpoint(self):
+        """
+        Trigger at setpoint listeners if the at setpoint state has changed since it was last published.
+        """
+        at_setpoint = bool(self.rbv_at_sp)
+        if at_setpoint != self._last_published_at_sp:
+            self._last_published_at_sp = at_setpoint
+            self.trigger_listeners(AT_SETPOINT_UPDATES[at_setpoint])
+
+    def _reset_published_state(self):
+        """
+        Forget the last published readback and at setpoint state so that the next update is always published.
+        """
+        self._last_published_rbv = None
+        self._last_published_rbv_alarm = None
+        self._last_published_at_sp = None
 
     def _update_alarms(self):
         """
@@ -560,7 +669,7 @@ class BeamlineParameter(metaclass=abc.ABCMeta):
         Args:
             _: The update event
         """
-        self.trigger_listeners(ParameterChangingUpdate(self.is_changing))
+        self.trigger_listeners(CHANGING_UPDATES[bool(self.is_changing)])
 
     def _on_update_sp_rbv(self):
         """
@@ -569,7 +678,7 @@ class BeamlineParameter(metaclass=abc.ABCMeta):
         self.trigger_listeners(
             ParameterSetpointReadbackUpdate(self._set_point_rbv, AlarmSeverity.No, AlarmStatus.No)
         )
-        self.trigger_listeners(ParameterAtSetpointUpdate(self.rbv_at_sp))
+        self._publish_at_setpoint()
 
     @property
     def name(self):
@@ -731,6 +840,8 @@ class AxisParameter(BeamlineParameter):
         custom_function: Optional[Callable[[Any, Any], str]] = None,
         characteristic_value="",
         sp_mirrors_rbv=False,
+        rbv_deadband: float = DEFAULT_RBV_DEADBAND,
+        custom_function_timeout: Optional[float] = None,
     ):
         """
         Initialiser.
@@ -743,10 +854,13 @@ class AxisParameter(BeamlineParameter):
             rbv_to_sp_tolerance: an error is reported if the difference between the read back value and setpoint
                 is larger than this value
             custom_function: custom function to run on move
+            custom_function_timeout: time in seconds after which a running custom function is reported; None to use
+                the default of the custom function executor
             characteristic_value: PV which the user wants to group with this parameter; leave out for no value.
                 This should not include the instrument prefix, e.g. MOT:MTR0101
             sp_mirrors_rbv: if True the sp gets set to the readback value when this parameter is asked to perform a
                 move; False this doesn't happen
+            rbv_deadband: change in readback needed before a new readback value is published
         """
         self.component = component
         self.axis = axis
@@ -758,8 +872,10 @@ class AxisParameter(BeamlineParameter):
             autosave,
             rbv_to_sp_tolerance=rbv_to_sp_tolerance,
             custom_function=custom_function,
+            custom_function_timeout=custom_function_timeout,
             characteristic_value=characteristic_value,
             sp_mirrors_rbv=sp_mirrors_rbv,
+            rbv_deadband=rbv_deadband,
         )
 
         if axis in [
@@ -937,6 +1053,7 @@ class InBeamParameter(BeamlineParameter):
         description: str = None,
         autosave: bool = False,
         custom_function: Optional[Callable[[bool, bool], str]] = None,
+        custom_function_timeout: Optional[float] = None,
     ):
         """
         Initializer.
@@ -946,11 +1063,18 @@ class InBeamParameter(BeamlineParameter):
             autosave: True if the parameter should be autosaved on change and read on start; False otherwise
             description: description
             custom_function: custom function to run on move
+            custom_function_timeout: time in seconds after which a running custom function is reported; None to use
+                the default of the custom function executor
         """
         if description is None:
             description = "{} component is in the beam".format(name)
         super(InBeamParameter, self).__init__(
-            name, description, autosave, rbv_to_sp_tolerance=0.001, custom_function=custom_function
+            name,
+            description,
+            autosave,
+            rbv_to_sp_tolerance=0.001,
+            custom_function=custom_function,
+            custom_function_timeout=custom_function_timeout,
         )
         self._component = component
 
@@ -967,6 +1091,13 @@ class InBeamParameter(BeamlineParameter):
 
         self.parameter_type = BeamlineParameterType.IN_OUT
 
+    @property
+    def component(self):
+        """
+        Returns (ReflectometryServer.components.Component): the component moved in and out of the beam
+        """
+        return self._component
+
     def _add_to_parameter_groups(self):
         super()._add_to_parameter_groups()
         self.group_names.append(BeamlineParameterGroup.TOGGLE)
@@ -1046,6 +1177,8 @@ class DirectParameter(BeamlineParameter):
         rbv_to_sp_tolerance: float = DEFAULT_RBV_TO_SP_TOLERANCE,
         custom_function: Optional[Callable[[Any, Any], str]] = None,
         engineering_correction: "EngineeringCorrection" = None,
+        rbv_deadband: float = DEFAULT_RBV_DEADBAND,
+        custom_function_timeout: Optional[float] = None,
     ):
         """
         Args:
@@ -1056,6 +1189,9 @@ class DirectParameter(BeamlineParameter):
             rbv_to_sp_tolerance: The max difference between setpoint and readback value for considering the
                 parameter to be "at readback value"
             custom_function: custom function to run on move
+            custom_function_timeout: time in seconds after which a running custom function is reported; None to use
+                the default of the custom function executor
+            rbv_deadband: change in readback needed before a new readback value is published
         """
         # This is to avoid circular imports when instantiating NoCorrection()
         from ReflectometryServer.engineering_corrections import NoCorrection
@@ -1070,6 +1206,8 @@ class DirectParameter(BeamlineParameter):
             autosave,
             rbv_to_sp_tolerance=rbv_to_sp_tolerance,
             custom_function=custom_function,
+            custom_function_timeout=custom_function_timeout,
+            rbv_deadband=rbv_deadband,
         )
         self._last_update = None
 
@@ -1184,6 +1322,8 @@ class SlitGapParameter(DirectParameter):
         autosave: bool = False,
         rbv_to_sp_tolerance: float = 0.002,
         custom_function: Optional[Callable[[Any, Any], str]] = None,
+        rbv_deadband: float = DEFAULT_RBV_DEADBAND,
+        custom_function_timeout: Optional[float] = None,
     ):
         """
         Args:
@@ -1194,6 +1334,9 @@ class SlitGapParameter(DirectParameter):
             rbv_to_sp_tolerance: The max difference between setpoint and readback value for considering the
                 parameter to be "at readback value"
             custom_function: custom function to run on move
+            custom_function_timeout: time in seconds after which a running custom function is reported; None to use
+                the default of the custom function executor
+            rbv_deadband: change in readback needed before a new readback value is published
         """
         super(SlitGapParameter, self).__init__(
             name,
@@ -1202,6 +1345,8 @@ class SlitGapParameter(DirectParameter):
             autosave,
             rbv_to_sp_tolerance=rbv_to_sp_tolerance,
             custom_function=custom_function,
+            custom_function_timeout=custom_function_timeout,
+            rbv_deadband=rbv_deadband,
         )
         self.engineering_unit = "mm"
 
@@ -1223,6 +1368,7 @@ class EnumParameter(BeamlineParameter):
         options: List[str],
         description: Optional[str] = None,
         custom_function: Optional[Callable[[Any, Any], str]] = None,
+        custom_function_timeout: Optional[float] = None,
     ):
         """
         Initializer.
@@ -1232,9 +1378,15 @@ class EnumParameter(BeamlineParameter):
             options: a list of string options allowed
             description: description of the parameter
             custom_function: custom function to run on move
+            custom_function_timeout: time in seconds after which a running custom function is reported; None to use
+                the default of the custom function executor
         """
         super(EnumParameter, self).__init__(
-            name, description=description, autosave=True, custom_function=custom_function
+            name,
+            description=description,
+            autosave=True,
+            custom_function=custom_function,
+            custom_function_timeout=custom_function_timeout,
         )
         self.parameter_type = BeamlineParameterType.ENUM
         self.options = options
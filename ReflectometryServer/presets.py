@@ -0,0 +1,222 @@
+"""
+Named presets of the beamline state which can be saved and recalled in a single operation. If the model inputs are the
+same as when a preset was saved its corrected motor targets are sent to the motors as saved, otherwise they are
+recalculated through the model.
+"""
+
+import hashlib
+import json
+import logging
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from pcaspy import Severity
+
+from ReflectometryServer.beamline import ActiveModeUpdate
+from ReflectometryServer.file_io import preset_autosave
+from ReflectometryServer.server_status_manager import STATUS_MANAGER, ProblemInfo
+
+if TYPE_CHECKING:
+    from ReflectometryServer.beamline import Beamline
+
+logger = logging.getLogger(__name__)
+
+# key under which all presets are stored in the preset autosave file
+PRESETS_KEY = "presets"
+
+# difference between a motor target and the target saved in a preset within which they are considered the same
+MOTOR_TARGET_TOLERANCE = 1e-6
+
+
+@dataclass
+class BeamlinePreset:
+    """
+    A named state of the beamline.
+    """
+
+    name: str  # name of the preset
+    set_points: Dict[str, Any]  # setpoint readback of each parameter keyed by parameter name
+    # corrected motor target of each driver keyed by name, sent to the motors on recall if the fingerprint matches
+    motor_targets: Dict[str, Optional[float]]
+    fingerprint: str  # fingerprint of the model inputs when the preset was saved
+
+
+def model_fingerprint(beamline: "Beamline") -> str:
+    """
+    A fingerprint of the inputs to the beamline model, other than the parameter setpoints, which affect the motor
+    targets. If two fingerprints match then the same setpoints will give the same motor targets.
+    Args:
+        beamline: beamline to fingerprint
+
+    Returns: the fingerprint
+    """
+    model_inputs = {
+        "mode": beamline.active_mode,
+        "constants": [[constant.name, constant.value] for constant in beamline.beamline_constants],
+        "corrections": [
+            [driver.name, driver.engineering_correction_description] for driver in beamline.drivers
+        ],
+    }
+    return hashlib.sha1(json.dumps(model_inputs, default=str).encode()).hexdigest()
+
+
+class PresetStore:
+    """
+    Store of beamline presets which is persisted to the preset autosave file.
+    """
+
+    def __init__(self, beamline: "Beamline"):
+        """
+        Initialise.
+        Args:
+            beamline: the beamline to save and recall the presets of
+        """
+        self._beamline = beamline
+        self._presets = self._read_presets()
+        self._model_fingerprint = None
+        self._preset_info = None
+        beamline.add_listener(ActiveModeUpdate, self._on_active_mode_update)
+
+    def _on_active_mode_update(self, _):
+        """
+        Forget the model fingerprint and the preset info made with it, because the mode and the mode selected
+        engineering corrections are inputs to the model. The constants and other corrections do not change once the
+        beamline has been created.
+        Args:
+            _: the update
+        """
+        self._model_fingerprint = None
+        self._preset_info = None
+
+    def _fingerprint(self) -> str:
+        """
+        Returns: the fingerprint of the current model inputs, which is only made again after the mode has changed
+        """
+        if self._model_fingerprint is None:
+            self._model_fingerprint = model_fingerprint(self._beamline)
+        return self._model_fingerprint
+
+    def _read_presets(self) -> Dict[str, BeamlinePreset]:
+        """
+        Returns: the presets read from the preset autosave file
+        """
+        presets_json = preset_autosave.read_parameter(PRESETS_KEY, None)
+        if presets_json is None:
+            return {}
+        try:
+            return {preset["name"]: BeamlinePreset(**preset) for preset in json.loads(presets_json)}
+        except (ValueError, TypeError, KeyError) as ex:
+            STATUS_MANAGER.update_error_log("Unable to read beamline presets: {}".format(ex), ex)
+            return {}
+
+    def _write_presets(self):
+        """
+        Write all the presets to the preset autosave file.
+        """
+        presets_json = json.dumps([asdict(preset) for preset in self._presets.values()])
+        preset_autosave.write_parameter(PRESETS_KEY, presets_json)
+
+    @property
+    def names(self) -> List[str]:
+        """
+        Returns: names of the presets in the order they were first saved
+        """
+        return list(self._presets.keys())
+
+    def preset_info(self) -> List[Dict[str, Any]]:
+        """
+        Returns: for each preset its name and whether it was saved with the same model inputs as the current model;
+            this is only made again after a preset has been saved or the mode has changed
+        """
+        if self._preset_info is None:
+            fingerprint = self._fingerprint()
+            self._preset_info = [
+                {"name": preset.name, "matches_model": preset.fingerprint == fingerprint}
+                for preset in self._presets.values()
+            ]
+        return self._preset_info
+
+    def save(self, name: str) -> BeamlinePreset:
+        """
+        Save the current setpoint readbacks of the parameters, and the motor targets they resolve to, as a preset. This
+        replaces any existing preset with the same name.
+        Args:
+            name: name of the preset
+
+        Returns: the saved preset
+        """
+        if name == "":
+            raise ValueError("Preset name must not be empty")
+        set_points = {
+            parameter.name: parameter.sp_rbv
+            for parameter in self._beamline.parameters.values()
+            if not parameter.read_only and parameter.sp_rbv is not None
+        }
+        motor_targets = {driver.name: driver.motor_target() for driver in self._beamline.drivers}
+        preset = BeamlinePreset(name, set_points, motor_targets, self._fingerprint())
+        self._presets[name] = preset
+        self._preset_info = None
+        self._write_presets()
+        logger.info("Saved beamline preset {}".format(name))
+        return preset
+
+    def recall(self, name: str):
+        """
+        Set all the parameters to the setpoints in a preset and move the beamline to them in a single move. The set
+        point beam path is always recalculated so the model is consistent with the motors. If the model inputs have not
+        changed since the preset was saved the motors are sent the saved motor targets, skipping the engineering
+        corrections, and any which differ from the model's are reported; otherwise the targets are recalculated.
+        Args:
+            name: name of the preset
+        """
+        try:
+            preset = self._presets[name]
+        except KeyError:
+            raise ValueError("No beamline preset named '{}'".format(name))
+
+        logger.info("Recalling beamline preset {}".format(name))
+        parameters = []
+        for param_name, set_point in preset.set_points.items():
+            parameter = self._beamline.parameters.get(param_name)
+            if parameter is None or parameter.read_only or parameter.is_locked:
+                STATUS_MANAGER.update_error_log(
+                    "Beamline preset {}: parameter {} is not in the beamline, is read only or is locked so "
+                    "was not set".format(name, param_name)
+                )
+                continue
+            parameter.sp_no_move = set_point
+            parameters.append(parameter)
+        if preset.fingerprint == self._fingerprint():
+            self._beamline.move_for_parameters(parameters, motor_targets=preset.motor_targets)
+            self._check_motor_targets(preset)
+        else:
+            logger.info(
+                "Beamline preset {} was saved with a different mode, corrections or constants; motor targets "
+                "were recalculated".format(name)
+            )
+            self._beamline.move_for_parameters(parameters)
+
+    def _check_motor_targets(self, preset: BeamlinePreset):
+        """
+        Report any motor targets of the model which differ from those saved in the preset and sent to the motors.
+        Args:
+            preset: preset which has been recalled
+        """
+        for driver in self._beamline.drivers:
+            saved_target = preset.motor_targets.get(driver.name)
+            target = driver.motor_target()
+            if saved_target is None or target is None:
+                continue
+            if abs(target - saved_target) > MOTOR_TARGET_TOLERANCE:
+                STATUS_MANAGER.update_error_log(
+                    "Beamline preset {}: motor target for {} is {} but was {} when saved".format(
+                        preset.name, driver.name, target, saved_target
+                    )
+                )
+                STATUS_MANAGER.update_active_problems(
+                    ProblemInfo(
+                        "Motor target differs from beamline preset",
+                        driver.name,
+                        Severity.MINOR_ALARM,
+                    )
+                )
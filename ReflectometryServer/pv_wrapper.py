@@ -6,15 +6,16 @@ import abc
 import logging
 import threading
 import time
-from collections import namedtuple
+from dataclasses import dataclass
 from functools import partial
-from typing import NoReturn
+from typing import Callable, NoReturn, Optional
 
 from genie_python.genie_advanced import motor_in_set_mode
 from pcaspy import Severity
 from server_common.channel_access import ChannelAccess, UnableToConnectToPVException
 from server_common.observable import observable
 
+from ReflectometryServer.ca_recording import CA_RECORDER
 from ReflectometryServer.ChannelAccess.constants import (
     MOTOR_MOVING_PV,
     MTR_MOVING,
@@ -22,7 +23,12 @@ from ReflectometryServer.ChannelAccess.constants import (
     MYPVPREFIX,
 )
 from ReflectometryServer.file_io import velocity_bool_autosave, velocity_float_autosave
+from ReflectometryServer.model_actor import MODEL_ACTOR, CommandPriority
+from ReflectometryServer.move_timeline import MOVE_TIMELINE
+from ReflectometryServer.recomputation_detector import RECOMPUTATION_DETECTOR
+from ReflectometryServer.server_metrics import SERVER_METRICS
 from ReflectometryServer.server_status_manager import STATUS_MANAGER, ProblemInfo
+from ReflectometryServer.tracing import TRACER
 
 # Time between monitor update processing to allow for multiple monitors to be collected together providing a single
 # update trigger
@@ -33,38 +39,80 @@ RETRY_INTERVAL = 5
 
 DEFAULT_SCALE_FACTOR = 100.0
 
+# Channel access used by wrappers which are not given one; None to use real channel access
+_default_ca = None
 
-# An update of the setpoint value of this motor axis.
-SetpointUpdate = namedtuple(
-    "SetpointUpdate",
-    [
-        "value",  # The new setpoint value of the axis (float)
-        "alarm_severity",  # The alarm severity of the axis, represented as an integer (see Channel Access doc)
-        "alarm_status",
-    ],
-)  # The alarm status of the axis, represented as an integer (see Channel Access doc)
-
-# An update of the readback value of this motor axis.
-ReadbackUpdate = namedtuple(
-    "ReadbackUpdate",
-    [
-        "value",  # The new readback value of the axis (float)
-        "alarm_severity",  # The alarm severity of the axis, represented as an integer (see Channel Access doc)
-        "alarm_status",
-    ],
-)  # The alarm status of the axis, represented as an integer (see Channel Access doc)
-
-# An update of the is-changing state of this motor axis.
-IsChangingUpdate = namedtuple(
-    "IsChangingUpdate",
-    [
-        "value",  # The new is-changing state of the axis (boolean)
-        "alarm_severity",  # The alarm severity of the axis, represented as an integer (see Channel Access doc)
-        "alarm_status",
-    ],
-)  # The alarm status of the axis, represented as an integer (see Channel Access doc)
+
+def set_default_channel_access(ca) -> None:
+    """
+    Set the channel access used by wrappers which are not given one, e.g. to simulate motors.
+    Args:
+        ca: object with the channel access interface; None to use real channel access
+    """
+    global _default_ca
+    _default_ca = ca
+
+
+def default_channel_access():
+    """
+    Returns: the channel access used by wrappers which are not given one
+    """
+    return ChannelAccess if _default_ca is None else _default_ca
+
+
+@dataclass(slots=True)
+class SetpointUpdate:
+    """
+    An update of the setpoint value of this motor axis.
+    """
+
+    value: float  # The new setpoint value of the axis
+    alarm_severity: int  # The alarm severity of the axis as an integer (see Channel Access doc)
+    alarm_status: int  # The alarm status of the axis as an integer (see Channel Access doc)
+
+
+@dataclass(slots=True)
+class ReadbackUpdate:
+    """
+    An update of the readback value of this motor axis.
+    """
+
+    value: float  # The new readback value of the axis
+    alarm_severity: int  # The alarm severity of the axis as an integer (see Channel Access doc)
+    alarm_status: int  # The alarm status of the axis as an integer (see Channel Access doc)
+
+
+@dataclass(slots=True)
+class IsChangingUpdate:
+    """
+    An update of the is-changing state of this motor axis.
+    """
+
+    value: bool  # The new is-changing state of the axis
+    alarm_severity: int  # The alarm severity of the axis as an integer (see Channel Access doc)
+    alarm_status: int  # The alarm status of the axis as an integer (see Channel Access doc)
 
 
+@dataclass(slots=True)
+class ReadbackBatchStartUpdate:
+    """
+    Event that is triggered, by the model actor, before a batch of monitor events is processed.
+    """
+
+    size: int  # number of events in the batch
+
+
+@dataclass(slots=True)
+class ReadbackBatchUpdate:
+    """
+    Event that is triggered, by the model actor, when a batch of monitor events has been processed.
+    """
+
+    size: int  # number of events in the batch
+    duration: float  # time in seconds taken to process the batch
+
+
+@observable(ReadbackBatchStartUpdate, ReadbackBatchUpdate)
 class ProcessMonitorEvents:
     """
     Collect updates produced and only apply the latest ones.
@@ -75,6 +123,8 @@ class ProcessMonitorEvents:
         self.triggers = {}
         self._process_triggers = threading.Event()
         self._process_triggers.clear()
+        # function called with the number of events and the time in seconds taken to process each batch; None for none
+        self.batch_timer: Optional[Callable[[int, float], None]] = None
 
     def add_trigger(self, trigger_fn, update, start_processing=True) -> None:
         """
@@ -85,6 +135,7 @@ class ProcessMonitorEvents:
             update: update to pass to that trigger
             start_processing: True to start the processing loop; False don't process until loop is started
         """
+        SERVER_METRICS.monitor_events.increment()
         with self.triggers_lock:
             self.triggers[(trigger_fn, update.__class__)] = (trigger_fn, update)
             if start_processing and not self._process_triggers.is_set():
@@ -108,6 +159,13 @@ class ProcessMonitorEvents:
                 logger.error("Exception occurred in process events: {}".format(e))
         self._set_motor_moving_pv(0)
 
+    def wait_for_processing(self) -> None:
+        """
+        Wait until all the triggers which have been added have been processed.
+        """
+        while self._process_triggers.is_set():
+            time.sleep(MIN_TIME_BETWEEN_MONITOR_UPDATES_FROM_MONITORS)
+
     def _set_motor_moving_pv(self, value) -> None:
         """
         Set/clear the motor is moving pv to indicate we are calculating the readback value
@@ -115,7 +173,7 @@ class ProcessMonitorEvents:
             value: value to set it to. 1 is moving, 0 not moving
         """
         try:
-            ChannelAccess.caput(MOTOR_MOVING_PV, value, safe_not_quick=False)
+            default_channel_access().caput(MOTOR_MOVING_PV, value, safe_not_quick=False)
         except Exception as e:
             STATUS_MANAGER.update_error_log("Failed to set motor moving pv: {}".format(e), e)
             STATUS_MANAGER.update_active_problems(
@@ -135,11 +193,38 @@ class ProcessMonitorEvents:
             if len(events_to_process) == 0:
                 self._process_triggers.clear()
 
-        for listener_trigger_fn, event in events_to_process.values():
-            try:
-                listener_trigger_fn(event)
-            except Exception as e:
-                logger.error("Exception occurred in processing an event: {}".format(e))
+        if len(events_to_process) > 0:
+            MODEL_ACTOR.call(
+                partial(self._trigger_events, events_to_process), CommandPriority.READBACK_BATCH
+            )
+
+    def _trigger_events(self, events_to_process) -> None:
+        """
+        Trigger the listeners for a batch of events.
+        Args:
+            events_to_process: dictionary of listener trigger functions and the events to trigger them with
+        """
+        start = time.perf_counter()
+        self.trigger_listeners(ReadbackBatchStartUpdate(len(events_to_process)))
+        try:
+            with RECOMPUTATION_DETECTOR.action("readback batch"):
+                for listener_trigger_fn, event in events_to_process.values():
+                    try:
+                        listener_trigger_fn(event)
+                    except Exception as e:
+                        logger.error("Exception occurred in processing an event: {}".format(e))
+            MOVE_TIMELINE.readbacks_processed(start)
+        finally:
+            # always ends the batch so that listeners waiting for its end are not left waiting
+            end = time.perf_counter()
+            self.trigger_listeners(ReadbackBatchUpdate(len(events_to_process), end - start))
+        TRACER.add_span(
+            "readback batch", "readback", start, end, {"events": len(events_to_process)}
+        )
+        SERVER_METRICS.record_batch(len(events_to_process), end - start)
+        batch_timer = self.batch_timer
+        if batch_timer is not None:
+            batch_timer(len(events_to_process), end - start)
 
 
 # Process triggers that derive from PV Monitors
@@ -162,7 +247,7 @@ class PVWrapper(metaclass=abc.ABCMeta):
             min_velocity_scale_factor: The factor by which to scale down vmax to use as minimum velocity.
         """
         if ca is None:
-            self._ca = ChannelAccess
+            self._ca = default_channel_access()
         else:
             self._ca = ca
         self._name = base_pv
@@ -260,7 +345,7 @@ class PVWrapper(metaclass=abc.ABCMeta):
         """
         while True:
             if self._ca.pv_exists(pv):
-                self._ca.add_monitor(pv, call_back_function)
+                self._ca.add_monitor(pv, CA_RECORDER.wrap_monitor(pv, call_back_function))
                 logger.debug("Monitoring {} for changes.".format(pv))
                 break
             else:
@@ -295,7 +380,8 @@ class PVWrapper(metaclass=abc.ABCMeta):
             value: The new value
             wait: wait for call back
         """
-        self._ca.caput(pv, value, wait=wait, safe_not_quick=False)
+        with TRACER.span("caput", "ca", {"pv": pv, "value": value}):
+            self._ca.caput(pv, value, wait=wait, safe_not_quick=False)
 
     def _write_pv_with_retry(self, pv, value, retry_count=5) -> None:
         """
@@ -307,7 +393,8 @@ class PVWrapper(metaclass=abc.ABCMeta):
             value: value to write
             retry_count: number of retries
         """
-        self._ca.caput_retry_on_fail(pv, value, retry_count=retry_count, safe_not_quick=False)
+        with TRACER.span("caput", "ca", {"pv": pv, "value": value}):
+            self._ca.caput_retry_on_fail(pv, value, retry_count=retry_count, safe_not_quick=False)
 
     @property
     def name(self):
@@ -573,6 +660,7 @@ class PVWrapper(metaclass=abc.ABCMeta):
             self.restore_pre_move_velocity()
         self._moving_state_cache = round(new_value)
 
+        MOVE_TIMELINE.motor_changing(self.name, self.is_moving)
         changing_update = IsChangingUpdate(self.is_moving, alarm_severity, alarm_status)
         PROCESS_MONITOR_EVENTS.add_trigger(self.trigger_listeners, changing_update)
 
@@ -870,6 +958,7 @@ class JawsAxisPVWrapper(PVWrapper, metaclass=abc.ABCMeta):
             alarm_status (server_common.channel_access.AlarmCondition): the alarm status
         """
         self._moving_state_cache = round(new_value)
+        MOVE_TIMELINE.motor_changing(self.name, self.is_moving)
         changing_update = IsChangingUpdate(self.is_moving, alarm_severity, alarm_status)
         PROCESS_MONITOR_EVENTS.add_trigger(self.trigger_listeners, changing_update)
 
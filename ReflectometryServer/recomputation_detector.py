@@ -0,0 +1,301 @@
+"""
+Diagnostic for redundant recomputation: counts how many times a single originating action, i.e. a write to the server,
+a coalesced move or a batch of motor readbacks, recalculates the same component's beam path, the same engineering
+correction or the same parameter readback, and how many of those recalculations repeat one already made in the action
+with the same inputs.
+
+Run as a script to print the worst offenders for moves of a synthetic beamline:
+    python -m ReflectometryServer.recomputation_detector [--components N] [--top N]
+"""
+
+import argparse
+import logging
+import threading
+from collections import defaultdict, namedtuple
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Default number of offenders in a report
+DEFAULT_REPORT_LENGTH = 20
+
+Recomputation = namedtuple(
+    "Recomputation",
+    [
+        "action",  # originating action, e.g. write PARAM:THETA:SP
+        "kind",  # kind of computation, e.g. beam path
+        "name",  # name of the object which computed
+        "count",  # number of computations in a single action
+        "repeats",  # number of those computations with inputs already computed in the action
+    ],
+)
+
+
+class RecomputationKind:
+    """
+    Kinds of computation which are counted.
+    """
+
+    BEAM_PATH = "beam path"  # a component's beam path recalculated for its incoming beam
+    CORRECTION_TO_AXIS = (
+        "correction to axis"  # an engineering correction of a setpoint sent to a motor
+    )
+    CORRECTION_FROM_AXIS = "correction from axis"  # an engineering correction of a motor readback
+    PARAMETER_READBACK = "parameter readback"  # a parameter's readback recalculated
+
+
+def _input_key(inputs: Any) -> Any:
+    """
+    Args:
+        inputs: inputs of a computation
+
+    Returns: the inputs if they are hashable; otherwise their representation
+    """
+    try:
+        hash(inputs)
+        return inputs
+    except TypeError:
+        return repr(inputs)
+
+
+class ActionRecomputations:
+    """
+    The computations made in one originating action.
+    """
+
+    def __init__(self, action: str):
+        """
+        Initialise.
+        Args:
+            action: name of the action
+        """
+        self.action = action
+        self.counts: Dict[Tuple[str, str], int] = defaultdict(int)
+        self.repeats: Dict[Tuple[str, str], int] = defaultdict(int)
+        self._inputs_seen: Dict[Tuple[str, str], set] = defaultdict(set)
+
+    def record(self, kind: str, name: str, inputs: Any):
+        """
+        Record a computation.
+        Args:
+            kind: kind of computation
+            name: name of the object which computed
+            inputs: inputs of the computation
+        """
+        key = (kind, name)
+        self.counts[key] += 1
+        input_key = _input_key(inputs)
+        if input_key in self._inputs_seen[key]:
+            self.repeats[key] += 1
+        else:
+            self._inputs_seen[key].add(input_key)
+
+    def recomputations(self) -> List[Recomputation]:
+        """
+        Returns: the computations of each object in the action
+        """
+        return [
+            Recomputation(self.action, kind, name, count, self.repeats.get((kind, name), 0))
+            for (kind, name), count in self.counts.items()
+        ]
+
+    def max_count(self, kind: Optional[str] = None) -> int:
+        """
+        Args:
+            kind: kind of computation; None for all kinds
+
+        Returns: the most times a single object computed in the action
+        """
+        return max(
+            (count for (count_kind, _), count in self.counts.items() if kind in (None, count_kind)),
+            default=0,
+        )
+
+
+class RecomputationDetector:
+    """
+    Counts the computations of each object per originating action while it is enabled. Computations which happen
+    outside an action, e.g. while the beamline is being created, are not counted. An action which starts inside
+    another, e.g. a write made by a custom function, is counted as part of the outer action.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._worst: Dict[Tuple[str, str, str], Recomputation] = {}
+        self.last_action: Optional[ActionRecomputations] = None
+
+    @contextmanager
+    def action(self, name: str):
+        """
+        Context in which computations are counted as part of an originating action.
+        Args:
+            name: name of the action
+        """
+        if not self.enabled or getattr(self._local, "action", None) is not None:
+            yield
+            return
+        action = ActionRecomputations(name)
+        self._local.action = action
+        try:
+            yield
+        finally:
+            self._local.action = None
+            self._finish(action)
+
+    def in_action(self, name: str, function: Callable[[], Any]) -> Callable[[], Any]:
+        """
+        Args:
+            name: name of the action
+            function: function which makes the action
+
+        Returns: function which calls the function as an originating action; the function itself if not enabled
+        """
+        if not self.enabled:
+            return function
+
+        def _in_action():
+            with self.action(name):
+                return function()
+
+        return _in_action
+
+    def record(self, kind: str, name: str, inputs: Any):
+        """
+        Record a computation in the current action, if any. Only call while enabled.
+        Args:
+            kind: kind of computation
+            name: name of the object which computed
+            inputs: inputs of the computation; for a computation whose inputs are awkward to capture, the result
+        """
+        action = getattr(self._local, "action", None)
+        if action is not None:
+            action.record(kind, name, inputs)
+
+    def _finish(self, action: ActionRecomputations):
+        """
+        Keep the worst count of each object for an action of the same name.
+        Args:
+            action: the action which has finished
+        """
+        with self._lock:
+            self.last_action = action
+            for recomputation in action.recomputations():
+                key = (recomputation.action, recomputation.kind, recomputation.name)
+                worst = self._worst.get(key)
+                if worst is None or (recomputation.repeats, recomputation.count) > (
+                    worst.repeats,
+                    worst.count,
+                ):
+                    self._worst[key] = recomputation
+
+    def reset(self):
+        """
+        Clear the counts.
+        """
+        with self._lock:
+            self._worst = {}
+            self.last_action = None
+
+    def worst_offenders(
+        self, top_n: Optional[int] = DEFAULT_REPORT_LENGTH, min_count: int = 2
+    ) -> List[Recomputation]:
+        """
+        Args:
+            top_n: number of offenders; None for all
+            min_count: least number of computations in an action for an object to be an offender
+
+        Returns: the objects which computed most in an action, most repeated computations first
+        """
+        with self._lock:
+            offenders = [
+                recomputation
+                for recomputation in self._worst.values()
+                if recomputation.count >= min_count
+            ]
+        offenders.sort(
+            key=lambda recomputation: (recomputation.repeats, recomputation.count), reverse=True
+        )
+        return offenders[:top_n]
+
+    def report(self, top_n: Optional[int] = DEFAULT_REPORT_LENGTH) -> str:
+        """
+        Args:
+            top_n: number of offenders; None for all
+
+        Returns: a table of the worst offenders; those which repeat a computation with the same inputs are flagged
+        """
+        lines = ["{:>6}{:>8}  {:<22}{:<30}{}".format("count", "repeats", "kind", "name", "action")]
+        for offender in self.worst_offenders(top_n):
+            lines.append(
+                "{:>6}{:>8}{} {:<22}{:<30}{}".format(
+                    offender.count,
+                    offender.repeats,
+                    "!" if offender.repeats > 0 else " ",
+                    offender.kind,
+                    offender.name,
+                    offender.action,
+                )
+            )
+        return "\n".join(lines)
+
+    def dump(self, path: str):
+        """
+        Write the report of all the offenders to a file.
+        Args:
+            path: path of the file
+        """
+        with open(path, "w") as report_file:
+            report_file.write(self.report(None))
+            report_file.write("\n")
+        logger.info("Recomputation report written to {}".format(path))
+
+
+# Detector of redundant recomputation in the server
+RECOMPUTATION_DETECTOR = RecomputationDetector()
+
+
+def _report_for_synthetic_beamline(components: int, top_n: int) -> str:
+    """
+    Move each parameter of a synthetic beamline, letting the motors finish each move, and report the worst offenders.
+    Args:
+        components: number of components in the beamline
+        top_n: number of offenders to report
+
+    Returns: the report
+    """
+    from ReflectometryServer.pv_wrapper import PROCESS_MONITOR_EVENTS
+
+    # the server records to the detector of the imported module, not to the one of this module run as a script
+    from ReflectometryServer.recomputation_detector import RECOMPUTATION_DETECTOR as detector
+    from ReflectometryServer.synthetic_beamline import (
+        create_headless_beamline,
+        move_simulated_motors,
+    )
+
+    beamline, _, simulated_motors = create_headless_beamline(components=components)
+    detector.enabled = True
+    try:
+        for parameter in beamline.parameters.values():
+            if isinstance(parameter.sp, float) and not parameter.read_only:
+                with detector.action("move {}".format(parameter.name)):
+                    parameter.sp = parameter.sp + 0.1
+                move_simulated_motors(simulated_motors, 10)
+                PROCESS_MONITOR_EVENTS.wait_for_processing()
+    finally:
+        detector.enabled = False
+    return detector.report(top_n)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Report redundant recomputation for moves of a synthetic beamline"
+    )
+    parser.add_argument("--components", type=int, default=20, help="components in the beamline")
+    parser.add_argument(
+        "--top", type=int, default=DEFAULT_REPORT_LENGTH, help="offenders to report"
+    )
+    arguments = parser.parse_args()
+    print(_report_for_synthetic_beamline(arguments.components, arguments.top))
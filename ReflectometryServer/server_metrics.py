@@ -0,0 +1,233 @@
+"""
+Runtime metrics of how loaded the server is: counters of channel access reads and writes, monitor events from the
+motors, posts of PV values, autosave writes and status updates, and histograms of the size and processing time of each
+batch of monitor events. Recording a metric is a lock and an addition so the metrics are always on; they are published
+periodically as rates over the last interval.
+"""
+
+import bisect
+import logging
+import threading
+import time
+from collections import namedtuple
+from typing import Dict, Optional, Sequence
+
+from server_common.observable import observable
+
+logger = logging.getLogger(__name__)
+
+# Interval in seconds between publishing the metrics
+METRICS_UPDATE_INTERVAL = 1.0
+
+# Upper bounds of the buckets of the histogram of number of monitor events in a batch
+BATCH_SIZE_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+# Upper bounds in ms of the buckets of the histogram of time taken to process a batch of monitor events
+BATCH_TIME_BUCKETS = (0.1, 0.2, 0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+MetricsUpdate = namedtuple(
+    "MetricsUpdate",
+    [
+        "rates",  # dictionary of the rate per second of each counter over the last interval
+        "totals",  # dictionary of the total of each counter since the server started
+        "batch_size",  # mean number of monitor events in a batch over the last interval; 0 if there were none
+        "batch_time",  # mean time in ms to process a batch over the last interval; 0 if there were none
+        "histograms",  # dictionary of the statistics of each histogram since the server started
+    ],
+)
+
+
+class MetricCounter:
+    """
+    Count of events, safe to increment from any thread.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.count = 0
+
+    def increment(self, amount: int = 1):
+        """
+        Count events.
+        Args:
+            amount: number of events
+        """
+        with self._lock:
+            self.count += amount
+
+
+class MetricHistogram:
+    """
+    Histogram of values with fixed buckets, safe to record from any thread.
+    """
+
+    def __init__(self, buckets: Sequence[float]):
+        """
+        Initialise.
+        Args:
+            buckets: upper bounds of the buckets in ascending order; larger values go in a final overflow bucket
+        """
+        self._lock = threading.Lock()
+        self._buckets = tuple(buckets)
+        self._counts = [0] * (len(self._buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+
+    def record(self, value: float):
+        """
+        Record a value.
+        Args:
+            value: the value
+        """
+        with self._lock:
+            self._counts[bisect.bisect_left(self._buckets, value)] += 1
+            self.count += 1
+            self.total += value
+            self.maximum = max(self.maximum, value)
+
+    def as_dict(self) -> Dict[str, object]:
+        """
+        Returns: the statistics and the count in each bucket, keyed by the bucket's upper bound
+        """
+        with self._lock:
+            buckets = {
+                "<={:g}".format(bound): count for bound, count in zip(self._buckets, self._counts)
+            }
+            buckets[">{:g}".format(self._buckets[-1])] = self._counts[-1]
+            return {
+                "count": self.count,
+                "mean": self.total / self.count if self.count > 0 else 0.0,
+                "max": self.maximum,
+                "buckets": buckets,
+            }
+
+
+@observable(MetricsUpdate)
+class ServerMetrics:
+    """
+    The metrics of the server, published periodically once started.
+    """
+
+    def __init__(self):
+        self.ca_reads = MetricCounter()
+        self.ca_writes = MetricCounter()
+        self.monitor_events = MetricCounter()
+        self.pv_posts = MetricCounter()
+        self.autosave_writes = MetricCounter()
+        self.status_updates = MetricCounter()
+        self.batch_size = MetricHistogram(BATCH_SIZE_BUCKETS)
+        self.batch_time = MetricHistogram(BATCH_TIME_BUCKETS)
+
+        self._sample_lock = threading.Lock()
+        self._last_sample_time = time.perf_counter()
+        self._last_totals = self._totals()
+        self._last_batches = (0, 0.0, 0.0)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _counters(self) -> Dict[str, MetricCounter]:
+        """
+        Returns: the counters keyed by name
+        """
+        return {
+            "ca_reads": self.ca_reads,
+            "ca_writes": self.ca_writes,
+            "monitor_events": self.monitor_events,
+            "pv_posts": self.pv_posts,
+            "autosave_writes": self.autosave_writes,
+            "status_updates": self.status_updates,
+        }
+
+    def _totals(self) -> Dict[str, int]:
+        """
+        Returns: the total of each counter keyed by name
+        """
+        return {name: counter.count for name, counter in self._counters().items()}
+
+    def record_batch(self, size: int, duration: float):
+        """
+        Record a batch of monitor events having been processed.
+        Args:
+            size: number of events in the batch
+            duration: time in seconds taken to process the batch
+        """
+        self.batch_size.record(size)
+        self.batch_time.record(duration * 1000)
+
+    def sample(self) -> MetricsUpdate:
+        """
+        Take the metrics over the interval since the last sample.
+
+        Returns: the metrics
+        """
+        with self._sample_lock:
+            now = time.perf_counter()
+            interval = max(now - self._last_sample_time, 1e-9)
+            totals = self._totals()
+            rates = {
+                name: (total - self._last_totals[name]) / interval for name, total in totals.items()
+            }
+            batches = (self.batch_size.count, self.batch_size.total, self.batch_time.total)
+            new_batches = batches[0] - self._last_batches[0]
+            if new_batches > 0:
+                batch_size = (batches[1] - self._last_batches[1]) / new_batches
+                batch_time = (batches[2] - self._last_batches[2]) / new_batches
+            else:
+                batch_size = batch_time = 0.0
+            self._last_sample_time = now
+            self._last_totals = totals
+            self._last_batches = batches
+
+        histograms = {
+            "batch_size": self.batch_size.as_dict(),
+            "batch_time_ms": self.batch_time.as_dict(),
+        }
+        return MetricsUpdate(rates, totals, batch_size, batch_time, histograms)
+
+    def publish(self):
+        """
+        Take the metrics over the interval since the last sample and tell the listeners.
+        """
+        self.trigger_listeners(self.sample())
+
+    def start(self, interval: float = METRICS_UPDATE_INTERVAL):
+        """
+        Start publishing the metrics periodically on a thread of its own.
+        Args:
+            interval: time in seconds between publishing
+        """
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, args=(interval,), name="server_metrics", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stop publishing the metrics.
+        """
+        thread = self._thread
+        if thread is None:
+            return
+        self._stop.set()
+        thread.join()
+        self._thread = None
+
+    def _run(self, interval: float):
+        """
+        Publish the metrics every interval until stopped.
+        Args:
+            interval: time in seconds between publishing
+        """
+        while not self._stop.wait(interval):
+            try:
+                self.publish()
+            except Exception:
+                logger.exception("Exception when publishing server metrics")
+
+
+# Runtime metrics of the server
+SERVER_METRICS = ServerMetrics()
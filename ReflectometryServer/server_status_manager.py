@@ -6,6 +6,8 @@ from typing import Optional
 from pcaspy import Severity
 from server_common.observable import observable
 
+from ReflectometryServer.server_metrics import SERVER_METRICS
+
 StatusDescription = namedtuple(
     "StatusDescription",
     [
@@ -168,9 +170,11 @@ class _ServerStatusManager:
         self._trigger_status_update()
 
     def _trigger_status_update(self):
-        self.trigger_listeners(StatusUpdate(self._status, self._message))
+        SERVER_METRICS.status_updates.increment()
+        self.trigger_listeners(StatusUpdate(self.status, self.message))
 
     def _trigger_active_problems_update(self):
+        SERVER_METRICS.status_updates.increment()
         self.trigger_listeners(
             ActiveProblemsUpdate(
                 self.active_errors, self.active_warnings, self.active_other_problems
@@ -178,6 +182,7 @@ class _ServerStatusManager:
         )
 
     def _trigger_error_log_update(self):
+        SERVER_METRICS.status_updates.increment()
         self.trigger_listeners(ErrorLogUpdate(self._error_log_as_string()))
 
     def update_active_problems(self, problem):
@@ -203,6 +208,27 @@ class _ServerStatusManager:
         self.status = self._get_highest_error_level()
         self._trigger_active_problems_update()
 
+    def clear_active_problem(self, problem):
+        """
+        Removes the source of a problem from the active problems known to the status manager. The problem is removed
+        once it has no sources left.
+
+        Params:
+            problem(ProblemInfo): The problem to clear
+        """
+        dict_to_clear = self._get_problems_by_severity(problem.severity)
+        sources = dict_to_clear.get(problem.description)
+        if sources is None or problem.source not in sources:
+            return
+
+        sources.remove(problem.source)
+        if not sources:
+            del dict_to_clear[problem.description]
+
+        self.message = self._construct_status_message()
+        self.status = self._get_highest_error_level()
+        self._trigger_active_problems_update()
+
     def update_error_log(self, message: str, exception: Optional[Exception] = None):
         """
         Logs an error and appends it to the list of current errors for display to the user.
@@ -0,0 +1,596 @@
+"""
+In process simulation of motor records and jaws sets which can be used by the PV wrappers instead of channel access,
+so that the server can be run without any motor IOCs. Motors move on a virtual clock which can run faster than real
+time.
+"""
+
+import logging
+import math
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from server_common.channel_access import AlarmSeverity, AlarmStatus
+
+logger = logging.getLogger(__name__)
+
+# Real time in seconds between updates of the simulated motors
+TICK_INTERVAL = 0.01
+
+# Fields of a simulated motor record and their initial values
+MOTOR_FIELD_DEFAULTS = {
+    "VAL": 0.0,  # setpoint
+    "RBV": 0.0,  # readback
+    "VELO": 1.0,  # velocity
+    "VMAX": 1.0,  # maximum velocity
+    "VBAS": 0.0,  # base velocity, i.e. the velocity at the start and end of a move
+    "ACCL": 0.2,  # time in seconds to accelerate from the base velocity to the velocity
+    "BDST": 0.0,  # backlash distance; the final approach is made over this distance in its direction
+    "BVEL": 1.0,  # backlash velocity
+    "DMOV": 1,  # done moving; 1 when stopped
+    "DIR": "Pos",  # user direction
+    "HLM": 10000.0,  # high soft limit; wide because the server refuses moves outside the limits
+    "LLM": -10000.0,  # low soft limit; the soft limits are not applied when they are equal
+    "LVIO": 0,  # 1 if the last move was refused because it violated the soft limits
+    "MRES": 0.001,  # motor resolution; the readback is a whole number of steps
+}
+
+# Directions of the blades in a jaws set; the first blade in each pair is on the positive side
+JAWS_BLADES = {"V": ("JN", "JS"), "H": ("JE", "JW")}
+
+_JAWS_PV = re.compile(r"^(?P<base>.+):(?P<axis>[VH])(?P<sort>GAP|CENT)(?P<suffix>:SP|:DMOV)?$")
+_JAWS_BLADE_PV = re.compile(r"^(?P<base>.+):(?P<blade>JN|JS|JE|JW):MTR(\.(?P<field>[A-Z]+))?$")
+_MOTOR_PV = re.compile(r"^(?P<base>[^.]+)(\.(?P<field>[A-Z]+))?$")
+
+
+class VirtualClock:
+    """
+    Clock for the simulation which runs at a multiple of real time and can also be advanced by hand.
+    """
+
+    def __init__(self, speed: float = 1.0):
+        """
+        Initialise.
+        Args:
+            speed: virtual seconds per real second; 0 for a clock which only moves when advanced
+        """
+        self.speed = speed
+        self._real_start = time.monotonic()
+        self._offset = 0.0
+
+    def time(self) -> float:
+        """
+        Returns: the current virtual time in seconds
+        """
+        return (time.monotonic() - self._real_start) * self.speed + self._offset
+
+    def advance(self, seconds: float):
+        """
+        Move the clock forward.
+        Args:
+            seconds: virtual time in seconds to move forward by
+        """
+        self._offset += seconds
+
+
+class _MoveSegment:
+    """
+    Part of a move at a single peak velocity, accelerating from and decelerating to the base velocity.
+    """
+
+    def __init__(
+        self,
+        start: float,
+        end: float,
+        velocity: float,
+        base_velocity: float,
+        acceleration_time: float,
+        start_time: float,
+    ):
+        """
+        Initialise.
+        Args:
+            start: start position
+            end: end position
+            velocity: peak velocity
+            base_velocity: velocity at the start and end of the segment
+            acceleration_time: time to accelerate from the base velocity to the peak velocity
+            start_time: virtual time the segment starts
+        """
+        self.start = start
+        self.end = end
+        self.start_time = start_time
+        self._direction = math.copysign(1, end - start)
+        distance = abs(end - start)
+        velocity = max(velocity, base_velocity, 1e-9)
+
+        if acceleration_time <= 0 or velocity == base_velocity:
+            self._acceleration = 0.0
+            self._peak_velocity = velocity
+            self._base_velocity = velocity
+            self._acceleration_duration = 0.0
+        else:
+            self._acceleration = (velocity - base_velocity) / acceleration_time
+            self._base_velocity = base_velocity
+            acceleration_distance = (base_velocity + velocity) / 2 * acceleration_time
+            if 2 * acceleration_distance <= distance:
+                self._peak_velocity = velocity
+                self._acceleration_duration = acceleration_time
+            else:
+                self._peak_velocity = math.sqrt(base_velocity**2 + self._acceleration * distance)
+                self._acceleration_duration = (
+                    self._peak_velocity - base_velocity
+                ) / self._acceleration
+
+        self._acceleration_distance = (
+            self._base_velocity * self._acceleration_duration
+            + self._acceleration * self._acceleration_duration**2 / 2
+        )
+        self._constant_duration = (
+            max(distance - 2 * self._acceleration_distance, 0.0) / self._peak_velocity
+        )
+        self._distance = distance
+        self.end_time = start_time + 2 * self._acceleration_duration + self._constant_duration
+
+    def position(self, now: float) -> float:
+        """
+        Args:
+            now: virtual time
+
+        Returns: position at the given time
+        """
+        elapsed = now - self.start_time
+        if elapsed <= 0:
+            return self.start
+        if now >= self.end_time:
+            return self.end
+        if elapsed < self._acceleration_duration:
+            travelled = self._base_velocity * elapsed + self._acceleration * elapsed**2 / 2
+        elif elapsed < self._acceleration_duration + self._constant_duration:
+            travelled = self._acceleration_distance + self._peak_velocity * (
+                elapsed - self._acceleration_duration
+            )
+        else:
+            decelerating = elapsed - self._acceleration_duration - self._constant_duration
+            travelled = (
+                self._acceleration_distance
+                + self._peak_velocity * self._constant_duration
+                + self._peak_velocity * decelerating
+                - self._acceleration * decelerating**2 / 2
+            )
+        return self.start + self._direction * min(travelled, self._distance)
+
+
+class SimulatedMotor:
+    """
+    Simulation of a motor record with velocity, acceleration, backlash, soft limits and done moving.
+    """
+
+    def __init__(self, name: str, **fields):
+        """
+        Initialise.
+        Args:
+            name: name of the motor record PV
+            **fields: initial values of fields which differ from the defaults
+        """
+        self.name = name
+        self.fields: Dict[str, Any] = dict(MOTOR_FIELD_DEFAULTS)
+        self.fields.update(fields)
+        self.fields["RBV"] = self.fields["VAL"]
+        self._position = float(self.fields["VAL"])
+        self._segment: Optional[_MoveSegment] = None
+        self._next_targets: List[Tuple[float, float]] = []
+
+    @property
+    def is_moving(self) -> bool:
+        """
+        Returns: True if the motor is moving
+        """
+        return self.fields["DMOV"] == 0
+
+    def put(self, field: str, value: Any, now: float):
+        """
+        Write to a field of the motor.
+        Args:
+            field: field name, e.g. VAL
+            value: value to write
+            now: current virtual time
+        """
+        if field == "VAL":
+            self._move_to(float(value), now)
+        elif field == "VELO":
+            maximum = self.fields["VMAX"]
+            self.fields["VELO"] = min(value, maximum) if maximum > 0 else value
+        elif field in self.fields:
+            self.fields[field] = value
+        else:
+            raise ValueError("Simulated motor has no field {}".format(field))
+
+    def _limits_violated(self, target: float) -> bool:
+        """
+        Args:
+            target: target position
+
+        Returns: True if the soft limits are set and the target is outside them
+        """
+        high, low = self.fields["HLM"], self.fields["LLM"]
+        return high != low and not low <= target <= high
+
+    def _move_to(self, target: float, now: float):
+        """
+        Start a move to a target, with a final backlash move if needed.
+        Args:
+            target: position to move to
+            now: current virtual time
+        """
+        if self._limits_violated(target):
+            self.fields["LVIO"] = 1
+            logger.info(
+                "Simulated motor {} refused move to {}: soft limits".format(self.name, target)
+            )
+            return
+        self.update(now)
+        self.fields["LVIO"] = 0
+        self.fields["VAL"] = target
+
+        backlash = self.fields["BDST"]
+        distance = target - self._position
+        if backlash == 0:
+            targets = [(target, self.fields["VELO"])]
+        elif distance * backlash > 0 and abs(distance) <= abs(backlash):
+            targets = [(target, self.fields["BVEL"])]
+        else:
+            targets = [(target - backlash, self.fields["VELO"]), (target, self.fields["BVEL"])]
+
+        self._segment = None
+        self._next_targets = targets
+        self._start_next_segment(now)
+
+    def _start_next_segment(self, start_time: float):
+        """
+        Start the next segment of the move, or stop if there are none.
+        Args:
+            start_time: virtual time the segment starts
+        """
+        while self._next_targets:
+            end, velocity = self._next_targets.pop(0)
+            if end != self._position:
+                self._segment = _MoveSegment(
+                    self._position,
+                    end,
+                    velocity,
+                    self.fields["VBAS"],
+                    self.fields["ACCL"],
+                    start_time,
+                )
+                self.fields["DMOV"] = 0
+                return
+        self._segment = None
+        self.fields["DMOV"] = 1
+
+    def update(self, now: float):
+        """
+        Move the motor along its current move to the given time.
+        Args:
+            now: current virtual time
+        """
+        while self._segment is not None:
+            self._position = self._segment.position(now)
+            if now < self._segment.end_time:
+                break
+            self._start_next_segment(self._segment.end_time)
+        resolution = self.fields["MRES"]
+        if resolution > 0:
+            self.fields["RBV"] = round(self._position / resolution) * resolution
+        else:
+            self.fields["RBV"] = self._position
+
+
+class SimulatedJaws:
+    """
+    Simulation of a jaws set with gap and centre setpoints in each direction, each driving a pair of blade motors.
+    """
+
+    def __init__(self, base: str, motors: Dict[str, SimulatedMotor]):
+        """
+        Initialise.
+        Args:
+            base: base PV of the jaws, e.g. IN:INST:MOT:JAWS1
+            motors: blade motors keyed by blade name, e.g. JN
+        """
+        self.base = base
+        self.motors = motors
+        self._set_points = {}
+        for axis in JAWS_BLADES:
+            self._set_points[axis + "GAP"] = self._gap(axis)
+            self._set_points[axis + "CENT"] = self._centre(axis)
+
+    def _gap(self, axis: str) -> float:
+        positive, negative = JAWS_BLADES[axis]
+        return self.motors[positive].fields["RBV"] - self.motors[negative].fields["RBV"]
+
+    def _centre(self, axis: str) -> float:
+        positive, negative = JAWS_BLADES[axis]
+        return (self.motors[positive].fields["RBV"] + self.motors[negative].fields["RBV"]) / 2
+
+    def get(self, axis: str, sort: str, suffix: Optional[str]) -> Any:
+        """
+        Args:
+            axis: V or H
+            sort: GAP or CENT
+            suffix: None for the readback, :SP for the setpoint, :DMOV for done moving
+
+        Returns: the value
+        """
+        if suffix == ":SP":
+            return self._set_points[axis + sort]
+        if suffix == ":DMOV":
+            return int(not any(self.motors[blade].is_moving for blade in JAWS_BLADES[axis]))
+        return self._gap(axis) if sort == "GAP" else self._centre(axis)
+
+    def put(self, axis: str, sort: str, value: float, now: float):
+        """
+        Set the gap or centre setpoint and move the blades to it.
+        Args:
+            axis: V or H
+            sort: GAP or CENT
+            value: new setpoint
+            now: current virtual time
+        """
+        self._set_points[axis + sort] = float(value)
+        gap, centre = self._set_points[axis + "GAP"], self._set_points[axis + "CENT"]
+        positive, negative = JAWS_BLADES[axis]
+        self.motors[positive].put("VAL", centre + gap / 2, now)
+        self.motors[negative].put("VAL", centre - gap / 2, now)
+
+
+class SimulatedChannelAccess:
+    """
+    Channel access stand in which simulates motor records and jaws sets. Motors and jaws are created when their PVs
+    are first used; other PVs hold the last value written to them.
+    """
+
+    def __init__(self, clock: Optional[VirtualClock] = None):
+        """
+        Initialise.
+        Args:
+            clock: virtual clock for the simulation; None for a clock running at real time
+        """
+        self.clock = clock if clock is not None else VirtualClock()
+        self._lock = threading.RLock()
+        self._motors: Dict[str, SimulatedMotor] = {}
+        self._jaws: Dict[str, SimulatedJaws] = {}
+        self._values: Dict[str, Any] = {}
+        self._monitors: Dict[str, List[Callable]] = {}
+        self._last_posted: Dict[str, Any] = {}
+        self._thread = None
+
+    def add_motor(self, name: str, **fields) -> SimulatedMotor:
+        """
+        Add a motor with initial field values. Use this before the motor is first used to set its initial state.
+        Args:
+            name: name of the motor record PV
+            **fields: initial values of fields which differ from the defaults
+
+        Returns: the motor
+        """
+        with self._lock:
+            motor = SimulatedMotor(name, **fields)
+            self._motors[name] = motor
+            return motor
+
+    def motor(self, name: str) -> SimulatedMotor:
+        """
+        Args:
+            name: name of the motor record PV
+
+        Returns: the motor, created with default fields if it does not exist
+        """
+        with self._lock:
+            if name not in self._motors:
+                self._motors[name] = SimulatedMotor(name)
+            return self._motors[name]
+
+    def jaws(self, base: str) -> SimulatedJaws:
+        """
+        Args:
+            base: base PV of the jaws
+
+        Returns: the jaws set, created with blade motors if it does not exist
+        """
+        with self._lock:
+            if base not in self._jaws:
+                motors = {
+                    blade: self.motor("{}:{}:MTR".format(base, blade))
+                    for blades in JAWS_BLADES.values()
+                    for blade in blades
+                }
+                self._jaws[base] = SimulatedJaws(base, motors)
+            return self._jaws[base]
+
+    def _resolve(self, pv: str):
+        """
+        Args:
+            pv: pv name
+
+        Returns: jaws and its axis, sort and suffix; or a motor and field; or None if the PV is a plain value
+        """
+        match = _JAWS_PV.match(pv)
+        if match is not None:
+            return self.jaws(match["base"]), (match["axis"], match["sort"], match["suffix"])
+        match = _JAWS_BLADE_PV.match(pv)
+        if match is not None:
+            self.jaws(match["base"])
+            return self.motor("{}:{}:MTR".format(match["base"], match["blade"])), match["field"]
+        match = _MOTOR_PV.match(pv)
+        if match is not None:
+            field = match["field"]
+            if field in MOTOR_FIELD_DEFAULTS or (field is None and match["base"] in self._motors):
+                return self.motor(match["base"]), field
+        return None
+
+    def pv_exists(self, pv: str, timeout: Optional[float] = None) -> bool:
+        """
+        Args:
+            pv: pv name
+            timeout: unused
+
+        Returns: True if the PV is a simulated motor or jaws PV or has been written to
+        """
+        with self._lock:
+            return self._resolve(pv) is not None or pv in self._values
+
+    def caget(self, pv: str, as_string: bool = False, timeout: Optional[float] = None) -> Any:
+        """
+        Args:
+            pv: pv name
+            as_string: unused
+            timeout: unused
+
+        Returns: value of the PV; None if it does not exist
+        """
+        with self._lock:
+            self._update_motors()
+            return self._get(pv)
+
+    def _get(self, pv: str) -> Any:
+        resolved = self._resolve(pv)
+        if resolved is None:
+            return self._values.get(pv)
+        device, address = resolved
+        if isinstance(device, SimulatedJaws):
+            return device.get(*address)
+        return device.fields[address or "VAL"]
+
+    def caput(
+        self,
+        pv: str,
+        value: Any,
+        wait: bool = False,
+        timeout: Optional[float] = None,
+        safe_not_quick: bool = True,
+    ):
+        """
+        Write to a PV. For motor and jaws setpoints this starts a move.
+        Args:
+            pv: pv name
+            value: value to write
+            wait: True to wait for the move to finish if this is a setpoint, only possible if the simulation is
+                running; puts to other fields complete straight away
+            timeout: unused
+            safe_not_quick: unused
+        """
+        with self._lock:
+            now = self.clock.time()
+            self._update_motors(now)
+            resolved = self._resolve(pv)
+            starts_move = False
+            if resolved is None:
+                self._values[pv] = value
+            else:
+                device, address = resolved
+                if isinstance(device, SimulatedJaws):
+                    axis, sort, _ = address
+                    device.put(axis, sort, value, now)
+                    starts_move = True
+                else:
+                    field = address or "VAL"
+                    device.put(field, value, now)
+                    starts_move = field == "VAL"
+        self._post_monitors()
+        if wait and starts_move and self.is_running:
+            while self._is_moving(pv):
+                time.sleep(TICK_INTERVAL)
+
+    def caput_retry_on_fail(
+        self, pv: str, value: Any, retry_count: int = 5, safe_not_quick: bool = True
+    ):
+        """
+        Write to a PV waiting for any move to finish.
+        Args:
+            pv: pv name
+            value: value to write
+            retry_count: unused because simulated writes do not fail
+            safe_not_quick: unused
+        """
+        self.caput(pv, value, wait=True, safe_not_quick=safe_not_quick)
+
+    def add_monitor(
+        self, pv: str, call_back_function: Callable, link_alarm_on_disconnect: bool = True
+    ):
+        """
+        Call a function with the value, alarm severity and alarm status whenever the PV changes. As with a channel
+        access monitor it is called straight away with the current value.
+        Args:
+            pv: pv name
+            call_back_function: function to call
+            link_alarm_on_disconnect: unused
+        """
+        with self._lock:
+            self._monitors.setdefault(pv, []).append(call_back_function)
+            value = self._get(pv)
+            self._last_posted[pv] = value
+        if value is not None:
+            call_back_function(value, AlarmSeverity.No, AlarmStatus.No)
+
+    def _is_moving(self, pv: str) -> bool:
+        with self._lock:
+            resolved = self._resolve(pv)
+            if resolved is None:
+                return False
+            device, address = resolved
+            if isinstance(device, SimulatedJaws):
+                return device.get(address[0], address[1], ":DMOV") == 0
+            return device.is_moving
+
+    def _update_motors(self, now: Optional[float] = None):
+        now = self.clock.time() if now is None else now
+        for motor in self._motors.values():
+            motor.update(now)
+
+    def update(self):
+        """
+        Move all the motors to the current virtual time and post monitors for any PVs which have changed.
+        """
+        with self._lock:
+            self._update_motors()
+        self._post_monitors()
+
+    def _post_monitors(self):
+        """
+        Call the monitor functions of all PVs whose values have changed since they were last posted.
+        """
+        with self._lock:
+            changes = []
+            for pv, call_backs in self._monitors.items():
+                value = self._get(pv)
+                if value != self._last_posted.get(pv):
+                    self._last_posted[pv] = value
+                    changes.extend((call_back, value) for call_back in call_backs)
+        for call_back, value in changes:
+            try:
+                call_back(value, AlarmSeverity.No, AlarmStatus.No)
+            except Exception:
+                logger.exception("Exception in monitor of simulated PV")
+
+    @property
+    def is_running(self) -> bool:
+        """
+        Returns: True if the simulation is updating the motors in the background
+        """
+        return self._thread is not None
+
+    def start(self):
+        """
+        Start updating the motors in the background.
+        """
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="simulated_motors", daemon=True)
+            self._thread.start()
+            logger.info("Simulated motors running at {} times real time".format(self.clock.speed))
+
+    def _run(self):
+        while True:
+            self.update()
+            time.sleep(TICK_INTERVAL)
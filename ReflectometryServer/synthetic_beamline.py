@@ -0,0 +1,388 @@
+"""
+Generator of synthetic beamline configurations, much larger than any real beamline, for measuring how the server
+scales with the number of components.
+
+A generated beamline has, in order along the beam:
+    plain components with a height stage, the first of which have slit sets and the last of which park on a sequence
+    reflecting components, parked in the first mode and in the beam in every other mode
+    theta
+    benches, which define theta from their angle
+    the rest of the plain components
+    a tilting detector, which defines theta from its position
+
+To use it as the configuration of the IOC create a config.py containing:
+    from ReflectometryServer.synthetic_beamline import get_beamline
+and set the sizes with the SYNTHETIC_* macros. Running with the SIMULATE_MOTORS macro set means no motors are needed;
+`create_headless_beamline` does the same without an IOC.
+"""
+
+import logging
+from typing import Dict, Optional, Tuple
+
+from ReflectometryServer.beamline import Beamline
+from ReflectometryServer.components import (
+    BenchComponent,
+    BenchSetup,
+    Component,
+    ReflectingComponent,
+    ThetaComponent,
+    TiltingComponent,
+)
+from ReflectometryServer.config_helper import (
+    ConfigHelper,
+    add_beam_start,
+    add_component,
+    add_driver,
+    add_mode,
+    add_parameter,
+    add_slit_parameters,
+    as_mode_correction,
+    get_configured_beamline,
+)
+from ReflectometryServer.engineering_corrections import (
+    ConstantCorrection,
+    EngineeringCorrection,
+    UserFunctionCorrection,
+)
+from ReflectometryServer.geometry import ChangeAxis, PositionAndAngle
+from ReflectometryServer.ioc_driver import IocDriver
+from ReflectometryServer.out_of_beam import OutOfBeamPosition, OutOfBeamSequence
+from ReflectometryServer.parameters import AxisParameter, BeamlineParameter, InBeamParameter
+from ReflectometryServer.pv_wrapper import (
+    PROCESS_MONITOR_EVENTS,
+    MotorPVWrapper,
+    set_default_channel_access,
+)
+from ReflectometryServer.simulated_motors import SimulatedChannelAccess, VirtualClock
+
+logger = logging.getLogger(__name__)
+
+# Macro for each size of the beamline and its default
+SIZE_MACROS = {
+    "components": ("SYNTHETIC_COMPONENTS", 20),
+    "reflecting": ("SYNTHETIC_REFLECTING", 2),
+    "benches": ("SYNTHETIC_BENCHES", 1),
+    "parked": ("SYNTHETIC_PARKED", 2),
+    "slits": ("SYNTHETIC_SLITS", 4),
+    "modes": ("SYNTHETIC_MODES", 3),
+    "corrections": ("SYNTHETIC_CORRECTIONS", 4),
+}
+
+# Distance along the beam between components
+COMPONENT_SPACING = 100.0
+
+# Number of motor axes on each motor controller, used to number the motor PVs
+AXES_PER_CONTROLLER = 8
+
+# Positions a parked component goes through as it leaves the beam
+PARKING_SEQUENCE = [-5.0, -20.0, -50.0]
+
+# Position of a parked reflecting component
+REFLECTING_PARKED_POSITION = -50.0
+
+# Geometry of each bench, as per POLREF
+BENCH_PIVOT_TO_FRONT_JACK = 1201.0
+BENCH_PIVOT_TO_REAR_JACK = 2759.0
+BENCH_PIVOT_TO_BEAM = 628.0
+BENCH_MIN_ANGLE = 0.0
+BENCH_MAX_ANGLE = 4.8
+
+# Correction added to a driver for each degree of theta by the user function corrections
+CORRECTION_PER_THETA_DEGREE = 0.01
+
+# Number of components which are always in the beamline; theta and the detector
+_FIXED_COMPONENTS = 2
+
+
+def _theta_correction(setpoint: float, theta: Optional[float]) -> float:
+    """
+    Args:
+        setpoint: setpoint of the driver
+        theta: setpoint of theta; None if it is not yet set
+
+    Returns: correction which is proportional to theta
+    """
+    return 0.0 if theta is None else theta * CORRECTION_PER_THETA_DEGREE
+
+
+class _SyntheticBeamlineBuilder:
+    """
+    Adds the components, parameters and drivers of a synthetic beamline to the configuration.
+    """
+
+    def __init__(self, modes: int, corrections: int):
+        """
+        Initialise.
+        Args:
+            modes: number of modes
+            corrections: number of drivers with an engineering correction
+        """
+        self.modes = [add_mode("MODE{}".format(index)) for index in range(modes)]
+        self.axes: Dict[str, MotorPVWrapper] = {}
+        self.theta: Optional[BeamlineParameter] = None
+        self._corrections_left = corrections
+        self._position = 0.0
+
+    def _next_position(self) -> PositionAndAngle:
+        """
+        Returns: setup of the next component along the beam
+        """
+        self._position += COMPONENT_SPACING
+        return PositionAndAngle(0.0, self._position, 90.0)
+
+    def _correction(self) -> Optional[EngineeringCorrection]:
+        """
+        Returns: the engineering correction for the next driver, cycling through the sorts of correction; None once
+            all the corrections have been used
+        """
+        if self._corrections_left <= 0:
+            return None
+        self._corrections_left -= 1
+        sort = self._corrections_left % 3
+        if sort == 0 and self.theta is not None:
+            return UserFunctionCorrection(_theta_correction, self.theta)
+        if sort == 1:
+            return as_mode_correction(0.1, self.modes[:1])
+        return ConstantCorrection(0.1)
+
+    def _add_driver(self, component, axis: ChangeAxis, **kwargs) -> IocDriver:
+        """
+        Add a driver on a new simulated motor.
+        Args:
+            component: component to drive
+            axis: axis of the component to drive
+            **kwargs: other arguments of the driver
+
+        Returns: the driver
+        """
+        index = len(self.axes)
+        pv_name = "MOT:MTR{:02d}{:02d}".format(
+            index // AXES_PER_CONTROLLER + 1, index % AXES_PER_CONTROLLER + 1
+        )
+        motor_axis = MotorPVWrapper(pv_name)
+        self.axes["{}_{}".format(component.name, axis.name)] = motor_axis
+        return add_driver(
+            IocDriver(
+                component, axis, motor_axis, engineering_correction=self._correction(), **kwargs
+            )
+        )
+
+    def add_plain(self, index: int, has_slits: bool, is_parked: bool):
+        """
+        Add a component with a height stage.
+        Args:
+            index: index of the component
+            has_slits: True to add a slit set with the component
+            is_parked: True if the component can be parked with a sequence
+        """
+        name = "C{}".format(index)
+        component = add_component(Component(name, self._next_position()))
+        add_parameter(AxisParameter(name, component, ChangeAxis.POSITION), modes=self.modes)
+        out_of_beam_positions = None
+        if is_parked:
+            add_parameter(
+                InBeamParameter("{}INBEAM".format(name), component),
+                modes=self.modes,
+                mode_inits=[(mode, True) for mode in self.modes],
+            )
+            out_of_beam_positions = [OutOfBeamSequence(PARKING_SEQUENCE)]
+        self._add_driver(
+            component, ChangeAxis.POSITION, out_of_beam_positions=out_of_beam_positions
+        )
+        if has_slits:
+            add_slit_parameters(index + 1, modes=self.modes, include_centres=True)
+
+    def add_reflecting(self, index: int):
+        """
+        Add a reflecting component which is parked in the first mode.
+        Args:
+            index: index of the reflecting component
+        """
+        name = "SM{}".format(index)
+        component = add_component(ReflectingComponent(name, self._next_position()))
+        add_parameter(
+            InBeamParameter("{}INBEAM".format(name), component),
+            modes=self.modes,
+            mode_inits=[(mode, mode != self.modes[0]) for mode in self.modes],
+        )
+        add_parameter(
+            AxisParameter("{}OFFSET".format(name), component, ChangeAxis.POSITION),
+            modes=self.modes,
+        )
+        add_parameter(
+            AxisParameter("{}ANGLE".format(name), component, ChangeAxis.ANGLE), modes=self.modes
+        )
+        self._add_driver(
+            component,
+            ChangeAxis.POSITION,
+            out_of_beam_positions=[OutOfBeamPosition(REFLECTING_PARKED_POSITION)],
+        )
+        self._add_driver(component, ChangeAxis.ANGLE)
+
+    def add_theta(self) -> ThetaComponent:
+        """
+        Returns: the theta component which has been added
+        """
+        theta = add_component(ThetaComponent("THETA", self._next_position()))
+        self.theta = add_parameter(
+            AxisParameter("THETA", theta, ChangeAxis.ANGLE), modes=self.modes
+        )
+        return theta
+
+    def add_bench(self, index: int) -> BenchComponent:
+        """
+        Add a bench driven by a front and rear jack.
+        Args:
+            index: index of the bench
+
+        Returns: the bench
+        """
+        name = "BENCH{}".format(index)
+        position = self._next_position()
+        bench = add_component(
+            BenchComponent(
+                name,
+                BenchSetup(
+                    position.y,
+                    position.z,
+                    position.angle,
+                    BENCH_PIVOT_TO_FRONT_JACK,
+                    BENCH_PIVOT_TO_REAR_JACK,
+                    0.0,
+                    BENCH_PIVOT_TO_BEAM,
+                    BENCH_MIN_ANGLE,
+                    BENCH_MAX_ANGLE,
+                ),
+            )
+        )
+        add_parameter(
+            AxisParameter("{}ANGLE".format(name), bench, ChangeAxis.ANGLE), modes=self.modes
+        )
+        add_parameter(
+            AxisParameter("{}OFFSET".format(name), bench, ChangeAxis.POSITION), modes=self.modes
+        )
+        self._add_driver(bench, ChangeAxis.JACK_FRONT)
+        self._add_driver(bench, ChangeAxis.JACK_REAR)
+        return bench
+
+    def add_detector(self) -> TiltingComponent:
+        """
+        Returns: the detector which has been added
+        """
+        detector = add_component(TiltingComponent("DET", self._next_position()))
+        add_parameter(AxisParameter("DETOFFSET", detector, ChangeAxis.POSITION), modes=self.modes)
+        add_parameter(AxisParameter("DETANGLE", detector, ChangeAxis.ANGLE), modes=self.modes)
+        self._add_driver(detector, ChangeAxis.POSITION)
+        self._add_driver(detector, ChangeAxis.ANGLE)
+        return detector
+
+
+def add_synthetic_beamline(
+    components: int = 20,
+    reflecting: int = 2,
+    benches: int = 1,
+    parked: int = 2,
+    slits: int = 4,
+    modes: int = 3,
+    corrections: int = 4,
+) -> Dict[str, MotorPVWrapper]:
+    """
+    Add a synthetic beamline to the configuration. Components which are not reflecting components, benches, theta or
+    the detector are plain components with a height stage; slit sets go with the first of these and the last of them
+    are parked with a sequence.
+    Args:
+        components: total number of components
+        reflecting: number of reflecting components
+        benches: number of benches
+        parked: number of plain components which can be parked with a sequence
+        slits: number of slit sets
+        modes: number of modes; every parameter is in every mode
+        corrections: number of drivers with an engineering correction, cycling through the sorts of correction
+
+    Returns: the motor axis of each driver by component and axis name
+    """
+    plain = components - reflecting - benches - _FIXED_COMPONENTS
+    if plain < 0:
+        raise ValueError(
+            "Synthetic beamline of {} components is too small for {} reflecting components, {} benches, theta "
+            "and a detector".format(components, reflecting, benches)
+        )
+    if slits > plain or parked > plain:
+        raise ValueError(
+            "Synthetic beamline has {} plain components, too few for {} slit sets or {} parked "
+            "components".format(plain, slits, parked)
+        )
+    if modes < 1:
+        raise ValueError("Synthetic beamline needs at least one mode")
+
+    builder = _SyntheticBeamlineBuilder(modes, corrections)
+    before_theta = plain // 2
+    for index in range(before_theta):
+        builder.add_plain(index, index < slits, index >= plain - parked)
+    for index in range(reflecting):
+        builder.add_reflecting(index)
+    theta = builder.add_theta()
+    for index in range(benches):
+        theta.add_angle_of(builder.add_bench(index))
+    for index in range(before_theta, plain):
+        builder.add_plain(index, index < slits, index >= plain - parked)
+    theta.add_angle_to(builder.add_detector())
+
+    add_beam_start(PositionAndAngle(0.0, 0.0, 0.0))
+    return builder.axes
+
+
+def synthetic_beamline_sizes(macros: Dict[str, str]) -> Dict[str, int]:
+    """
+    Args:
+        macros: macros of the IOC
+
+    Returns: size arguments of the synthetic beamline set by the SYNTHETIC_* macros, or their defaults
+    """
+    return {size: int(macros.get(macro, default)) for size, (macro, default) in SIZE_MACROS.items()}
+
+
+def get_beamline(macros: Dict[str, str]) -> Beamline:
+    """
+    Configuration of a synthetic beamline sized by the SYNTHETIC_* macros.
+    Args:
+        macros: macros of the IOC
+
+    Returns: the beamline
+    """
+    add_synthetic_beamline(**synthetic_beamline_sizes(macros))
+    return get_configured_beamline()
+
+
+def create_headless_beamline(
+    speed: float = 0.0, **sizes: int
+) -> Tuple[Beamline, Dict[str, MotorPVWrapper], SimulatedChannelAccess]:
+    """
+    Create a synthetic beamline whose motors are simulated, so no IOCs are needed. The simulation becomes the default
+    channel access; it is not started so motors only move when it is updated, see move_simulated_motors.
+    Args:
+        speed: speed of the virtual clock of the simulation compared with real time
+        **sizes: sizes of the beamline, as the arguments of add_synthetic_beamline
+
+    Returns: the beamline, with the initial readbacks of its motors applied, its motor axes and the simulated channel
+        access
+    """
+    simulated_motors = SimulatedChannelAccess(VirtualClock(speed))
+    set_default_channel_access(simulated_motors)
+    ConfigHelper.reset()
+    axes = add_synthetic_beamline(**sizes)
+    beamline = get_configured_beamline()
+    PROCESS_MONITOR_EVENTS.wait_for_processing()
+    return beamline, axes, simulated_motors
+
+
+def move_simulated_motors(simulated_motors: SimulatedChannelAccess, seconds: float):
+    """
+    Move the simulated motors on by some virtual time and wait for the beamline to process their new readbacks.
+    Args:
+        simulated_motors: simulated channel access of a headless beamline
+        seconds: virtual time to move on by
+    """
+    simulated_motors.clock.advance(seconds)
+    simulated_motors.update()
+    PROCESS_MONITOR_EVENTS.wait_for_processing()
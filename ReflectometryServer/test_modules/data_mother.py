@@ -614,6 +614,10 @@ class MockMotorPVWrapper:
     def trigger_rbv_change(self):
         self.trigger_listeners(ReadbackUpdate(self._value, AlarmSeverity.No, AlarmStatus.No))
 
+    @property
+    def is_moving(self):
+        return False
+
     @property
     def rbv(self):
         return self._value
@@ -9,6 +9,7 @@ from ReflectometryServer import *
 from ReflectometryServer.beamline import BeamlineConfigurationInvalidException
 from ReflectometryServer.beamline_constant import BeamlineConstant
 from ReflectometryServer.exceptions import BeamlineConfigurationParkAutosaveInvalidException
+from ReflectometryServer.file_io import MODE_KEY
 from ReflectometryServer.ioc_driver import CorrectedReadbackUpdate
 from ReflectometryServer.out_of_beam import OutOfBeamSequence
 from ReflectometryServer.test_modules.data_mother import (
@@ -453,6 +454,12 @@ class TestBeamlineModeInitialization(unittest.TestCase):
         self.nr_mode = BeamlineMode("nr", [])
         self.pnr_mode = BeamlineMode("pnr", [])
 
+    def _mock_component(self, name):
+        component = Mock()
+        component.name = name
+        component.beam_path_set_point.is_reflecting = False
+        return component
+
     @patch("ReflectometryServer.beamline.mode_autosave")
     def test_GIVEN_no_autosaved_mode_WHEN_instantiating_beamline_THEN_defaults_to_first_in_list(
         self, mode_autosave
@@ -559,6 +566,46 @@ class TestBeamlineModeInitialization(unittest.TestCase):
             result[detector_comp_name][0], is_(position_and_angle(result[theta_comp_name][1]))
         )
 
+    @patch("ReflectometryServer.beamline.mode_autosave")
+    def test_GIVEN_beamline_with_components_WHEN_change_mode_THEN_mode_autosaved_once(
+        self, mode_autosave
+    ):
+        mode_autosave.read_parameter.return_value = "nr"
+        components = [self._mock_component(name) for name in ["comp1", "comp2", "comp3"]]
+        beamline = Beamline(components, [], [], [self.nr_mode, self.pnr_mode])
+        mode_autosave.reset_mock()
+
+        beamline.active_mode = "pnr"
+
+        mode_autosave.write_parameter.assert_called_once_with(MODE_KEY, value="pnr")
+
+    @patch("ReflectometryServer.beamline.mode_autosave")
+    def test_GIVEN_beamline_WHEN_change_between_modes_which_are_not_disabled_THEN_incoming_beam_can_change_not_reset(
+        self, mode_autosave
+    ):
+        mode_autosave.read_parameter.return_value = "nr"
+        component = self._mock_component("comp")
+        beamline = Beamline([component], [], [], [self.nr_mode, self.pnr_mode])
+        component.reset_mock()
+
+        beamline.active_mode = "pnr"
+
+        component.set_incoming_beam_can_change.assert_not_called()
+
+    @patch("ReflectometryServer.beamline.mode_autosave")
+    def test_GIVEN_beamline_WHEN_change_to_disabled_mode_THEN_incoming_beam_can_not_change(
+        self, mode_autosave
+    ):
+        mode_autosave.read_parameter.return_value = "nr"
+        component = self._mock_component("comp")
+        disabled_mode = BeamlineMode("disabled", [], is_disabled=True)
+        beamline = Beamline([component], [], [], [self.nr_mode, disabled_mode])
+        component.reset_mock()
+
+        beamline.active_mode = "disabled"
+
+        component.set_incoming_beam_can_change.assert_called_once_with(False)
+
 
 class TestRealisticWithAutosaveInit(unittest.TestCase):
     @patch("ReflectometryServer.parameters.param_float_autosave")
@@ -1077,6 +1124,32 @@ class TestBeamlineReadOnlyParameters(unittest.TestCase):
         assert_that(result, is_(expected_parameters))
 
 
+class TestBeamlineMoveForParameters(unittest.TestCase):
+    @no_autosave
+    def setUp(self):
+        self.beamline, self.axes = DataMother.beamline_s1_s3_theta_detector(spacing=10)
+        self.beamline._perform_move_for_all_drivers = Mock()
+
+    def test_GIVEN_several_parameters_with_new_setpoints_WHEN_move_for_parameters_THEN_all_parameters_moved_with_one_driver_move(
+        self,
+    ):
+        s1 = self.beamline.parameter("s1")
+        s3 = self.beamline.parameter("s3")
+        s3.sp_no_move = 3.0
+        s1.sp_no_move = 1.0
+
+        self.beamline.move_for_parameters({s3, s1})
+
+        assert_that(s1.sp_rbv, is_(1.0))
+        assert_that(s3.sp_rbv, is_(3.0))
+        self.beamline._perform_move_for_all_drivers.assert_called_once()
+
+    def test_GIVEN_no_parameters_WHEN_move_for_parameters_THEN_drivers_not_moved(self):
+        self.beamline.move_for_parameters(set())
+
+        self.beamline._perform_move_for_all_drivers.assert_not_called()
+
+
 class TestComponentOutOfBeam(unittest.TestCase):
     @no_autosave
     def setUp(self):
@@ -10,7 +10,7 @@ from ReflectometryServer import *
 from ReflectometryServer import ChangeAxis
 from ReflectometryServer.beamline import BeamlineConfigurationInvalidException
 from ReflectometryServer.ioc_driver import CorrectedReadbackUpdate
-from ReflectometryServer.parameters import ParameterReadbackUpdate
+from ReflectometryServer.parameters import ParameterAtSetpointUpdate, ParameterReadbackUpdate
 from ReflectometryServer.pv_wrapper import ReadbackUpdate
 from ReflectometryServer.server_status_manager import STATUS_MANAGER
 from ReflectometryServer.test_modules.data_mother import DataMother, create_mock_axis
@@ -905,7 +905,8 @@ class TestBeamlineParameterReadback(unittest.TestCase):
         )
 
         listener.assert_called_with(ParameterReadbackUpdate(displacement - beam_height, None, None))
-        assert_that(listener.call_count, is_(2))  # once for beam path and once for physcial move
+        # beam path and physical move update both fire but the readback only changes once
+        assert_that(listener.call_count, is_(1))
 
     def test_GIVEN_reflection_angle_WHEN_set_readback_on_component_THEN_call_back_triggered_on_component_change(
         self,
@@ -1101,8 +1102,8 @@ class TestBeamlineParameterReadback(unittest.TestCase):
         )
 
         listener.assert_called_with(ParameterReadbackUpdate(True, alarm_severity, alarm_status))
-        #  once for beam path update and once for physical move update
-        assert_that(listener.call_count, is_(2))
+        #  beam path update and physical move update both fire but the readback only changes once
+        assert_that(listener.call_count, is_(1))
         self.assertEqual(in_beam_parameter.alarm_severity, alarm_severity)
         self.assertEqual(in_beam_parameter.alarm_status, alarm_status)
 
@@ -1148,6 +1149,61 @@ class TestBeamlineParameterReadback(unittest.TestCase):
         self.assertEqual(parameter.alarm_status, alarm_status)
 
 
+class TestBeamlineParameterReadbackChangeDetection(unittest.TestCase):
+    def setUp(self):
+        self.pv_wrapper = create_mock_axis("s1vg", 0.0, 1)
+        self.parameter = DirectParameter("param", self.pv_wrapper, rbv_deadband=0.01)
+        self.pv_wrapper.trigger_rbv_change()
+        self.parameter.sp = 1.0
+        self.listener = Mock()
+        self.at_sp_listener = Mock()
+        self.parameter.add_listener(ParameterReadbackUpdate, self.listener)
+        self.parameter.add_listener(ParameterAtSetpointUpdate, self.at_sp_listener)
+        self.pv_wrapper.trigger_listeners(ReadbackUpdate(1.0, None, None))
+        self.listener.reset_mock()
+        self.at_sp_listener.reset_mock()
+
+    def test_GIVEN_readback_WHEN_same_readback_received_THEN_no_updates_are_triggered(self):
+        self.pv_wrapper.trigger_listeners(ReadbackUpdate(1.0, None, None))
+
+        self.listener.assert_not_called()
+        self.at_sp_listener.assert_not_called()
+
+    def test_GIVEN_readback_WHEN_readback_changes_within_deadband_THEN_no_update_is_triggered(self):
+        self.pv_wrapper.trigger_listeners(ReadbackUpdate(1.005, None, None))
+
+        self.listener.assert_not_called()
+
+    def test_GIVEN_readback_WHEN_readback_changes_by_more_than_deadband_THEN_update_is_triggered(
+        self,
+    ):
+        self.pv_wrapper.trigger_listeners(ReadbackUpdate(1.02, None, None))
+
+        self.listener.assert_called_once_with(ParameterReadbackUpdate(1.02, None, None))
+
+    def test_GIVEN_readback_WHEN_readback_creeps_in_steps_smaller_than_deadband_THEN_update_is_triggered_once_total_change_exceeds_deadband(
+        self,
+    ):
+        for value in [1.004, 1.008, 1.012]:
+            self.pv_wrapper.trigger_listeners(ReadbackUpdate(value, None, None))
+
+        self.listener.assert_called_once_with(ParameterReadbackUpdate(1.012, None, None))
+
+    def test_GIVEN_readback_WHEN_same_readback_received_with_new_alarm_THEN_update_is_triggered(
+        self,
+    ):
+        self.pv_wrapper.trigger_listeners(ReadbackUpdate(1.0, 1, 2))
+
+        self.listener.assert_called_once_with(ParameterReadbackUpdate(1.0, 1, 2))
+
+    def test_GIVEN_readback_WHEN_readback_moves_away_from_setpoint_THEN_at_setpoint_update_is_triggered(
+        self,
+    ):
+        self.pv_wrapper.trigger_listeners(ReadbackUpdate(2.0, None, None))
+
+        self.at_sp_listener.assert_called_once_with(ParameterAtSetpointUpdate(False))
+
+
 class TestBeamlineThetaComponentWhenDisabled(unittest.TestCase):
     def test_GIVEN_theta_with_0_deg_beam_and_next_component_in_beam_but_disabled_WHEN_set_theta_to_45_THEN_component_sp_is_at_45_degrees(
         self,
@@ -1567,6 +1623,20 @@ class TestCustomFunctionCall(unittest.TestCase):
 
         assert_that(STATUS_MANAGER.error_log, contains_string(expected_text))
 
+    def test_GIVEN_parameter_with_custom_function_timeout_WHEN_move_THEN_function_submitted_with_timeout(
+        self,
+    ):
+        expected_timeout = 5.0
+        component = Component("comp", PositionAndAngle(0, 0, 0))
+        param = InBeamParameter(
+            "myname", component, custom_function=Mock(), custom_function_timeout=expected_timeout
+        )
+
+        with patch("ReflectometryServer.parameters.CUSTOM_FUNCTION_EXECUTOR") as executor:
+            param.sp = True
+
+        assert_that(executor.submit.call_args[1]["timeout"], is_(expected_timeout))
+
     def test_GIVEN_Axis_Parameter_WHEN_move_THEN_custom_function_is_called_with_move_to_and_move_from_values(
         self,
     ):
@@ -0,0 +1,116 @@
+import time
+import unittest
+
+from hamcrest import *
+from mock import Mock
+
+from ReflectometryServer import ConfigHelper
+from ReflectometryServer.ChannelAccess.ca_process_loop import (
+    CA_PROCESS_WAKEUP,
+    CaProcessLoop,
+    ProcessWakeup,
+    PutLatencyUpdate,
+)
+from ReflectometryServer.ChannelAccess.ca_replay import create_driver
+from ReflectometryServer.ChannelAccess.pv_manager import CA_PUT_LATENCY
+from ReflectometryServer.pv_wrapper import set_default_channel_access
+from ReflectometryServer.synthetic_beamline import create_headless_beamline
+from ReflectometryServer.test_modules.utils import no_autosave
+
+MIN_TIMEOUT = 0.001
+MAX_TIMEOUT = 0.008
+
+
+class TestCaProcessLoop(unittest.TestCase):
+    def setUp(self):
+        self.process = Mock()
+        self.poll = Mock()
+        self.wakeup = ProcessWakeup()
+        self.loop = CaProcessLoop(self.process, self.poll, MIN_TIMEOUT, MAX_TIMEOUT, self.wakeup)
+
+    def _timeouts_used(self):
+        return [call_args[0][0] for call_args in self.process.call_args_list]
+
+    def test_GIVEN_no_wakeup_WHEN_process_repeatedly_THEN_timeout_backs_off_to_max(self):
+        for _ in range(3):
+            self.loop.process_once()
+
+        assert_that(self._timeouts_used(), contains_exactly(MAX_TIMEOUT, MAX_TIMEOUT, MAX_TIMEOUT))
+        assert_that(self.poll.call_count, is_(3))
+
+    def test_GIVEN_wakeup_WHEN_process_repeatedly_THEN_timeout_is_min_then_backs_off(self):
+        self.wakeup.wake()
+
+        for _ in range(5):
+            self.loop.process_once()
+
+        assert_that(self._timeouts_used(), contains_exactly(0.001, 0.002, 0.004, 0.008, 0.008))
+
+    def test_GIVEN_fixed_timeout_WHEN_woken_THEN_timeout_unchanged(self):
+        loop = CaProcessLoop(self.process, self.poll, MAX_TIMEOUT, MAX_TIMEOUT, self.wakeup)
+        self.wakeup.wake()
+
+        loop.process_once()
+        loop.process_once()
+
+        assert_that(self._timeouts_used(), contains_exactly(MAX_TIMEOUT, MAX_TIMEOUT))
+
+    def test_GIVEN_put_finished_WHEN_process_THEN_latency_recorded_and_listeners_told(self):
+        listener = Mock()
+        self.wakeup.add_listener(PutLatencyUpdate, listener)
+        self.wakeup.put_started()
+        self.wakeup.put_finished()
+
+        self.loop.process_once()
+        self.loop.process_once()
+
+        assert_that(self.wakeup.put_latency.count, is_(1))
+        listener.assert_called_once()
+        assert_that(listener.call_args[0][0].latency, greater_than_or_equal_to(0))
+
+    def test_GIVEN_put_not_finished_WHEN_process_THEN_no_latency_recorded(self):
+        self.wakeup.put_started()
+
+        self.loop.process_once()
+
+        assert_that(self.wakeup.put_latency.count, is_(0))
+
+    def test_GIVEN_put_finished_during_processing_WHEN_process_THEN_latency_recorded_after_next_process(
+        self,
+    ):
+        def _put_during_process(timeout):
+            self.wakeup.put_started()
+            self.wakeup.put_finished()
+
+        self.process.side_effect = _put_during_process
+        self.loop.process_once()
+        self.process.side_effect = None
+        count_after_put = self.wakeup.put_latency.count
+        self.loop.process_once()
+
+        assert_that(count_after_put, is_(0))
+        assert_that(self.wakeup.put_latency.count, is_(1))
+
+
+class TestPutLatencyPv(unittest.TestCase):
+    def setUp(self):
+        ConfigHelper.reset()
+
+    def tearDown(self):
+        set_default_channel_access(None)
+
+    @no_autosave
+    def test_GIVEN_driver_WHEN_put_sent_THEN_latency_pv_read_without_reading_model(self):
+        beamline, _, _ = create_headless_beamline(components=6, benches=0, slits=1)
+        driver = create_driver(beamline)
+        self.addCleanup(driver.close)
+        driver._footprint_manager = Mock()
+
+        CA_PROCESS_WAKEUP.record_put_sent(time.perf_counter() - 0.002)
+
+        driver._footprint_manager.get_sample_length.assert_not_called()
+        assert_that(driver.read(CA_PUT_LATENCY), greater_than_or_equal_to(2))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from hamcrest import *
+from mock import Mock
+from parameterized import parameterized
+from server_common.channel_access import AlarmSeverity, AlarmStatus
+
+from ReflectometryServer.ca_recording import CaRecorder, RecordKind, read_recording
+
+PV = "TE:MOT:MTR0101.RBV"
+
+
+class TestCaRecorder(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "recording.bin")
+        self.recorder = CaRecorder()
+
+    def tearDown(self):
+        self.recorder.stop()
+        shutil.rmtree(self.directory)
+
+    @parameterized.expand(
+        [(None,), (1.5,), (-3,), (True,), ("text",), ([1.0, 2.5],), ([1, "a"],), ({"a": 1},)]
+    )
+    def test_GIVEN_value_written_WHEN_recording_read_THEN_value_is_the_same(self, value):
+        self.recorder.start(self.path)
+        self.recorder.record_write("PARAM:THETA:SP", value)
+        self.recorder.stop()
+
+        events = read_recording(self.path).events
+
+        assert_that(events, has_length(1))
+        assert_that(events[0].kind, is_(RecordKind.WRITE))
+        assert_that(events[0].pv, is_("PARAM:THETA:SP"))
+        assert_that(events[0].value, equal_to(value))
+
+    def test_GIVEN_monitor_wrapped_WHEN_recording_and_monitor_called_THEN_update_recorded_and_function_called(
+        self,
+    ):
+        call_back = Mock()
+        monitor = self.recorder.wrap_monitor(PV, call_back)
+        self.recorder.start(self.path, {"CONFIG": "test"})
+
+        monitor(2.0, AlarmSeverity.Major, AlarmStatus.HiHi)
+        monitor(3.0, AlarmSeverity.No, AlarmStatus.No)
+        self.recorder.stop()
+        recording = read_recording(self.path)
+
+        call_back.assert_called_with(3.0, AlarmSeverity.No, AlarmStatus.No)
+        assert_that(recording.metadata["macros"], is_({"CONFIG": "test"}))
+        assert_that(
+            [(event.pv, event.value, event.severity, event.status) for event in recording.events],
+            contains_exactly(
+                (PV, 2.0, AlarmSeverity.Major, AlarmStatus.HiHi),
+                (PV, 3.0, AlarmSeverity.No, AlarmStatus.No),
+            ),
+        )
+        assert_that(recording.events[0].time, less_than_or_equal_to(recording.events[1].time))
+
+    def test_GIVEN_monitor_with_alarm_which_is_not_a_number_WHEN_called_THEN_function_called_and_update_dropped(
+        self,
+    ):
+        call_back = Mock()
+        monitor = self.recorder.wrap_monitor(PV, call_back)
+        self.recorder.start(self.path)
+
+        monitor(2.0, None, None)
+        monitor(3.0, AlarmSeverity.No, AlarmStatus.No)
+        self.recorder.stop()
+
+        call_back.assert_any_call(2.0, None, None)
+        assert_that(
+            [(event.pv, event.value) for event in read_recording(self.path).events],
+            contains_exactly((PV, 3.0)),
+        )
+
+    def test_GIVEN_more_pvs_than_can_be_indexed_WHEN_recorded_THEN_update_dropped(self):
+        self.recorder.start(self.path)
+        self.recorder._names = {"PV{}".format(index): index for index in range(2**16)}
+
+        self.recorder.record_monitor(PV, 2.0, AlarmSeverity.No, AlarmStatus.No)
+        self.recorder.stop()
+
+        assert_that(read_recording(self.path).events, is_([]))
+        assert_that(self.recorder._names, not_(has_key(PV)))
+
+    def test_GIVEN_not_recording_WHEN_monitor_called_THEN_function_called_and_nothing_recorded(
+        self,
+    ):
+        call_back = Mock()
+        monitor = self.recorder.wrap_monitor(PV, call_back)
+        self.recorder.start(self.path)
+        self.recorder.stop()
+
+        monitor(2.0, AlarmSeverity.No, AlarmStatus.No)
+
+        call_back.assert_called_once_with(2.0, AlarmSeverity.No, AlarmStatus.No)
+        assert_that(read_recording(self.path).events, is_([]))
+
+    def test_GIVEN_recording_cut_short_WHEN_read_THEN_complete_events_are_read(self):
+        self.recorder.start(self.path)
+        self.recorder.record_write("BL:MOVE", 1)
+        self.recorder.record_write("PARAM:THETA:SP", "a long value which is cut short")
+        self.recorder.stop()
+        with open(self.path, "rb+") as recording_file:
+            recording_file.truncate(os.path.getsize(self.path) - 5)
+
+        events = read_recording(self.path).events
+
+        assert_that([event.pv for event in events], contains_exactly("BL:MOVE"))
+
+    def test_GIVEN_file_which_is_not_a_recording_WHEN_read_THEN_error(self):
+        with open(self.path, "wb") as not_a_recording:
+            not_a_recording.write(b"not a recording")
+
+        assert_that(calling(read_recording).with_args(self.path), raises(ValueError))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from hamcrest import *
+from mock import Mock
+from server_common.channel_access import AlarmSeverity, AlarmStatus
+
+from ReflectometryServer import ConfigHelper
+from ReflectometryServer.ca_recording import (
+    CA_RECORDER,
+    CaRecording,
+    RecordedEvent,
+    RecordKind,
+    read_recording,
+)
+from ReflectometryServer.ChannelAccess.ca_replay import ReplayChannelAccess, create_driver, replay
+from ReflectometryServer.pv_wrapper import set_default_channel_access
+from ReflectometryServer.synthetic_beamline import (
+    create_headless_beamline,
+    get_beamline,
+    move_simulated_motors,
+)
+from ReflectometryServer.test_modules.utils import DEFAULT_TEST_TOLERANCE, no_autosave
+
+PV = "TE:MOT:MTR0101.RBV"
+
+
+def _monitor_event(time, value):
+    return RecordedEvent(RecordKind.MONITOR, time, PV, value, AlarmSeverity.No, AlarmStatus.No)
+
+
+class TestReplayChannelAccess(unittest.TestCase):
+    def setUp(self):
+        recording = CaRecording({}, [_monitor_event(0.0, 1.0), _monitor_event(1.0, 2.0)])
+        self.ca = ReplayChannelAccess(recording)
+
+    def test_GIVEN_pv_in_recording_WHEN_read_THEN_first_recorded_value(self):
+        assert_that(self.ca.caget(PV), is_(1.0))
+
+    def test_GIVEN_motor_field_not_in_recording_WHEN_read_THEN_simulated_motor_value(self):
+        assert_that(self.ca.caget("TE:MOT:MTR0101.VELO"), is_(1.0))
+
+    def test_GIVEN_monitor_WHEN_event_posted_THEN_monitor_called_with_event_and_value_updated(self):
+        monitor = Mock()
+        self.ca.add_monitor(PV, monitor)
+
+        self.ca.post(PV, 2.0, AlarmSeverity.Minor, AlarmStatus.High)
+
+        monitor.assert_called_with(2.0, AlarmSeverity.Minor, AlarmStatus.High)
+        assert_that(self.ca.caget(PV), is_(2.0))
+
+    def test_GIVEN_pv_WHEN_written_THEN_write_counted_and_value_unchanged(self):
+        self.ca.caput(PV, 5.0)
+
+        assert_that(self.ca.put_count, is_(1))
+        assert_that(self.ca.caget(PV), is_(1.0))
+
+
+class TestReplay(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "recording.bin")
+        ConfigHelper.reset()
+
+    def tearDown(self):
+        CA_RECORDER.stop()
+        set_default_channel_access(None)
+        shutil.rmtree(self.directory)
+
+    @no_autosave
+    def test_GIVEN_recorded_session_with_move_WHEN_replayed_as_fast_as_possible_THEN_beamline_ends_as_recorded(
+        self,
+    ):
+        macros = {"SYNTHETIC_COMPONENTS": "6", "SYNTHETIC_BENCHES": "0", "SYNTHETIC_SLITS": "1"}
+        CA_RECORDER.start(self.path, macros)
+        beamline, _, simulated_motors = create_headless_beamline(components=6, benches=0, slits=1)
+        driver = create_driver(beamline)
+        self.addCleanup(driver.close)
+        driver.write("PARAM:C0:SP", 0.5)
+        move_simulated_motors(simulated_motors, 10)
+        CA_RECORDER.stop()
+        set_default_channel_access(None)
+
+        result = replay(read_recording(self.path), get_beamline, speed=None)
+
+        assert_that(result.beamline.parameter("C0").sp, close_to(0.5, DEFAULT_TEST_TOLERANCE))
+        assert_that(result.beamline.parameter("C0").rbv, close_to(0.5, DEFAULT_TEST_TOLERANCE))
+        assert_that(result.timings, has_entries({"write PARAM:C0:SP": has_length(1)}))
+        assert_that(result.timings, has_key("construction"))
+
+
+if __name__ == "__main__":
+    unittest.main()
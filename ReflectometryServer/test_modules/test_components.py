@@ -291,6 +291,20 @@ class TestObservationOfComponentReadback(unittest.TestCase):
         assert_that(self._value, is_(2))
         assert_that(result, expected_value)
 
+    def test_GIVEN_listener_WHEN_readback_changes_twice_THEN_listener_is_given_same_update_for_beam_path(
+        self,
+    ):
+        listener = Mock()
+        self.component.beam_path_rbv.add_listener(BeamPathUpdate, listener)
+        axis = self.component.beam_path_rbv.axis[ChangeAxis.POSITION]
+
+        axis.set_displacement(CorrectedReadbackUpdate(1, None, None))
+        axis.set_displacement(CorrectedReadbackUpdate(2, None, None))
+
+        first_update, second_update = [args[0][0] for args in listener.call_args_list]
+        assert_that(first_update, is_(BeamPathUpdate(self.component.beam_path_rbv)))
+        assert_that(second_update is first_update, is_(True))
+
 
 class TestThetaComponent(unittest.TestCase):
     def test_GIVEN_no_next_component_WHEN_get_read_back_THEN_nan_returned(self):
@@ -6,6 +6,7 @@ from parameterized import parameterized
 
 from ReflectometryServer import *
 from ReflectometryServer.beamline import ActiveModeUpdate
+from ReflectometryServer.custom_function_executor import DEFAULT_MAX_WORKERS, DEFAULT_TIMEOUT
 from ReflectometryServer.test_modules.data_mother import create_mock_axis
 from ReflectometryServer.test_modules.test_engineering_corrections import MockBeamline
 
@@ -78,6 +79,64 @@ class TestConfigHelper(unittest.TestCase):
         assert_that(ConfigHelper.parameters, only_contains(expected1, expected2))
         assert_that(result.parameters.values(), only_contains(expected1, expected2))
 
+    def test_GIVEN_parameter_added_with_monitor_deadband_WHEN_get_beamline_THEN_parameter_has_monitor_deadband(
+        self,
+    ):
+        expected_deadband = 0.1
+        comp = Component("1", PositionAndAngle(0, 0, 1))
+        param = AxisParameter("param1", comp, ChangeAxis.POSITION)
+        add_component(comp)
+
+        add_parameter(param, monitor_deadband=expected_deadband)
+
+        assert_that(param.monitor_deadband, is_(expected_deadband))
+
+    def test_GIVEN_parameter_added_with_rbv_deadband_WHEN_get_beamline_THEN_parameter_has_rbv_deadband(
+        self,
+    ):
+        expected_deadband = 0.1
+        comp = Component("1", PositionAndAngle(0, 0, 1))
+        param = AxisParameter("param1", comp, ChangeAxis.POSITION)
+        add_component(comp)
+
+        add_parameter(param, rbv_deadband=expected_deadband)
+
+        assert_that(param.rbv_deadband, is_(expected_deadband))
+
+    def test_GIVEN_parameter_added_with_custom_function_timeout_WHEN_get_beamline_THEN_parameter_has_timeout(
+        self,
+    ):
+        expected_timeout = 30.0
+        comp = Component("1", PositionAndAngle(0, 0, 1))
+        param = AxisParameter("param1", comp, ChangeAxis.POSITION)
+        add_component(comp)
+
+        add_parameter(param, custom_function_timeout=expected_timeout)
+
+        assert_that(param.custom_function_timeout, is_(expected_timeout))
+
+    @patch("ReflectometryServer.config_helper.CUSTOM_FUNCTION_EXECUTOR")
+    def test_GIVEN_custom_function_execution_set_WHEN_get_beamline_THEN_executor_configured(
+        self, executor
+    ):
+        set_custom_function_execution(4, timeout=60)
+        executor.configure.assert_not_called()
+
+        get_configured_beamline()
+
+        executor.configure.assert_called_once_with(4, 60)
+
+    @patch("ReflectometryServer.config_helper.CUSTOM_FUNCTION_EXECUTOR")
+    def test_GIVEN_custom_function_execution_set_WHEN_reset_and_get_beamline_THEN_executor_configured_with_defaults(
+        self, executor
+    ):
+        set_custom_function_execution(4, timeout=60)
+
+        ConfigHelper.reset()
+        get_configured_beamline()
+
+        executor.configure.assert_called_once_with(DEFAULT_MAX_WORKERS, DEFAULT_TIMEOUT)
+
     def test_GIVEN_no_mode_added_WHEN_get_beamline_THEN_modes_are_empty(self):
         result = get_configured_beamline()
 
@@ -210,6 +269,20 @@ class TestConfigHelper(unittest.TestCase):
                 contains_exactly(True, True),
             )
 
+    def test_GIVEN_add_slits_with_rbv_deadband_WHEN_get_parameters_in_config_THEN_slit_gaps_have_rbv_deadband(
+        self,
+    ):
+        expected_deadband = 0.01
+        with patch("ReflectometryServer.config_helper.create_jaws_pv_driver"):
+            add_slit_parameters(1, rbv_deadband=expected_deadband)
+
+            result = ConfigHelper.parameters
+
+            assert_that(
+                [parameter.rbv_deadband for parameter in result],
+                only_contains(expected_deadband),
+            )
+
     def test_GIVEN_add_slits_and_gaps_WHEN_get_parameters_in_config_THEN_parameters_for_all_slit_gaps_and_centres_exist(
         self,
     ):
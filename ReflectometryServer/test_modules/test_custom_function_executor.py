@@ -0,0 +1,158 @@
+import threading
+import unittest
+
+from hamcrest import *
+from mock import Mock
+
+from ReflectometryServer.custom_function_executor import (
+    TIMED_OUT_DESCRIPTION,
+    CustomFunctionExecutor,
+    CustomFunctionStatusUpdate,
+)
+from ReflectometryServer.server_status_manager import STATUS_MANAGER
+
+TIMEOUT = 5
+
+
+class TestCustomFunctionExecutor(unittest.TestCase):
+    def setUp(self):
+        STATUS_MANAGER.clear_all()
+        self.executor = CustomFunctionExecutor(max_workers=2)
+        self.release = threading.Event()
+        self.started = threading.Event()
+
+    def tearDown(self):
+        self.release.set()
+
+    def _blocking_function(self, *args):
+        self.started.set()
+        self.release.wait(TIMEOUT)
+        return args
+
+    def test_GIVEN_custom_function_WHEN_submit_THEN_function_called_with_arguments(self):
+        function = Mock(return_value="done")
+
+        future = self.executor.submit("theta", function, 1, 2)
+
+        assert_that(future.result(TIMEOUT), is_("done"))
+        function.assert_called_once_with(1, 2)
+
+    def test_GIVEN_custom_function_running_for_parameter_WHEN_submit_for_same_parameter_THEN_waits_until_first_finishes(
+        self,
+    ):
+        order = []
+        first = self.executor.submit("theta", self._blocking_function, "first")
+        self.started.wait(TIMEOUT)
+
+        second = self.executor.submit("theta", order.append, "second")
+        second_ran_while_first_running = second.done()
+        self.release.set()
+        first.result(TIMEOUT)
+        second.result(TIMEOUT)
+
+        assert_that(second_ran_while_first_running, is_(False))
+        assert_that(order, contains_exactly("second"))
+
+    def test_GIVEN_custom_function_running_for_parameter_WHEN_submit_for_other_parameter_THEN_runs_without_waiting(
+        self,
+    ):
+        self.executor.submit("theta", self._blocking_function)
+        self.started.wait(TIMEOUT)
+
+        result = self.executor.submit("height", lambda: "other").result(TIMEOUT)
+
+        assert_that(result, is_("other"))
+
+    def test_GIVEN_call_waiting_for_parameter_WHEN_submit_for_same_parameter_THEN_waiting_call_cancelled(
+        self,
+    ):
+        order = []
+        first = self.executor.submit("theta", self._blocking_function)
+        self.started.wait(TIMEOUT)
+
+        superseded = self.executor.submit("theta", order.append, "superseded")
+        latest = self.executor.submit("theta", order.append, "latest")
+        self.release.set()
+        first.result(TIMEOUT)
+        latest.result(TIMEOUT)
+
+        assert_that(superseded.cancelled(), is_(True))
+        assert_that(order, contains_exactly("latest"))
+        assert_that(self.executor.superseded_count, is_(1))
+
+    def test_GIVEN_calls_running_and_waiting_WHEN_queue_depth_THEN_both_counted(self):
+        self.executor.submit("theta", self._blocking_function)
+        self.started.wait(TIMEOUT)
+        self.executor.submit("theta", lambda: None)
+
+        result = self.executor.queue_depth
+
+        assert_that(result, is_(2))
+        assert_that(self.executor.running, contains_exactly("theta"))
+
+    def test_GIVEN_timeout_WHEN_custom_function_runs_for_longer_THEN_error_reported(self):
+        future = self.executor.submit("theta", self._blocking_function, timeout=0.01)
+        self.started.wait(TIMEOUT)
+
+        while self.executor.timed_out_count == 0 and not future.done():
+            threading.Event().wait(0.01)
+        self.release.set()
+        future.result(TIMEOUT)
+
+        assert_that(self.executor.timed_out_count, is_(1))
+        assert_that(STATUS_MANAGER.error_log, contains_string("theta"))
+
+    def test_GIVEN_custom_function_timed_out_WHEN_it_finishes_THEN_problem_cleared(self):
+        finished = threading.Event()
+        self.executor.add_listener(
+            CustomFunctionStatusUpdate, lambda update: update.queue_depth == 0 and finished.set()
+        )
+        future = self.executor.submit("theta", self._blocking_function, timeout=0.01)
+        self.started.wait(TIMEOUT)
+        while TIMED_OUT_DESCRIPTION not in STATUS_MANAGER.active_warnings and not future.done():
+            threading.Event().wait(0.01)
+        sources_while_running = set(STATUS_MANAGER.active_warnings.get(TIMED_OUT_DESCRIPTION, []))
+
+        self.release.set()
+        finished.wait(TIMEOUT)
+
+        assert_that(sources_while_running, is_({"theta"}))
+        assert_that(STATUS_MANAGER.active_warnings, is_({}))
+
+    def test_GIVEN_custom_function_raises_WHEN_submit_THEN_exception_on_future(self):
+        def _raise():
+            raise ValueError("Oh Dear")
+
+        future = self.executor.submit("theta", _raise)
+
+        assert_that(calling(future.result).with_args(TIMEOUT), raises(ValueError))
+
+    def test_GIVEN_listener_WHEN_custom_function_runs_THEN_status_updates_sent(self):
+        listener = Mock()
+        self.executor.add_listener(CustomFunctionStatusUpdate, listener)
+
+        self.executor.submit("theta", self._blocking_function)
+
+        update = listener.call_args[0][0]
+        assert_that(update.queue_depth, is_(1))
+
+    def test_GIVEN_default_executor_WHEN_custom_function_running_THEN_function_for_other_parameter_waits(
+        self,
+    ):
+        executor = CustomFunctionExecutor()
+        executor.submit("theta", self._blocking_function)
+        self.started.wait(TIMEOUT)
+
+        other = executor.submit("height", lambda: "other")
+        other_ran_while_first_running = other.done()
+        self.release.set()
+
+        assert_that(other_ran_while_first_running, is_(False))
+        assert_that(other.result(TIMEOUT), is_("other"))
+
+    def test_GIVEN_no_workers_WHEN_configure_THEN_error(self):
+        assert_that(calling(self.executor.configure).with_args(0), raises(ValueError))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+import json
+import unittest
+
+from hamcrest import *
+from mock import patch
+
+from ReflectometryServer.dependency_graph import (
+    FOOTPRINT_NODE,
+    DependencyGraph,
+    compile_dependency_graph,
+)
+from ReflectometryServer.footprint_calc import BaseFootprintSetup
+from ReflectometryServer.test_modules.data_mother import DataMother
+from ReflectometryServer.test_modules.utils import no_autosave
+
+
+class TestDependencyGraph(unittest.TestCase):
+    def setUp(self):
+        self.graph = DependencyGraph()
+        self.graph.add_edge("a", "c")
+        self.graph.add_edge("b", "c")
+        self.graph.add_edge("c", "d")
+        self.graph.add_edge("a", "d")
+        self.graph.add_node("e")
+
+    def test_GIVEN_graph_WHEN_topological_order_THEN_each_node_after_nodes_which_affect_it(self):
+        result = self.graph.topological_order()
+
+        assert_that(result, contains_exactly("a", "b", "e", "c", "d"))
+
+    def test_GIVEN_graph_WHEN_affected_by_THEN_all_nodes_reachable_in_topological_order(self):
+        result = self.graph.affected_by("b")
+
+        assert_that(result, contains_exactly("c", "d"))
+
+    def test_GIVEN_graph_WHEN_affected_by_node_with_no_successors_THEN_nothing_affected(self):
+        result = self.graph.affected_by("e")
+
+        assert_that(result, is_([]))
+
+    def test_GIVEN_graph_WHEN_affected_by_unknown_node_THEN_error(self):
+        assert_that(calling(self.graph.affected_by).with_args("unknown"), raises(ValueError))
+
+    def test_GIVEN_graph_with_cycle_WHEN_topological_order_THEN_error(self):
+        self.graph.add_edge("d", "a")
+
+        assert_that(calling(self.graph.topological_order), raises(ValueError))
+
+    def test_GIVEN_graph_WHEN_to_json_THEN_json_contains_nodes_and_edges(self):
+        result = json.loads(self.graph.to_json())
+
+        assert_that(result["nodes"], contains_exactly("a", "b", "e", "c", "d"))
+        assert_that(
+            result["edges"], contains_inanyorder(["a", "c"], ["a", "d"], ["b", "c"], ["c", "d"])
+        )
+
+
+class TestCompiledDependencyGraph(unittest.TestCase):
+    @no_autosave
+    def setUp(self):
+        self.beamline, _ = DataMother.beamline_s1_s3_theta_detector(spacing=10)
+        self.graph = self.beamline.dependency_graph
+
+    def test_GIVEN_beamline_WHEN_parameter_on_component_which_does_not_reflect_changes_THEN_only_its_component_and_driver_affected(
+        self,
+    ):
+        result = self.graph.affected_by("parameter:s1")
+
+        assert_that(result, contains_exactly("component:s1_comp", "driver:MOT:MTR0101"))
+
+    def test_GIVEN_beamline_WHEN_theta_changes_THEN_all_downstream_components_and_their_drivers_affected(
+        self,
+    ):
+        result = self.graph.affected_by("parameter:theta")
+
+        assert_that(
+            result,
+            contains_inanyorder(
+                "component:ThetaComp_comp",
+                "component:s3_comp",
+                "component:Detector_comp",
+                "driver:MOT:MTR0102",
+                "driver:MOT:MTR0104",
+                "driver:MOT:MTR0105",
+            ),
+        )
+        assert_that(result[0], is_("component:ThetaComp_comp"))
+
+    def test_GIVEN_beamline_WHEN_changes_beam_downstream_THEN_only_reflecting_components_change_beam(
+        self,
+    ):
+        result = {
+            component.name: self.graph.changes_beam_downstream(component.name)
+            for component in self.beamline
+        }
+
+        assert_that(
+            result,
+            is_(
+                {
+                    "s1_comp": False,
+                    "ThetaComp_comp": True,
+                    "s3_comp": False,
+                    "Detector_comp": False,
+                }
+            ),
+        )
+
+    def test_GIVEN_footprint_setup_with_theta_WHEN_compile_THEN_theta_affects_footprint(self):
+        theta = self.beamline.parameter("theta")
+
+        result = compile_dependency_graph(
+            list(self.beamline),
+            list(self.beamline.parameters.values()),
+            self.beamline.drivers,
+            BaseFootprintSetup(theta=theta),
+        )
+
+        assert_that(result.affected_by("parameter:theta"), has_item(FOOTPRINT_NODE))
+
+    def test_GIVEN_beamline_WHEN_component_which_does_not_reflect_moves_THEN_downstream_beam_paths_not_recalculated(
+        self,
+    ):
+        s1 = self.beamline.parameter("s1")
+        s3_comp = self.beamline[2]
+
+        with patch.object(s3_comp.beam_path_set_point, "set_incoming_beam") as set_incoming_beam:
+            s1.sp_no_move = 1.0
+            s1.move_to_sp_no_callback()
+
+        set_incoming_beam.assert_not_called()
+
+    def test_GIVEN_beamline_WHEN_theta_moves_THEN_downstream_beam_paths_recalculated(self):
+        theta = self.beamline.parameter("theta")
+        s3_comp = self.beamline[2]
+
+        with patch.object(s3_comp.beam_path_set_point, "set_incoming_beam") as set_incoming_beam:
+            theta.sp_no_move = 1.0
+            theta.move_to_sp_no_callback()
+
+        set_incoming_beam.assert_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
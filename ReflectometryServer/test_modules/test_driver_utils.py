@@ -1,12 +1,44 @@
+import json
+import threading
 import unittest
 
 from hamcrest import *
+from mock import Mock, patch
+from pcaspy import Severity
 from server_common.channel_access import AlarmSeverity, AlarmStatus
+from server_common.utilities import convert_from_json, dehex_and_decompress
 
+from ReflectometryServer import ConfigHelper
 from ReflectometryServer.beamline import Beamline, BeamlineMode
-from ReflectometryServer.ChannelAccess.driver_utils import DriverParamHelper
-from ReflectometryServer.ChannelAccess.pv_manager import PVManager
-from ReflectometryServer.parameters import EnumParameter, ParameterUpdateBase
+from ReflectometryServer.ChannelAccess.ca_replay import create_driver
+from ReflectometryServer.ChannelAccess.driver_utils import (
+    DriverParamHelper,
+    PublishedState,
+    PvSort,
+)
+from ReflectometryServer.ChannelAccess.pv_manager import (
+    BEAMLINE_MOVE,
+    PARAM_SNAPSHOT,
+    SERVER_MESSAGE,
+    SERVER_STATUS,
+    SEVR_FIELD,
+    PVManager,
+)
+from ReflectometryServer.components import Component
+from ReflectometryServer.geometry import ChangeAxis, PositionAndAngle
+from ReflectometryServer.ioc_driver import IocDriver
+from ReflectometryServer.model_actor import MODEL_ACTOR, CommandPriority
+from ReflectometryServer.parameters import AxisParameter, EnumParameter, ParameterUpdateBase
+from ReflectometryServer.pv_wrapper import (
+    PROCESS_MONITOR_EVENTS,
+    ReadbackUpdate,
+    SetpointUpdate,
+    set_default_channel_access,
+)
+from ReflectometryServer.server_status_manager import STATUS, STATUS_MANAGER, ProblemInfo
+from ReflectometryServer.synthetic_beamline import create_headless_beamline, move_simulated_motors
+from ReflectometryServer.test_modules.data_mother import DataMother, create_mock_axis
+from ReflectometryServer.test_modules.utils import no_autosave
 
 
 class TestDriverUtils(unittest.TestCase):
@@ -126,6 +158,427 @@ class TestDriverUtils(unittest.TestCase):
         assert_that(result_severity, is_(expected_severity))
         assert_that(result_status, is_(expected_status))
 
+    def test_GIVEN_enum_param_WHEN_get_param_snapshot_THEN_snapshot_contains_parameter_state(self):
+        self.param.sp = self.opt1
+
+        result = self.driver_helper.get_param_snapshot()
+
+        assert_that(
+            result,
+            contains_exactly(
+                has_entries(
+                    {
+                        "name": self.param_name,
+                        "sp": self.opt1,
+                        "sp_rbv": self.opt1,
+                        "rbv": self.opt1,
+                        "at_sp": True,
+                        "changing": False,
+                    }
+                )
+            ),
+        )
+
+
+class TestBulkParamWrite(unittest.TestCase):
+    @no_autosave
+    def setUp(self) -> None:
+        self.comp = Component("comp", PositionAndAngle(0, 0, 90))
+        self.float_param = AxisParameter("HEIGHT", self.comp, ChangeAxis.POSITION)
+        self.float_param.sp_no_move = 0.0
+        self.options = ["opt1", "opt2"]
+        self.enum_custom_function = Mock(return_value=None)
+        self.enum_param = EnumParameter(
+            "ENUM", self.options, custom_function=self.enum_custom_function
+        )
+        self.high_limit = 10.0
+        self.axis = create_mock_axis("MOT:MTR0101", 0, 1, llm=-self.high_limit, hlm=self.high_limit)
+        bl = Beamline(
+            [self.comp],
+            [self.float_param, self.enum_param],
+            [IocDriver(self.comp, ChangeAxis.POSITION, self.axis)],
+            [BeamlineMode("mode", [])],
+        )
+        self.axis.trigger_listeners(SetpointUpdate(0.0, AlarmSeverity.No, AlarmStatus.No))
+
+        pvmanager = PVManager()
+        pvmanager.set_beamline(bl)
+
+        self.driver_helper = DriverParamHelper(pvmanager, bl)
+
+    def test_GIVEN_valid_setpoints_WHEN_bulk_write_with_no_move_THEN_setpoints_set_and_not_moved(
+        self,
+    ):
+        expected_height = 1.5
+        expected_option = self.options[1]
+
+        errors = self.driver_helper.bulk_param_write(
+            json.dumps({"HEIGHT": expected_height, "ENUM": expected_option}), move=False
+        )
+
+        assert_that(errors, is_({}))
+        assert_that(self.float_param.sp_no_move, is_(expected_height))
+        assert_that(self.float_param.sp_changed, is_(True))
+        assert_that(self.enum_param.sp_no_move, is_(expected_option))
+
+    def test_GIVEN_valid_setpoints_WHEN_bulk_write_with_move_THEN_setpoints_are_moved_to(self):
+        expected_height = 1.5
+
+        errors = self.driver_helper.bulk_param_write(
+            json.dumps({"HEIGHT": expected_height}), move=True
+        )
+
+        assert_that(errors, is_({}))
+        assert_that(self.float_param.sp_rbv, is_(expected_height))
+        assert_that(self.float_param.sp_changed, is_(False))
+
+    def test_GIVEN_one_invalid_setpoint_WHEN_bulk_write_THEN_no_setpoints_set_and_error_reported_for_invalid_parameter(
+        self,
+    ):
+        errors = self.driver_helper.bulk_param_write(
+            json.dumps({"HEIGHT": 1.5, "ENUM": "not an option"}), move=False
+        )
+
+        assert_that(errors, only_contains("ENUM"))
+        assert_that(self.float_param.sp_no_move, is_(0.0))
+
+    def test_GIVEN_unknown_parameter_WHEN_bulk_write_THEN_error_reported_for_parameter(self):
+        errors = self.driver_helper.bulk_param_write(json.dumps({"UNKNOWN": 1.0}), move=False)
+
+        assert_that(errors, has_key("UNKNOWN"))
+
+    def test_GIVEN_float_parameter_WHEN_bulk_write_string_THEN_error_reported_for_parameter(self):
+        errors = self.driver_helper.bulk_param_write(json.dumps({"HEIGHT": "1.0"}), move=False)
+
+        assert_that(errors, has_key("HEIGHT"))
+
+    def test_GIVEN_invalid_json_WHEN_bulk_write_THEN_error_reported(self):
+        errors = self.driver_helper.bulk_param_write("{HEIGHT: 1.0", move=False)
+
+        assert_that(errors, has_length(1))
+
+    def test_GIVEN_float_parameter_WHEN_bulk_write_nan_THEN_error_reported_for_parameter(self):
+        errors = self.driver_helper.bulk_param_write('{"HEIGHT": NaN}', move=False)
+
+        assert_that(errors, has_key("HEIGHT"))
+        assert_that(self.float_param.sp_no_move, is_(0.0))
+
+    @no_autosave
+    def test_GIVEN_setpoints_with_one_outside_driver_limits_WHEN_bulk_write_with_move_THEN_previous_setpoints_put_back_and_not_moved(
+        self,
+    ):
+        previous_enum_sp_rbv = self.enum_param.sp_rbv
+
+        errors = self.driver_helper.bulk_param_write(
+            json.dumps({"HEIGHT": self.high_limit + 1, "ENUM": self.options[1]}), move=True
+        )
+
+        assert_that(errors, has_key(""))
+        assert_that(self.float_param.sp_rbv, is_(0.0))
+        assert_that(self.float_param.sp_no_move, is_(0.0))
+        assert_that(self.enum_param.sp_rbv, is_(previous_enum_sp_rbv))
+        assert_that(
+            self.comp.beam_path_set_point.axis[ChangeAxis.POSITION].get_displacement(), is_(0.0)
+        )
+        assert_that(self.axis.sp, is_(0))
+
+    @no_autosave
+    @patch("ReflectometryServer.parameters.param_float_autosave.write_parameter")
+    @patch("ReflectometryServer.parameters.CUSTOM_FUNCTION_EXECUTOR")
+    def test_GIVEN_other_parameter_with_changed_setpoint_WHEN_bulk_write_with_move_outside_limits_THEN_its_setpoints_put_back_and_no_custom_function_or_autosave(
+        self, custom_function_executor, write_parameter
+    ):
+        self.enum_param.sp_no_move = self.options[1]
+        previous_enum_sp_rbv = self.enum_param.sp_rbv
+
+        errors = self.driver_helper.bulk_param_write(
+            json.dumps({"HEIGHT": self.high_limit + 1}), move=True
+        )
+
+        assert_that(errors, has_key(""))
+        assert_that(self.enum_param.sp_no_move, is_(self.options[1]))
+        assert_that(self.enum_param.sp_rbv, is_(previous_enum_sp_rbv))
+        assert_that(self.enum_param.sp_changed, is_(True))
+        custom_function_executor.submit.assert_not_called()
+        write_parameter.assert_not_called()
+
+    @no_autosave
+    @patch("ReflectometryServer.parameters.param_float_autosave.write_parameter")
+    @patch("ReflectometryServer.parameters.CUSTOM_FUNCTION_EXECUTOR")
+    def test_GIVEN_setpoints_within_limits_WHEN_bulk_write_with_move_THEN_custom_function_run_and_setpoint_autosaved(
+        self, custom_function_executor, write_parameter
+    ):
+        errors = self.driver_helper.bulk_param_write(
+            json.dumps({"ENUM": self.options[1]}), move=True
+        )
+
+        assert_that(errors, is_({}))
+        custom_function_executor.submit.assert_called_once()
+        write_parameter.assert_called_once_with("ENUM", self.options[1])
+
+
+class TestCoalescedParamWrite(unittest.TestCase):
+    @no_autosave
+    def setUp(self) -> None:
+        self.beamline, _ = DataMother.beamline_s1_s3_theta_detector(spacing=10)
+        self.beamline.move_coalescing_window = 10
+        self.beamline._perform_move_for_all_drivers = Mock()
+        self.pvmanager = PVManager()
+        self.pvmanager.set_beamline(self.beamline)
+        self.on_move = Mock()
+
+        self.driver_helper = DriverParamHelper(
+            self.pvmanager, self.beamline, on_coalesced_move=self.on_move
+        )
+
+    def tearDown(self) -> None:
+        self.driver_helper._move_coalescer.flush()
+
+    def _sp_pv_name(self, param_name):
+        for pv_name, (name, sort) in self.pvmanager.param_names_pv_names_and_sort():
+            if name == param_name and sort == PvSort.SP:
+                return pv_name
+
+    def test_GIVEN_move_coalescing_window_WHEN_setpoints_written_THEN_parameters_not_moved_until_window_ends(
+        self,
+    ):
+        self.driver_helper.param_write(self._sp_pv_name("s3"), 3.0)
+        self.driver_helper.param_write(self._sp_pv_name("s1"), 1.0)
+
+        assert_that(self.beamline.parameter("s1").sp, is_(1.0))
+        assert_that(self.beamline.parameter("s1").sp_changed, is_(True))
+        self.beamline._perform_move_for_all_drivers.assert_not_called()
+
+    def test_GIVEN_move_coalescing_window_WHEN_setpoints_written_and_window_ends_THEN_parameters_moved_with_one_driver_move(
+        self,
+    ):
+        self.driver_helper.param_write(self._sp_pv_name("s3"), 3.0)
+        self.driver_helper.param_write(self._sp_pv_name("s1"), 1.0)
+
+        self.driver_helper._move_coalescer.flush()
+
+        assert_that(self.beamline.parameter("s1").sp_rbv, is_(1.0))
+        assert_that(self.beamline.parameter("s3").sp_rbv, is_(3.0))
+        self.beamline._perform_move_for_all_drivers.assert_called_once()
+        self.on_move.assert_called_once()
+
+    def test_GIVEN_model_actor_not_running_and_write_in_progress_WHEN_window_ends_THEN_move_made_after_write(
+        self,
+    ):
+        write_started = threading.Event()
+        release_write = threading.Event()
+
+        def _write():
+            write_started.set()
+            release_write.wait(5)
+
+        write_thread = threading.Thread(
+            target=MODEL_ACTOR.call, args=(_write, CommandPriority.USER_WRITE)
+        )
+        write_thread.start()
+        write_started.wait(5)
+        self.driver_helper.param_write(self._sp_pv_name("s1"), 1.0)
+        timer_thread = threading.Thread(target=self.driver_helper._move_coalescer.flush)
+        timer_thread.start()
+
+        timer_thread.join(0.1)
+        moved_during_write = self.beamline._perform_move_for_all_drivers.called
+        release_write.set()
+        write_thread.join(5)
+        timer_thread.join(5)
+
+        assert_that(MODEL_ACTOR.is_running, is_(False))
+        assert_that(moved_during_write, is_(False))
+        self.beamline._perform_move_for_all_drivers.assert_called_once()
+
+
+class TestPublishedState(unittest.TestCase):
+    def setUp(self):
+        self.state = PublishedState({"PV": 1.0}, {"PV": (AlarmSeverity.No, AlarmStatus.No)})
+
+    def test_GIVEN_published_state_WHEN_read_value_and_alarms_THEN_published_values_returned(self):
+        result = (
+            self.state.value("PV"),
+            self.state.alarm_severity("PV"),
+            self.state.alarm_status("PV"),
+        )
+
+        assert_that(result, is_((1.0, AlarmSeverity.No, AlarmStatus.No)))
+
+    def test_GIVEN_published_state_WHEN_read_pv_not_published_THEN_key_error(self):
+        assert_that(calling(self.state.value).with_args("OTHER"), raises(KeyError))
+
+    def test_GIVEN_published_state_WHEN_updated_THEN_new_state_has_changes_and_original_is_unchanged(
+        self,
+    ):
+        result = self.state.updated(
+            {"PV": 2.0, "OTHER": "value"}, {"PV": (AlarmSeverity.Major, AlarmStatus.HiHi)}
+        )
+
+        assert_that(result.value("PV"), is_(2.0))
+        assert_that(result.value("OTHER"), is_("value"))
+        assert_that(result.alarm_severity("PV"), is_(AlarmSeverity.Major))
+        assert_that(self.state.value("PV"), is_(1.0))
+        assert_that(self.state.alarm_severity("PV"), is_(AlarmSeverity.No))
+
+    def test_GIVEN_values_dictionary_WHEN_dictionary_changed_after_publish_THEN_published_state_unchanged(
+        self,
+    ):
+        values = {"PV": 1.0}
+        state = PublishedState(values, {})
+
+        values["PV"] = 2.0
+
+        assert_that(state.value("PV"), is_(1.0))
+
+    def test_GIVEN_many_updates_WHEN_changes_merged_into_shared_values_THEN_earlier_states_unchanged(
+        self,
+    ):
+        states = [self.state]
+        for index in range(10):
+            states.append(
+                states[-1].updated(
+                    {"PV{}".format(index): index}, {"PV": (AlarmSeverity.Minor, index)}
+                )
+            )
+
+        assert_that(states[-1].value("PV"), is_(1.0))
+        assert_that(states[-1].value("PV9"), is_(9))
+        assert_that(states[-1].alarm_status("PV"), is_(9))
+        assert_that(states[5].value("PV4"), is_(4))
+        assert_that(calling(states[5].value).with_args("PV5"), raises(KeyError))
+        assert_that(states[5].alarm_status("PV"), is_(4))
+
+
+class TestDriverPublishing(unittest.TestCase):
+    def setUp(self):
+        ConfigHelper.reset()
+
+    def tearDown(self):
+        STATUS_MANAGER.clear_all()
+        set_default_channel_access(None)
+
+    @no_autosave
+    def test_GIVEN_driver_WHEN_batch_of_readbacks_processed_THEN_state_published_once_with_new_readbacks(
+        self,
+    ):
+        beamline, axes, _ = create_headless_beamline(components=6, benches=0, slits=1)
+        driver = create_driver(beamline)
+        self.addCleanup(driver.close)
+        events = {
+            name: (axis.trigger_listeners, ReadbackUpdate(0.5, AlarmSeverity.No, AlarmStatus.No))
+            for name, axis in axes.items()
+        }
+        readback_before = driver.read("PARAM:C0")
+
+        with patch.object(
+            PublishedState, "updated", autospec=True, side_effect=PublishedState.updated
+        ) as published_state_updated:
+            PROCESS_MONITOR_EVENTS._trigger_events(events)
+
+        assert_that(published_state_updated.call_count, is_(1))
+        assert_that(driver.read("PARAM:C0"), is_(driver.getParam("PARAM:C0")))
+        assert_that(driver.read("PARAM:C0"), is_not(close_to(readback_before, 1e-6)))
+
+    @no_autosave
+    def test_GIVEN_driver_WHEN_server_status_is_error_THEN_status_read_with_its_alarm(self):
+        beamline, _, _ = create_headless_beamline(components=6, benches=0, slits=1)
+        driver = create_driver(beamline)
+        self.addCleanup(driver.close)
+
+        STATUS_MANAGER.update_active_problems(ProblemInfo("problem", "test", Severity.MAJOR_ALARM))
+
+        assert_that(
+            driver.read(SERVER_STATUS), is_(STATUS.status_codes().index(STATUS.ERROR.value))
+        )
+        assert_that(driver.read(SERVER_STATUS + SEVR_FIELD), is_(Severity.MAJOR_ALARM))
+
+    @no_autosave
+    def test_GIVEN_driver_WHEN_server_status_changes_THEN_status_published_without_reading_model(
+        self,
+    ):
+        beamline, _, _ = create_headless_beamline(components=6, benches=0, slits=1)
+        driver = create_driver(beamline)
+        self.addCleanup(driver.close)
+        driver._footprint_manager = Mock()
+
+        STATUS_MANAGER.update_active_problems(ProblemInfo("problem", "test", Severity.MAJOR_ALARM))
+
+        driver._footprint_manager.get_sample_length.assert_not_called()
+        assert_that(driver.read(SERVER_MESSAGE), contains_string("problem"))
+
+    @no_autosave
+    def test_GIVEN_driver_WHEN_beamline_move_written_THEN_move_read_as_zero(self):
+        beamline, _, _ = create_headless_beamline(components=6, benches=0, slits=1)
+        driver = create_driver(beamline)
+        self.addCleanup(driver.close)
+
+        driver.write(BEAMLINE_MOVE, 1)
+
+        assert_that(driver.read(BEAMLINE_MOVE), is_(0))
+
+
+class TestDriverParamSnapshot(unittest.TestCase):
+    def setUp(self):
+        ConfigHelper.reset()
+
+    def tearDown(self):
+        set_default_channel_access(None)
+
+    @no_autosave
+    def test_GIVEN_parameter_moved_WHEN_readbacks_processed_THEN_snapshot_has_new_readback(self):
+        beamline, _, simulated_motors = create_headless_beamline(components=6, benches=0, slits=1)
+        driver = create_driver(beamline)
+        self.addCleanup(driver.close)
+        beamline.parameter("C0").sp = 0.5
+
+        move_simulated_motors(simulated_motors, 10)
+        PROCESS_MONITOR_EVENTS.wait_for_processing()
+
+        snapshot = convert_from_json(dehex_and_decompress(driver.getParam(PARAM_SNAPSHOT)))
+        assert_that(
+            snapshot,
+            has_item(has_entries({"name": "C0", "rbv": close_to(0.5, 1e-6), "at_sp": True})),
+        )
+
+    @no_autosave
+    def test_GIVEN_readback_is_nan_WHEN_readbacks_processed_THEN_snapshot_has_null_readback(self):
+        beamline, axes, _ = create_headless_beamline(components=6, benches=0, slits=1)
+        driver = create_driver(beamline)
+        self.addCleanup(driver.close)
+
+        PROCESS_MONITOR_EVENTS._trigger_events(
+            {
+                name: (
+                    axis.trigger_listeners,
+                    ReadbackUpdate(float("NaN"), AlarmSeverity.No, AlarmStatus.No),
+                )
+                for name, axis in axes.items()
+            }
+        )
+
+        snapshot = convert_from_json(dehex_and_decompress(driver.getParam(PARAM_SNAPSHOT)))
+        assert_that(snapshot, has_item(has_entries({"name": "C0", "rbv": None})))
+
+    @no_autosave
+    def test_GIVEN_driver_closed_WHEN_readbacks_processed_THEN_snapshot_not_updated(self):
+        beamline, axes, _ = create_headless_beamline(components=6, benches=0, slits=1)
+        driver = create_driver(beamline)
+        snapshot_before = driver.getParam(PARAM_SNAPSHOT)
+
+        driver.close()
+        PROCESS_MONITOR_EVENTS._trigger_events(
+            {
+                name: (
+                    axis.trigger_listeners,
+                    ReadbackUpdate(0.5, AlarmSeverity.No, AlarmStatus.No),
+                )
+                for name, axis in axes.items()
+            }
+        )
+
+        assert_that(driver.getParam(PARAM_SNAPSHOT), is_(snapshot_before))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -89,6 +89,16 @@ class TestHeightDriver(unittest.TestCase):
         assert_that(self.height_axis.velocity, is_(expected_velocity))
         assert_that(self.height_axis.sp, is_(target_position))
 
+    def test_GIVEN_motor_target_WHEN_moving_axis_THEN_motor_target_is_set_instead_of_component_setpoint(
+        self,
+    ):
+        expected_target = 20.5
+        self.jaws.beam_path_set_point.axis[ChangeAxis.POSITION].set_relative_to_beam(20.0)
+
+        self.jaws_driver.perform_move(4.0, True, motor_target=expected_target)
+
+        assert_that(self.height_axis.sp, is_(expected_target))
+
     def test_GIVEN_displacement_changed_WHEN_listeners_on_axis_triggered_THEN_listeners_on_driving_layer_triggered(
         self,
     ):
@@ -551,6 +561,7 @@ class BeamlineMoveDurationTest(unittest.TestCase):
         slit_2 = Component("slit_2", setup=PositionAndAngle(y=0.0, z=20.0, angle=90.0))
         slit_2_height_axis = create_mock_axis("SLIT2:HEIGHT", 0.0, 10.0)
         self.slit_2_driver = MagicMock(IocDriver)
+        self.slit_2_driver.name = "SLIT2:HEIGHT"
         self.slit_2_driver.check_limits_against_sps = MagicMock(return_value=(True, 0, 0, 0))
         self.slit_2_driver.get_max_move_duration = MagicMock(return_value=0)
         self.slit_2_driver.component = slit_2
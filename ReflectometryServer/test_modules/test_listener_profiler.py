@@ -0,0 +1,182 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from collections import namedtuple
+
+from hamcrest import *
+from mock import Mock
+from server_common.observable import observable
+
+from ReflectometryServer import ConfigHelper
+from ReflectometryServer.listener_profiler import ListenerProfiler
+from ReflectometryServer.pv_wrapper import set_default_channel_access
+from ReflectometryServer.synthetic_beamline import create_headless_beamline, move_simulated_motors
+from ReflectometryServer.test_modules.utils import no_autosave
+
+FirstUpdate = namedtuple("FirstUpdate", ["value"])
+SecondUpdate = namedtuple("SecondUpdate", ["value"])
+
+
+@observable(FirstUpdate)
+class First:
+    pass
+
+
+@observable(SecondUpdate)
+class Second:
+    pass
+
+
+class TestListenerProfiler(unittest.TestCase):
+    def setUp(self):
+        self.profiler = ListenerProfiler()
+        self.profiler.install([First, Second])
+
+    def tearDown(self):
+        self.profiler.uninstall()
+
+    def _listener_stats(self, listener_name):
+        return [
+            entry
+            for entry in self.profiler.profile(None).listeners
+            if entry["listener"] == listener_name
+        ]
+
+    def test_GIVEN_listener_WHEN_triggered_twice_THEN_calls_counted_and_listener_called(self):
+        first = First()
+        listener = Mock(__qualname__="listener")
+        first.add_listener(FirstUpdate, listener)
+
+        first.trigger_listeners(FirstUpdate(1))
+        first.trigger_listeners(FirstUpdate(2))
+
+        listener.assert_called_with(FirstUpdate(2))
+        assert_that(
+            self._listener_stats("listener"),
+            contains_exactly(has_entries({"update": "FirstUpdate", "count": 2})),
+        )
+
+    def test_GIVEN_listener_which_triggers_another_observable_WHEN_triggered_THEN_cascade_depth_and_fan_out_recorded(
+        self,
+    ):
+        first = First()
+        second = Second()
+        first.add_listener(FirstUpdate, lambda update: second.trigger_listeners(SecondUpdate(1)))
+        second.add_listener(SecondUpdate, Mock(__qualname__="second_listener"))
+        second.add_listener(SecondUpdate, Mock(__qualname__="another_second_listener"))
+
+        first.trigger_listeners(FirstUpdate(1))
+
+        assert_that(
+            self.profiler.profile().cascades,
+            contains_exactly(
+                has_entries(
+                    {"event": "First.FirstUpdate", "count": 1, "max_depth": 2, "max_fan_out": 3}
+                )
+            ),
+        )
+
+    def test_GIVEN_listener_WHEN_removed_THEN_not_called(self):
+        first = First()
+        listener = Mock(__qualname__="listener")
+        first.add_listener(FirstUpdate, listener)
+
+        first.remove_listener(FirstUpdate, listener)
+        first.trigger_listeners(FirstUpdate(1))
+
+        listener.assert_not_called()
+
+    def test_GIVEN_bound_method_listener_WHEN_triggered_THEN_recorded_by_class_and_method_name(
+        self,
+    ):
+        first = First()
+        second = Second()
+        first.add_listener(FirstUpdate, second.trigger_listeners)
+
+        first.trigger_listeners(FirstUpdate(1))
+
+        assert_that(self._listener_stats("Second.trigger_listeners"), has_length(1))
+
+    def test_GIVEN_profile_WHEN_reset_THEN_profile_empty(self):
+        first = First()
+        first.add_listener(FirstUpdate, Mock(__qualname__="listener"))
+        first.trigger_listeners(FirstUpdate(1))
+
+        self.profiler.reset()
+
+        assert_that(self.profiler.profile(), is_(([], [])))
+
+    def test_GIVEN_many_listeners_WHEN_top_n_profiled_THEN_only_n_reported(self):
+        first = First()
+        for index in range(5):
+            first.add_listener(FirstUpdate, Mock(__qualname__="listener{}".format(index)))
+        first.trigger_listeners(FirstUpdate(1))
+
+        assert_that(self.profiler.profile(2).listeners, has_length(2))
+
+    def test_GIVEN_profile_WHEN_dumped_THEN_file_holds_whole_profile_as_json(self):
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, "profile.json")
+            first = First()
+            for index in range(3):
+                first.add_listener(FirstUpdate, Mock(__qualname__="listener{}".format(index)))
+            first.trigger_listeners(FirstUpdate(1))
+
+            self.profiler.dump(path)
+
+            with open(path) as dump_file:
+                profile = json.load(dump_file)
+            assert_that(profile["listeners"], has_length(3))
+            assert_that(profile["cascades"], has_length(1))
+        finally:
+            shutil.rmtree(directory)
+
+    def test_GIVEN_profiler_uninstalled_WHEN_listener_added_and_triggered_THEN_not_recorded(self):
+        self.profiler.uninstall()
+        first = First()
+        first.add_listener(FirstUpdate, Mock(__qualname__="listener"))
+
+        first.trigger_listeners(FirstUpdate(1))
+
+        assert_that(self.profiler.profile(), is_(([], [])))
+
+
+class TestListenerProfilerOnBeamline(unittest.TestCase):
+    def setUp(self):
+        ConfigHelper.reset()
+        self.profiler = ListenerProfiler()
+        self.profiler.install()
+
+    def tearDown(self):
+        self.profiler.uninstall()
+        set_default_channel_access(None)
+
+    @no_autosave
+    def test_GIVEN_profiler_installed_on_server_WHEN_beamline_moved_THEN_chain_from_motor_readbacks_profiled(
+        self,
+    ):
+        beamline, _, simulated_motors = create_headless_beamline(components=6, benches=0, slits=1)
+
+        beamline.parameter("C0").sp = 0.5
+        move_simulated_motors(simulated_motors, 10)
+
+        profile = self.profiler.profile(None)
+        assert_that(
+            [(entry["update"], entry["listener"]) for entry in profile.listeners],
+            has_item(("ReadbackUpdate", "IocDriver._on_update_rbv")),
+        )
+        assert_that(
+            profile.cascades,
+            has_item(
+                has_entries(
+                    {"event": "MotorPVWrapper.ReadbackUpdate", "max_depth": greater_than(2)}
+                )
+            ),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
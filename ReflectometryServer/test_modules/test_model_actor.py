@@ -0,0 +1,153 @@
+import threading
+import unittest
+from functools import partial
+
+from hamcrest import *
+
+from ReflectometryServer.model_actor import CommandPriority, ModelActor
+
+TIMEOUT = 5
+
+
+class TestModelActor(unittest.TestCase):
+    def setUp(self):
+        self.actor = ModelActor()
+
+    def tearDown(self):
+        self.actor.stop(TIMEOUT)
+
+    def _block_actor(self):
+        """
+        Submit a command which blocks the model thread until the returned event is set.
+        """
+        started = threading.Event()
+        release = threading.Event()
+
+        def _blocking_command():
+            started.set()
+            release.wait(TIMEOUT)
+
+        self.actor.submit(_blocking_command, CommandPriority.USER_WRITE)
+        started.wait(TIMEOUT)
+        return release
+
+    def test_GIVEN_actor_not_started_WHEN_call_THEN_function_run_on_calling_thread(self):
+        result = self.actor.call(threading.current_thread, CommandPriority.USER_WRITE)
+
+        assert_that(result, is_(threading.current_thread()))
+
+    def test_GIVEN_actor_not_started_and_command_running_on_other_thread_WHEN_call_THEN_function_run_after_command(
+        self,
+    ):
+        started = threading.Event()
+        release = threading.Event()
+        order = []
+
+        def _blocking_command():
+            started.set()
+            release.wait(TIMEOUT)
+            order.append("blocking")
+
+        other_thread = threading.Thread(
+            target=self.actor.call, args=(_blocking_command, CommandPriority.READBACK_BATCH)
+        )
+        other_thread.start()
+        started.wait(TIMEOUT)
+        threading.Timer(0.1, release.set).start()
+
+        self.actor.call(partial(order.append, "call"), CommandPriority.USER_WRITE)
+        other_thread.join(TIMEOUT)
+
+        assert_that(order, contains_exactly("blocking", "call"))
+
+    def test_GIVEN_actor_started_WHEN_call_THEN_function_run_on_model_thread_and_result_returned(
+        self,
+    ):
+        self.actor.start()
+
+        result = self.actor.call(
+            lambda: threading.current_thread().name, CommandPriority.USER_WRITE
+        )
+
+        assert_that(result, is_("model_actor"))
+
+    def test_GIVEN_actor_busy_WHEN_readback_batch_then_user_write_submitted_THEN_user_write_run_first(
+        self,
+    ):
+        self.actor.start()
+        order = []
+        release = self._block_actor()
+
+        readback = self.actor.submit(
+            lambda: order.append("readback"), CommandPriority.READBACK_BATCH
+        )
+        write = self.actor.submit(lambda: order.append("write"), CommandPriority.USER_WRITE)
+        release.set()
+        readback.result(TIMEOUT)
+        write.result(TIMEOUT)
+
+        assert_that(order, contains_exactly("write", "readback"))
+
+    def test_GIVEN_actor_busy_WHEN_commands_of_same_priority_submitted_THEN_run_in_submission_order(
+        self,
+    ):
+        self.actor.start()
+        order = []
+        release = self._block_actor()
+
+        futures = [
+            self.actor.submit(partial(order.append, index), CommandPriority.USER_WRITE)
+            for index in range(5)
+        ]
+        release.set()
+        for future in futures:
+            future.result(TIMEOUT)
+
+        assert_that(order, contains_exactly(0, 1, 2, 3, 4))
+
+    def test_GIVEN_actor_started_WHEN_function_raises_THEN_exception_raised_by_call(self):
+        self.actor.start()
+
+        def _raise():
+            raise ValueError("bad value")
+
+        assert_that(
+            calling(self.actor.call).with_args(_raise, CommandPriority.USER_WRITE),
+            raises(ValueError),
+        )
+
+    def test_GIVEN_actor_started_WHEN_call_from_model_thread_THEN_run_immediately(self):
+        self.actor.start()
+
+        def _nested_call():
+            return self.actor.call(lambda: "nested", CommandPriority.READBACK_BATCH)
+
+        result = self.actor.call(_nested_call, CommandPriority.USER_WRITE)
+
+        assert_that(result, is_("nested"))
+
+    def test_GIVEN_actor_started_WHEN_commands_run_THEN_latency_recorded_for_their_priority(self):
+        self.actor.start()
+
+        self.actor.call(lambda: None, CommandPriority.USER_WRITE)
+        self.actor.call(lambda: None, CommandPriority.USER_WRITE)
+        self.actor.call(lambda: None, CommandPriority.READBACK_BATCH)
+        result = self.actor.latency_metrics()
+
+        assert_that(result["USER_WRITE"]["count"], is_(2))
+        assert_that(result["READBACK_BATCH"]["count"], is_(1))
+        assert_that(result["MOVE"]["count"], is_(0))
+        assert_that(result["USER_WRITE"]["max"], greater_than_or_equal_to(0))
+
+    def test_GIVEN_actor_stopped_WHEN_call_THEN_function_run_on_calling_thread(self):
+        self.actor.start()
+        self.actor.stop(TIMEOUT)
+
+        result = self.actor.call(threading.current_thread, CommandPriority.USER_WRITE)
+
+        assert_that(self.actor.is_running, is_(False))
+        assert_that(result, is_(threading.current_thread()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,179 @@
+import time
+import unittest
+
+from hamcrest import *
+from mock import Mock
+
+from ReflectometryServer import ConfigHelper
+from ReflectometryServer.move_timeline import (
+    MOVE_TIMELINE,
+    MoveOutcome,
+    MoveTimeline,
+    MoveTimelineUpdate,
+)
+from ReflectometryServer.pv_wrapper import PROCESS_MONITOR_EVENTS, set_default_channel_access
+from ReflectometryServer.synthetic_beamline import create_headless_beamline, move_simulated_motors
+from ReflectometryServer.test_modules.utils import no_autosave
+
+
+class TestMoveTimeline(unittest.TestCase):
+    def setUp(self):
+        self.timeline = MoveTimeline(history_length=2)
+        self.listener = Mock()
+        self.timeline.add_listener(MoveTimelineUpdate, self.listener)
+
+    def _last_move(self):
+        return self.timeline.moves()[-1]
+
+    def _move(self, motors):
+        self.timeline.start("THETA")
+        self.timeline.end_stage("recalc")
+        self.timeline.end_stage("limits")
+        self.timeline.end_stage("duration")
+        for motor in motors:
+            self.timeline.put_sent("driver_" + motor, motor, 0.001)
+        self.timeline.setpoints_sent(2.0)
+
+    def test_GIVEN_move_WHEN_setpoints_sent_THEN_stages_and_puts_recorded_and_moving(self):
+        self._move(["MTR1", "MTR2"])
+
+        assert_that(
+            self._last_move(),
+            has_entries(
+                {
+                    "source": "THETA",
+                    "outcome": MoveOutcome.MOVING,
+                    "stages": has_entries(
+                        {
+                            "recalc": not_none(),
+                            "limits": not_none(),
+                            "duration": not_none(),
+                            "puts": not_none(),
+                        }
+                    ),
+                    "puts": {"driver_MTR1": 1.0, "driver_MTR2": 1.0},
+                    "move_duration": 2.0,
+                    "calc": not_none(),
+                }
+            ),
+        )
+        update = self.listener.call_args[0][0]
+        assert_that(update.calc_time, is_(not_none()))
+        assert_that(update.wall_time, is_(None))
+
+    def test_GIVEN_no_setpoints_sent_WHEN_setpoints_sent_THEN_no_motion(self):
+        self._move([])
+
+        assert_that(self._last_move(), has_entries({"outcome": MoveOutcome.NO_MOTION}))
+
+    def test_GIVEN_moving_WHEN_motors_move_and_stop_and_readbacks_processed_THEN_complete_with_motor_times(
+        self,
+    ):
+        self._move(["MTR1", "MTR2"])
+
+        self.timeline.motor_changing("MTR1", True)
+        self.timeline.motor_changing("MTR2", True)
+        self.timeline.motor_changing("MTR1", False)
+        self.timeline.motor_changing("MTR2", False)
+        self.timeline.readbacks_processed(time.perf_counter())
+
+        move = self._last_move()
+        assert_that(move["outcome"], is_(MoveOutcome.COMPLETE))
+        assert_that(move["first_moving"], less_than_or_equal_to(move["last_stopped"]))
+        assert_that(move["last_stopped"], less_than_or_equal_to(move["settled"]))
+        assert_that(self.listener.call_args[0][0].wall_time, is_(not_none()))
+
+    def test_GIVEN_moving_WHEN_only_some_motors_stopped_THEN_still_moving(self):
+        self._move(["MTR1", "MTR2"])
+
+        self.timeline.motor_changing("MTR1", True)
+        self.timeline.motor_changing("MTR2", True)
+        self.timeline.motor_changing("MTR1", False)
+        self.timeline.readbacks_processed(time.perf_counter())
+
+        assert_that(self._last_move(), has_entries({"outcome": MoveOutcome.MOVING}))
+
+    def test_GIVEN_motor_moved_and_stopped_while_setpoints_being_sent_WHEN_setpoints_sent_THEN_settling(
+        self,
+    ):
+        self.timeline.start("THETA")
+        self.timeline.motor_changing("MTR1", True)
+        self.timeline.motor_changing("MTR1", False)
+        self.timeline.put_sent("driver", "MTR1", 0.001)
+
+        self.timeline.setpoints_sent(1.0)
+
+        assert_that(self._last_move(), has_entries({"outcome": MoveOutcome.SETTLING}))
+
+    def test_GIVEN_motors_stopped_WHEN_readbacks_processed_from_batch_started_before_stop_THEN_still_settling(
+        self,
+    ):
+        self._move(["MTR1"])
+        batch_start = time.perf_counter()
+        self.timeline.motor_changing("MTR1", True)
+        self.timeline.motor_changing("MTR1", False)
+
+        self.timeline.readbacks_processed(batch_start)
+
+        assert_that(self._last_move(), has_entries({"outcome": MoveOutcome.SETTLING}))
+
+    def test_GIVEN_moving_WHEN_new_move_started_THEN_previous_move_superseded(self):
+        self._move(["MTR1"])
+
+        self.timeline.start("HEIGHT")
+
+        assert_that(
+            [(move["source"], move["outcome"]) for move in self.timeline.moves()],
+            contains_exactly(
+                ("THETA", MoveOutcome.SUPERSEDED), ("HEIGHT", MoveOutcome.CALCULATING)
+            ),
+        )
+
+    def test_GIVEN_history_full_WHEN_move_started_THEN_oldest_move_dropped(self):
+        for source in ["A", "B", "C"]:
+            self.timeline.start(source)
+            self.timeline.failed()
+
+        assert_that([move["source"] for move in self.timeline.moves()], contains_exactly("B", "C"))
+
+
+class TestMoveTimelineOnBeamline(unittest.TestCase):
+    def setUp(self):
+        ConfigHelper.reset()
+
+    def tearDown(self):
+        set_default_channel_access(None)
+
+    @no_autosave
+    def test_GIVEN_beamline_WHEN_parameter_moved_and_motors_finish_THEN_move_complete(self):
+        beamline, _, simulated_motors = create_headless_beamline(components=6, benches=0, slits=1)
+
+        beamline.parameter("C0").sp = 0.5
+        move_simulated_motors(simulated_motors, 10)
+        PROCESS_MONITOR_EVENTS.wait_for_processing()
+
+        move = MOVE_TIMELINE.moves()[-1]
+        assert_that(
+            move,
+            has_entries(
+                {
+                    "source": "C0",
+                    "outcome": MoveOutcome.COMPLETE,
+                    "puts": has_length(1),
+                    "first_moving": not_none(),
+                    "settled": not_none(),
+                }
+            ),
+        )
+
+    @no_autosave
+    def test_GIVEN_setpoint_outside_soft_limits_WHEN_moved_THEN_move_failed(self):
+        beamline, _, _ = create_headless_beamline(components=6, benches=0, slits=1)
+
+        beamline.parameter("C0").sp = 1e6
+
+        assert_that(MOVE_TIMELINE.moves()[-1], has_entries({"outcome": MoveOutcome.FAILED}))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -202,6 +202,28 @@ class TestMovementIntercept(unittest.TestCase):
         result = movement.calculate_interception(beam)
         assert_that(result, is_(position(Position(z + z_offset, z + z_offset))))
 
+    def test_GIVEN_movement_perp_to_z_and_intercept_calculated_WHEN_beam_changes_THEN_intercept_is_for_new_beam(
+        self,
+    ):
+        z = 7
+        movement = LinearMovementCalc(PositionAndAngle(0, z, 90))
+        movement.calculate_interception(PositionAndAngle(0, 0, 45))
+
+        result = movement.calculate_interception(PositionAndAngle(1, 0, 0))
+
+        assert_that(result, is_(position(Position(1, z))))
+
+    def test_GIVEN_movement_perp_to_z_and_distance_to_beam_calculated_WHEN_beam_changes_THEN_distance_is_for_new_beam(
+        self,
+    ):
+        movement = LinearMovementCalc(PositionAndAngle(0, 10, 90))
+        movement.set_displacement(5)
+        movement.get_distance_relative_to_beam(PositionAndAngle(0, 0, 0))
+
+        result = movement.get_distance_relative_to_beam(PositionAndAngle(2, 0, 0))
+
+        assert_that(result, is_(close_to(3, 1e-9)))
+
 
 class TestMovementRelativeToBeam(unittest.TestCase):
     def test_GIVEN_movement_along_y_WHEN_set_position_relative_to_beam_to_0_THEN_position_is_at_intercept(
@@ -374,5 +396,30 @@ class TestMovementValueObserver(unittest.TestCase):
         assert_that(result, is_(expected_value))
 
 
+class TestPositionValues(unittest.TestCase):
+    def test_GIVEN_two_positions_and_angles_with_same_values_WHEN_compared_THEN_equal_and_same_hash(
+        self,
+    ):
+        first = PositionAndAngle(1, 2, 3)
+        second = PositionAndAngle(1.0, 2.0, 3.0)
+
+        assert_that(first, is_(equal_to(second)))
+        assert_that(hash(first), is_(hash(second)))
+
+    @parameterized.expand(
+        [(PositionAndAngle(1, 2, 4),), (PositionAndAngle(1, 3, 3),), (Position(1, 2),)]
+    )
+    def test_GIVEN_position_and_angle_WHEN_compared_to_different_value_THEN_not_equal(self, other):
+        assert_that(PositionAndAngle(1, 2, 3), is_(not_(equal_to(other))))
+
+    @parameterized.expand([("y",), ("z",), ("angle",)])
+    def test_GIVEN_position_and_angle_WHEN_attribute_set_THEN_error_as_it_is_immutable(
+        self, attribute
+    ):
+        beam = PositionAndAngle(1, 2, 3)
+
+        assert_that(calling(setattr).with_args(beam, attribute, 10), raises(AttributeError))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -32,6 +32,35 @@ class TestComponentWithOutOfBeamPositions(unittest.TestCase):
 
         assert_that(actual.get_final_position(), is_(expected))
 
+    def test_GIVEN_multiple_out_of_beam_positions_WHEN_getting_position_for_changing_intercepts_THEN_position_follows_the_beam(
+        self,
+    ):
+        lookup = OutOfBeamLookup(self.positions)
+        expected_positions = [
+            PARK_HIGH_POS,
+            PARK_HIHI_POS,
+            PARK_HIHI_POS,
+            PARK_LOW_POS,
+            PARK_HIGH_POS,
+        ]
+
+        actual = [
+            lookup.get_position_for_intercept(Position(beam_height, 0)).get_final_position()
+            for beam_height in [-5, 0, 0, 15, -0.1]
+        ]
+
+        assert_that(actual, is_(expected_positions))
+
+    @parameterized.expand([(float("nan"),), (float("inf"),), (float("-inf"),)])
+    def test_GIVEN_multiple_out_of_beam_positions_WHEN_getting_position_for_non_finite_intercept_THEN_default_position_returned(
+        self, beam_height
+    ):
+        lookup = OutOfBeamLookup(self.positions)
+
+        actual = lookup.get_position_for_intercept(Position(beam_height, 0))
+
+        assert_that(actual.get_final_position(), is_(PARK_HIGH_POS))
+
     @parameterized.expand(
         [
             (-5, PARK_LOW_POS, True),
@@ -0,0 +1,124 @@
+import unittest
+
+from hamcrest import *
+from mock import ANY, Mock, patch
+
+from ReflectometryServer.presets import PresetStore, model_fingerprint
+from ReflectometryServer.test_modules.data_mother import DataMother
+from ReflectometryServer.test_modules.utils import no_autosave
+
+
+class TestPresetStore(unittest.TestCase):
+    @no_autosave
+    def setUp(self):
+        self.beamline, self.axes = DataMother.beamline_s1_s3_theta_detector(spacing=10)
+        self.beamline._perform_move_for_all_drivers = Mock()
+        self.s1 = self.beamline.parameter("s1")
+        self.s3 = self.beamline.parameter("s3")
+        self.s1.sp = 1.0
+        self.s3.sp = 3.0
+
+        patcher = patch("ReflectometryServer.presets.preset_autosave")
+        self.preset_autosave = patcher.start()
+        self.preset_autosave.read_parameter.return_value = None
+        self.addCleanup(patcher.stop)
+
+        self.store = PresetStore(self.beamline)
+
+    def test_GIVEN_beamline_WHEN_save_preset_THEN_preset_contains_setpoints_motor_targets_and_fingerprint(
+        self,
+    ):
+        result = self.store.save("preset")
+
+        assert_that(result.set_points, has_entries({"s1": 1.0, "s3": 3.0}))
+        assert_that(result.motor_targets, has_entries({"MOT:MTR0101": 1.0, "MOT:MTR0102": 3.0}))
+        assert_that(result.fingerprint, is_(model_fingerprint(self.beamline)))
+        assert_that(self.store.names, contains_exactly("preset"))
+        self.preset_autosave.write_parameter.assert_called_once()
+
+    def test_GIVEN_saved_preset_WHEN_presets_read_by_new_store_THEN_preset_is_restored(self):
+        saved = self.store.save("preset")
+        self.preset_autosave.read_parameter.return_value = (
+            self.preset_autosave.write_parameter.call_args[0][1]
+        )
+
+        result = PresetStore(self.beamline)
+
+        assert_that(result.names, contains_exactly("preset"))
+        assert_that(result._presets["preset"], is_(saved))
+
+    def test_GIVEN_saved_preset_and_setpoints_changed_WHEN_recall_preset_THEN_parameters_moved_back_to_preset_in_one_move(
+        self,
+    ):
+        self.store.save("preset")
+        self.s1.sp = 10.0
+        self.s3.sp = 30.0
+        self.beamline._perform_move_for_all_drivers.reset_mock()
+
+        self.store.recall("preset")
+
+        assert_that(self.s1.sp_rbv, is_(1.0))
+        assert_that(self.s3.sp_rbv, is_(3.0))
+        self.beamline._perform_move_for_all_drivers.assert_called_once()
+
+    def test_GIVEN_saved_preset_WHEN_recall_preset_THEN_drivers_sent_saved_motor_targets(self):
+        saved = self.store.save("preset")
+        self.s1.sp = 10.0
+        self.beamline._perform_move_for_all_drivers.reset_mock()
+
+        self.store.recall("preset")
+
+        self.beamline._perform_move_for_all_drivers.assert_called_once_with(
+            ANY, saved.motor_targets
+        )
+
+    def test_GIVEN_saved_preset_and_mode_changed_WHEN_recall_preset_THEN_motor_targets_recalculated(
+        self,
+    ):
+        self.store.save("preset")
+        self.beamline.active_mode = "DISABLED"
+        self.beamline._perform_move_for_all_drivers.reset_mock()
+
+        self.store.recall("preset")
+
+        self.beamline._perform_move_for_all_drivers.assert_called_once_with(ANY)
+
+    def test_GIVEN_saved_preset_WHEN_list_THEN_preset_matches_model(self):
+        self.store.save("preset")
+
+        result = self.store.preset_info()
+
+        assert_that(result, contains_exactly({"name": "preset", "matches_model": True}))
+
+    def test_GIVEN_saved_preset_and_mode_changed_WHEN_list_THEN_preset_does_not_match_model(self):
+        self.store.save("preset")
+        self.beamline.active_mode = "DISABLED"
+
+        result = self.store.preset_info()
+
+        assert_that(result, contains_exactly({"name": "preset", "matches_model": False}))
+
+    def test_GIVEN_preset_listed_WHEN_list_again_THEN_model_not_fingerprinted_again(self):
+        self.store.save("preset")
+        self.store.preset_info()
+
+        with patch("ReflectometryServer.presets.model_fingerprint") as fingerprint:
+            self.store.preset_info()
+
+        fingerprint.assert_not_called()
+
+    def test_GIVEN_preset_listed_WHEN_another_preset_saved_THEN_list_has_both_presets(self):
+        self.store.save("preset")
+        self.store.preset_info()
+
+        self.store.save("other")
+        result = self.store.preset_info()
+
+        assert_that([info["name"] for info in result], contains_exactly("preset", "other"))
+
+    def test_GIVEN_no_preset_WHEN_recall_THEN_error(self):
+        assert_that(calling(self.store.recall).with_args("unknown"), raises(ValueError))
+
+
+if __name__ == "__main__":
+    unittest.main()
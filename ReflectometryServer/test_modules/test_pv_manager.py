@@ -76,6 +76,42 @@ class TestDriverUtils(unittest.TestCase):
 
         assert_that(pv_value, is_(expected_value))
 
+    def test_GIVEN_axis_param_WHEN_create_beamline_THEN_readback_mdel_is_set_from_pv_precision(
+        self,
+    ):
+        param_name = "MYVALUE"
+        param = AxisParameter(param_name, self.comp, ChangeAxis.POSITION)
+        pvmanager = self.create_beamline(param)
+
+        result = pvmanager.PVDB[f"PARAM:{param_name}"]["mdel"]
+
+        assert_that(result, close_to(0.0005, 1e-9))
+
+    def test_GIVEN_axis_param_with_monitor_deadband_WHEN_create_beamline_THEN_readback_mdel_is_parameters(
+        self,
+    ):
+        expected_deadband = 0.1
+        param_name = "MYVALUE"
+        param = AxisParameter(param_name, self.comp, ChangeAxis.POSITION)
+        param.monitor_deadband = expected_deadband
+        pvmanager = self.create_beamline(param)
+
+        result = pvmanager.PVDB[f"PARAM:{param_name}"]["mdel"]
+
+        assert_that(result, is_(expected_deadband))
+
+    def test_GIVEN_axis_param_with_monitor_deadband_WHEN_create_beamline_THEN_setpoint_has_no_monitor_deadband(
+        self,
+    ):
+        param_name = "MYVALUE"
+        param = AxisParameter(param_name, self.comp, ChangeAxis.POSITION)
+        param.monitor_deadband = 0.1
+        pvmanager = self.create_beamline(param)
+
+        result = pvmanager.PVDB[f"PARAM:{param_name}:SP"]
+
+        assert_that(result, not_(has_key("mdel")))
+
 
 if __name__ == "__main__":
     unittest.main()
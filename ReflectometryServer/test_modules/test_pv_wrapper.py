@@ -8,7 +8,11 @@ from server_common.channel_access import UnableToConnectToPVException
 import ReflectometryServer
 from ReflectometryServer import *
 from ReflectometryServer.ChannelAccess.constants import MOTOR_MOVING_PV
-from ReflectometryServer.pv_wrapper import DEFAULT_SCALE_FACTOR, ProcessMonitorEvents
+from ReflectometryServer.pv_wrapper import (
+    DEFAULT_SCALE_FACTOR,
+    ProcessMonitorEvents,
+    ReadbackBatchUpdate,
+)
 from ReflectometryServer.test_modules.data_mother import MockChannelAccess
 
 FLOAT_TOLERANCE = 1e-9
@@ -471,6 +475,17 @@ class TestAggregateMonitorEvents(unittest.TestCase):
 
         assert_that(self.event_arg, contains_inanyorder(expected_value1, expected_value2))
 
+    def test_GIVEN_two_events_WHEN_processed_THEN_batch_update_triggered_once_with_batch_size(self):
+        batch_listener = Mock()
+        self.pme.add_listener(ReadbackBatchUpdate, batch_listener)
+        self.pme.add_trigger(self.event, "HI", start_processing=False)
+        self.pme.add_trigger(self.event, 1, start_processing=False)
+
+        self.pme.process_current_triggers()
+
+        batch_listener.assert_called_once()
+        assert_that(batch_listener.call_args[0][0].size, is_(2))
+
     def test_GIVEN_one_event_WHEN_processed_THEN_loop_is_terminated(self):
         expected_value = "HI"
         self.pme.add_trigger(self.event, expected_value, start_processing=False)
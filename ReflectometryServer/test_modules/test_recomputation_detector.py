@@ -0,0 +1,187 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from hamcrest import *
+from server_common.channel_access import AlarmSeverity, AlarmStatus
+
+from ReflectometryServer import ConfigHelper
+from ReflectometryServer.pv_wrapper import (
+    PROCESS_MONITOR_EVENTS,
+    ReadbackUpdate,
+    set_default_channel_access,
+)
+from ReflectometryServer.recomputation_detector import (
+    RECOMPUTATION_DETECTOR,
+    Recomputation,
+    RecomputationDetector,
+    RecomputationKind,
+)
+from ReflectometryServer.synthetic_beamline import create_headless_beamline
+from ReflectometryServer.test_modules.utils import no_autosave
+
+# Most computations of a single beam path and parameter readback in a move of the synthetic beamline; each beam path
+# is recalculated as every component upstream of it changes, lower these as the redundancy is removed
+MAX_BEAM_PATH_COMPUTATIONS_IN_MOVE = 15
+MAX_PARAMETER_READBACKS_IN_MOVE = 14
+
+
+class TestRecomputationDetector(unittest.TestCase):
+    def setUp(self):
+        self.detector = RecomputationDetector()
+        self.detector.enabled = True
+
+    def test_GIVEN_detector_off_WHEN_computation_made_in_action_THEN_nothing_recorded(self):
+        self.detector.enabled = False
+
+        with self.detector.action("write"):
+            self.detector.record(RecomputationKind.BEAM_PATH, "S1", 1)
+
+        assert_that(self.detector.last_action, is_(None))
+
+    def test_GIVEN_computation_outside_action_WHEN_recorded_THEN_nothing_recorded(self):
+        self.detector.record(RecomputationKind.BEAM_PATH, "S1", 1)
+
+        assert_that(self.detector.worst_offenders(min_count=1), is_([]))
+
+    def test_GIVEN_computations_in_action_WHEN_action_finishes_THEN_counts_and_repeats_of_same_inputs_recorded(
+        self,
+    ):
+        with self.detector.action("write"):
+            self.detector.record(RecomputationKind.BEAM_PATH, "S1", (1, 2))
+            self.detector.record(RecomputationKind.BEAM_PATH, "S1", (1, 2))
+            self.detector.record(RecomputationKind.BEAM_PATH, "S1", (1, 3))
+            self.detector.record(RecomputationKind.BEAM_PATH, "S2", (1, 2))
+
+        assert_that(
+            self.detector.last_action.recomputations(),
+            contains_inanyorder(
+                Recomputation("write", RecomputationKind.BEAM_PATH, "S1", 3, 1),
+                Recomputation("write", RecomputationKind.BEAM_PATH, "S2", 1, 0),
+            ),
+        )
+        assert_that(self.detector.last_action.max_count(RecomputationKind.BEAM_PATH), is_(3))
+        assert_that(
+            self.detector.last_action.max_count(RecomputationKind.PARAMETER_READBACK), is_(0)
+        )
+
+    def test_GIVEN_unhashable_inputs_WHEN_recorded_twice_THEN_repeat_recorded(self):
+        with self.detector.action("write"):
+            self.detector.record(RecomputationKind.PARAMETER_READBACK, "THETA", [1.0])
+            self.detector.record(RecomputationKind.PARAMETER_READBACK, "THETA", [1.0])
+
+        assert_that(
+            self.detector.last_action.recomputations(),
+            contains_exactly(has_property("repeats", 1)),
+        )
+
+    def test_GIVEN_action_inside_action_WHEN_computation_made_THEN_counted_in_outer_action(self):
+        with self.detector.action("outer"):
+            with self.detector.action("inner"):
+                self.detector.record(RecomputationKind.BEAM_PATH, "S1", 1)
+            self.detector.record(RecomputationKind.BEAM_PATH, "S1", 2)
+
+        assert_that(self.detector.last_action.action, is_("outer"))
+        assert_that(self.detector.last_action.max_count(), is_(2))
+
+    def test_GIVEN_function_in_action_WHEN_called_THEN_result_returned_and_computations_counted(
+        self,
+    ):
+        def function():
+            self.detector.record(RecomputationKind.BEAM_PATH, "S1", 1)
+            return 2
+
+        result = self.detector.in_action("write", function)()
+
+        assert_that(result, is_(2))
+        assert_that(self.detector.last_action.max_count(), is_(1))
+
+    def test_GIVEN_several_actions_WHEN_worst_offenders_THEN_worst_of_each_object_most_repeats_first(
+        self,
+    ):
+        for repeats in [2, 1]:
+            with self.detector.action("write"):
+                for _ in range(repeats + 1):
+                    self.detector.record(RecomputationKind.BEAM_PATH, "S1", 1)
+        with self.detector.action("write"):
+            self.detector.record(RecomputationKind.BEAM_PATH, "S2", 1)
+            self.detector.record(RecomputationKind.BEAM_PATH, "S2", 2)
+        with self.detector.action("write"):
+            self.detector.record(RecomputationKind.BEAM_PATH, "S3", 1)
+
+        assert_that(
+            self.detector.worst_offenders(),
+            contains_exactly(
+                Recomputation("write", RecomputationKind.BEAM_PATH, "S1", 3, 2),
+                Recomputation("write", RecomputationKind.BEAM_PATH, "S2", 2, 0),
+            ),
+        )
+
+    def test_GIVEN_offenders_WHEN_dumped_THEN_report_written_with_repeats_flagged(self):
+        with self.detector.action("write THETA"):
+            self.detector.record(RecomputationKind.BEAM_PATH, "S1", 1)
+            self.detector.record(RecomputationKind.BEAM_PATH, "S1", 1)
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, "report.txt")
+
+            self.detector.dump(path)
+
+            with open(path) as report_file:
+                lines = report_file.read().splitlines()
+            assert_that(lines, has_length(2))
+            assert_that(lines[1], all_of(contains_string("!"), contains_string("write THETA")))
+        finally:
+            shutil.rmtree(directory)
+
+
+class TestRecomputationOnBeamline(unittest.TestCase):
+    def setUp(self):
+        ConfigHelper.reset()
+        RECOMPUTATION_DETECTOR.reset()
+
+    def tearDown(self):
+        RECOMPUTATION_DETECTOR.enabled = False
+        RECOMPUTATION_DETECTOR.reset()
+        set_default_channel_access(None)
+
+    @no_autosave
+    def test_GIVEN_beamline_WHEN_parameter_moved_THEN_recomputation_of_beam_paths_and_readbacks_not_increased(
+        self,
+    ):
+        beamline, _, simulated_motors = create_headless_beamline(components=6, benches=0, slits=1)
+        RECOMPUTATION_DETECTOR.enabled = True
+
+        with RECOMPUTATION_DETECTOR.action("move C0"):
+            beamline.parameter("C0").sp = 0.5
+
+        move = RECOMPUTATION_DETECTOR.last_action
+        assert_that(
+            move.max_count(RecomputationKind.BEAM_PATH),
+            is_(less_than_or_equal_to(MAX_BEAM_PATH_COMPUTATIONS_IN_MOVE)),
+        )
+        assert_that(
+            move.max_count(RecomputationKind.PARAMETER_READBACK),
+            is_(less_than_or_equal_to(MAX_PARAMETER_READBACKS_IN_MOVE)),
+        )
+        assert_that(move.max_count(RecomputationKind.CORRECTION_TO_AXIS), is_(1))
+
+    @no_autosave
+    def test_GIVEN_beamline_WHEN_batch_of_readbacks_processed_THEN_readback_batch_recorded(self):
+        beamline, axes, _ = create_headless_beamline(components=6, benches=0, slits=1)
+        RECOMPUTATION_DETECTOR.enabled = True
+        events = {
+            name: (axis.trigger_listeners, ReadbackUpdate(0.5, AlarmSeverity.No, AlarmStatus.No))
+            for name, axis in axes.items()
+        }
+
+        PROCESS_MONITOR_EVENTS._trigger_events(events)
+
+        batch = RECOMPUTATION_DETECTOR.last_action
+        assert_that(batch.action, is_("readback batch"))
+        assert_that(batch.max_count(RecomputationKind.CORRECTION_FROM_AXIS), greater_than(0))
+
+
+if __name__ == "__main__":
+    unittest.main()
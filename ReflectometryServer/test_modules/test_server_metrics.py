@@ -0,0 +1,168 @@
+import json
+import time
+import unittest
+
+from hamcrest import *
+from mock import Mock
+
+from ReflectometryServer import ConfigHelper
+from ReflectometryServer.ChannelAccess.ca_replay import create_driver
+from ReflectometryServer.ChannelAccess.pv_manager import METRICS, METRICS_RATE_PVS
+from ReflectometryServer.pv_wrapper import PROCESS_MONITOR_EVENTS, set_default_channel_access
+from ReflectometryServer.server_metrics import (
+    SERVER_METRICS,
+    MetricHistogram,
+    MetricsUpdate,
+    ServerMetrics,
+)
+from ReflectometryServer.synthetic_beamline import create_headless_beamline, move_simulated_motors
+from ReflectometryServer.test_modules.utils import no_autosave
+
+
+class TestMetricHistogram(unittest.TestCase):
+    def test_GIVEN_values_WHEN_recorded_THEN_counted_in_buckets_with_statistics(self):
+        histogram = MetricHistogram([1, 10])
+
+        for value in [0.5, 1, 5, 20]:
+            histogram.record(value)
+
+        assert_that(
+            histogram.as_dict(),
+            has_entries(
+                {
+                    "count": 4,
+                    "mean": close_to(6.625, 1e-9),
+                    "max": 20,
+                    "buckets": {"<=1": 2, "<=10": 1, ">10": 1},
+                }
+            ),
+        )
+
+
+class TestServerMetrics(unittest.TestCase):
+    def setUp(self):
+        self.metrics = ServerMetrics()
+
+    def test_GIVEN_counts_WHEN_sampled_THEN_totals_and_rates_over_interval_given(self):
+        self.metrics.ca_writes.increment()
+        self.metrics.ca_writes.increment()
+        self.metrics.autosave_writes.increment(3)
+
+        update = self.metrics.sample()
+
+        assert_that(
+            update.totals, has_entries({"ca_writes": 2, "autosave_writes": 3, "ca_reads": 0})
+        )
+        assert_that(update.rates["ca_writes"], greater_than(0))
+        assert_that(update.rates["ca_reads"], is_(0))
+
+    def test_GIVEN_sampled_WHEN_sampled_again_with_no_new_counts_THEN_rates_zero_and_totals_kept(
+        self,
+    ):
+        self.metrics.ca_writes.increment()
+        self.metrics.sample()
+
+        update = self.metrics.sample()
+
+        assert_that(update.totals["ca_writes"], is_(1))
+        assert_that(update.rates["ca_writes"], is_(0))
+
+    def test_GIVEN_batches_WHEN_sampled_THEN_mean_size_and_time_over_interval_given(self):
+        self.metrics.record_batch(100, 1.0)
+        self.metrics.sample()
+        self.metrics.record_batch(2, 0.001)
+        self.metrics.record_batch(4, 0.003)
+
+        update = self.metrics.sample()
+
+        assert_that(update.batch_size, close_to(3, 1e-9))
+        assert_that(update.batch_time, close_to(2, 1e-9))
+        assert_that(update.histograms["batch_size"], has_entries({"count": 3, "max": 100}))
+
+    def test_GIVEN_no_batches_in_interval_WHEN_sampled_THEN_mean_size_and_time_zero(self):
+        update = self.metrics.sample()
+
+        assert_that(update.batch_size, is_(0))
+        assert_that(update.batch_time, is_(0))
+
+    def test_GIVEN_listener_WHEN_started_THEN_metrics_published_periodically(self):
+        listener = Mock()
+        self.metrics.add_listener(MetricsUpdate, listener)
+
+        self.metrics.start(0.01)
+        try:
+            time.sleep(0.1)
+        finally:
+            self.metrics.stop()
+
+        assert_that(listener.call_count, greater_than(1))
+
+
+class TestServerMetricsPvs(unittest.TestCase):
+    def setUp(self):
+        ConfigHelper.reset()
+
+    def tearDown(self):
+        set_default_channel_access(None)
+
+    @no_autosave
+    def test_GIVEN_driver_WHEN_parameter_written_and_motors_move_THEN_metrics_pvs_updated(self):
+        beamline, _, simulated_motors = create_headless_beamline(components=6, benches=0, slits=1)
+        driver = create_driver(beamline)
+        self.addCleanup(driver.close)
+        SERVER_METRICS.sample()
+
+        driver.write("PARAM:C0:SP", 0.5)
+        move_simulated_motors(simulated_motors, 10)
+        PROCESS_MONITOR_EVENTS.wait_for_processing()
+        SERVER_METRICS.publish()
+
+        write_rate_pv, _ = METRICS_RATE_PVS["ca_writes"]
+        assert_that(driver.getParam(write_rate_pv), greater_than(0))
+        metrics = json.loads(driver.getParam(METRICS))
+        assert_that(
+            metrics,
+            has_entries(
+                {
+                    "rates": has_entries(
+                        {"monitor_events": greater_than(0), "pv_posts": greater_than(0)}
+                    ),
+                    "histograms": has_entries(
+                        {"batch_size": has_entries({"count": greater_than(0)})}
+                    ),
+                    "model_queue_latency": has_key("USER_WRITE"),
+                    "custom_functions": has_entries(
+                        {"superseded": not_none(), "timed_out": not_none()}
+                    ),
+                }
+            ),
+        )
+
+    @no_autosave
+    def test_GIVEN_driver_WHEN_metrics_published_THEN_metrics_pvs_read_without_reading_model(self):
+        beamline, _, _ = create_headless_beamline(components=6, benches=0, slits=1)
+        driver = create_driver(beamline)
+        self.addCleanup(driver.close)
+        driver._footprint_manager = Mock()
+
+        SERVER_METRICS.publish()
+
+        driver._footprint_manager.get_sample_length.assert_not_called()
+        assert_that(driver.read(METRICS), is_(driver.getParam(METRICS)))
+
+    @no_autosave
+    def test_GIVEN_driver_WHEN_pv_updated_THEN_post_counted_only_when_pv_changed(self):
+        beamline, _, _ = create_headless_beamline(components=6, benches=0, slits=1)
+        driver = create_driver(beamline)
+        self.addCleanup(driver.close)
+        posts_before = SERVER_METRICS.pv_posts.count
+
+        driver.setParam("PARAM:C0", 123.0)
+        driver.updatePV("PARAM:C0")
+        driver.updatePV("PARAM:C0")
+
+        assert_that(SERVER_METRICS.pv_posts.count - posts_before, is_(1))
+
+
+if __name__ == "__main__":
+    unittest.main()
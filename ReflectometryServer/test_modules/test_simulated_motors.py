@@ -0,0 +1,195 @@
+import threading
+import unittest
+
+from hamcrest import *
+from mock import Mock, PropertyMock, patch
+
+from ReflectometryServer.pv_wrapper import JawsGapPVWrapper, MotorPVWrapper
+from ReflectometryServer.simulated_motors import SimulatedChannelAccess, VirtualClock
+from ReflectometryServer.test_modules.utils import DEFAULT_TEST_TOLERANCE
+
+MOTOR = "MOT:MTR0101"
+JAWS = "MOT:JAWS1"
+
+
+class TestSimulatedMotor(unittest.TestCase):
+    def setUp(self):
+        self.clock = VirtualClock(speed=0)
+        self.ca = SimulatedChannelAccess(self.clock)
+
+    def _advance(self, seconds):
+        self.clock.advance(seconds)
+        self.ca.update()
+
+    def test_GIVEN_motor_with_no_acceleration_WHEN_moved_THEN_moves_at_velocity_until_done(self):
+        self.ca.add_motor(MOTOR, VELO=2.0, VMAX=2.0, ACCL=0)
+
+        self.ca.caput(MOTOR, 4.0)
+        self._advance(1)
+        halfway = (self.ca.caget(MOTOR + ".RBV"), self.ca.caget(MOTOR + ".DMOV"))
+        self._advance(1)
+        finished = (self.ca.caget(MOTOR + ".RBV"), self.ca.caget(MOTOR + ".DMOV"))
+
+        assert_that(halfway[0], close_to(2.0, DEFAULT_TEST_TOLERANCE))
+        assert_that(halfway[1], is_(0))
+        assert_that(finished[0], close_to(4.0, DEFAULT_TEST_TOLERANCE))
+        assert_that(finished[1], is_(1))
+
+    def test_GIVEN_motor_with_acceleration_WHEN_moved_THEN_moves_less_far_than_at_full_velocity(
+        self,
+    ):
+        self.ca.add_motor(MOTOR, VELO=1.0, ACCL=1.0)
+
+        self.ca.caput(MOTOR, 10.0)
+        self._advance(1)
+
+        assert_that(self.ca.caget(MOTOR + ".RBV"), close_to(0.5, DEFAULT_TEST_TOLERANCE))
+
+    def test_GIVEN_motor_with_backlash_WHEN_moved_against_backlash_direction_THEN_final_approach_at_backlash_velocity(
+        self,
+    ):
+        self.ca.add_motor(MOTOR, VELO=1.0, ACCL=0, BDST=1.0, BVEL=0.5)
+
+        self.ca.caput(MOTOR, -2.0)
+        self._advance(3)
+        after_main_move = self.ca.caget(MOTOR + ".RBV")
+        self._advance(1)
+        during_backlash = self.ca.caget(MOTOR + ".RBV")
+        self._advance(1)
+
+        assert_that(after_main_move, close_to(-3.0, DEFAULT_TEST_TOLERANCE))
+        assert_that(during_backlash, close_to(-2.5, DEFAULT_TEST_TOLERANCE))
+        assert_that(self.ca.caget(MOTOR + ".RBV"), close_to(-2.0, DEFAULT_TEST_TOLERANCE))
+        assert_that(self.ca.caget(MOTOR + ".DMOV"), is_(1))
+
+    def test_GIVEN_motor_with_soft_limits_WHEN_moved_outside_limits_THEN_motor_does_not_move(self):
+        self.ca.add_motor(MOTOR, HLM=1.0, LLM=-1.0)
+
+        self.ca.caput(MOTOR, 2.0)
+        self._advance(5)
+
+        assert_that(self.ca.caget(MOTOR + ".RBV"), is_(0.0))
+        assert_that(self.ca.caget(MOTOR + ".LVIO"), is_(1))
+
+    def test_GIVEN_velocity_above_max_WHEN_written_THEN_velocity_limited_to_max(self):
+        self.ca.add_motor(MOTOR, VMAX=2.0)
+
+        self.ca.caput(MOTOR + ".VELO", 5.0)
+
+        assert_that(self.ca.caget(MOTOR + ".VELO"), is_(2.0))
+
+    def test_GIVEN_monitor_on_readback_WHEN_motor_moves_THEN_monitor_called_with_new_value(self):
+        self.ca.add_motor(MOTOR, ACCL=0)
+        monitor = Mock()
+        self.ca.add_monitor(MOTOR + ".RBV", monitor)
+
+        self.ca.caput(MOTOR, 1.0)
+        self._advance(1)
+
+        assert_that(monitor.call_args[0][0], close_to(1.0, DEFAULT_TEST_TOLERANCE))
+
+    def test_GIVEN_motor_WHEN_monitor_added_THEN_monitor_called_with_current_value(self):
+        self.ca.add_motor(MOTOR, VAL=3.0)
+        monitor = Mock()
+
+        self.ca.add_monitor(MOTOR + ".RBV", monitor)
+
+        assert_that(monitor.call_args[0][0], is_(3.0))
+
+    def test_GIVEN_pv_which_is_not_a_motor_WHEN_written_THEN_value_can_be_read(self):
+        self.ca.caput("CS:MOT:_MOVING2.A", 1)
+
+        assert_that(self.ca.caget("CS:MOT:_MOVING2.A"), is_(1))
+        assert_that(self.ca.pv_exists("NOT:WRITTEN"), is_(False))
+
+
+class TestSimulatedJaws(unittest.TestCase):
+    def setUp(self):
+        self.clock = VirtualClock(speed=0)
+        self.ca = SimulatedChannelAccess(self.clock)
+
+    def test_GIVEN_jaws_WHEN_gap_set_THEN_blades_move_either_side_of_centre(self):
+        self.ca.caput(JAWS + ":VCENT:SP", 1.0)
+        self.clock.advance(10)
+        self.ca.caput(JAWS + ":VGAP:SP", 2.0)
+        self.clock.advance(10)
+
+        assert_that(self.ca.caget(JAWS + ":JN:MTR.RBV"), close_to(2.0, DEFAULT_TEST_TOLERANCE))
+        assert_that(self.ca.caget(JAWS + ":JS:MTR.RBV"), close_to(0.0, DEFAULT_TEST_TOLERANCE))
+        assert_that(self.ca.caget(JAWS + ":VGAP"), close_to(2.0, DEFAULT_TEST_TOLERANCE))
+        assert_that(self.ca.caget(JAWS + ":VCENT"), close_to(1.0, DEFAULT_TEST_TOLERANCE))
+        assert_that(self.ca.caget(JAWS + ":VGAP:DMOV"), is_(1))
+
+    def test_GIVEN_jaws_WHEN_gap_moving_THEN_not_done_moving(self):
+        self.ca.caput(JAWS + ":HGAP:SP", 10.0)
+        self.clock.advance(1)
+
+        assert_that(self.ca.caget(JAWS + ":HGAP:DMOV"), is_(0))
+
+
+class TestSimulatedChannelAccessWithPVWrappers(unittest.TestCase):
+    def setUp(self):
+        self.clock = VirtualClock(speed=0)
+        self.ca = SimulatedChannelAccess(self.clock)
+
+    def test_GIVEN_motor_wrapper_on_simulation_WHEN_setpoint_set_THEN_readback_follows(self):
+        wrapper = MotorPVWrapper(MOTOR, ca=self.ca)
+        wrapper.initialise()
+
+        wrapper.sp = 0.5
+        self.clock.advance(10)
+
+        assert_that(wrapper.rbv, close_to(0.5, DEFAULT_TEST_TOLERANCE))
+        assert_that(wrapper.max_velocity, is_(1.0))
+
+    def test_GIVEN_jaws_wrapper_on_simulation_WHEN_gap_set_THEN_readback_follows(self):
+        wrapper = JawsGapPVWrapper(JAWS, is_vertical=True, ca=self.ca)
+        wrapper.initialise()
+
+        wrapper.sp = 3.0
+        self.clock.advance(10)
+
+        assert_that(wrapper.rbv, close_to(3.0, DEFAULT_TEST_TOLERANCE))
+
+
+class TestSimulatedChannelAccessPutWithWait(unittest.TestCase):
+    def setUp(self):
+        self.clock = VirtualClock(speed=0)
+        self.ca = SimulatedChannelAccess(self.clock)
+        patcher = patch.object(
+            SimulatedChannelAccess, "is_running", new_callable=PropertyMock, return_value=True
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.ca.caput(MOTOR, 10.0)
+
+    def _put_in_background(self, pv, value):
+        put = threading.Thread(target=self.ca.caput, args=(pv, value), kwargs={"wait": True})
+        put.daemon = True
+        put.start()
+        put.join(0.1)
+        return put
+
+    def test_GIVEN_motor_moving_WHEN_put_to_setpoint_with_wait_THEN_put_waits_until_move_finished(
+        self,
+    ):
+        put = self._put_in_background(MOTOR + ".VAL", 5.0)
+        waited = put.is_alive()
+        self.clock.advance(100)
+        self.ca.update()
+        put.join(1)
+
+        assert_that(waited, is_(True))
+        assert_that(put.is_alive(), is_(False))
+
+    def test_GIVEN_motor_moving_WHEN_put_to_other_field_with_wait_THEN_put_does_not_wait_for_move(
+        self,
+    ):
+        put = self._put_in_background(MOTOR + ".VELO", 0.5)
+
+        assert_that(put.is_alive(), is_(False))
+        assert_that(self.ca.caget(MOTOR + ".VELO"), is_(0.5))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import unittest
+
+from hamcrest import *
+
+from ReflectometryServer import ConfigHelper
+from ReflectometryServer.components import BenchComponent, ReflectingComponent
+from ReflectometryServer.pv_wrapper import set_default_channel_access
+from ReflectometryServer.simulated_motors import SimulatedChannelAccess, VirtualClock
+from ReflectometryServer.synthetic_beamline import (
+    add_synthetic_beamline,
+    create_headless_beamline,
+    get_beamline,
+    move_simulated_motors,
+)
+from ReflectometryServer.test_modules.utils import DEFAULT_TEST_TOLERANCE, no_autosave
+
+
+class TestSyntheticBeamline(unittest.TestCase):
+    def setUp(self):
+        ConfigHelper.reset()
+
+    def tearDown(self):
+        set_default_channel_access(None)
+
+    @no_autosave
+    def test_GIVEN_sizes_WHEN_create_headless_beamline_THEN_beamline_has_components_of_each_sort(
+        self,
+    ):
+        beamline, axes, _ = create_headless_beamline(
+            components=12, reflecting=2, benches=1, parked=3, slits=2, modes=4, corrections=3
+        )
+
+        components = list(beamline)
+        assert_that(components, has_length(12))
+        assert_that(
+            [component for component in components if type(component) is ReflectingComponent],
+            has_length(2),
+        )
+        assert_that(
+            [component for component in components if type(component) is BenchComponent],
+            has_length(1),
+        )
+        assert_that(beamline.mode_names, has_length(4))
+        assert_that(
+            list(beamline.parameters), has_items("S1VG", "S2HC", "C6INBEAM", "THETA", "DETOFFSET")
+        )
+        assert_that(axes, has_length(len(beamline.drivers)))
+
+    @no_autosave
+    def test_GIVEN_headless_beamline_WHEN_theta_moved_and_motors_moved_THEN_detector_follows_theta(
+        self,
+    ):
+        beamline, _, simulated_motors = create_headless_beamline(
+            components=6, reflecting=0, benches=0, parked=1, slits=1, corrections=0
+        )
+
+        beamline.parameter("THETA").sp = 1.0
+        move_simulated_motors(simulated_motors, 1000)
+
+        assert_that(beamline.parameter("THETA").rbv, close_to(1.0, 0.001))
+        assert_that(beamline.parameter("DETOFFSET").rbv, close_to(0.0, 0.01))
+
+    @no_autosave
+    def test_GIVEN_headless_beamline_WHEN_slit_gap_set_and_motors_moved_THEN_gap_readback_follows(
+        self,
+    ):
+        beamline, _, simulated_motors = create_headless_beamline(
+            components=6, benches=0, parked=1, slits=1
+        )
+
+        beamline.parameter("S1VG").sp = 2.0
+        move_simulated_motors(simulated_motors, 1000)
+
+        assert_that(beamline.parameter("S1VG").rbv, close_to(2.0, DEFAULT_TEST_TOLERANCE))
+
+    def test_GIVEN_too_few_components_for_the_other_sizes_WHEN_added_THEN_error(self):
+        assert_that(
+            calling(add_synthetic_beamline).with_args(components=4, reflecting=2, benches=1),
+            raises(ValueError),
+        )
+
+    def test_GIVEN_more_slits_than_plain_components_WHEN_added_THEN_error(self):
+        assert_that(
+            calling(add_synthetic_beamline).with_args(
+                components=5, reflecting=1, benches=0, slits=3
+            ),
+            raises(ValueError),
+        )
+
+    @no_autosave
+    def test_GIVEN_size_macros_WHEN_get_beamline_THEN_beamline_sized_by_macros(self):
+        set_default_channel_access(SimulatedChannelAccess(VirtualClock(0)))
+
+        beamline = get_beamline(
+            {"SYNTHETIC_COMPONENTS": "8", "SYNTHETIC_REFLECTING": "0", "SYNTHETIC_MODES": "2"}
+        )
+
+        assert_that(list(beamline), has_length(8))
+        assert_that(beamline.mode_names, has_length(2))
+
+
+if __name__ == "__main__":
+    unittest.main()
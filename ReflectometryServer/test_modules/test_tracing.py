@@ -0,0 +1,152 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+from hamcrest import *
+
+from ReflectometryServer import ConfigHelper
+from ReflectometryServer.pv_wrapper import set_default_channel_access
+from ReflectometryServer.synthetic_beamline import create_headless_beamline, move_simulated_motors
+from ReflectometryServer.test_modules.utils import no_autosave
+from ReflectometryServer.tracing import TRACER, Tracer, traced
+
+
+class TestTracer(unittest.TestCase):
+    def setUp(self):
+        self.tracer = Tracer(buffer_size=3)
+
+    def _names(self):
+        return [event["name"] for event in self.tracer.trace_events() if event["ph"] == "X"]
+
+    def test_GIVEN_tracing_off_WHEN_span_THEN_nothing_recorded(self):
+        with self.tracer.span("name", "category"):
+            pass
+
+        assert_that(self.tracer.trace_events(), is_([]))
+
+    def test_GIVEN_tracing_on_WHEN_span_THEN_complete_event_recorded_with_thread_name(self):
+        self.tracer.enabled = True
+
+        with self.tracer.span("name", "category", {"pv": "PV"}):
+            pass
+
+        assert_that(
+            self.tracer.trace_events(),
+            contains_inanyorder(
+                has_entries(
+                    {
+                        "name": "name",
+                        "cat": "category",
+                        "ph": "X",
+                        "dur": greater_than_or_equal_to(0),
+                        "tid": threading.get_ident(),
+                        "args": {"pv": "PV"},
+                    }
+                ),
+                has_entries(
+                    {
+                        "name": "thread_name",
+                        "ph": "M",
+                        "args": {"name": threading.current_thread().name},
+                    }
+                ),
+            ),
+        )
+
+    def test_GIVEN_full_buffer_WHEN_span_added_THEN_oldest_span_dropped(self):
+        self.tracer.enabled = True
+
+        for index in range(4):
+            self.tracer.add_span("span{}".format(index), "category", index, index + 0.5)
+
+        assert_that(self._names(), contains_exactly("span1", "span2", "span3"))
+
+    def test_GIVEN_spans_WHEN_cleared_THEN_no_spans(self):
+        self.tracer.enabled = True
+        self.tracer.add_span("span", "category", 0, 1)
+
+        self.tracer.clear()
+
+        assert_that(self.tracer.trace_events(), is_([]))
+
+    def test_GIVEN_spans_WHEN_dumped_THEN_file_is_trace_event_format(self):
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, "trace.json")
+            self.tracer.enabled = True
+            self.tracer.add_span("span", "category", 1.0, 1.5)
+
+            self.tracer.dump(path)
+
+            with open(path) as trace_file:
+                trace = json.load(trace_file)
+            assert_that(
+                trace["traceEvents"],
+                has_item(has_entries({"name": "span", "ts": 1e6, "dur": 0.5e6})),
+            )
+        finally:
+            shutil.rmtree(directory)
+
+
+class TestTracedDecorator(unittest.TestCase):
+    def tearDown(self):
+        TRACER.enabled = False
+        TRACER.clear()
+
+    def test_GIVEN_tracing_on_WHEN_traced_function_called_THEN_result_returned_and_span_named_after_function(
+        self,
+    ):
+        @traced("category")
+        def function(value):
+            return value * 2
+
+        TRACER.enabled = True
+
+        result = function(2)
+
+        assert_that(result, is_(4))
+        assert_that(
+            TRACER.trace_events(),
+            has_item(has_entries({"name": function.__qualname__, "cat": "category"})),
+        )
+
+
+class TestTracingBeamline(unittest.TestCase):
+    def setUp(self):
+        ConfigHelper.reset()
+
+    def tearDown(self):
+        TRACER.enabled = False
+        TRACER.clear()
+        set_default_channel_access(None)
+
+    @no_autosave
+    def test_GIVEN_tracing_on_WHEN_parameter_moved_THEN_move_from_parameter_to_motor_puts_traced(
+        self,
+    ):
+        beamline, _, simulated_motors = create_headless_beamline(components=6, benches=0, slits=1)
+        TRACER.enabled = True
+
+        beamline.parameter("C0").sp = 0.5
+        move_simulated_motors(simulated_motors, 10)
+
+        names = {event["name"] for event in TRACER.trace_events()}
+        assert_that(
+            names,
+            has_items(
+                "Beamline._move_for_single_beamline_parameters",
+                "IocDriver.perform_move",
+                "correction to axis",
+                "correction from axis",
+                "beam path",
+                "caput",
+                "readback batch",
+            ),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,191 @@
+"""
+Optional tracing of the server as a timeline, e.g. from a user write through the parameter and beam path calculations
+to the puts which start the motors, and of each batch of readbacks back through the model.
+
+While tracing is on, spans are kept in a ring buffer holding the most recent spans; the buffer can be written at any
+time as a Trace Event Format file, which is read by chrome://tracing and Perfetto. While tracing is off the cost of a
+span is a single check.
+"""
+
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Number of spans kept in the ring buffer; the oldest are dropped when it is full
+TRACE_BUFFER_SIZE = 100000
+
+
+class _Span:
+    """
+    Span which records itself in the trace when it ends.
+    """
+
+    __slots__ = ("_tracer", "_name", "_category", "_args", "_start")
+
+    def __init__(self, tracer: "Tracer", name: str, category: str, args: Optional[Dict[str, Any]]):
+        self._tracer = tracer
+        self._name = name
+        self._category = category
+        self._args = args
+        self._start = 0.0
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._tracer.add_span(
+            self._name, self._category, self._start, time.perf_counter(), self._args
+        )
+        return False
+
+
+class _NoSpan:
+    """
+    Span which does nothing, used while tracing is off.
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+
+_NO_SPAN = _NoSpan()
+
+
+class Tracer:
+    """
+    Records spans of the server's work in a ring buffer while tracing is on.
+    """
+
+    def __init__(self, buffer_size: int = TRACE_BUFFER_SIZE):
+        """
+        Initialise.
+        Args:
+            buffer_size: number of spans kept
+        """
+        self.enabled = False
+        self._spans = deque(maxlen=buffer_size)
+
+    def span(self, name: str, category: str, args: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            name: name of the span
+            category: category of the span, e.g. move
+            args: extra information shown with the span
+
+        Returns: context manager which records the time spent in it as a span
+        """
+        if not self.enabled:
+            return _NO_SPAN
+        return _Span(self, name, category, args)
+
+    def add_span(
+        self,
+        name: str,
+        category: str,
+        start: float,
+        end: float,
+        args: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        Record a span which has already been timed, if tracing is on.
+        Args:
+            name: name of the span
+            category: category of the span
+            start: perf_counter time in seconds the span started
+            end: perf_counter time in seconds the span ended
+            args: extra information shown with the span
+        """
+        if self.enabled:
+            # appending to a deque is thread safe
+            self._spans.append((name, category, start, end, threading.get_ident(), args))
+
+    def clear(self):
+        """
+        Remove all the spans from the buffer.
+        """
+        self._spans.clear()
+
+    def trace_events(self) -> List[Dict[str, Any]]:
+        """
+        Returns: the spans in the buffer, and the names of their threads, as trace events
+        """
+        process_id = os.getpid()
+        events = []
+        thread_ids = set()
+        for name, category, start, end, thread_id, args in list(self._spans):
+            thread_ids.add(thread_id)
+            event = {
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": start * 1e6,
+                "dur": (end - start) * 1e6,
+                "pid": process_id,
+                "tid": thread_id,
+            }
+            if args is not None:
+                event["args"] = args
+            events.append(event)
+
+        thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for thread_id in thread_ids:
+            events.append(
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": process_id,
+                    "tid": thread_id,
+                    "args": {"name": thread_names.get(thread_id, str(thread_id))},
+                }
+            )
+        return events
+
+    def dump(self, path: str):
+        """
+        Write the spans in the buffer to a Trace Event Format file.
+        Args:
+            path: path of the file
+        """
+        events = self.trace_events()
+        with open(path, "w") as trace_file:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, trace_file, default=str)
+        logger.info("Trace of {} events written to {}".format(len(events), path))
+
+
+# Tracer for the server
+TRACER = Tracer()
+
+
+def traced(category: str) -> Callable[[Callable], Callable]:
+    """
+    Decorator which records each call of a function as a span named after the function, while tracing is on.
+    Args:
+        category: category of the span
+
+    Returns: decorator
+    """
+
+    def _decorator(function: Callable) -> Callable:
+        name = function.__qualname__
+
+        @functools.wraps(function)
+        def _traced(*args, **kwargs):
+            if not TRACER.enabled:
+                return function(*args, **kwargs)
+            with _Span(TRACER, name, category, None):
+                return function(*args, **kwargs)
+
+        return _traced
+
+    return _decorator
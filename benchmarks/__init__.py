@@ -0,0 +1,3 @@
+"""
+Benchmarks for the reflectometry server; these are standalone scripts run with python -m benchmarks.<module>
+"""
@@ -0,0 +1,146 @@
+"""
+Benchmark of the latency from a channel access put to the monitor it causes, comparing processing channel access with a
+fixed timeout with processing with an adaptive timeout.
+
+A local soft IOC stands in for the reflectometry server. It is served by the processing loop under test and, like the
+server, the monitor comes from a thread other than the one processing channel access: a put to the setpoint updates
+the readback on a model thread a short time later. The client puts to the setpoint and waits for the readback monitor.
+
+Run with:
+    python -m benchmarks.bench_ca_put_latency
+"""
+
+import multiprocessing
+import statistics
+import threading
+import time
+
+from CaChannel import CaChannel, ca
+from pcaspy import Driver, SimpleServer
+
+from ReflectometryServer.ChannelAccess.ca_process_loop import (
+    ADAPTIVE_MAX_TIMEOUT,
+    ADAPTIVE_MIN_TIMEOUT,
+    CA_PROCESS_WAKEUP,
+    FIXED_TIMEOUT,
+    CaProcessLoop,
+)
+
+PREFIX = "TE:BENCH:REFL_01:"
+SETPOINT = "VALUE:SP"
+READBACK = "VALUE"
+PVDB = {
+    SETPOINT: {"type": "float", "prec": 3},
+    READBACK: {"type": "float", "prec": 3},
+}
+
+# Time in seconds the stand in model takes to produce a readback from a setpoint
+MODEL_DELAY = 0.002
+
+NUMBER_OF_PUTS = 200
+TIMEOUT = 5.0
+
+
+class StandInDriver(Driver):
+    """
+    Driver which, like the reflectometry driver, wakes the processing loop when it posts updates and times puts.
+    """
+
+    def write(self, reason, value):
+        CA_PROCESS_WAKEUP.put_started()
+        try:
+            self.setParam(reason, value)
+            self.updatePVs()
+            CA_PROCESS_WAKEUP.wake()
+            threading.Timer(MODEL_DELAY, self._update_readback, [value]).start()
+        finally:
+            CA_PROCESS_WAKEUP.put_finished()
+        return True
+
+    def _update_readback(self, value):
+        self.setParam(READBACK, value)
+        self.updatePVs()
+        CA_PROCESS_WAKEUP.wake()
+
+
+def serve(min_timeout, max_timeout, ready, stop):
+    """
+    Serve the stand in soft IOC until told to stop.
+    Args:
+        min_timeout: minimum timeout of the processing loop
+        max_timeout: maximum timeout of the processing loop
+        ready: event to set once the server is serving
+        stop: event which stops the server when set
+    """
+    server = SimpleServer()
+    server.createPV(PREFIX, PVDB)
+    StandInDriver()
+    loop = CaProcessLoop(server.process, lambda: None, min_timeout, max_timeout)
+    ready.set()
+    while not stop.is_set():
+        loop.process_once()
+
+
+def put_to_monitor_latencies():
+    """
+    Returns: latency in milli seconds for each put to the setpoint until the readback monitor arrives
+    """
+    received = threading.Event()
+    expected = {"value": None}
+
+    def _on_monitor(epics_args, _):
+        if epics_args["pv_value"] == expected["value"]:
+            received.set()
+
+    setpoint = CaChannel(PREFIX + SETPOINT)
+    readback = CaChannel(PREFIX + READBACK)
+    setpoint.searchw()
+    readback.searchw()
+    readback.add_masked_array_event(ca.DBR_DOUBLE, None, ca.DBE_VALUE, _on_monitor)
+    readback.pend_event(0.1)
+
+    latencies = []
+    for index in range(NUMBER_OF_PUTS):
+        expected["value"] = float(index + 1)
+        received.clear()
+        start = time.perf_counter()
+        setpoint.array_put(expected["value"])
+        setpoint.flush_io()
+        while not received.is_set():
+            readback.pend_event(0.0001)
+            if time.perf_counter() - start > TIMEOUT:
+                raise TimeoutError("No monitor for put {}".format(index))
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def run():
+    """
+    Run the benchmark for each processing mode and print the results.
+    """
+    print("{:<12}{:>15}{:>15}{:>15}".format("mode", "median (ms)", "mean (ms)", "max (ms)"))
+    for mode, min_timeout, max_timeout in [
+        ("fixed", FIXED_TIMEOUT, FIXED_TIMEOUT),
+        ("adaptive", ADAPTIVE_MIN_TIMEOUT, ADAPTIVE_MAX_TIMEOUT),
+    ]:
+        ready = multiprocessing.Event()
+        stop = multiprocessing.Event()
+        server = multiprocessing.Process(
+            target=serve, args=(min_timeout, max_timeout, ready, stop), daemon=True
+        )
+        server.start()
+        ready.wait(TIMEOUT)
+        try:
+            latencies = put_to_monitor_latencies()
+        finally:
+            stop.set()
+            server.join(TIMEOUT)
+        print(
+            "{:<12}{:>15.2f}{:>15.2f}{:>15.2f}".format(
+                mode, statistics.median(latencies), statistics.mean(latencies), max(latencies)
+            )
+        )
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,82 @@
+"""
+Benchmark of the latency of switching the beamline mode on a DataMother beamline, alternating between a mode which
+is not disabled and one which is. Also switches between two modes which are not disabled.
+
+Autosave writes are replaced by mocks so that no files are written; the number of autosave writes per switch is
+reported instead.
+
+Run with:
+    python -m benchmarks.bench_mode_switch
+"""
+
+import time
+
+from mock import Mock, patch
+
+from ReflectometryServer import BeamlineMode
+from ReflectometryServer.test_modules.data_mother import DataMother
+from ReflectometryServer.test_modules.utils import no_autosave
+
+NUMBER_OF_SWITCHES = 1000
+BEAMLINE_SPACING = 10
+
+
+@no_autosave
+def create_beamline():
+    """
+    Returns: beamline with slits, theta and a detector with modes NR, DISABLED and a second non-disabled mode NR2
+    """
+    beamline, _ = DataMother.beamline_s1_s3_theta_detector(BEAMLINE_SPACING)
+    second_mode = BeamlineMode("NR2", ["s1", "theta", "det"])
+    beamline._modes[second_mode.name] = second_mode
+    return beamline
+
+
+def time_per_switch(beamline, modes):
+    """
+    Args:
+        beamline: beamline to switch the mode of
+        modes: names of the modes to cycle through
+
+    Returns: mean time per mode switch in micro seconds and the mean number of autosave writes per switch
+    """
+    mode_autosave_write = Mock()
+    disable_mode_autosave_write = Mock()
+    patchers = [
+        patch(
+            "ReflectometryServer.beamline.mode_autosave.write_parameter", new=mode_autosave_write
+        ),
+        patch(
+            "ReflectometryServer.beam_path_calc.disable_mode_autosave.write_parameter",
+            new=disable_mode_autosave_write,
+        ),
+        patch("ReflectometryServer.parameters.param_float_autosave.write_parameter", new=Mock()),
+    ]
+    for patcher in patchers:
+        patcher.start()
+    try:
+        start = time.perf_counter()
+        for index in range(NUMBER_OF_SWITCHES):
+            beamline.active_mode = modes[index % len(modes)]
+        duration = time.perf_counter() - start
+    finally:
+        for patcher in patchers:
+            patcher.stop()
+
+    autosave_writes = mode_autosave_write.call_count + disable_mode_autosave_write.call_count
+    return duration / NUMBER_OF_SWITCHES * 1e6, autosave_writes / NUMBER_OF_SWITCHES
+
+
+def run():
+    """
+    Run the benchmark for each set of modes and print the results.
+    """
+    beamline = create_beamline()
+    print("{:<20}{:>15}{:>20}".format("modes", "time (us)", "autosave writes"))
+    for modes in [("NR", "DISABLED"), ("NR", "NR2")]:
+        switch_time, autosave_writes = time_per_switch(beamline, modes)
+        print("{:<20}{:>15.1f}{:>20.1f}".format("/".join(modes), switch_time, autosave_writes))
+
+
+if __name__ == "__main__":
+    run()
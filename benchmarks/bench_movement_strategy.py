@@ -0,0 +1,63 @@
+"""
+Micro-benchmarks for the interception calculations in the linear movement strategy.
+
+Run with:
+    python -m benchmarks.bench_movement_strategy
+"""
+
+import itertools
+import timeit
+
+from ReflectometryServer.geometry import PositionAndAngle
+from ReflectometryServer.movement_strategy import LinearMovementCalc
+
+NUMBER_OF_CALLS = 100000
+REPEATS = 5
+
+# Number of different beams cycled through so that the new beam case misses the intercept cache
+NUMBER_OF_NEW_BEAMS = 1000
+
+
+def _time_per_call(statement, namespace):
+    """
+    Time a statement taking the best of several repeats.
+    Args:
+        statement: statement to time
+        namespace: globals in which to run the statement
+
+    Returns: best time per call in micro seconds
+    """
+    best = min(timeit.repeat(statement, globals=namespace, number=NUMBER_OF_CALLS, repeat=REPEATS))
+    return best / NUMBER_OF_CALLS * 1e6
+
+
+def run():
+    """
+    Run the benchmarks and print the results.
+    """
+    namespace = {
+        "vertical": LinearMovementCalc(PositionAndAngle(0, 10, 90)),
+        "angled": LinearMovementCalc(PositionAndAngle(0, 10, 30)),
+        "beam": PositionAndAngle(0, 0, 2.3),
+        "new_beams": itertools.cycle(
+            [
+                PositionAndAngle(0, index * 0.001, 2.3 + index * 0.001)
+                for index in range(NUMBER_OF_NEW_BEAMS)
+            ]
+        ),
+    }
+    benchmarks = [
+        ("intercept, vertical axis, unchanged beam", "vertical.calculate_interception(beam)"),
+        ("intercept, angled axis, unchanged beam", "angled.calculate_interception(beam)"),
+        ("distance to beam, unchanged beam", "angled.get_distance_relative_to_beam(beam)"),
+        (
+            "intercept, angled axis, new beam",
+            "angled.calculate_interception(next(new_beams))",
+        ),
+    ]
+    for name, statement in benchmarks:
+        print("{:<45}{:8.3f} us".format(name, _time_per_call(statement, namespace)))
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,125 @@
+"""
+Benchmark of the cost of a single motor readback cascading through a DataMother beamline, i.e. from the pv wrapper,
+through the driver, axis, beam path calcs and parameters.
+
+Reports the time per cascade, the peak memory allocated by the python allocator during a cascade and the number of
+event objects (the classes named ...Update) built during a cascade.
+
+Run with:
+    python -m benchmarks.bench_readback_cascade
+"""
+
+import sys
+import time
+import tracemalloc
+
+from server_common.channel_access import AlarmSeverity, AlarmStatus
+
+from ReflectometryServer.pv_wrapper import ReadbackUpdate
+from ReflectometryServer.test_modules.data_mother import DataMother
+from ReflectometryServer.test_modules.utils import no_autosave
+
+NUMBER_OF_CASCADES = 2000
+BEAMLINE_SPACING = 10
+
+# Suffix of the class names of the events passed to listeners
+EVENT_CLASS_SUFFIX = "Update"
+
+
+@no_autosave
+def create_beamline():
+    """
+    Returns: beamline with slits, theta and a detector and the axes which drive it
+    """
+    return DataMother.beamline_s1_s3_theta_detector(BEAMLINE_SPACING)
+
+
+def _readback_cascade(axis, value):
+    """
+    Send a readback from a motor axis through the beamline.
+    Args:
+        axis: mock motor axis
+        value: readback value
+    """
+    axis.trigger_listeners(ReadbackUpdate(value, AlarmSeverity.No, AlarmStatus.No))
+
+
+def time_per_cascade(axis):
+    """
+    Args:
+        axis: axis to send readbacks from
+    Returns: mean time per readback cascade in micro seconds
+    """
+    start = time.perf_counter()
+    for index in range(NUMBER_OF_CASCADES):
+        _readback_cascade(axis, index % 2)
+    return (time.perf_counter() - start) / NUMBER_OF_CASCADES * 1e6
+
+
+def peak_memory_per_cascade(axis):
+    """
+    Args:
+        axis: axis to send readbacks from
+    Returns: mean of the peak memory traced during each readback cascade in bytes
+    """
+    tracemalloc.start()
+    try:
+        total_peak = 0
+        for index in range(NUMBER_OF_CASCADES):
+            baseline, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            _readback_cascade(axis, index % 2)
+            _, peak = tracemalloc.get_traced_memory()
+            total_peak += peak - baseline
+    finally:
+        tracemalloc.stop()
+    return total_peak / NUMBER_OF_CASCADES
+
+
+def events_built_per_cascade(axis):
+    """
+    Args:
+        axis: axis to send readbacks from
+    Returns: mean number of event objects built during each readback cascade
+    """
+    built = 0
+
+    def _count_event_constructions(frame, event, _):
+        nonlocal built
+        # dataclasses are built in __init__, namedtuples in a lambda taking _cls
+        if event == "call" and frame.f_code.co_name in ("__init__", "__new__", "<lambda>"):
+            instance = frame.f_locals.get("self", frame.f_locals.get("_cls"))
+            event_class = instance if isinstance(instance, type) else type(instance)
+            if event_class.__name__.endswith(EVENT_CLASS_SUFFIX):
+                built += 1
+
+    sys.setprofile(_count_event_constructions)
+    try:
+        for index in range(NUMBER_OF_CASCADES):
+            _readback_cascade(axis, index % 2)
+    finally:
+        sys.setprofile(None)
+    return built / NUMBER_OF_CASCADES
+
+
+def run():
+    """
+    Run the benchmark for each motor axis on the beamline and print the results.
+    """
+    _, axes = create_beamline()
+    print(
+        "{:<20}{:>15}{:>20}{:>15}".format("axis", "time (us)", "peak alloc (bytes)", "events built")
+    )
+    for name, axis in axes.items():
+        print(
+            "{:<20}{:>15.1f}{:>20.0f}{:>15.1f}".format(
+                name,
+                time_per_cascade(axis),
+                peak_memory_per_cascade(axis),
+                events_built_per_cascade(axis),
+            )
+        )
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,426 @@
+"""
+End to end benchmark suite run over DataMother beamlines, synthetic chains of slits and generated large beamlines.
+
+For each beamline it measures:
+    construction: time to build the beamline from its configuration
+    parameter_move: time to set and move a single parameter
+    beamline_move: time to set every parameter and move the whole beamline
+    readback_cascade: time for a single motor readback to cascade through the beamline
+    mode_switch: time to switch the beamline mode
+    footprint_update: time to calculate the footprint, resolution and q range for all sorts of value
+    update_monitors: time for the driver to update the monitors of every PV
+
+Motors are mocks whose readbacks follow their setpoints immediately, so times are those of the server alone, except
+for the generated beamlines whose motors are simulated and only move when the simulation is updated. Autosave
+is replaced by mocks so that no files are read or written. Each beamline is measured in its own process. Results are
+printed and can be written as JSON to compare with the results from another commit; slow downs of more than 10% are
+marked with a !.
+
+Run with:
+    python -m benchmarks.bench_suite [--output results.json] [--compare previous.json] [--beamline NAME]
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import statistics
+import subprocess
+import time
+from datetime import datetime
+
+from mock import Mock, patch
+from pcaspy import SimpleServer
+from server_common.channel_access import AlarmSeverity, AlarmStatus
+
+from ReflectometryServer import (
+    ChangeAxis,
+    ConfigHelper,
+    add_beam_start,
+    add_component,
+    add_driver,
+    add_mode,
+    add_parameter,
+    get_configured_beamline,
+)
+from ReflectometryServer.ChannelAccess.pv_manager import PVManager
+from ReflectometryServer.ChannelAccess.reflectometry_driver import ReflectometryDriver
+from ReflectometryServer.components import Component, ThetaComponent, TiltingComponent
+from ReflectometryServer.footprint_manager import FootprintSort
+from ReflectometryServer.geometry import PositionAndAngle
+from ReflectometryServer.ioc_driver import IocDriver
+from ReflectometryServer.parameters import AxisParameter
+from ReflectometryServer.pv_wrapper import ReadbackUpdate
+from ReflectometryServer.synthetic_beamline import create_headless_beamline
+from ReflectometryServer.test_modules.data_mother import DataMother, create_mock_axis
+from ReflectometryServer.test_modules.utils import no_autosave
+
+BEAMLINE_SPACING = 10
+
+# Number of times each measurement is repeated, construction and update monitors are much slower than the rest
+REPEATS = {
+    "construction": 20,
+    "parameter_move": 500,
+    "beamline_move": 200,
+    "readback_cascade": 500,
+    "mode_switch": 200,
+    "footprint_update": 500,
+    "update_monitors": 50,
+}
+
+# Prefix of the PVs of the driver created to measure updating monitors; these are never served
+PV_PREFIX = "TE:BENCH:REFL_01:"
+
+# Fractional slow down compared with previous results above which a measurement is flagged
+REGRESSION_THRESHOLD = 0.1
+
+
+def _synthetic_beamline(number_of_components):
+    """
+    Create a beamline with a chain of slits, a theta and a detector. Every slit has a height parameter driven by its
+    own motor.
+    Args:
+        number_of_components: number of slits
+
+    Returns: beamline, axes
+    """
+    ConfigHelper.reset()
+    nr = add_mode("NR")
+    disabled = add_mode("DISABLED", is_disabled=True)
+    axes = {}
+
+    def _add_slit(index, position):
+        name = "s{}".format(index)
+        component = add_component(
+            Component("{}_comp".format(name), PositionAndAngle(0.0, position, 90))
+        )
+        add_parameter(AxisParameter(name, component, ChangeAxis.POSITION), modes=[nr, disabled])
+        axis = create_mock_axis("MOT:MTR{:04d}".format(index), 0, 1)
+        add_driver(IocDriver(component, ChangeAxis.POSITION, axis))
+        axes["{}_axis".format(name)] = axis
+
+    before_theta = number_of_components // 2
+    for index in range(before_theta):
+        _add_slit(index, (index + 1) * BEAMLINE_SPACING)
+
+    theta = add_component(
+        ThetaComponent(
+            "theta_comp", PositionAndAngle(0.0, (before_theta + 1) * BEAMLINE_SPACING, 90)
+        )
+    )
+    add_parameter(AxisParameter("theta", theta, ChangeAxis.ANGLE), modes=[nr, disabled])
+
+    for index in range(before_theta, number_of_components):
+        _add_slit(index, (index + 2) * BEAMLINE_SPACING)
+
+    detector = add_component(
+        TiltingComponent(
+            "det_comp", PositionAndAngle(0.0, (number_of_components + 2) * BEAMLINE_SPACING, 90)
+        )
+    )
+    theta.add_angle_to(detector)
+    add_parameter(AxisParameter("det", detector, ChangeAxis.POSITION), modes=[nr, disabled])
+    det_axis = create_mock_axis("MOT:DET", 0, 1)
+    add_driver(IocDriver(detector, ChangeAxis.POSITION, det_axis))
+    axes["det_axis"] = det_axis
+
+    add_beam_start(PositionAndAngle(0.0, 0.0, 0.0))
+    beamline = get_configured_beamline()
+    beamline.active_mode = nr
+    return beamline, axes
+
+
+# Name of each beamline benchmarked and a function to create it, returning the beamline and its motor axes
+BEAMLINES = {
+    "s1_s3_theta_detector": lambda: DataMother.beamline_s1_s3_theta_detector(BEAMLINE_SPACING),
+    "s1_gap_theta_s3_gap_detector": lambda: DataMother.beamline_s1_gap_theta_s3_gap_detector(
+        BEAMLINE_SPACING
+    ),
+    "synthetic_10": lambda: _synthetic_beamline(10),
+    "synthetic_40": lambda: _synthetic_beamline(40),
+    "generated_20": lambda: create_headless_beamline(components=20)[:2],
+    "generated_100": lambda: create_headless_beamline(
+        components=100, reflecting=4, benches=2, parked=10, slits=8, modes=5, corrections=20
+    )[:2],
+}
+
+
+def _summary(times):
+    """
+    Args:
+        times: times of each repeat in seconds
+
+    Returns: summary statistics of the times in micro seconds
+    """
+    times_in_us = [duration * 1e6 for duration in times]
+    return {
+        "count": len(times_in_us),
+        "mean_us": statistics.mean(times_in_us),
+        "median_us": statistics.median(times_in_us),
+        "min_us": min(times_in_us),
+        "max_us": max(times_in_us),
+    }
+
+
+def _time_repeats(repeats, function):
+    """
+    Args:
+        repeats: number of times to call the function
+        function: function to time, called with the index of the repeat
+
+    Returns: time of each call in seconds
+    """
+    times = []
+    for index in range(repeats):
+        start = time.perf_counter()
+        function(index)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def measure_construction(create_beamline):
+    """
+    Args:
+        create_beamline: function which creates the beamline
+
+    Returns: time of each construction in seconds
+    """
+    return _time_repeats(REPEATS["construction"], lambda _: create_beamline())
+
+
+def measure_parameter_move(beamline, _):
+    """
+    Args:
+        beamline: beamline to move
+
+    Returns: time of each move of the first parameter in the mode in seconds
+    """
+    names = beamline.get_param_names_in_mode() or list(beamline.parameters.keys())
+    parameter = beamline.parameters[names[0]]
+
+    def _move(index):
+        parameter.sp = index % 2
+
+    return _time_repeats(REPEATS["parameter_move"], _move)
+
+
+def measure_beamline_move(beamline, _):
+    """
+    Args:
+        beamline: beamline to move
+
+    Returns: time of each move of the beamline, after setting every parameter, in seconds
+    """
+    parameters = list(beamline.parameters.values())
+
+    def _move(index):
+        for parameter in parameters:
+            parameter.sp_no_move = index % 2
+        beamline.move = 1
+
+    return _time_repeats(REPEATS["beamline_move"], _move)
+
+
+def measure_readback_cascade(_, axes):
+    """
+    Args:
+        axes: motor axes of the beamline
+
+    Returns: time of each readback cascade, cycling through the axes, in seconds
+    """
+    axes = list(axes.values())
+
+    def _cascade(index):
+        axis = axes[index % len(axes)]
+        axis.trigger_listeners(ReadbackUpdate(index % 2, AlarmSeverity.No, AlarmStatus.No))
+
+    return _time_repeats(REPEATS["readback_cascade"], _cascade)
+
+
+def measure_mode_switch(beamline, _):
+    """
+    Args:
+        beamline: beamline to switch the mode of
+
+    Returns: time of each switch, cycling through the modes, in seconds
+    """
+    modes = beamline.mode_names
+
+    def _switch(index):
+        beamline.active_mode = modes[index % len(modes)]
+
+    times = _time_repeats(REPEATS["mode_switch"], _switch)
+    beamline.active_mode = modes[0]
+    return times
+
+
+def measure_footprint_update(beamline, _):
+    """
+    Args:
+        beamline: beamline to calculate the footprint of
+
+    Returns: time of each calculation of all footprint values in seconds
+    """
+    footprint_manager = beamline.footprint_manager
+
+    def _update(_):
+        for sort in FootprintSort:
+            footprint_manager.get_footprint(sort)
+            footprint_manager.get_resolution(sort)
+            footprint_manager.get_q_min(sort)
+            footprint_manager.get_q_max(sort)
+
+    return _time_repeats(REPEATS["footprint_update"], _update)
+
+
+def measure_update_monitors(beamline, _, server, prefix):
+    """
+    Args:
+        beamline: beamline to serve
+        server: channel access server the PVs are created on
+        prefix: prefix for the PVs
+
+    Returns: time of each update of all monitors by the driver in seconds
+    """
+    pv_manager = PVManager()
+    server.createPV(prefix, pv_manager.PVDB)
+    driver = ReflectometryDriver(server, pv_manager)
+    pv_manager.set_beamline(beamline)
+    server.createPV(prefix, pv_manager.get_init_filtered_pvdb())
+    driver.set_beamline(beamline)
+    try:
+        return _time_repeats(REPEATS["update_monitors"], lambda _: driver.update_monitors())
+    finally:
+        driver.close()
+
+
+@no_autosave
+@patch("ReflectometryServer.beamline.mode_autosave.write_parameter", new=Mock())
+@patch("ReflectometryServer.beam_path_calc.disable_mode_autosave.write_parameter", new=Mock())
+@patch("ReflectometryServer.parameters.param_float_autosave.write_parameter", new=Mock())
+@patch("ReflectometryServer.parameters.param_bool_autosave.write_parameter", new=Mock())
+def _run_measurements(name):
+    """
+    Run every measurement on a beamline.
+    Args:
+        name: name of the beamline
+
+    Returns: summary of each measurement
+    """
+    create_beamline = BEAMLINES[name]
+    results = {"construction": _summary(measure_construction(create_beamline))}
+    beamline, axes = create_beamline()
+    results["parameter_count"] = len(beamline.parameters)
+    results["driver_count"] = len(beamline.drivers)
+    for measurement, measure in [
+        ("parameter_move", measure_parameter_move),
+        ("beamline_move", measure_beamline_move),
+        ("readback_cascade", measure_readback_cascade),
+        ("mode_switch", measure_mode_switch),
+        ("footprint_update", measure_footprint_update),
+    ]:
+        results[measurement] = _summary(measure(beamline, axes))
+    results["update_monitors"] = _summary(
+        measure_update_monitors(beamline, axes, SimpleServer(), PV_PREFIX)
+    )
+    return results
+
+
+def _measure_beamline(name):
+    """
+    Args:
+        name: name of the beamline
+
+    Returns: summary of each measurement; a module level function which is not decorated so it can be run in a pool
+    """
+    return _run_measurements(name)
+
+
+def benchmark_beamline(name):
+    """
+    Run every measurement on a beamline in its own process, so that listeners added to the module level managers for
+    one beamline do not slow down the next.
+    Args:
+        name: name of the beamline
+
+    Returns: summary of each measurement
+    """
+    with multiprocessing.get_context("spawn").Pool(1) as pool:
+        return pool.apply(_measure_beamline, (name,))
+
+
+def _git_commit():
+    """
+    Returns: the commit being benchmarked, or None if it is not known
+    """
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            stderr=subprocess.DEVNULL,
+            text=True,
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(results, previous=None):
+    """
+    Print the median time of each measurement, with the change compared with previous results if given.
+    Args:
+        results: results of the benchmark
+        previous: results of an earlier benchmark to compare with
+    """
+    print("{:<30}{:<20}{:>15}{:>12}".format("beamline", "measurement", "median (us)", "change"))
+    for name, measurements in results["beamlines"].items():
+        for measurement in REPEATS:
+            median = measurements[measurement]["median_us"]
+            change = ""
+            try:
+                before = previous["beamlines"][name][measurement]["median_us"]
+                ratio = median / before - 1
+                change = "{:+.1%}{}".format(ratio, " !" if ratio > REGRESSION_THRESHOLD else "")
+            except (KeyError, TypeError, ZeroDivisionError):
+                pass
+            print("{:<30}{:<20}{:>15.1f}{:>12}".format(name, measurement, median, change))
+
+
+def run(beamline_names=None, output=None, compare=None):
+    """
+    Run the benchmark and print the results.
+    Args:
+        beamline_names: names of the beamlines to benchmark; None for all
+        output: path of a file to write the results to as JSON; None to not write them
+        compare: path of a JSON results file to compare the results with; None to not compare
+    """
+    results = {
+        "commit": _git_commit(),
+        "time": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "beamlines": {},
+    }
+    for name in BEAMLINES:
+        if beamline_names is None or name in beamline_names:
+            results["beamlines"][name] = benchmark_beamline(name)
+
+    previous = None
+    if compare is not None:
+        with open(compare) as compare_file:
+            previous = json.load(compare_file)
+    print_results(results, previous)
+
+    if output is not None:
+        with open(output, "w") as output_file:
+            json.dump(results, output_file, indent=2)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the end to end benchmark suite")
+    parser.add_argument("--output", help="file to write the results to as JSON")
+    parser.add_argument("--compare", help="JSON results file from a previous run to compare with")
+    parser.add_argument(
+        "--beamline", action="append", choices=list(BEAMLINES), help="beamline to benchmark"
+    )
+    arguments = parser.parse_args()
+    run(arguments.beamline, arguments.output, arguments.compare)
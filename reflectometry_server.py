@@ -43,6 +43,12 @@ from server_common.channel_access import ChannelAccess
 from server_common.helpers import get_macro_values, register_ioc_start
 
 from ReflectometryServer.beamline_configuration import create_beamline_from_configuration
+from ReflectometryServer.ca_recording import CA_RECORDER
+from ReflectometryServer.ChannelAccess.ca_process_loop import (
+    ADAPTIVE_MAX_TIMEOUT,
+    ADAPTIVE_MIN_TIMEOUT,
+    CaProcessLoop,
+)
 from ReflectometryServer.ChannelAccess.constants import (
     DEFAULT_ASG_RULES,
     MYPVPREFIX,
@@ -50,16 +56,18 @@ from ReflectometryServer.ChannelAccess.constants import (
     REFLECTOMETRY_PREFIX,
 )
 from ReflectometryServer.ChannelAccess.pv_manager import PVManager
+from ReflectometryServer.listener_profiler import LISTENER_PROFILER
+from ReflectometryServer.model_actor import MODEL_ACTOR
+from ReflectometryServer.pv_wrapper import set_default_channel_access
+from ReflectometryServer.recomputation_detector import RECOMPUTATION_DETECTOR
+from ReflectometryServer.server_metrics import SERVER_METRICS
+from ReflectometryServer.simulated_motors import SimulatedChannelAccess, VirtualClock
+from ReflectometryServer.tracing import TRACER
 
 
 def process_ca_loop():
     logger.info("Reflectometry Server processing requests")
-    while True:
-        try:
-            SERVER.process(0.1)
-            ChannelAccess.poll()
-        except Exception:
-            break
+    ca_process_loop.run()
 
 
 logger.info("Initialising...")
@@ -86,12 +94,51 @@ SERVER.createPV(
 
 driver = ReflectometryDriver(SERVER, pv_manager)
 
+macros = get_macro_values()
+
+# Simulate the motors in process, rather than use the motor IOCs, if requested
+if macros.get("SIMULATE_MOTORS", "false").lower() == "true":
+    simulated_motors = SimulatedChannelAccess(
+        VirtualClock(float(macros.get("SIMULATED_MOTOR_SPEED", 1.0)))
+    )
+    set_default_channel_access(simulated_motors)
+    simulated_motors.start()
+
+# Record channel access traffic into the server, for replay with ca_replay, if requested. This
+# starts before the beamline is created so that the initial values of the motors are recorded.
+if macros.get("CA_RECORD_FILE"):
+    CA_RECORDER.start(macros["CA_RECORD_FILE"], macros)
+
+# Profile the listeners of the beamline model if requested. This is installed before the beamline
+# is created because only listeners added after it is installed are profiled.
+if macros.get("PROFILE_LISTENERS", "false").lower() == "true":
+    LISTENER_PROFILER.install()
+
+# Trace the server into a ring buffer from the start, rather than only once turned on through its
+# PV, if requested
+if macros.get("TRACE", "false").lower() == "true":
+    TRACER.enabled = True
+
+# Count recomputations in each originating action from the start, rather than only once turned on
+# through its PV
+if macros.get("RECOMPUTE", "false").lower() == "true":
+    RECOMPUTATION_DETECTOR.enabled = True
+
+# Process channel access with a short timeout after the model posts updates, rather than a fixed
+# timeout, if requested
+if macros.get("CA_PROCESS_MODE", "FIXED").upper() == "ADAPTIVE":
+    ca_process_loop = CaProcessLoop(
+        SERVER.process, ChannelAccess.poll, ADAPTIVE_MIN_TIMEOUT, ADAPTIVE_MAX_TIMEOUT
+    )
+else:
+    ca_process_loop = CaProcessLoop(SERVER.process, ChannelAccess.poll)
+
 process_ca_thread = Thread(target=process_ca_loop)
 process_ca_thread.daemon = True
 process_ca_thread.start()
 
 logger.info("Instantiating Beamline Model")
-beamline = create_beamline_from_configuration(get_macro_values())
+beamline = create_beamline_from_configuration(macros)
 pv_manager.set_beamline(beamline)
 
 # Do not re-create PVs that already exist
@@ -100,6 +147,13 @@ pvdb_to_add = pv_manager.get_init_filtered_pvdb()
 SERVER.createPV(REFLECTOMETRY_PREFIX, pvdb_to_add)
 driver.set_beamline(beamline)
 
+# Publish the runtime metrics of the server to their PVs
+SERVER_METRICS.start()
+
+# Run all changes to the model on a single model thread if requested
+if macros.get("MODEL_ACTOR", "false").lower() == "true":
+    MODEL_ACTOR.start()
+
 register_ioc_start(REFL_IOC_NAME, pv_manager.PVDB, REFLECTOMETRY_PREFIX)
 
 logger.info("Reflectometry IOC started.")